@@ -0,0 +1,23 @@
+"""
+Offline backtesting.
+
+Replays stored 1m candles through the same CandleBuffer -> LiveFeatureEngine
+-> StrategyOrchestrator -> EntryGateChecker -> PaperExecutor path the live
+bot uses, on a simulated clock.
+
+Run: python -m backtest --help
+"""
+
+from backtest.data import CandleFrame, iter_candles, load_parquet_frames, load_store_frames
+from backtest.engine import BacktestConfig, BacktestEngine, BacktestReport, StrategyStats
+
+__all__ = [
+    "BacktestConfig",
+    "BacktestEngine",
+    "BacktestReport",
+    "CandleFrame",
+    "StrategyStats",
+    "iter_candles",
+    "load_parquet_frames",
+    "load_store_frames",
+]
@@ -0,0 +1,72 @@
+"""
+Backtest CLI.
+
+Run:
+    python -m backtest                         # data/candles_1m/*.parquet
+    python -m backtest --source store --days 7 # logs/<mode>/candles
+    python -m backtest --symbols BTC-USD,SOL-USD --json report.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from backtest.data import iter_candles, load_parquet_frames, load_store_frames
+from backtest.engine import BacktestConfig, BacktestEngine
+
+
+def _parse_date(value: str) -> datetime:
+    ts = datetime.fromisoformat(value)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backtest", description="Replay stored candles through the strategy pipeline")
+    parser.add_argument("--source", choices=["parquet", "store"], default="parquet",
+                        help="parquet: data/candles_1m exports (or --files); store: CandleStore")
+    parser.add_argument("--files", nargs="*", help="Parquet files to replay (default: data/candles_1m/*.parquet)")
+    parser.add_argument("--symbols", help="Comma-separated symbols (default: all)")
+    parser.add_argument("--days", type=int, default=30, help="Store lookback in days")
+    parser.add_argument("--start", type=_parse_date, help="Replay start (ISO date/time, UTC)")
+    parser.add_argument("--end", type=_parse_date, help="Replay end (ISO date/time, UTC)")
+    parser.add_argument("--trade-usd", type=float, help="Position size (default: paper max_trade_usd)")
+    parser.add_argument("--spread-bps", type=float, default=5.0, help="Assumed spread for gates/features")
+    parser.add_argument("--test-gates", action="store_true",
+                        help="Skip live-only gates (warmth, exposure, spread, whitelist)")
+    parser.add_argument("--seed", type=int, default=0, help="Slippage RNG seed")
+    parser.add_argument("--json", type=Path, help="Write the report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show pipeline warnings")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    symbols = [s.strip() for s in args.symbols.split(",")] if args.symbols else None
+    if args.source == "store":
+        frames = load_store_frames(symbols, days=args.days)
+    else:
+        frames = load_parquet_frames(args.files, symbols)
+    if args.start or args.end:
+        frames = {s: f.between(args.start, args.end) for s, f in frames.items()}
+    if not any(len(f) for f in frames.values()):
+        print("No candles to replay", file=sys.stderr)
+        return 1
+
+    config = BacktestConfig(
+        trade_usd=args.trade_usd,
+        spread_bps=args.spread_bps,
+        live_gates=not args.test_gates,
+        seed=args.seed,
+    )
+    report = BacktestEngine(config).run(iter_candles(frames))
+    print(report.format())
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Candle sources for offline replay.
+
+Loads 1m candles from the persistent CandleStore or from the daily
+``data/candles_1m/*.parquet`` exports into per-symbol column arrays, then
+merges them into a single time-ordered stream.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+try:
+    import pandas as pd
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    pd = None
+
+from core.models import Candle
+from core.models.candle import valid_ohlcv
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+PARQUET_DIR = Path(__file__).parent.parent / "data" / "candles_1m"
+
+
+@dataclass
+class CandleFrame:
+    """Time-sorted 1m candles for one symbol as column arrays."""
+    symbol: str
+    ts: np.ndarray       # Epoch seconds (int64), candle open time
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_candles(cls, symbol: str, candles: list[Candle]) -> "CandleFrame":
+        return cls(
+            symbol=symbol,
+            ts=np.array([int(c.timestamp.timestamp()) for c in candles], dtype=np.int64),
+            open=np.array([c.open for c in candles], dtype=np.float64),
+            high=np.array([c.high for c in candles], dtype=np.float64),
+            low=np.array([c.low for c in candles], dtype=np.float64),
+            close=np.array([c.close for c in candles], dtype=np.float64),
+            volume=np.array([c.volume for c in candles], dtype=np.float64),
+        )
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "CandleFrame":
+        """Return the candles with ``start <= ts < end``."""
+        lo = 0 if start is None else int(np.searchsorted(self.ts, start.timestamp(), "left"))
+        hi = len(self.ts) if end is None else int(np.searchsorted(self.ts, end.timestamp(), "left"))
+        return CandleFrame(
+            self.symbol, self.ts[lo:hi], self.open[lo:hi], self.high[lo:hi],
+            self.low[lo:hi], self.close[lo:hi], self.volume[lo:hi],
+        )
+
+
+def load_store_frames(
+    symbols: Optional[Iterable[str]] = None,
+    days: int = 30,
+    store=None,
+) -> dict[str, CandleFrame]:
+    """Load the last ``days`` of 1m candles from a CandleStore."""
+    if store is None:
+        from core.candle_store import candle_store as store
+
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    frames: dict[str, CandleFrame] = {}
+    for symbol in symbols or store.list_symbols():
+        arrays = store.load_range(symbol, "1m", start=start)
+        if len(arrays):
+            frames[symbol] = CandleFrame(
+                symbol, arrays.ts.astype(np.int64), arrays.open, arrays.high,
+                arrays.low, arrays.close, arrays.volume,
+            )
+    logger.info("[BACKTEST] Loaded %d symbols from candle store", len(frames))
+    return frames
+
+
+def load_parquet_frames(
+    paths: Optional[Iterable[str | Path]] = None,
+    symbols: Optional[Iterable[str]] = None,
+) -> dict[str, CandleFrame]:
+    """
+    Load 1m candles from parquet exports (long format: ts, symbol, OHLCV).
+
+    Defaults to every ``data/candles_1m/*.parquet``. Duplicate (symbol, ts)
+    rows across files keep the last occurrence.
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pandas/pyarrow are required to load parquet candles")
+
+    paths = sorted(Path(p) for p in paths) if paths else sorted(PARQUET_DIR.glob("*.parquet"))
+    symbols = set(symbols) if symbols else None
+    columns = ["ts", "symbol", "open", "high", "low", "close", "volume"]
+
+    parts = []
+    for path in paths:
+        names = pq.read_schema(path).names
+        filters = [("symbol", "in", sorted(symbols))] if symbols else None
+        if "type" in names:
+            type_filter = ("type", "=", "candle_1m")
+            filters = [*filters, type_filter] if filters else [type_filter]
+        parts.append(pd.read_parquet(path, columns=columns, filters=filters))
+    if not parts:
+        return {}
+
+    df = pd.concat(parts, ignore_index=True)
+    ts = pd.to_datetime(df["ts"], utc=True, format="ISO8601")
+    df["ts"] = (ts - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    df = df.drop_duplicates(subset=["symbol", "ts"], keep="last").sort_values(["symbol", "ts"], kind="stable")
+
+    frames: dict[str, CandleFrame] = {}
+    for symbol, group in df.groupby("symbol", sort=True):
+        frames[symbol] = CandleFrame(
+            symbol=symbol,
+            ts=group["ts"].to_numpy(np.int64),
+            open=group["open"].to_numpy(np.float64),
+            high=group["high"].to_numpy(np.float64),
+            low=group["low"].to_numpy(np.float64),
+            close=group["close"].to_numpy(np.float64),
+            volume=group["volume"].to_numpy(np.float64),
+        )
+    logger.info("[BACKTEST] Loaded %d candles for %d symbols from %d parquet files",
+                len(df), len(frames), len(paths))
+    return frames
+
+
+def iter_candles(frames: dict[str, CandleFrame]) -> Iterator[tuple[str, Candle]]:
+    """
+    Merge per-symbol frames into one stream ordered by (ts, symbol).
+
+    The merge is a single lexsort over the concatenated columns; rows are
+    converted to Python scalars in bulk so the per-candle cost is just the
+    (unvalidated) Candle construction.
+    """
+    items = sorted(((s, f) for s, f in frames.items() if len(f)), key=lambda item: item[0])
+    if not items:
+        return
+    names = [s for s, _ in items]
+    ts = np.concatenate([f.ts for _, f in items])
+    sym = np.concatenate([np.full(len(f), i, dtype=np.int32) for i, (_, f) in enumerate(items)])
+    order = np.lexsort((sym, ts))
+
+    columns = [
+        np.concatenate([getattr(f, name) for _, f in items])[order]
+        for name in ("open", "high", "low", "close", "volume")
+    ]
+    # Validate once, vectorized, so rows can skip per-candle checks
+    valid = valid_ohlcv(*columns)
+    if not valid.all():
+        logger.warning("[BACKTEST] Skipping %d invalid candles", int((~valid).sum()))
+        order = order[valid]
+        columns = [col[valid] for col in columns]
+    utc = timezone.utc
+    fromtimestamp = datetime.fromtimestamp
+    trusted = Candle.trusted
+    for t, i, o, h, l, c, v in zip(ts[order].tolist(), sym[order].tolist(), *(col.tolist() for col in columns)):
+        yield names[i], trusted(fromtimestamp(t, utc), o, h, l, c, v)
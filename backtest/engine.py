@@ -0,0 +1,435 @@
+"""
+Backtest Engine - Replays 1m candles through the live decision pipeline.
+
+Per candle, in stream order:
+1. CandleBuffer.add_1m (5m aggregation; 1h/1d rolled up here)
+2. LiveFeatureEngine.update
+3. Exit check for an open position (stop / TP / time stop, intrabar)
+4. StrategyOrchestrator.analyze -> Signal -> EntryGateChecker
+5. PaperExecutor fill
+
+All time-based logic runs on a simulated clock set to the candle close.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from core.config import settings
+from core.helpers import safe_features, set_clock
+from core.logging_utils import get_logger
+from core.mode_configs import PaperModeConfig
+from core.models import Candle, CandleBuffer, Position, Signal, SignalType, TradeResult
+from core.position_registry import PositionRegistry
+from execution.entry_gates import EntryGateChecker
+from execution.paper_executor import PaperExecutor
+from execution.risk import CircuitBreaker, DailyStats
+from logic.intelligence import intelligence
+from logic.live_features import LiveFeatureEngine
+from logic.strategies.orchestrator import StrategyOrchestrator
+
+logger = get_logger(__name__)
+
+ONE_MINUTE = timedelta(minutes=1)
+
+
+@dataclass
+class BacktestConfig:
+    """Replay settings; trading limits come from the paper mode config."""
+    paper: PaperModeConfig = field(default_factory=PaperModeConfig)
+    trade_usd: Optional[float] = None      # Defaults to paper.max_trade_usd
+    spread_bps: float = 5.0                # Assumed spread (no order book offline)
+    btc_regime: str = "normal"
+    vol_regime: str = "normal"
+    cooldown_seconds: int = settings.order_cooldown_seconds
+    live_gates: bool = True                # False = EntryGateChecker test mode
+    seed: Optional[int] = 0                # Slippage RNG seed (None = unseeded)
+
+
+@dataclass
+class StrategyStats:
+    """Closed-trade performance for one strategy."""
+    strategy_id: str
+    signals: int = 0
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_pnl: float = 0.0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return (self.wins / self.trades * 100) if self.trades else 0.0
+
+    @property
+    def avg_pnl(self) -> float:
+        return self.total_pnl / self.trades if self.trades else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        return self.gross_profit / self.gross_loss if self.gross_loss > 0 else float("inf")
+
+    def record(self, result: TradeResult):
+        self.trades += 1
+        self.total_pnl += result.pnl
+        if result.pnl > 0:
+            self.wins += 1
+            self.gross_profit += result.pnl
+        else:
+            self.losses += 1
+            self.gross_loss += abs(result.pnl)
+
+
+@dataclass
+class BacktestReport:
+    """Outcome of a replay."""
+    candles: int = 0
+    symbols: int = 0
+    elapsed_s: float = 0.0
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    signals: int = 0
+    rejections: Dict[str, int] = field(default_factory=dict)
+    trades: List[TradeResult] = field(default_factory=list)
+    by_strategy: Dict[str, StrategyStats] = field(default_factory=dict)
+    final_balance: float = 0.0
+
+    @property
+    def candles_per_sec(self) -> float:
+        return self.candles / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    @property
+    def total_pnl(self) -> float:
+        return sum(t.pnl for t in self.trades)
+
+    @property
+    def win_rate(self) -> float:
+        wins = sum(1 for t in self.trades if t.pnl > 0)
+        return (wins / len(self.trades) * 100) if self.trades else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "candles": self.candles,
+            "symbols": self.symbols,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "candles_per_sec": round(self.candles_per_sec, 1),
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+            "signals": self.signals,
+            "trades": len(self.trades),
+            "total_pnl": round(self.total_pnl, 4),
+            "win_rate": round(self.win_rate, 2),
+            "final_balance": round(self.final_balance, 4),
+            "rejections": dict(self.rejections),
+            "by_strategy": {
+                sid: {
+                    "signals": s.signals,
+                    "trades": s.trades,
+                    "wins": s.wins,
+                    "losses": s.losses,
+                    "win_rate": round(s.win_rate, 2),
+                    "total_pnl": round(s.total_pnl, 4),
+                    "avg_pnl": round(s.avg_pnl, 4),
+                    "gross_profit": round(s.gross_profit, 4),
+                    "gross_loss": round(s.gross_loss, 4),
+                    "profit_factor": round(s.profit_factor, 3) if s.gross_loss > 0 else None,
+                }
+                for sid, s in self.by_strategy.items()
+            },
+        }
+
+    def format(self) -> str:
+        """Render a plain-text summary table."""
+        lines = [
+            f"Replayed {self.candles} candles / {self.symbols} symbols "
+            f"in {self.elapsed_s:.1f}s ({self.candles_per_sec:,.0f} candles/s)",
+        ]
+        if self.start and self.end:
+            lines.append(f"Period: {self.start:%Y-%m-%d %H:%M} -> {self.end:%Y-%m-%d %H:%M} UTC")
+        lines.append(
+            f"Signals: {self.signals}  Trades: {len(self.trades)}  "
+            f"Win rate: {self.win_rate:.1f}%  P&L: ${self.total_pnl:+.2f}  "
+            f"Balance: ${self.final_balance:.2f}"
+        )
+        if self.by_strategy:
+            lines.append("")
+            lines.append(f"  {'Strategy':<20} {'Signals':>7} {'Trades':>6} {'Win%':>7} {'P&L':>10} {'PF':>6}")
+            lines.append(f"  {'-'*20} {'-'*7} {'-'*6} {'-'*7} {'-'*10} {'-'*6}")
+            for sid, s in sorted(self.by_strategy.items(), key=lambda x: -x[1].total_pnl):
+                pf = f"{s.profit_factor:.2f}" if s.profit_factor < 100 else "∞"
+                lines.append(
+                    f"  {sid:<20} {s.signals:>7} {s.trades:>6} {s.win_rate:>6.1f}% "
+                    f"${s.total_pnl:>+8.2f} {pf:>6}"
+                )
+        if self.rejections:
+            lines.append("")
+            lines.append("  Top gate rejections:")
+            for reason, count in Counter(self.rejections).most_common(5):
+                lines.append(f"    {reason}: {count}")
+        return "\n".join(lines)
+
+
+class _BarRoller:
+    """Rolls 1m candles into a higher-timeframe bar of ``seconds`` length."""
+
+    __slots__ = ("seconds", "bucket", "open", "high", "low", "close", "volume")
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self.bucket: Optional[int] = None
+
+    def push(self, candle: Candle, ts: int) -> Optional[Candle]:
+        """Add a candle; returns the completed previous bar on a bucket change."""
+        bucket = ts - ts % self.seconds
+        done = None
+        if bucket != self.bucket:
+            if self.bucket is not None:
+                done = Candle.trusted(
+                    datetime.fromtimestamp(self.bucket, timezone.utc),
+                    self.open, self.high, self.low, self.close, self.volume,
+                )
+            self.bucket = bucket
+            self.open, self.high, self.low = candle.open, candle.high, candle.low
+            self.close, self.volume = candle.close, candle.volume
+        else:
+            self.high = max(self.high, candle.high)
+            self.low = min(self.low, candle.low)
+            self.close = candle.close
+            self.volume += candle.volume
+        return done
+
+
+class BacktestEngine:
+    """
+    Offline replay of the live pipeline on a simulated clock.
+
+    One position per symbol; exits are evaluated on each new 1m candle using
+    its high/low (stop first, then TP2, TP1 as a full exit, then time stop).
+    """
+
+    def __init__(
+        self,
+        config: Optional[BacktestConfig] = None,
+        orchestrator: Optional[StrategyOrchestrator] = None,
+    ):
+        self.config = config or BacktestConfig()
+        self.orchestrator = orchestrator or StrategyOrchestrator()
+        self.features = LiveFeatureEngine()
+        self.executor = PaperExecutor(self.config.paper)
+        self.registry = PositionRegistry(self.config.paper)
+        self.daily_stats = DailyStats()
+        self.positions: Dict[str, Position] = {}
+        self.order_cooldown: Dict[str, datetime] = {}
+        self.gates = EntryGateChecker(
+            positions=self.positions,
+            position_registry=self.registry,
+            daily_stats=self.daily_stats,
+            circuit_breaker=CircuitBreaker(),
+            order_cooldown=self.order_cooldown,
+            exchange_holdings={},
+            cooldown_seconds=self.config.cooldown_seconds,
+            get_candle_buffer_func=self.get_buffer,
+            is_test=not self.config.live_gates,
+        )
+        self.buffers: Dict[str, CandleBuffer] = {}
+        self._rollers: Dict[str, tuple[_BarRoller, _BarRoller]] = {}
+        self._now: Optional[datetime] = None
+        self._day: Optional[int] = None
+        self.report = BacktestReport()
+
+    def get_buffer(self, symbol: str) -> Optional[CandleBuffer]:
+        return self.buffers.get(symbol)
+
+    def now(self) -> datetime:
+        """Simulated time (close of the candle being processed)."""
+        return self._now or datetime.now(timezone.utc)
+
+    def run(self, candles: Iterable[tuple[str, Candle]]) -> BacktestReport:
+        """Replay a time-ordered ``(symbol, candle)`` stream."""
+        return asyncio.run(self.run_async(candles))
+
+    async def run_async(self, candles: Iterable[tuple[str, Candle]]) -> BacktestReport:
+        if self.config.seed is not None:
+            random.seed(self.config.seed)
+        report = self.report
+        set_clock(self.now)
+        started = time.perf_counter()
+        try:
+            for symbol, candle in candles:
+                await self._on_candle(symbol, candle)
+                report.candles += 1
+            # Mark remaining positions to the last close
+            for symbol in list(self.positions):
+                buffer = self.buffers[symbol]
+                await self._close(symbol, buffer.last_price, "end_of_data")
+        finally:
+            set_clock(None)
+        report.elapsed_s = time.perf_counter() - started
+        report.symbols = len(self.buffers)
+        report.end = self._now
+        report.final_balance = self.executor.balance
+        report.rejections = dict(report.rejections)
+        return report
+
+    async def _on_candle(self, symbol: str, candle: Candle):
+        ts = int(candle.timestamp.timestamp())
+        self._now = candle.timestamp + ONE_MINUTE
+        if self.report.start is None:
+            self.report.start = candle.timestamp
+        self._roll_day(ts)
+
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = CandleBuffer(symbol=symbol, log_5m=False)
+            self._rollers[symbol] = (_BarRoller(3600), _BarRoller(86400))
+        buffer.add_1m(candle)
+        self._roll_higher_tf(symbol, buffer, candle, ts)
+
+        vwap = buffer.vwap(30) if len(buffer.candles_1m) >= 30 else 0.0
+        indicators = self.features.update(symbol, candle, self.config.spread_bps, vwap)
+        if indicators is not None:
+            intelligence.update_live_indicators(symbol, indicators)
+
+        position = self.positions.get(symbol)
+        if position is not None:
+            await self._check_exit(position, candle)
+            return
+
+        strat_signal = self.orchestrator.analyze(
+            symbol, buffer, self._build_features(indicators, buffer),
+            {"btc_regime": self.config.btc_regime, "vol_regime": self.config.vol_regime},
+        )
+        if strat_signal is None:
+            return
+        self.report.signals += 1
+        self._stats(strat_signal.strategy_id).signals += 1
+        signal = self._adapt_signal(symbol, strat_signal)
+        if signal is None:
+            return
+
+        gate_result, _ = self.gates.check_all_gates(signal)
+        if not gate_result.passed:
+            reason = gate_result.reason or "rejected"
+            self.report.rejections[reason] = self.report.rejections.get(reason, 0) + 1
+            return
+        await self._open(signal, buffer.last_price)
+
+    def _roll_day(self, ts: int):
+        """Reset daily loss tracking at simulated UTC midnight."""
+        day = ts // 86400
+        if day != self._day:
+            self._day = day
+            self.daily_stats.total_pnl = 0.0
+
+    def _roll_higher_tf(self, symbol: str, buffer: CandleBuffer, candle: Candle, ts: int):
+        roll_1h, roll_1d = self._rollers[symbol]
+        bar_1h = roll_1h.push(candle, ts)
+        bar_1d = roll_1d.push(candle, ts)
+        if bar_1h is None and bar_1d is None:
+            return
+        if bar_1h is not None:
+            buffer.candles_1h = [*buffer.candles_1h, bar_1h]
+        if bar_1d is not None:
+            buffer.candles_1d = [*buffer.candles_1d, bar_1d]
+        self.features.update_higher_tf(symbol, buffer.candles_1h, buffer.candles_1d)
+
+    def _build_features(self, ind, buffer: CandleBuffer) -> dict:
+        """Same feature dict the live bot hands to the orchestrator."""
+        features = {
+            "trend_5m": 0.0,
+            "trend_1h": 0.0,
+            "trend_15m": 0.0,
+            "vol_ratio": 1.0,
+            "vwap_pct": 0.0,
+            "vwap_distance": 0.0,
+            "spread_bps": self.config.spread_bps,
+        }
+        if ind is not None and ind.is_ready:
+            features.update({
+                "trend_5m": ind.trend_5m,
+                "trend_1h": ind.trend_15m,  # 15m as proxy for 1h, as in live
+                "trend_15m": ind.trend_15m,
+                "vol_ratio": ind.volume_ratio,
+                "vwap_pct": ind.vwap_distance,
+                "vwap_distance": ind.vwap_distance,
+            })
+        else:
+            vwap = buffer.vwap(30)
+            if vwap > 0 and buffer.last_price > 0:
+                features["vwap_pct"] = (buffer.last_price - vwap) / vwap * 100
+                features["vwap_distance"] = features["vwap_pct"]
+        return safe_features(features)
+
+    def _adapt_signal(self, symbol: str, strat_signal) -> Optional[Signal]:
+        """StrategySignal -> core Signal (mirrors the live adapter, no scanner)."""
+        if strat_signal.entry_price <= 0 or strat_signal.stop_price <= 0:
+            return None
+        signal = Signal(
+            symbol=symbol,
+            strategy_id=strat_signal.strategy_id,
+            type=SignalType.FLAG_BREAKOUT,
+            timestamp=self.now(),
+            price=strat_signal.entry_price,
+            confidence=min(max(strat_signal.edge_score_base / 100, 0.0), 1.0),
+            stop_price=strat_signal.stop_price,
+            tp1_price=strat_signal.tp1_price,
+            tp2_price=strat_signal.tp2_price,
+            reason=strat_signal.reason or f"{strat_signal.strategy_id} setup",
+            spread_bps=self.config.spread_bps,
+        )
+        signal.confluence_count = getattr(strat_signal, "confluence_count", 1)
+        return signal
+
+    async def _open(self, signal: Signal, price: float):
+        size_usd = self.config.trade_usd or self.config.paper.max_trade_usd
+        ok, reason = self.executor.can_execute_order(size_usd, signal.symbol)
+        if not ok:
+            self.report.rejections["executor"] = self.report.rejections.get("executor", 0) + 1
+            return
+        position = await self.executor.open_position(
+            signal.symbol, size_usd, price,
+            signal.stop_price, signal.tp1_price, signal.tp2_price,
+        )
+        if position is None:
+            return
+        position.entry_time = self.now()
+        position.strategy_id = signal.strategy_id
+        position.entry_cost_usd = size_usd
+        self.positions[signal.symbol] = position
+        self.registry.add_position(position)
+        self.order_cooldown[signal.symbol] = self.now()
+        self.orchestrator.reset(signal.symbol)
+
+    async def _check_exit(self, position: Position, candle: Candle):
+        if position.stop_price and candle.low <= position.stop_price:
+            # Gap through the stop fills at the open
+            await self._close(position.symbol, min(position.stop_price, candle.open), "stop")
+        elif position.tp2_price and candle.high >= position.tp2_price:
+            await self._close(position.symbol, position.tp2_price, "tp2")
+        elif position.tp1_price and candle.high >= position.tp1_price:
+            await self._close(position.symbol, position.tp1_price, "tp1")
+        elif self.now() - position.entry_time >= timedelta(minutes=self.config.paper.max_hold_minutes):
+            await self._close(position.symbol, candle.close, "time_stop")
+
+    async def _close(self, symbol: str, price: float, reason: str):
+        position = self.positions.pop(symbol)
+        self.registry.remove_position(symbol)
+        result = await self.executor.close_position(position, price, reason)
+        result.exit_time = self.now()
+        self.report.trades.append(result)
+        self._stats(result.strategy_id or "unknown").record(result)
+        # DailyStats.record_trade persists to disk; only the loss limit matters here
+        self.daily_stats.total_pnl += result.pnl
+        self.order_cooldown[symbol] = self.now()
+        self.orchestrator.reset(symbol)
+
+    def _stats(self, strategy_id: str) -> StrategyStats:
+        stats = self.report.by_strategy.get(strategy_id)
+        if stats is None:
+            stats = self.report.by_strategy[strategy_id] = StrategyStats(strategy_id)
+        return stats
@@ -0,0 +1,405 @@
+"""
+Parameter Sweep - Parallel backtests over a parameter grid x symbol shards.
+
+Candles are staged once into an uncompressed Arrow IPC file; every worker
+memory-maps it and slices out its symbols zero-copy, so tasks carry only
+parameter dicts and symbol names. Completed tasks are appended to a JSONL
+checkpoint, and a rerun with the same grid skips them.
+
+Grid keys:
+    paper.<field>         PaperModeConfig (risk limits, bf_* thresholds)
+    orchestrator.<field>  OrchestratorConfig (enable_* flags, confluence)
+    settings.<field>      core.config.settings (strategy thresholds)
+    <field>               BacktestConfig (trade_usd, spread_bps, ...)
+
+Run:
+    python -m backtest.sweep --grid '{"orchestrator.enable_vwap_reclaim": [true, false]}'
+
+Each shard is an independent portfolio; cross-symbol limits (max positions,
+daily loss) only apply within a shard.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from backtest.data import CandleFrame, iter_candles, load_parquet_frames
+from backtest.engine import BacktestConfig, BacktestEngine
+from core.config import settings
+from core.logging_utils import get_logger
+from core.mode_configs import BaseTradingConfig, PaperModeConfig
+
+logger = get_logger(__name__)
+
+SWEEP_DIR = Path(__file__).parent.parent / "data" / "backtest"
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+_INDEX_KEY = b"cointrader.symbol_index"
+
+
+# ---------------------------------------------------------------------------
+# Shared candle file
+# ---------------------------------------------------------------------------
+
+def write_candle_arrow(frames: dict[str, CandleFrame], path: str | Path) -> Path:
+    """Stage frames into one Arrow IPC file (symbol-contiguous, one batch)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    symbols = sorted(s for s, f in frames.items() if len(f))
+
+    index, offset = {}, 0
+    for symbol in symbols:
+        index[symbol] = [offset, len(frames[symbol])]
+        offset += len(frames[symbol])
+
+    def column(name):
+        if not symbols:
+            return np.empty(0)
+        return np.concatenate([getattr(frames[s], name) for s in symbols])
+
+    table = pa.table(
+        {"ts": pa.array(column("ts"), type=pa.int64()),
+         **{name: pa.array(column(name), type=pa.float64()) for name in _COLUMNS}},
+    ).replace_schema_metadata({_INDEX_KEY: json.dumps(index)})
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+    os.replace(tmp, path)
+    logger.info("[SWEEP] Staged %d candles for %d symbols to %s", offset, len(symbols), path)
+    return path
+
+
+class CandleArrow:
+    """Memory-mapped view of a staged candle file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        source = pa.memory_map(str(self.path), "r")
+        self.table = pa.ipc.open_file(source).read_all()
+        raw_index = self.table.schema.metadata[_INDEX_KEY]
+        self.index: dict[str, list[int]] = json.loads(raw_index)
+        # Identifies the staged data so checkpoints from other data are ignored
+        self.data_id = hashlib.sha1(raw_index + str(self.table.num_rows).encode()).hexdigest()[:12]
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.index)
+
+    def frame(self, symbol: str) -> CandleFrame:
+        """Zero-copy CandleFrame for one symbol (views into the mapping)."""
+        offset, length = self.index[symbol]
+        part = self.table.slice(offset, length)
+        arrays = {
+            name: part.column(name).chunk(0).to_numpy(zero_copy_only=True) if length
+            else np.empty(0)
+            for name in ("ts", *_COLUMNS)
+        }
+        return CandleFrame(symbol=symbol, **arrays)
+
+    def frames(self, symbols: Iterable[str]) -> dict[str, CandleFrame]:
+        return {s: self.frame(s) for s in symbols if s in self.index}
+
+
+# ---------------------------------------------------------------------------
+# Grid / tasks
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SweepTask:
+    """One parameter combination over one symbol shard."""
+    key: str
+    params: dict
+    symbols: list[str]
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    """Cartesian product of a {name: [values]} grid (key order preserved)."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def _task_key(params: dict, symbols: list[str], data_id: str) -> str:
+    blob = json.dumps({"params": params, "symbols": symbols, "data": data_id}, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def build_config(params: dict):
+    """Split a param dict into (BacktestConfig, OrchestratorConfig, settings overrides)."""
+    from logic.strategies.orchestrator import OrchestratorConfig
+
+    paper = PaperModeConfig()
+    orch = OrchestratorConfig()
+    backtest_fields = {f.name for f in fields(BacktestConfig)}
+    overrides, direct = {}, {}
+    for name, value in params.items():
+        scope, _, attr = name.rpartition(".")
+        if scope == "paper":
+            target = paper
+        elif scope == "orchestrator":
+            target = orch
+        elif scope == "settings":
+            if not hasattr(settings, attr):
+                raise ValueError(f"Unknown setting: {attr}")
+            overrides[attr] = value
+            continue
+        elif not scope and attr in backtest_fields and attr != "paper":
+            direct[attr] = value
+            continue
+        else:
+            raise ValueError(f"Unknown sweep parameter: {name}")
+        if not hasattr(target, attr):
+            raise ValueError(f"Unknown sweep parameter: {name}")
+        setattr(target, attr, value)
+    return BacktestConfig(paper=paper, **direct), orch, overrides
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+_candles: Optional[CandleArrow] = None
+
+
+def _init_worker(arrow_path: str):
+    global _candles
+    logging.getLogger().setLevel(logging.ERROR)
+    _candles = CandleArrow(arrow_path)
+
+
+def run_task(task: SweepTask, candles: Optional[CandleArrow] = None) -> dict:
+    """Run one backtest; settings overrides are restored afterwards."""
+    from logic.intelligence import intelligence
+    from logic.strategies.orchestrator import StrategyOrchestrator
+
+    candles = candles or _candles
+    config, orch_config, overrides = build_config(task.params)
+    saved = {name: getattr(settings, name) for name in overrides}
+    try:
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        # Indicator cache is process-global; don't leak the previous task's symbols
+        intelligence.cache.clear_all()
+        orchestrator = StrategyOrchestrator(orch_config)
+        for strategy in orchestrator.strategies:
+            if isinstance(getattr(strategy, "config", None), BaseTradingConfig):
+                strategy.config = config.paper
+        report = BacktestEngine(config, orchestrator).run(iter_candles(candles.frames(task.symbols)))
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+    return report.to_dict()
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class SweepRunner:
+    """Fans tasks out over a process pool and merges results per parameter set."""
+
+    def __init__(
+        self,
+        arrow_path: str | Path,
+        grid: dict[str, list],
+        symbols: Optional[Iterable[str]] = None,
+        shard_size: int = 1,
+        workers: Optional[int] = None,
+        checkpoint: Optional[str | Path] = None,
+        rank_by: str = "total_pnl",
+    ):
+        self.arrow_path = Path(arrow_path)
+        self.grid = grid
+        candles = CandleArrow(self.arrow_path)
+        self.data_id = candles.data_id
+        self.symbols = sorted(symbols) if symbols else candles.symbols
+        self.shard_size = max(1, shard_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        self.rank_by = rank_by
+
+    def tasks(self) -> list[SweepTask]:
+        shards = [
+            self.symbols[i:i + self.shard_size]
+            for i in range(0, len(self.symbols), self.shard_size)
+        ]
+        return [
+            SweepTask(_task_key(params, shard, self.data_id), params, shard)
+            for params in expand_grid(self.grid)
+            for shard in shards
+        ]
+
+    def _load_checkpoint(self) -> dict[str, dict]:
+        done: dict[str, dict] = {}
+        if not self.checkpoint or not self.checkpoint.exists():
+            return done
+        with open(self.checkpoint, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    done[entry["key"]] = entry
+                except (json.JSONDecodeError, KeyError):
+                    continue  # Torn last line from an interrupted run
+        return done
+
+    def _ends_torn(self) -> bool:
+        """True if the checkpoint's last line was cut off before its newline."""
+        if not self.checkpoint.exists() or self.checkpoint.stat().st_size == 0:
+            return False
+        with open(self.checkpoint, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def run(self) -> list[dict]:
+        """Run outstanding tasks and return the ranked, merged table."""
+        tasks = self.tasks()
+        done = self._load_checkpoint()
+        pending = [t for t in tasks if t.key not in done]
+        if len(pending) < len(tasks):
+            logger.info("[SWEEP] Resuming: %d/%d tasks already done", len(tasks) - len(pending), len(tasks))
+
+        if pending:
+            ckpt = None
+            if self.checkpoint:
+                self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+                torn = self._ends_torn()
+                ckpt = open(self.checkpoint, "a", encoding="utf-8")
+                if torn:
+                    ckpt.write("\n")  # Keep the next entry off the torn line
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(pending)),
+                    mp_context=get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(str(self.arrow_path),),
+                ) as pool:
+                    futures = {pool.submit(run_task, task): task for task in pending}
+                    for future in as_completed(futures):
+                        task = futures[future]
+                        entry = {
+                            "key": task.key,
+                            "params": task.params,
+                            "symbols": task.symbols,
+                            "result": future.result(),
+                        }
+                        done[task.key] = entry
+                        if ckpt:
+                            ckpt.write(json.dumps(entry) + "\n")
+                            ckpt.flush()
+                            os.fsync(ckpt.fileno())
+            finally:
+                if ckpt:
+                    ckpt.close()
+
+        return self.merge([done[t.key] for t in tasks])
+
+    def merge(self, entries: list[dict]) -> list[dict]:
+        """Aggregate shard results per parameter set and rank them."""
+        rows: dict[str, dict] = {}
+        for entry in entries:
+            pkey = json.dumps(entry["params"], sort_keys=True)
+            result = entry["result"]
+            row = rows.get(pkey)
+            if row is None:
+                row = rows[pkey] = {
+                    "params": entry["params"], "shards": 0, "candles": 0, "elapsed_s": 0.0,
+                    "signals": 0, "trades": 0, "wins": 0, "total_pnl": 0.0,
+                    "gross_profit": 0.0, "gross_loss": 0.0,
+                }
+            row["shards"] += 1
+            row["candles"] += result["candles"]
+            row["elapsed_s"] += result["elapsed_s"]
+            row["signals"] += result["signals"]
+            row["trades"] += result["trades"]
+            row["total_pnl"] += result["total_pnl"]
+            for stats in result["by_strategy"].values():
+                row["wins"] += stats["wins"]
+                row["gross_profit"] += stats["gross_profit"]
+                row["gross_loss"] += stats["gross_loss"]
+
+        ranked = []
+        for row in rows.values():
+            trades = row["trades"]
+            row["win_rate"] = round(row["wins"] / trades * 100, 2) if trades else 0.0
+            row["avg_pnl"] = round(row["total_pnl"] / trades, 4) if trades else 0.0
+            row["profit_factor"] = (
+                round(row["gross_profit"] / row["gross_loss"], 3) if row["gross_loss"] > 0 else None
+            )
+            row["total_pnl"] = round(row["total_pnl"], 4)
+            row["candles_per_sec"] = round(row["candles"] / row["elapsed_s"], 1) if row["elapsed_s"] else 0.0
+            del row["gross_profit"], row["gross_loss"]
+            ranked.append(row)
+        ranked.sort(key=lambda r: (r.get(self.rank_by) is None, -(r.get(self.rank_by) or 0)))
+        for i, row in enumerate(ranked, 1):
+            row["rank"] = i
+        return ranked
+
+
+def format_table(rows: list[dict], top: int = 20) -> str:
+    """Render ranked sweep rows as a plain-text table."""
+    lines = [
+        f"  {'#':>3} {'Trades':>6} {'Win%':>6} {'P&L':>10} {'PF':>6}  Params",
+        f"  {'-'*3} {'-'*6} {'-'*6} {'-'*10} {'-'*6}  {'-'*30}",
+    ]
+    for row in rows[:top]:
+        if row["profit_factor"] is not None:
+            pf = f"{row['profit_factor']:.2f}"
+        else:
+            pf = "∞" if row["trades"] else "-"
+        params = " ".join(f"{k}={v}" for k, v in row["params"].items())
+        lines.append(
+            f"  {row['rank']:>3} {row['trades']:>6} {row['win_rate']:>5.1f}% "
+            f"${row['total_pnl']:>+8.2f} {pf:>6}  {params}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backtest.sweep", description="Parallel parameter sweep")
+    parser.add_argument("--grid", required=True, help="Grid as JSON or a path to a JSON file")
+    parser.add_argument("--files", nargs="*", help="Parquet files (default: data/candles_1m/*.parquet)")
+    parser.add_argument("--arrow", type=Path, default=SWEEP_DIR / "candles_1m.arrow",
+                        help="Staged Arrow file (built from --files if missing or --restage)")
+    parser.add_argument("--restage", action="store_true", help="Rebuild the Arrow file")
+    parser.add_argument("--symbols", help="Comma-separated symbols (default: all)")
+    parser.add_argument("--shard-size", type=int, default=1, help="Symbols per task")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint", type=Path, default=SWEEP_DIR / "sweep_checkpoint.jsonl")
+    parser.add_argument("--rank-by", default="total_pnl", choices=["total_pnl", "win_rate", "profit_factor", "avg_pnl"])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", type=Path, help="Write ranked rows as JSON")
+    args = parser.parse_args(argv)
+
+    grid_path = Path(args.grid)
+    grid = json.loads(grid_path.read_text() if grid_path.exists() else args.grid)
+    symbols = [s.strip() for s in args.symbols.split(",")] if args.symbols else None
+
+    if args.restage or not args.arrow.exists():
+        write_candle_arrow(load_parquet_frames(args.files), args.arrow)
+
+    runner = SweepRunner(
+        args.arrow, grid, symbols=symbols, shard_size=args.shard_size,
+        workers=args.workers, checkpoint=args.checkpoint, rank_by=args.rank_by,
+    )
+    rows = runner.run()
+    print(format_table(rows, args.top))
+    if args.out:
+        args.out.write_text(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,20 +6,41 @@ Writes all candles (WS + REST) to disk for:
 - Future backtesting
 - Historical analysis
 
-Format: logs/candles/{symbol}/{tf}.jsonl
+Layout (time-partitioned per symbol/timeframe):
+    logs/<mode>/candles/{symbol}/{tf}/YYYY-MM-DD.jsonl    open day segment (append-only)
+    logs/<mode>/candles/{symbol}/{tf}/YYYY-MM-DD.parquet  sealed day (immutable)
+    logs/<mode>/candles/{symbol}/{tf}/YYYY-MM.parquet     merged month (immutable)
+
+Candles are appended to the JSONL segment of their own UTC day. A background
+compactor seals each closed day into one parquet file, folds the day files
+of finished months into a single month file, and drops partitions past the
+retention window. Every candle is therefore rewritten at most twice (seal,
+month merge), and range reads open only the partitions that overlap.
+
+Late data for an already sealed day lands in a fresh segment for that day
+and is merged into the day (or month) file on the next compaction. Files
+from the old flat layout ({symbol}/{tf}.jsonl / .parquet) are still read and
+are migrated into partitions by the compactor.
 """
 
+import io
 import json
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict
-from dataclasses import dataclass, asdict
-import threading
+
+import numpy as np
 
 try:
     import pandas as pd
     import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
     import pyarrow.parquet as pq
     PARQUET_AVAILABLE = True
 except ImportError:
@@ -44,7 +65,7 @@ class StoredCandle:
     volume: float
     tf: str              # "1m" or "5m"
     source: str          # "ws" or "rest"
-    
+
     @classmethod
     def from_candle(cls, candle: Candle, tf: str, source: str) -> "StoredCandle":
         return cls(
@@ -57,12 +78,12 @@ class StoredCandle:
             tf=tf,
             source=source
         )
-    
+
     def to_candle(self) -> Candle:
         ts = datetime.fromisoformat(self.ts.replace('Z', '+00:00'))
         if ts.tzinfo is None:
             ts = ts.replace(tzinfo=timezone.utc)
-        return Candle(
+        return Candle.trusted(
             timestamp=ts,
             open=self.open,
             high=self.high,
@@ -72,26 +93,194 @@ class StoredCandle:
         )
 
 
+TIMEFRAMES = ("1m", "5m", "1h", "1d")
+_PARQUET_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+# Roughly one day of 1m bars per row group so range reads skip whole groups
+_ROW_GROUP_SIZE = 1440
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+_SEALING = ".sealing"
+
+
+@dataclass
+class CandleArrays:
+    """Columnar candles, oldest first; ``ts`` is epoch seconds (float64)."""
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def empty(cls) -> "CandleArrays":
+        return cls(*(np.empty(0, dtype=np.float64) for _ in range(6)))
+
+    def columns(self) -> tuple:
+        return self.ts, self.open, self.high, self.low, self.close, self.volume
+
+    @classmethod
+    def concat(cls, parts: List["CandleArrays"]) -> "CandleArrays":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate(cols) for cols in zip(*(p.columns() for p in parts))))
+
+    def select(self, index) -> "CandleArrays":
+        return CandleArrays(*(col[index] for col in self.columns()))
+
+    def normalized(
+        self,
+        cutoff: Optional[float] = None,
+        max_count: Optional[int] = None,
+        end: Optional[float] = None,
+    ) -> "CandleArrays":
+        """Sort by ts, keep the last row per ts, keep ``cutoff <= ts < end`` and the newest max_count."""
+        if len(self) == 0:
+            return self
+        order = np.argsort(self.ts, kind="stable")
+        ts = self.ts[order]
+        keep = np.append(ts[1:] != ts[:-1], True)
+        if cutoff is not None:
+            keep &= ts >= cutoff
+        if end is not None:
+            keep &= ts < end
+        result = self.select(order[keep])
+        if max_count is not None and len(result) > max_count:
+            result = result.select(slice(len(result) - max_count, None))
+        return result
+
+    def to_candles(self) -> List[Candle]:
+        utc = timezone.utc
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            Candle.trusted(fromtimestamp(t, utc), o, h, l, c, v)
+            for t, o, h, l, c, v in zip(*(col.tolist() for col in self.columns()))
+        ]
+
+
+def _parse_ts(value: str) -> float:
+    ts = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _utc_day(ts: datetime) -> str:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _partition_bounds(stem: str) -> Optional[tuple[date, date]]:
+    """[start, end) dates covered by a partition file stem (day or month)."""
+    try:
+        if _DAY_RE.match(stem):
+            start = date.fromisoformat(stem)
+            return start, start + timedelta(days=1)
+        if _MONTH_RE.match(stem):
+            start = date.fromisoformat(stem + "-01")
+            end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+            return start, end
+    except ValueError:
+        pass
+    return None
+
+
+def _parse_jsonl_python(data: bytes) -> CandleArrays:
+    rows = []
+    for line in data.split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            d = json.loads(line)
+            rows.append((
+                _parse_ts(d["ts"]), float(d["open"]), float(d["high"]),
+                float(d["low"]), float(d["close"]), float(d["volume"]),
+            ))
+        except (ValueError, TypeError, KeyError):
+            continue
+    if not rows:
+        return CandleArrays.empty()
+    return CandleArrays(*np.array(rows, dtype=np.float64).T)
+
+
+def _parse_jsonl(data: bytes) -> CandleArrays:
+    """
+    Parse complete JSONL candle lines into columns.
+
+    Uses pyarrow's multithreaded JSON reader; malformed lines or non-UTC
+    timestamp formats fall back to the per-line parser.
+    """
+    if not data.strip():
+        return CandleArrays.empty()
+    if PARQUET_AVAILABLE:
+        try:
+            table = pa_json.read_json(io.BytesIO(data), parse_options=_JSON_PARSE_OPTIONS)
+            ts_text = table.column("ts")
+            # Stored timestamps are UTC isoformat(); anything else takes the slow path
+            suffix_ok = pc.all(pc.or_(
+                pc.equal(pc.utf8_length(ts_text), 19),
+                pc.match_substring_regex(ts_text, r"(\+00:00|Z)$"),
+            )).as_py()
+            if suffix_ok and table.num_rows:
+                ts = pc.strptime(pc.utf8_slice_codeunits(ts_text, 0, 19),
+                                 format="%Y-%m-%dT%H:%M:%S", unit="s")
+                columns = [table.column(name) for name in _PARQUET_COLUMNS[1:]]
+                if all(col.null_count == 0 for col in [ts, *columns]):
+                    return CandleArrays(
+                        ts.cast(pa.int64()).to_numpy().astype(np.float64),
+                        *(col.to_numpy().astype(np.float64, copy=False) for col in columns),
+                    )
+        except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError):
+            pass
+    return _parse_jsonl_python(data)
+
+
+if PARQUET_AVAILABLE:
+    _JSON_PARSE_OPTIONS = pa_json.ParseOptions(
+        explicit_schema=pa.schema([("ts", pa.string())] + [(name, pa.float64()) for name in _PARQUET_COLUMNS[1:]]),
+        unexpected_field_behavior="ignore",
+    )
+
+
+def _read_complete_lines(path: Path) -> bytes:
+    """File contents up to the last newline (a torn trailing write is skipped)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return data[:data.rfind(b"\n") + 1]
+
+
 class CandleStore:
     """
-    Persistent candle storage with append-only JSONL files.
-    
+    Persistent candle storage: append-only JSONL day segments sealed into
+    immutable day/month parquet partitions.
+
     Directory structure:
-    logs/<mode>/candles/{symbol}/1m.jsonl
-    logs/<mode>/candles/{symbol}/5m.jsonl
+    logs/<mode>/candles/{symbol}/{tf}/{YYYY-MM-DD}.jsonl|.parquet
+    logs/<mode>/candles/{symbol}/{tf}/{YYYY-MM}.parquet
     """
-    
-    def __init__(self, base_dir: str | Path | None = None):
+
+    def __init__(self, base_dir: str | Path | None = None, retention_days: int = 180):
         # Resolve base dir lazily so TRADING_MODE overrides are respected
         if base_dir:
             resolved = Path(base_dir)
             self._base_dir_func = lambda: resolved
         else:
             self._base_dir_func = lambda: get_logs_dir() / "candles"
+        self.retention_days = retention_days
         self._write_lock = threading.Lock()
-        self._write_buffer: Dict[str, List[str]] = {}  # symbol -> lines
+        self._compact_lock = threading.Lock()
+        self._write_buffer: Dict[tuple, List[tuple]] = {}  # (symbol, tf) -> [(day, line)]
         self._buffer_size = 10  # Flush every N candles
-        
+        self._compactor: Optional[threading.Thread] = None
+        self._compactor_stop = threading.Event()
+
         # Stats
         self.candles_written = 0
         self.candles_loaded = 0
@@ -102,292 +291,429 @@ class CandleStore:
         path = self._base_dir_func()
         path.mkdir(parents=True, exist_ok=True)
         return path
-    
-    def _get_file_path(self, symbol: str, tf: str, ext: str = "jsonl") -> Path:
-        """Get file path for symbol/timeframe."""
+
+    def _series_dir(self, symbol: str, tf: str) -> Path:
+        """Partition directory for symbol/timeframe (not created)."""
         # Sanitize symbol for filesystem
         safe_symbol = symbol.replace("/", "-").replace(":", "-")
-        symbol_dir = self.base_dir / safe_symbol
-        symbol_dir.mkdir(parents=True, exist_ok=True)
-        return symbol_dir / f"{tf}.{ext}"
-    
+        return self.base_dir / safe_symbol / tf
+
+    def _get_file_path(self, symbol: str, tf: str, ext: str = "jsonl") -> Path:
+        """Legacy flat-layout path ({symbol}/{tf}.{ext}); read and migrated only."""
+        return self._series_dir(symbol, tf).with_suffix(f".{ext}")
+
     def _get_parquet_path(self, symbol: str, tf: str) -> Path:
-        """Get parquet file path for symbol/timeframe."""
+        """Legacy flat-layout parquet path."""
         return self._get_file_path(symbol, tf, "parquet")
-    
+
+    # ------------------------------------------------------------------ writes
+
     def write_candle(self, symbol: str, candle: Candle, tf: str, source: str = "ws"):
         """Write a single candle to storage."""
         stored = StoredCandle.from_candle(candle, tf, source)
         line = json.dumps(asdict(stored))
-        
+
         with self._write_lock:
-            key = f"{symbol}_{tf}"
-            if key not in self._write_buffer:
-                self._write_buffer[key] = []
-            self._write_buffer[key].append(line)
-            
+            key = (symbol, tf)
+            pending = self._write_buffer.setdefault(key, [])
+            pending.append((_utc_day(candle.timestamp), line))
+
             # Flush if buffer full
-            if len(self._write_buffer[key]) >= self._buffer_size:
+            if len(pending) >= self._buffer_size:
                 self._flush_buffer(symbol, tf)
-    
+
     def write_candles(self, symbol: str, candles: List[Candle], tf: str, source: str = "rest"):
         """Write multiple candles to storage."""
         if not candles:
             return
-        
-        lines = []
-        for candle in candles:
-            stored = StoredCandle.from_candle(candle, tf, source)
-            lines.append(json.dumps(asdict(stored)))
-        
-        file_path = self._get_file_path(symbol, tf)
-        
+
+        rows = [
+            (_utc_day(candle.timestamp), json.dumps(asdict(StoredCandle.from_candle(candle, tf, source))))
+            for candle in candles
+        ]
         with self._write_lock:
-            with open(file_path, 'a') as f:
-                f.write('\n'.join(lines) + '\n')
+            self._append_segments(symbol, tf, rows)
             self.candles_written += len(candles)
-    
+
+    def _append_segments(self, symbol: str, tf: str, rows: List[tuple]):
+        """Append (day, line) rows to their day segments (caller holds the write lock)."""
+        by_day: Dict[str, List[str]] = {}
+        for day, line in rows:
+            by_day.setdefault(day, []).append(line)
+        series_dir = self._series_dir(symbol, tf)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        for day, lines in by_day.items():
+            with open(series_dir / f"{day}.jsonl", 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+
     def _flush_buffer(self, symbol: str, tf: str):
         """Flush write buffer to disk."""
-        key = f"{symbol}_{tf}"
-        if key not in self._write_buffer or not self._write_buffer[key]:
+        rows = self._write_buffer.get((symbol, tf))
+        if not rows:
             return
-        
-        file_path = self._get_file_path(symbol, tf)
-        lines = self._write_buffer[key]
-        
-        with open(file_path, 'a') as f:
-            f.write('\n'.join(lines) + '\n')
-        
-        self.candles_written += len(lines)
-        self._write_buffer[key] = []
-    
+
+        self._append_segments(symbol, tf, rows)
+        self.candles_written += len(rows)
+        self._write_buffer[(symbol, tf)] = []
+
     def flush_all(self):
         """Flush all buffers to disk."""
         with self._write_lock:
-            for key in list(self._write_buffer.keys()):
-                symbol, tf = key.rsplit('_', 1)
+            for symbol, tf in list(self._write_buffer.keys()):
                 self._flush_buffer(symbol, tf)
-    
+
+    # ------------------------------------------------------------------- reads
+
     def load_candles(
-        self, 
-        symbol: str, 
-        tf: str, 
+        self,
+        symbol: str,
+        tf: str,
         max_age_hours: int = 24,
         max_count: int = 500
     ) -> List[Candle]:
-        """Load candles from storage. Tries parquet first (fast), then JSONL."""
-        # Try parquet first (100x faster)
-        if PARQUET_AVAILABLE:
-            candles = self._load_from_parquet(symbol, tf, max_age_hours, max_count)
-            if candles:
-                return candles
-        
-        # Fall back to JSONL
-        return self._load_from_jsonl(symbol, tf, max_age_hours, max_count)
-    
-    def _load_from_parquet(
+        """Load the newest candles from storage."""
+        return self.load_arrays(symbol, tf, max_age_hours, max_count).to_candles()
+
+    def load_arrays(
         self,
         symbol: str,
         tf: str,
         max_age_hours: int = 24,
         max_count: int = 500
-    ) -> List[Candle]:
-        """Load candles from parquet file (fast)."""
-        parquet_path = self._get_parquet_path(symbol, tf)
-        
-        if not parquet_path.exists():
-            return []
-        
+    ) -> CandleArrays:
+        """Columnar load of the newest ``max_count`` candles within ``max_age_hours``."""
+        start = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        return self.load_range(symbol, tf, start=start, max_count=max_count)
+
+    def load_range(
+        self,
+        symbol: str,
+        tf: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_count: Optional[int] = None,
+    ) -> CandleArrays:
+        """
+        Columnar load of candles with ``start <= ts < end``.
+
+        Only partitions overlapping the range are opened; inside parquet
+        files the range is pushed down to row-group statistics.
+        """
+        lo = start.timestamp() if start is not None else None
+        hi = end.timestamp() if end is not None else None
         try:
-            df = pd.read_parquet(parquet_path)
-            if df.empty:
-                return []
-            
-            # Convert timestamp column
-            if 'ts' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['ts'], utc=True)
-            elif 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
-            else:
-                return []
-            
-            # Filter by age
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-            df = df[df['timestamp'] >= cutoff]
-            
-            # Sort and limit
-            df = df.sort_values('timestamp').drop_duplicates(subset=['timestamp'])
-            if len(df) > max_count:
-                df = df.tail(max_count)
-            
-            # Convert to Candle objects
-            candles = []
-            for _, row in df.iterrows():
-                candle = Candle(
-                    timestamp=row['timestamp'].to_pydatetime(),
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row.get('volume', 0))
-                )
-                candles.append(candle)
-            
-            self.candles_loaded += len(candles)
-            return candles
-            
+            parts = [
+                self._read_partition(path, lo, hi)
+                for path in self._partition_files(symbol, tf, start, end)
+            ]
+            arrays = CandleArrays.concat(parts).normalized(lo, max_count, hi)
         except Exception as e:
-            logger.debug("[STORE] Parquet load failed %s/%s: %s", symbol, tf, e)
-            return []
-    
-    def _load_from_jsonl(
+            logger.warning("[STORE] Error loading %s/%s: %s", symbol, tf, e)
+            return CandleArrays.empty()
+        self.candles_loaded += len(arrays)
+        return arrays
+
+    def _partition_files(
         self,
         symbol: str,
         tf: str,
-        max_age_hours: int = 24,
-        max_count: int = 500
-    ) -> List[Candle]:
-        """Load candles from JSONL file (slower but append-friendly)."""
-        file_path = self._get_file_path(symbol, tf)
-        
-        if not file_path.exists():
-            return []
-        
-        candles = []
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-        
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Path]:
+        """Files that may hold candles in [start, end), oldest partition first."""
+        files = []
+        for legacy in (self._get_parquet_path(symbol, tf), self._get_file_path(symbol, tf)):
+            if legacy.exists():
+                files.append(legacy)
+
+        series_dir = self._series_dir(symbol, tf)
+        if not series_dir.is_dir():
+            return files
+        first = start.astimezone(timezone.utc).date() if start is not None else None
+        last = end.astimezone(timezone.utc).date() if end is not None else None
+        partitions = []
+        for path in series_dir.iterdir():
+            name = path.name
+            if name.endswith(_SEALING):
+                name = name[:-len(_SEALING)]
+            stem, _, ext = name.partition(".")
+            bounds = _partition_bounds(stem)
+            if bounds is None or ext not in ("jsonl", "parquet"):
+                continue
+            if first is not None and bounds[1] <= first:
+                continue
+            if last is not None and bounds[0] > last:
+                continue
+            # Parquet before segments of the same partition so newer rows win
+            partitions.append((bounds[0], ext == "jsonl", path))
+        files.extend(path for *_, path in sorted(partitions))
+        return files
+
+    def _read_partition(self, path: Path, lo: Optional[float], hi: Optional[float]) -> CandleArrays:
+        if ".parquet" in path.suffixes:
+            return self._read_parquet(path, lo, hi) if PARQUET_AVAILABLE else CandleArrays.empty()
         try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        stored = StoredCandle(**data)
-                        candle = stored.to_candle()
-                        
-                        # Filter by age
-                        if candle.timestamp >= cutoff:
-                            candles.append(candle)
-                    except (json.JSONDecodeError, TypeError, KeyError):
-                        continue
-            
-            # Sort by timestamp and deduplicate
-            candles.sort(key=lambda c: c.timestamp)
-            candles = self._deduplicate(candles)
-            
-            # Limit count (keep most recent)
-            if len(candles) > max_count:
-                candles = candles[-max_count:]
-            
-            self.candles_loaded += len(candles)
-            return candles
-            
+            return _parse_jsonl(_read_complete_lines(path))
+        except FileNotFoundError:
+            return CandleArrays.empty()  # Sealed or merged concurrently
+
+    @staticmethod
+    def _group_may_match(parquet, group: int, ts_index: int, lo, hi) -> bool:
+        stats = parquet.metadata.row_group(group).column(ts_index).statistics
+        if stats is None or not stats.has_min_max:
+            return True
+        try:
+            return (lo is None or stats.max >= lo) and (hi is None or stats.min < hi)
+        except TypeError:
+            return True
+
+    def _read_parquet(self, path: Path, lo: Optional[float] = None, hi: Optional[float] = None) -> CandleArrays:
+        """Read a parquet partition, skipping row groups outside [lo, hi)."""
+        try:
+            parquet = pq.ParquetFile(path)
+            schema = parquet.schema_arrow
+            ts_type = schema.field("ts").type
+            groups = list(range(parquet.metadata.num_row_groups))
+            if lo is not None or hi is not None:
+                bounds = [
+                    None if value is None else datetime.fromtimestamp(value, timezone.utc)
+                    for value in (lo, hi)
+                ]
+                if not pa.types.is_timestamp(ts_type):
+                    # Legacy ISO strings compare lexically
+                    bounds = [None if b is None else b.isoformat() for b in bounds]
+                ts_index = schema.get_field_index("ts")
+                groups = [i for i in groups if self._group_may_match(parquet, i, ts_index, *bounds)]
+            table = parquet.read_row_groups(groups, columns=_PARQUET_COLUMNS)
+        except FileNotFoundError:
+            return CandleArrays.empty()  # Merged concurrently
         except Exception as e:
-            logger.warning("[STORE] Error loading %s/%s: %s", symbol, tf, e)
-            return []
-    
-    def compact_to_parquet(self, symbol: str, tf: str) -> bool:
+            logger.debug("[STORE] Parquet load failed %s: %s", path, e)
+            return CandleArrays.empty()
+
+        if pa.types.is_timestamp(ts_type):
+            ts = table.column("ts").cast(pa.timestamp("us", "UTC")).cast(pa.int64()).to_numpy() / 1e6
+        else:
+            parsed = pd.to_datetime(table.column("ts").to_pandas(), utc=True, format="ISO8601")
+            ts = ((parsed - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy(np.float64)
+        columns = [
+            table.column(name).to_numpy().astype(np.float64, copy=False)
+            for name in _PARQUET_COLUMNS[1:]
+        ]
+        return CandleArrays(np.asarray(ts, dtype=np.float64), *columns)
+
+    # -------------------------------------------------------------- compaction
+
+    @staticmethod
+    def _write_parquet(arrays: CandleArrays, path: Path):
+        """Atomically write an immutable partition file."""
+        table = pa.table({
+            "ts": pa.array((arrays.ts * 1e6).astype(np.int64), pa.int64()).cast(pa.timestamp("us", "UTC")),
+            "open": arrays.open,
+            "high": arrays.high,
+            "low": arrays.low,
+            "close": arrays.close,
+            "volume": arrays.volume,
+        })
+        tmp_path = path.with_name(path.name + ".tmp")
+        pq.write_table(table, tmp_path, compression='snappy', row_group_size=_ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+
+    def compact_to_parquet(self, symbol: str, tf: str, today: Optional[date] = None) -> bool:
         """
-        Compact JSONL file to parquet for faster future reads.
-        Called periodically (e.g., every hour or on shutdown).
+        Compact one symbol/timeframe: migrate legacy files, seal closed days,
+        merge finished months and apply retention. Returns True if any file
+        was written or removed.
         """
         if not PARQUET_AVAILABLE:
             return False
-        
-        jsonl_path = self._get_file_path(symbol, tf)
-        parquet_path = self._get_parquet_path(symbol, tf)
-        
-        if not jsonl_path.exists():
-            return False
-        
-        try:
-            # Load all candles from JSONL
-            candles = self._load_from_jsonl(symbol, tf, max_age_hours=168, max_count=10000)
-            if not candles:
+        today = today or datetime.now(timezone.utc).date()
+        with self._compact_lock:
+            try:
+                changed = self._migrate_legacy(symbol, tf)
+                changed |= self._seal_days(symbol, tf, today)
+                changed |= self._merge_months(symbol, tf, today)
+                changed |= self._apply_retention(symbol, tf, today)
+                return changed
+            except Exception as e:
+                logger.warning("[STORE] Compact failed %s/%s: %s", symbol, tf, e)
                 return False
-            
-            # Convert to DataFrame
-            data = []
-            for c in candles:
-                data.append({
-                    'ts': c.timestamp.isoformat(),
-                    'open': c.open,
-                    'high': c.high,
-                    'low': c.low,
-                    'close': c.close,
-                    'volume': c.volume,
-                })
-            
-            df = pd.DataFrame(data)
-            
-            # Write to parquet
-            df.to_parquet(parquet_path, index=False, compression='snappy')
-            
-            logger.info("[STORE] Compacted %s/%s: %d candles to parquet", symbol, tf, len(candles))
-            return True
-            
-        except Exception as e:
-            logger.warning("[STORE] Compact failed %s/%s: %s", symbol, tf, e)
+
+    def _migrate_legacy(self, symbol: str, tf: str) -> bool:
+        """Split flat-layout {tf}.jsonl/{tf}.parquet into day segments."""
+        legacy = [p for p in (self._get_parquet_path(symbol, tf), self._get_file_path(symbol, tf)) if p.exists()]
+        if not legacy:
+            return False
+        arrays = CandleArrays.concat([self._read_partition(p, None, None) for p in legacy]).normalized()
+        days = (arrays.ts // 86400).astype(np.int64)
+        for day in np.unique(days).tolist():
+            rows = arrays.select(days == day)
+            day_str = (date(1970, 1, 1) + timedelta(days=day)).isoformat()
+            lines = [
+                json.dumps({"ts": datetime.fromtimestamp(t, timezone.utc).isoformat(), "open": o, "high": h,
+                            "low": l, "close": c, "volume": v, "tf": tf, "source": "legacy"})
+                for t, o, h, l, c, v in zip(*(col.tolist() for col in rows.columns()))
+            ]
+            with self._write_lock:
+                self._append_segments(symbol, tf, [(day_str, line) for line in lines])
+        for path in legacy:
+            path.unlink()
+        logger.info("[STORE] Migrated %s/%s: %d candles into day partitions", symbol, tf, len(arrays))
+        return True
+
+    def _seal_days(self, symbol: str, tf: str, today: date) -> bool:
+        """Seal every closed day's JSONL segment into its day/month parquet."""
+        series_dir = self._series_dir(symbol, tf)
+        if not series_dir.is_dir():
             return False
-    
+
+        # Detach closed segments under the write lock so no append is lost
+        with self._write_lock:
+            if self._write_buffer.get((symbol, tf)):
+                self._flush_buffer(symbol, tf)
+            for path in series_dir.glob("*.jsonl"):
+                bounds = _partition_bounds(path.stem)
+                if bounds is not None and bounds[1] <= today:
+                    os.replace(path, path.with_name(path.name + _SEALING))
+
+        sealed = False
+        for segment in sorted(series_dir.glob(f"*.jsonl{_SEALING}")):
+            day = segment.name.split(".", 1)[0]
+            month_path = series_dir / f"{day[:7]}.parquet"
+            # Late rows for an already merged month go into the month file
+            target = month_path if month_path.exists() else series_dir / f"{day}.parquet"
+            parts = [self._read_parquet(target)] if target.exists() else []
+            parts.append(_parse_jsonl(_read_complete_lines(segment)))
+            arrays = CandleArrays.concat(parts).normalized()
+            if len(arrays):
+                self._write_parquet(arrays, target)
+            segment.unlink()
+            sealed = True
+            logger.debug("[STORE] Sealed %s/%s %s (%d candles)", symbol, tf, day, len(arrays))
+        return sealed
+
+    def _merge_months(self, symbol: str, tf: str, today: date) -> bool:
+        """Fold the sealed day files of finished months into one month file."""
+        series_dir = self._series_dir(symbol, tf)
+        if not series_dir.is_dir():
+            return False
+        this_month = today.strftime("%Y-%m")
+        by_month: Dict[str, List[Path]] = {}
+        for path in series_dir.glob("*.parquet"):
+            if _DAY_RE.match(path.stem) and path.stem[:7] < this_month:
+                by_month.setdefault(path.stem[:7], []).append(path)
+
+        for month, day_files in sorted(by_month.items()):
+            month_path = series_dir / f"{month}.parquet"
+            parts = [self._read_parquet(month_path)] if month_path.exists() else []
+            parts.extend(self._read_parquet(p) for p in sorted(day_files))
+            self._write_parquet(CandleArrays.concat(parts).normalized(), month_path)
+            for path in day_files:
+                path.unlink()
+            logger.debug("[STORE] Merged %s/%s %s from %d day files", symbol, tf, month, len(day_files))
+        return bool(by_month)
+
+    def _apply_retention(self, symbol: str, tf: str, today: date) -> bool:
+        """Delete partitions that end before the retention window."""
+        series_dir = self._series_dir(symbol, tf)
+        if not series_dir.is_dir() or not self.retention_days:
+            return False
+        horizon = today - timedelta(days=self.retention_days)
+        removed = False
+        for path in series_dir.glob("*.parquet"):
+            bounds = _partition_bounds(path.stem)
+            if bounds is not None and bounds[1] <= horizon:
+                path.unlink()
+                removed = True
+        return removed
+
     def compact_all(self):
-        """Compact all JSONL files to parquet."""
+        """Compact every stored symbol/timeframe."""
         if not PARQUET_AVAILABLE:
             logger.warning("[STORE] Parquet not available, skipping compact")
             return
-        
+
         compacted = 0
         for symbol in self.list_symbols():
-            for tf in ["1m", "5m", "1h", "1d"]:
+            for tf in TIMEFRAMES:
                 if self.compact_to_parquet(symbol, tf):
                     compacted += 1
-        
+
         if compacted:
-            logger.info("[STORE] Compacted %d files to parquet", compacted)
-    
-    def _deduplicate(self, candles: List[Candle]) -> List[Candle]:
-        """Remove duplicate candles by timestamp."""
-        seen = set()
-        unique = []
-        for candle in candles:
-            ts_key = candle.timestamp.isoformat()
-            if ts_key not in seen:
-                seen.add(ts_key)
-                unique.append(candle)
-        return unique
-    
+            logger.info("[STORE] Compacted %d symbol/timeframe series", compacted)
+
+    def start_compactor(self, interval_seconds: float = 900.0):
+        """Run :meth:`compact_all` periodically on a daemon thread."""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor_stop.clear()
+
+        def loop():
+            while not self._compactor_stop.wait(interval_seconds):
+                try:
+                    self.compact_all()
+                except Exception as e:
+                    logger.warning("[STORE] Background compaction failed: %s", e)
+
+        self._compactor = threading.Thread(target=loop, name="candle-compactor", daemon=True)
+        self._compactor.start()
+
+    def stop_compactor(self, timeout: float = 5.0):
+        """Stop the background compactor (a pass in progress finishes first)."""
+        self._compactor_stop.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+            self._compactor = None
+
+    # --------------------------------------------------------------- rehydrate
+
+    def rehydrate_arrays(
+        self,
+        symbols: List[str],
+        max_age_hours: int = 4,
+        timeframes: tuple = ("1m", "5m"),
+        max_count: int = 500,
+        workers: int = 8,
+    ) -> Dict[str, Dict[str, CandleArrays]]:
+        """
+        Load candles for many symbols concurrently as column arrays.
+
+        Parquet and JSON decoding release the GIL, so a thread pool overlaps
+        the per-file reads. Returns {symbol: {tf: CandleArrays}} for symbols
+        with any stored data.
+        """
+        def load(symbol: str):
+            return symbol, {
+                tf: self.load_arrays(symbol, tf, max_age_hours, max_count) for tf in timeframes
+            }
+
+        result: Dict[str, Dict[str, CandleArrays]] = {}
+        if not symbols:
+            return result
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(symbols)))) as pool:
+            for symbol, data in pool.map(load, symbols):
+                if any(len(arrays) for arrays in data.values()):
+                    result[symbol] = data
+
+        total = sum(len(a) for data in result.values() for a in data.values())
+        logger.info("[STORE] Rehydrated %d candles for %d symbols", total, len(result))
+        return result
+
     def rehydrate_buffers(
-        self, 
+        self,
         symbols: List[str],
         max_age_hours: int = 4
     ) -> Dict[str, Dict[str, List[Candle]]]:
         """
         Load candles for multiple symbols on startup.
-        
+
         Returns: {symbol: {"1m": [candles], "5m": [candles]}}
+        Prefer :meth:`rehydrate_arrays` + ``CandleBuffer.append_arrays``.
         """
-        result = {}
-        
-        for symbol in symbols:
-            candles_1m = self.load_candles(symbol, "1m", max_age_hours)
-            candles_5m = self.load_candles(symbol, "5m", max_age_hours)
-            
-            if candles_1m or candles_5m:
-                result[symbol] = {
-                    "1m": candles_1m,
-                    "5m": candles_5m
-                }
-        
-        total = sum(
-            len(d["1m"]) + len(d["5m"]) 
-            for d in result.values()
-        )
-        logger.info("[STORE] Rehydrated %d candles for %d symbols", total, len(result))
-        
-        return result
+        return {
+            symbol: {tf: arrays.to_candles() for tf, arrays in data.items()}
+            for symbol, data in self.rehydrate_arrays(symbols, max_age_hours).items()
+        }
 
     def list_symbols(self) -> List[str]:
         """List symbols with stored candles."""
@@ -400,37 +726,48 @@ class CandleStore:
             return symbols
         except Exception:
             return []
-    
+
     def cleanup_old_files(self, max_age_days: int = 7):
-        """Remove old candle files to save disk space."""
-        cutoff = datetime.now() - timedelta(days=max_age_days)
+        """Remove partitions that end more than ``max_age_days`` ago."""
+        today = datetime.now(timezone.utc).date()
+        horizon = today - timedelta(days=max_age_days)
         removed = 0
-        
-        for symbol_dir in self.base_dir.iterdir():
-            if not symbol_dir.is_dir():
-                continue
-            
-            for file_path in symbol_dir.iterdir():
-                if file_path.suffix != '.jsonl':
+
+        for symbol in self.list_symbols():
+            for tf in TIMEFRAMES:
+                series_dir = self._series_dir(symbol, tf)
+                if not series_dir.is_dir():
                     continue
-                
-                try:
-                    mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if mtime < cutoff:
+                for file_path in series_dir.iterdir():
+                    bounds = _partition_bounds(file_path.name.split(".", 1)[0])
+                    if bounds is None or bounds[1] > horizon:
+                        continue
+                    try:
                         file_path.unlink()
                         removed += 1
-                except Exception:
-                    pass
-        
+                    except OSError:
+                        pass
+
         if removed:
             logger.info("[STORE] Cleaned up %d old candle files", removed)
 
     def get_last_candle_ts(self, symbol: str, tf: str) -> Optional[datetime]:
-        """Read the most recent candle timestamp from storage (fast tail read)."""
-        file_path = self._get_file_path(symbol, tf)
-        if not file_path.exists():
-            return None
+        """Most recent stored candle timestamp (tail read of the newest partitions)."""
+        files = self._partition_files(symbol, tf)
+        segments = [p for p in files if p.suffix in (".jsonl", _SEALING)]
+        parquets = [p for p in files if p.suffix == ".parquet"]
+        latest: Optional[datetime] = None
+        for file_path in segments[-1:]:
+            latest = self._tail_ts(file_path)
+        if parquets and PARQUET_AVAILABLE:
+            arrays = self._read_parquet(parquets[-1])
+            if len(arrays):
+                ts = datetime.fromtimestamp(float(arrays.ts.max()), timezone.utc)
+                latest = ts if latest is None else max(latest, ts)
+        return latest
 
+    @staticmethod
+    def _tail_ts(file_path: Path) -> Optional[datetime]:
         try:
             with open(file_path, "rb") as f:
                 f.seek(0, os.SEEK_END)
@@ -444,33 +781,37 @@ class CandleStore:
             lines = [line for line in data.splitlines() if line.strip()]
             if not lines:
                 return None
-            last_line = lines[-1]
-            payload = json.loads(last_line)
+            payload = json.loads(lines[-1])
             stored = StoredCandle(**payload)
             return stored.to_candle().timestamp
         except Exception as e:
-            logger.debug("[STORE] Tail read failed %s/%s: %s", symbol, tf, e)
+            logger.debug("[STORE] Tail read failed %s: %s", file_path, e)
             return None
-    
+
     def get_stats(self) -> dict:
         """Get storage statistics."""
         total_files = 0
         total_size = 0
+        segment_files = 0
         symbols = set()
-        
+
         for symbol_dir in self.base_dir.iterdir():
             if not symbol_dir.is_dir():
                 continue
             symbols.add(symbol_dir.name)
-            
-            for file_path in symbol_dir.iterdir():
+
+            for file_path in symbol_dir.rglob("*"):
+                if not file_path.is_file():
+                    continue
+                total_files += 1
+                total_size += file_path.stat().st_size
                 if file_path.suffix == '.jsonl':
-                    total_files += 1
-                    total_size += file_path.stat().st_size
-        
+                    segment_files += 1
+
         return {
             "symbols": len(symbols),
             "files": total_files,
+            "open_segments": segment_files,
             "size_mb": total_size / (1024 * 1024),
             "candles_written": self.candles_written,
             "candles_loaded": self.candles_loaded,
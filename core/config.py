@@ -162,6 +162,44 @@ class Settings(BaseSettings):
     position_qty_drift_tolerance: float = 0.00001  # Qty difference to flag as drift
     position_verify_tolerance: float = 0.95  # 5% tolerance for position verification
     
+    # Raw market capture: "binary" = logs/<mode>/ticks/*.bin (core.tick_capture),
+    # "jsonl" = legacy per-tick lines in market_*.jsonl
+    raw_capture_format: Literal["binary", "jsonl"] = Field(default="binary", alias="RAW_CAPTURE_FORMAT")
+    
+    # WS message JSON parser: "auto" = orjson when installed, else stdlib json
+    ws_json_parser: Literal["auto", "json", "orjson"] = Field(default="auto", alias="WS_JSON_PARSER")
+    
+    # WS connections the streamed symbols are sharded across
+    ws_shards: int = Field(default=4, alias="WS_SHARDS")
+    
+    # Shared REST budget (core.rest_scheduler): requests/second and burst
+    # across orders, polling, warmup and backfill
+    rest_rps: float = Field(default=8.0, alias="REST_RPS")
+    rest_burst: float = Field(default=8.0, alias="REST_BURST")
+    # Pooled keep-alive REST clients per pool (core.rest_pool)
+    rest_pool_size: int = Field(default=4, alias="REST_POOL_SIZE")
+    
+    # Worker threads for batched strategy evaluation (StrategyOrchestrator.analyze_many).
+    # Strategies are mostly pure Python, so threads contend for the GIL and the
+    # event loop waits for the whole batch either way; 1 = evaluate inline
+    strategy_workers: int = Field(default=1, alias="STRATEGY_WORKERS")
+    
+    # Dirty-flag scheduling (core.dirty_tracker): Clock B stages skip symbols
+    # whose candles, spread and position are unchanged, with a forced full pass
+    # every DIRTY_REFRESH_S seconds (0 = process everything every loop)
+    dirty_refresh_s: float = Field(default=30.0, alias="DIRTY_REFRESH_S")
+    dirty_spread_bps: float = Field(default=5.0, alias="DIRTY_SPREAD_BPS")
+    
+    # Stage/symbol latency histograms (core.perf), exported every interval
+    # to perf_YYYY-MM-DD.jsonl and /api/perf
+    perf_enabled: bool = Field(default=True, alias="PERF_ENABLED")
+    perf_interval_s: float = Field(default=60.0, alias="PERF_INTERVAL_S")
+    
+    # Offline replay (load testing): ticks_*.bin capture or 1m candle directory,
+    # speed multiplier "1", "10", ... or "max"
+    replay_path: str = Field(default="", alias="REPLAY_PATH")
+    replay_speed: str = Field(default="1", alias="REPLAY_SPEED")
+    
     # Ignored symbols (delisted, problematic, or dust to skip)
     ignored_symbols: str = "SNX-USD,CLV-USD,CGLD-USD,MANA-USD,NU-USD,BOND-USD"
     
@@ -0,0 +1,86 @@
+"""
+Dirty-Flag Scheduling
+
+Clock B stages (burst metrics, predictive ranker, strategies) only need to
+re-run for a symbol when its inputs changed:
+
+- a new or merged candle (``CandleBuffer.seq`` moved, whatever the source:
+  WS, REST poller, warmup, backfill)
+- a spread move of at least ``spread_bps`` since the last mark
+- a position open/close (``mark``)
+
+Each stage keeps its own view, so one stage consuming a change does not hide
+it from the others. Every ``refresh_s`` seconds a stage gets a forced full
+pass to pick up time-based inputs (market regime, daily stats, cache expiry).
+
+    dirty = DirtyTracker(refresh_s=30)
+    todo = dirty.select("strategies", ((s, buffers[s].seq) for s in candidates))
+"""
+
+import time
+from typing import Iterable, Optional
+
+
+class DirtyTracker:
+    """Per-stage change tracking keyed by symbol."""
+
+    def __init__(self, refresh_s: float = 30.0, spread_bps: float = 5.0):
+        self.refresh_s = refresh_s
+        self.spread_bps = spread_bps
+        self._seen: dict[str, dict[str, int]] = {}       # stage -> symbol -> buffer seq
+        self._marked: dict[str, set[str]] = {}           # stage -> symbols marked dirty
+        self._last_full: dict[str, float] = {}           # stage -> monotonic time of last full pass
+        self._spreads: dict[str, float] = {}             # symbol -> spread at last mark
+        self._counts: dict[str, list[int]] = {}          # stage -> [processed, skipped]
+
+    def mark(self, symbol: str):
+        """Mark ``symbol`` dirty for every stage (e.g. a position change)."""
+        for marked in self._marked.values():
+            marked.add(symbol)
+
+    def mark_spread(self, symbol: str, spread_bps: float):
+        """Mark ``symbol`` dirty when its spread moved by ``spread_bps`` or more."""
+        last = self._spreads.get(symbol)
+        if last is None or abs(spread_bps - last) >= self.spread_bps:
+            self._spreads[symbol] = spread_bps
+            if last is not None:
+                self.mark(symbol)
+
+    def select(self, stage: str, entries: Iterable[tuple[str, int]], now: Optional[float] = None) -> set[str]:
+        """
+        Symbols of ``(symbol, seq)`` entries that ``stage`` should process now.
+
+        A symbol is selected when its seq differs from the one this stage last
+        processed, when it was marked, or on the stage's forced refresh.
+        Selected symbols are recorded as processed.
+        """
+        now = time.monotonic() if now is None else now
+        seen = self._seen.setdefault(stage, {})
+        marked = self._marked.setdefault(stage, set())
+        force = self.refresh_s <= 0 or now - self._last_full.get(stage, float("-inf")) >= self.refresh_s
+        if force:
+            self._last_full[stage] = now
+
+        selected = set()
+        total = 0
+        for symbol, seq in entries:
+            total += 1
+            if force or symbol in marked or seen.get(symbol) != seq:
+                seen[symbol] = seq
+                selected.add(symbol)
+        marked.difference_update(selected)
+
+        counts = self._counts.setdefault(stage, [0, 0])
+        counts[0] += len(selected)
+        counts[1] += total - len(selected)
+        return selected
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """Processed/skipped symbol counts per stage (since start or last reset)."""
+        stats = {
+            stage: {"processed": processed, "skipped": skipped}
+            for stage, (processed, skipped) in sorted(self._counts.items())
+        }
+        if reset:
+            self._counts.clear()
+        return stats
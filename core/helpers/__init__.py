@@ -7,6 +7,7 @@ from .portfolio import is_dust
 from .reasons import GateReason
 from .rest_validation import validate_candles
 from .preflight import run_preflight
+from .clock import utc_now, set_clock
 
 __all__ = [
     "finite_float",
@@ -17,4 +18,6 @@ __all__ = [
     "GateReason",
     "validate_candles",
     "run_preflight",
+    "utc_now",
+    "set_clock",
 ]
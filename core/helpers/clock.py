@@ -0,0 +1,19 @@
+"""Swappable UTC clock so offline replays can drive time-based logic."""
+
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+_clock: Optional[Callable[[], datetime]] = None
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time (simulated when a clock is installed)."""
+    if _clock is not None:
+        return _clock()
+    return datetime.now(timezone.utc)
+
+
+def set_clock(clock: Optional[Callable[[], datetime]]) -> None:
+    """Install a clock callable (``None`` restores wall-clock time)."""
+    global _clock
+    _clock = clock
@@ -3,11 +3,10 @@
 import time
 from typing import Dict, Optional
 
-from coinbase.rest import RESTClient
-
 from core.logging_utils import get_logger
 from core.mode_configs import LiveModeConfig
 from core.portfolio import PortfolioSnapshot, portfolio_tracker
+from core.rest_pool import PooledClient, rest_pool
 from core.trading_interfaces import IPortfolioManager
 
 logger = get_logger(__name__)
@@ -22,7 +21,7 @@ class LivePortfolioManager(IPortfolioManager):
 
     def __init__(self, config: LiveModeConfig):
         self.config = config
-        self._client: Optional[RESTClient] = None
+        self._client: Optional[PooledClient] = None
         self._exchange_holdings: Dict[str, float] = {}
         self._portfolio_snapshot: Optional[PortfolioSnapshot] = None
         self._portfolio_value: float = 0.0
@@ -61,7 +60,7 @@ class LivePortfolioManager(IPortfolioManager):
             self._client = None
             return
         try:
-            self._client = RESTClient(api_key=self.config.api_key, api_secret=self.config.api_secret)
+            self._client = rest_pool.private_client(self.config.api_key, self.config.api_secret)
             logger.info("[ORDER] Live client initialized")
         except Exception as e:
             logger.error("[ORDER] Failed to init live client: %s", e, exc_info=True)
@@ -77,7 +76,7 @@ class LivePortfolioManager(IPortfolioManager):
             self._fetch_portfolio_uuid()
 
     @property
-    def client(self) -> Optional[RESTClient]:
+    def client(self) -> Optional[PooledClient]:
         return self._client
 
     @property
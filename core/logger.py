@@ -9,17 +9,28 @@ Logs are consolidated into 5 families for cleanliness:
 
 Atomic writes: Critical logs (trades, orders) use fsync to ensure
 data is persisted even if the process crashes immediately after.
+
+Writes go through a background JsonlWriter thread that keeps one open
+handle per file, batches lines and flushes on size/time. Critical records
+are group-committed: the caller still returns only after its line is
+fsync'd, but concurrent critical writes share one fsync.
 """
 
+import atexit
 import json
+import logging
 import os
-import tempfile
+import threading
+import time
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
 from core.mode_paths import get_logs_dir
 
+logger = logging.getLogger(__name__)
+
 # Map verbose layers to consolidated families to keep file count low
 LAYER_FAMILY_MAP = {
     # Market data
@@ -43,6 +54,7 @@ LAYER_FAMILY_MAP = {
     "daily_pnl": "pnl",
     # Health
     "health": "health",
+    "perf": "perf",
 }
 
 
@@ -80,28 +92,14 @@ def log_path(layer: str, ts: datetime = None) -> Path:
     return get_logs_dir() / f"{family}_{date_str}.jsonl"
 
 
-def append_jsonl(path: Path, record: dict, critical: bool = False):
-    """
-    Append a JSON record as a single line. Thread-safe via append mode.
-    
-    Args:
-        path: Target log file path
-        record: Dictionary to log as JSON
-        critical: If True, use fsync to ensure write is persisted to disk
-                  (slower but crash-safe). Use for trades/orders.
-    """
+def _append_line_sync(path: Path, line: str, critical: bool = False):
+    """Append one line directly (used when the background writer is unavailable)."""
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
     except (OSError, SystemExit):
         pass
     
-    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
-    
     if critical:
-        # Atomic write for critical data:
-        # 1. Write to temp file in same directory
-        # 2. fsync to ensure it's on disk
-        # 3. Append to main file with fsync
         try:
             # Write directly with fsync for durability
             fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
@@ -120,6 +118,306 @@ def append_jsonl(path: Path, record: dict, critical: bool = False):
             f.write(line)
 
 
+class _Commit(threading.Event):
+    """Release signal for a critical line; ``ok`` is False if it never reached disk."""
+    
+    def __init__(self):
+        super().__init__()
+        self.ok = True
+
+
+class _OpenLog:
+    """An open append handle plus its flush bookkeeping."""
+    
+    __slots__ = ("handle", "pending_bytes", "commits", "last_flush", "last_write")
+    
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.handle = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self.pending_bytes = 0
+        self.commits: list[tuple[str, _Commit]] = []  # Critical lines awaiting fsync
+        self.last_flush = time.monotonic()
+        self.last_write = self.last_flush
+
+
+class JsonlWriter:
+    """
+    Background JSONL writer with per-family bounded queues.
+    
+    - One open handle per log file; files are date-stamped, so daily
+      rotation happens by opening the new day's path and closing the old
+      handle once it goes idle.
+    - Non-critical lines are flushed when a file buffers ``flush_bytes``
+      or every ``flush_interval`` seconds.
+    - Critical lines (trades, orders, stops, exits) wake the writer at once;
+      every critical line in the batch is written, each touched file is
+      fsync'd once, then all waiting callers are released (group commit).
+    - When a family's queue holds ``max_pending`` lines, non-critical
+      writes are dropped (``overflow="drop"``) or wait for space
+      (``overflow="block"``). Critical writes always wait.
+    """
+    
+    def __init__(
+        self,
+        max_pending: int = 20_000,
+        flush_interval: float = 0.5,
+        flush_bytes: int = 256 * 1024,
+        overflow: str = "drop",
+        idle_close: float = 120.0,
+        commit_timeout: float = 5.0,
+    ):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"overflow must be 'drop' or 'block', got {overflow!r}")
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.overflow = overflow
+        self.idle_close = idle_close
+        self.commit_timeout = commit_timeout
+        
+        self._cond = threading.Condition()
+        self._queues: dict[str, deque] = {}  # family -> deque[(path, line, done_event)]
+        self._urgent = False
+        self._flush_requested: list[threading.Event] = []
+        self._handles: dict[Path, _OpenLog] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        
+        # Stats
+        self.lines_written = 0
+        self.dropped = 0
+        self.commits = 0
+    
+    def _ensure_started(self) -> bool:
+        if self._closed:
+            return False
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            return True
+        with self._cond:
+            if self._closed:
+                return False
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                # Fresh start (or forked child): handles from a parent are not ours
+                self._handles = {}
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+                self._thread.start()
+        return True
+    
+    def submit(self, family: str, path: Path, line: str, critical: bool = False) -> bool:
+        """
+        Queue a line for ``path``. Critical lines block until fsync'd.
+        Returns False if the caller should write the line synchronously:
+        writer closed, blocked past ``commit_timeout``, or a critical line
+        that could not be committed.
+        """
+        if not self._ensure_started():
+            return False
+        done = _Commit() if critical else None
+        deadline = time.monotonic() + self.commit_timeout
+        with self._cond:
+            queue = self._queues.get(family)
+            if queue is None:
+                queue = self._queues[family] = deque()
+            while len(queue) >= self.max_pending:
+                if not critical and self.overflow == "drop":
+                    self.dropped += 1
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    return False
+                self._cond.wait(min(remaining, self.flush_interval))
+                queue = self._queues.setdefault(family, deque())
+            entry = (path, line, done)
+            queue.append(entry)
+            if critical:
+                self._urgent = True
+                self._cond.notify_all()
+        if done is None:
+            return True
+        if not done.wait(self.commit_timeout):
+            logger.warning("[LOG] Critical write to %s not committed within %.1fs", path.name, self.commit_timeout)
+            with self._cond:
+                queue = self._queues.get(family)
+                if queue is not None and entry in queue:
+                    queue.remove(entry)
+            # The caller writes it synchronously. If the writer already took
+            # the line it may land twice; a duplicate beats a lost trade.
+            return False
+        return done.ok
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written and flushed."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        with self._cond:
+            self._flush_requested.append(done)
+            self._cond.notify_all()
+        return done.wait(timeout)
+    
+    def close(self, timeout: float = 5.0):
+        """Drain queues, close handles and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout)
+    
+    def get_stats(self) -> dict:
+        with self._cond:
+            pending = sum(len(q) for q in self._queues.values())
+        return {
+            "pending": pending,
+            "open_files": len(self._handles),
+            "lines_written": self.lines_written,
+            "dropped": self.dropped,
+            "commits": self.commits,
+        }
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and not self._urgent and not self._flush_requested:
+                    self._cond.wait(self.flush_interval)
+                batch = self._queues
+                self._queues = {}
+                self._urgent = False
+                flush_waiters = self._flush_requested
+                self._flush_requested = []
+                closing = self._closed
+                self._cond.notify_all()  # Space freed for blocked producers
+            
+            commit_waiters = self._write_batch(batch)
+            self._flush_handles(force=closing or bool(flush_waiters))
+            self.commits += bool(commit_waiters)
+            for done in commit_waiters:
+                done.set()
+            for done in flush_waiters:
+                done.set()
+            
+            if closing:
+                with self._cond:
+                    leftover = self._queues
+                    self._queues = {}
+                if leftover:
+                    commit_waiters = self._write_batch(leftover)
+                    self._flush_handles(force=True)
+                    for done in commit_waiters:
+                        done.set()
+                for log in self._handles.values():
+                    log.handle.close()
+                self._handles.clear()
+                return
+            self._close_idle()
+    
+    def _write_batch(self, batch: dict[str, deque]) -> list[_Commit]:
+        waiters = []
+        now = time.monotonic()
+        for queue in batch.values():
+            for path, line, done in queue:
+                try:
+                    log = self._handles.get(path)
+                    if log is None:
+                        log = self._handles[path] = _OpenLog(path)
+                    log.handle.write(line)
+                    log.pending_bytes += len(line)
+                    log.last_write = now
+                    if done is not None:
+                        log.commits.append((line, done))
+                    self.lines_written += 1
+                except (OSError, ValueError):
+                    # Disk trouble: never lose a critical line silently
+                    if done is not None:
+                        self._commit_sync(path, line, done)
+                if done is not None:
+                    waiters.append(done)
+        return waiters
+    
+    @staticmethod
+    def _commit_sync(path: Path, line: str, done: _Commit):
+        try:
+            _append_line_sync(path, line, critical=True)
+        except OSError:
+            done.ok = False
+    
+    def _flush_handles(self, force: bool = False):
+        now = time.monotonic()
+        for path, log in list(self._handles.items()):
+            due = (
+                force
+                or log.commits
+                or log.pending_bytes >= self.flush_bytes
+                or (log.pending_bytes and now - log.last_flush >= self.flush_interval)
+            )
+            if not due:
+                continue
+            try:
+                log.handle.flush()
+                if log.commits:
+                    os.fsync(log.handle.fileno())
+            except (OSError, ValueError):
+                # Buffered lines may be lost: recommit critical ones directly
+                # and drop the handle so the next write reopens the file
+                for line, done in log.commits:
+                    self._commit_sync(path, line, done)
+                self._handles.pop(path, None)
+                try:
+                    log.handle.close()
+                except (OSError, ValueError):
+                    pass
+            log.pending_bytes = 0
+            log.commits = []
+            log.last_flush = now
+    
+    def _close_idle(self):
+        now = time.monotonic()
+        idle = [
+            path for path, log in self._handles.items()
+            if not log.pending_bytes and now - log.last_write >= self.idle_close
+        ]
+        for path in idle:
+            try:
+                self._handles.pop(path).handle.close()
+            except OSError:
+                pass
+
+
+_writer = JsonlWriter()
+atexit.register(_writer.close)
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Force buffered log lines to disk (e.g. before reading logs back)."""
+    return _writer.flush(timeout)
+
+
+def get_log_writer_stats() -> dict:
+    """Queue depth, open files and drop counts for the background writer."""
+    return _writer.get_stats()
+
+
+def append_jsonl(path: Path, record: dict, critical: bool = False):
+    """
+    Append a JSON record as a single line via the background writer.
+    
+    Args:
+        path: Target log file path
+        record: Dictionary to log as JSON
+        critical: If True, block until the line is fsync'd to disk
+                  (crash-safe, group-committed). Use for trades/orders.
+    """
+    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    family = path.name.rsplit("_", 1)[0]
+    if not _writer.submit(family, path, line, critical=critical):
+        _append_line_sync(path, line, critical=critical)
+
+
 # Convenience functions for each layer
 def log_raw(record: dict, ts: datetime = None):
     """Log raw WS event (ticks, trades, heartbeats)."""
@@ -190,6 +488,11 @@ def log_health(record: dict, ts: datetime = None):
     append_jsonl(log_path("health", ts), record)
 
 
+def log_perf(record: dict, ts: datetime = None):
+    """Log a periodic stage/symbol latency snapshot (core.perf)."""
+    append_jsonl(log_path("perf", ts), record)
+
+
 def log_order(record: dict, ts: datetime = None):
     """Log order placement/response (critical - uses fsync)."""
     append_jsonl(log_path("orders", ts), record, critical=True)
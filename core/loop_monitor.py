@@ -0,0 +1,60 @@
+"""
+Event-Loop Lag Monitor
+
+Measures how late the event loop wakes a task that sleeps a fixed interval.
+Any synchronous work on the loop thread (REST calls, disk I/O, heavy math)
+shows up directly as lag, and so does the drift it causes in WS tick
+timestamps and candle closes.
+
+    monitor = LoopLagMonitor()
+    task = asyncio.create_task(monitor.run())
+    monitor.get_stats()  # {"last_ms", "p50_ms", "p99_ms", "max_ms", "samples"}
+"""
+
+import asyncio
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag every ``interval`` seconds over a rolling window."""
+
+    def __init__(self, interval: float = 0.25, window: int = 240):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=window)  # Lag in seconds
+        self.last_s = 0.0
+        self.max_s = 0.0  # Since start
+
+    async def run(self):
+        """Sample until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - due)
+
+    def record(self, lag_s: float):
+        lag_s = max(0.0, lag_s)
+        self._samples.append(lag_s)
+        self.last_s = lag_s
+        if lag_s > self.max_s:
+            self.max_s = lag_s
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Lag percentile over the window in seconds (None before the first sample)."""
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, np.float64), q))
+
+    def get_stats(self) -> dict:
+        p50 = self.percentile(50) or 0.0
+        p99 = self.percentile(99) or 0.0
+        return {
+            "last_ms": round(self.last_s * 1000, 1),
+            "p50_ms": round(p50 * 1000, 1),
+            "p99_ms": round(p99 * 1000, 1),
+            "max_ms": round(self.max_s * 1000, 1),
+            "samples": len(self._samples),
+        }
@@ -1,6 +1,6 @@
 """Typed data models for the trading bot."""
 
-from core.models.candle import Candle, CandleBuffer
+from core.models.candle import Candle, CandleBuffer, CandleRing
 from core.models.position import Position, PositionState, Side
 from core.models.signal import FlagPattern, ImpulseLeg, Signal, SignalType
 from core.models.trade_result import TradeResult
@@ -9,6 +9,7 @@ from core.models.trade import Intent, OrderRequest, TradePlan
 __all__ = [
     "Candle",
     "CandleBuffer",
+    "CandleRing",
     "FlagPattern",
     "ImpulseLeg",
     "Position",
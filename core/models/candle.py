@@ -1,6 +1,6 @@
 """Candle primitives and rolling buffer utilities."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -9,9 +9,25 @@ import numpy as np
 from core.logger import log_candle_5m, utc_iso_str
 
 
-@dataclass
+_new_object = object.__new__
+
+
+def valid_ohlcv(open, high, low, close, volume) -> np.ndarray:
+    """Vectorized form of ``Candle`` validation: True for rows that would pass."""
+    return (
+        (open > 0) & (high > 0) & (low > 0) & (close > 0) & (volume >= 0)
+        & (high >= np.maximum(open, close)) & (low <= np.minimum(open, close))
+    )
+
+
+@dataclass(slots=True)
 class Candle:
-    """OHLCV candle data."""
+    """OHLCV candle data.
+
+    The constructor validates (use it for data from the network). Internal
+    paths that build candles from already-validated data use
+    :meth:`trusted`, which skips the checks.
+    """
     timestamp: datetime
     open: float
     high: float
@@ -31,6 +47,26 @@ class Candle:
             raise ValueError(f'Candle low ({self.low}) > min(open, close)')
         if self.volume < 0:
             raise ValueError(f'Candle volume cannot be negative: {self.volume}')
+
+    @classmethod
+    def trusted(
+        cls,
+        timestamp: datetime,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> "Candle":
+        """Build a candle without validation (aggregates, store reloads, ring rows)."""
+        candle = _new_object(cls)
+        candle.timestamp = timestamp
+        candle.open = open
+        candle.high = high
+        candle.low = low
+        candle.close = close
+        candle.volume = volume
+        return candle
     
     def __repr__(self) -> str:
         return f"Candle({self.timestamp.strftime('%H:%M')}, O={self.open:.4f}, H={self.high:.4f}, L={self.low:.4f}, C={self.close:.4f}, V={self.volume:.0f})"
@@ -60,151 +96,648 @@ class Candle:
         return min(self.open, self.close) - self.low
 
 
+# Column layout shared by every CandleRing
+_TS, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _RANGE = range(7)
+_NUM_COLUMNS = 7
+
+
+def _candle_columns(candles: list[Candle]) -> tuple[np.ndarray, np.ndarray]:
+    """(ts, [open, high, low, close, volume]) arrays for a list of candles."""
+    ts = np.fromiter((c.timestamp.timestamp() for c in candles), np.float64, len(candles))
+    cols = np.array([(c.open, c.high, c.low, c.close, c.volume) for c in candles], dtype=np.float64)
+    return ts, cols.reshape(-1, 5).T
+
+
+class CandleRing:
+    """Fixed-capacity OHLCV ring buffer with zero-copy ordered views.
+
+    Every row is written twice, at ``slot`` and ``slot + capacity``, so the
+    newest ``len(ring)`` rows always form one contiguous, chronologically
+    ordered slice of the backing array. Column reads are therefore plain
+    NumPy views with no allocation or reordering.
+
+    Behaves like a read-only ``list[Candle]`` (len, indexing, slicing,
+    iteration) so existing ``buffer.candles_1m[-5:]`` call sites keep working.
+    Rows bulk-loaded with :meth:`extend_columns` get their ``Candle`` objects
+    built on the first list-style access.
+    """
+
+    __slots__ = ("capacity", "_cols", "_candles", "_head", "_size", "_lazy")
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"CandleRing capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self._cols = np.zeros((_NUM_COLUMNS, 2 * capacity), dtype=np.float64)
+        self._candles: list[Optional[Candle]] = [None] * (2 * capacity)
+        self._head = 0  # Next write slot in [0, capacity)
+        self._size = 0
+        self._lazy = False  # Some rows in the window have no Candle object yet
+
+    def _start(self) -> int:
+        return self._head + self.capacity - self._size
+
+    def append(self, candle: Candle):
+        """Append a candle, evicting the oldest one when full."""
+        slot = self._head
+        mirror = slot + self.capacity
+        cols = self._cols
+        row = (
+            candle.timestamp.timestamp(),
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+            candle.high - candle.low,
+        )
+        cols[:, slot] = row
+        cols[:, mirror] = row
+        self._candles[slot] = candle
+        self._candles[mirror] = candle
+        self._head = (slot + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend_columns(self, ts, open, high, low, close, volume):
+        """Bulk-append oldest-first column arrays (``ts`` in epoch seconds).
+
+        Only the newest ``capacity`` rows are kept. No per-row ``Candle`` is
+        created here; see :meth:`_materialize`.
+        """
+        self._write(ts, (open, high, low, close, volume), None)
+
+    def extend(self, candles: list[Candle]):
+        """Bulk-append oldest-first candles in one vectorized column write."""
+        candles = candles[-self.capacity:]
+        if candles:
+            ts, cols = _candle_columns(candles)
+            self._write(ts, cols, candles)
+
+    def merge_columns(self, ts, cols, candles: Optional[list] = None) -> int:
+        """Merge sorted, timestamp-unique rows into the window in one pass.
+
+        Rows whose timestamp is already buffered are skipped (existing rows
+        win). Newer rows are appended in place; otherwise both sorted runs
+        are interleaved by position and the newest ``capacity`` rows kept.
+        ``candles`` optionally carries the matching ``Candle`` objects.
+        Returns the number of rows inserted.
+        """
+        if len(ts) == 0:
+            return 0
+        old_ts = self.timestamps
+        if self._size == 0 or ts[0] > old_ts[-1]:
+            self._write(ts, cols, candles)
+            return len(ts)
+
+        # Drop incoming rows that collide with a buffered timestamp
+        pos = np.searchsorted(old_ts, ts)
+        dup = old_ts[np.minimum(pos, self._size - 1)] == ts
+        if dup.any():
+            new = ~dup
+            if not new.any():
+                return 0
+            ts, pos = ts[new], pos[new]
+            cols = [col[new] for col in cols]
+            if candles is not None:
+                candles = [candles[i] for i in np.flatnonzero(new).tolist()]
+
+        # Final positions of both runs in the merged order (no re-sort)
+        n_old, n_new = self._size, len(ts)
+        new_slots = pos + np.arange(n_new)
+        old_slots = np.arange(n_old) + np.searchsorted(ts, old_ts)
+        total = n_old + n_new
+        merged = np.empty((_RANGE, total), dtype=np.float64)
+        start = self._start()
+        merged[:, old_slots] = self._cols[:_RANGE, start:start + n_old]
+        merged[_TS, new_slots] = ts
+        for index, col in enumerate(cols, _OPEN):
+            merged[index, new_slots] = col
+        objects: list[Optional[Candle]] = [None] * total
+        for i, candle in zip(old_slots.tolist(), self._candles[start:start + n_old]):
+            objects[i] = candle
+        if candles is not None:
+            for i, candle in zip(new_slots.tolist(), candles):
+                objects[i] = candle
+
+        self.clear()
+        self._write(merged[_TS], merged[_OPEN:_RANGE], objects)
+        return n_new
+
+    def _write(self, ts, cols, candles: Optional[list]):
+        """Append rows at the head; ``candles`` entries may be None (lazy)."""
+        n = len(ts)
+        if n == 0:
+            return
+        if n > self.capacity:
+            cut = n - self.capacity
+            ts = ts[cut:]
+            cols = [col[cut:] for col in cols]
+            candles = candles[cut:] if candles is not None else None
+            n = self.capacity
+        open, high, low, close, volume = cols
+        block = np.vstack((ts, open, high, low, close, volume, np.subtract(high, low)))
+        slots = (self._head + np.arange(n)) % self.capacity
+        self._cols[:, slots] = block
+        self._cols[:, slots + self.capacity] = block
+        objects = self._candles
+        if candles is None:
+            for slot in slots.tolist():
+                objects[slot] = objects[slot + self.capacity] = None
+            self._lazy = True
+        else:
+            for slot, candle in zip(slots.tolist(), candles):
+                objects[slot] = objects[slot + self.capacity] = candle
+                if candle is None:
+                    self._lazy = True
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+
+    def _materialize(self):
+        """Build the Candle objects missing after :meth:`extend_columns`."""
+        start = self._start()
+        candles = self._candles
+        missing = [i for i in range(start, start + self._size) if candles[i] is None]
+        if missing:
+            utc = timezone.utc
+            fromtimestamp = datetime.fromtimestamp
+            rows = self._cols[:_RANGE, missing].T.tolist()
+            for i, (t, o, h, l, c, v) in zip(missing, rows):
+                candle = Candle.trusted(fromtimestamp(t, utc), o, h, l, c, v)
+                candles[i] = candle
+                candles[i + self.capacity if i < self.capacity else i - self.capacity] = candle
+        self._lazy = False
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._lazy = False
+        self._candles = [None] * (2 * self.capacity)
+
+    def load(self, candles):
+        """Replace contents with ``candles`` (keeps the newest ``capacity``)."""
+        candles = list(candles)[-self.capacity:]
+        self.clear()
+        for candle in candles:
+            self.append(candle)
+
+    def column(self, index: int) -> np.ndarray:
+        """Read-only, oldest-first view of one column."""
+        start = self._start()
+        view = self._cols[index, start:start + self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Epoch seconds, oldest first."""
+        return self.column(_TS)
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self.column(_OPEN)
+
+    @property
+    def highs(self) -> np.ndarray:
+        return self.column(_HIGH)
+
+    @property
+    def lows(self) -> np.ndarray:
+        return self.column(_LOW)
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.column(_CLOSE)
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.column(_VOLUME)
+
+    @property
+    def ranges(self) -> np.ndarray:
+        return self.column(_RANGE)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self):
+        if self._lazy:
+            self._materialize()
+        start = self._start()
+        return iter(self._candles[start:start + self._size])
+
+    def __reversed__(self):
+        if self._lazy:
+            self._materialize()
+        start = self._start()
+        return reversed(self._candles[start:start + self._size])
+
+    def __getitem__(self, key):
+        if self._lazy:
+            self._materialize()
+        start = self._start()
+        if isinstance(key, slice):
+            idx = range(start, start + self._size)[key]
+            if idx.step > 0:
+                return self._candles[idx.start:idx.stop:idx.step]
+            return [self._candles[i] for i in idx]
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("CandleRing index out of range")
+        return self._candles[start + key]
+
+    def __repr__(self) -> str:
+        return f"CandleRing({self._size}/{self.capacity})"
+
+
+# Rolling sums drift with float error; rebuild them from the ring this often
+_RESYNC_EVERY = 1024
+
+
+class _RollingVWAP:
+    """Running sums of midpoint*volume and volume over the last N candles."""
+
+    __slots__ = ("periods", "pv", "vol", "nonzero", "_pushes")
+
+    def __init__(self, ring: CandleRing, periods: int):
+        self.periods = periods
+        self.resync(ring)
+
+    def resync(self, ring: CandleRing):
+        volumes = ring.volumes[-self.periods:]
+        midpoints = (ring.highs[-self.periods:] + ring.lows[-self.periods:]) / 2
+        self.pv = float(np.dot(midpoints, volumes))
+        self.vol = float(volumes.sum())
+        self.nonzero = int(np.count_nonzero(volumes))
+        self._pushes = 0
+
+    def push(self, ring: CandleRing, candle: Candle):
+        """Account for ``candle`` before it is appended to ``ring``."""
+        if len(ring) >= self.periods:
+            old = ring[-self.periods]
+            if old.volume:
+                self.pv -= old.midpoint * old.volume
+                self.vol -= old.volume
+                self.nonzero -= 1
+        if candle.volume:
+            self.pv += candle.midpoint * candle.volume
+            self.vol += candle.volume
+            self.nonzero += 1
+        if not self.nonzero:
+            # Drop accumulated rounding error once the window is all zeros
+            self.pv = self.vol = 0.0
+        self._pushes += 1
+
+
+class _RunningEMA:
+    """EMA seeded from the first close and updated once per candle."""
+
+    __slots__ = ("period", "multiplier", "value")
+
+    def __init__(self, ring: CandleRing, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.value = 0.0
+        closes = ring.closes.tolist()
+        if closes:
+            self.value = closes[0]
+            for price in closes[1:]:
+                self.value = (price - self.value) * self.multiplier + self.value
+
+    def push(self, ring: CandleRing, candle: Candle):
+        if not ring:
+            self.value = candle.close
+        else:
+            self.value = (candle.close - self.value) * self.multiplier + self.value
+
+
+class _RollingATR:
+    """Running sum of the last N true ranges (mean of TR, as ``atr()`` has always used)."""
+
+    __slots__ = ("period", "tr_sum", "_pushes")
+
+    def __init__(self, ring: CandleRing, period: int):
+        self.period = period
+        self.resync(ring)
+
+    def resync(self, ring: CandleRing):
+        self.tr_sum = 0.0
+        self._pushes = 0
+        if len(ring) < 2:
+            return
+        n = min(self.period, len(ring) - 1)
+        highs = ring.highs[-n:]
+        lows = ring.lows[-n:]
+        prev_closes = ring.closes[-n - 1:-1]
+        self.tr_sum = float(np.maximum(
+            highs - lows,
+            np.maximum(np.abs(highs - prev_closes), np.abs(lows - prev_closes)),
+        ).sum())
+
+    @staticmethod
+    def _true_range(candle: Candle, prev_close: float) -> float:
+        return max(
+            candle.high - candle.low,
+            abs(candle.high - prev_close),
+            abs(candle.low - prev_close),
+        )
+
+    def push(self, ring: CandleRing, candle: Candle):
+        size = len(ring)
+        if size == 0:
+            return
+        if size >= self.period + 1:
+            self.tr_sum -= self._true_range(ring[-self.period], ring[-self.period - 1].close)
+        self.tr_sum += self._true_range(candle, ring[-1].close)
+        self._pushes += 1
+
+
 @dataclass
 class CandleBuffer:
-    """Rolling buffer of candles with computed indicators."""
+    """Rolling buffer of candles with computed indicators.
+
+    Each timeframe lives in a :class:`CandleRing`; ``candles_*`` expose the
+    rings as list-like sequences and ``get_*`` return zero-copy NumPy views.
+    """
     symbol: str
-    candles_1m: list[Candle] = field(default_factory=list)
-    candles_5m: list[Candle] = field(default_factory=list)
-    candles_1h: list[Candle] = field(default_factory=list)  # Higher timeframe
-    candles_1d: list[Candle] = field(default_factory=list)  # Daily candles
     max_1m: int = 120  # 2 hours
     max_5m: int = 48   # 4 hours
     max_1h: int = 48   # 48 hours
     max_1d: int = 30   # 30 days
+    log_5m: bool = True  # Write aggregated 5m candles to the analytics log
+    
+    def __post_init__(self):
+        self._rings: dict[str, CandleRing] = {
+            "1m": CandleRing(self.max_1m),
+            "5m": CandleRing(self.max_5m),
+            "1h": CandleRing(self.max_1h),  # Higher timeframe
+            "1d": CandleRing(self.max_1d),  # Daily candles
+        }
+        # Incremental indicators per timeframe, registered lazily on first read
+        # and advanced once per appended candle so reads stay O(1)
+        self._indicators: dict[str, dict[tuple, object]] = {tf: {} for tf in self._rings}
+        # Bumped on every change to any ring (memo key for derived features)
+        self.seq = 0
+    
+    @property
+    def candles_1m(self) -> CandleRing:
+        return self._rings["1m"]
+    
+    @candles_1m.setter
+    def candles_1m(self, candles):
+        self._load("1m", candles)
+    
+    @property
+    def candles_5m(self) -> CandleRing:
+        return self._rings["5m"]
+    
+    @candles_5m.setter
+    def candles_5m(self, candles):
+        self._load("5m", candles)
+    
+    @property
+    def candles_1h(self) -> CandleRing:
+        return self._rings["1h"]
+    
+    @candles_1h.setter
+    def candles_1h(self, candles):
+        self._load("1h", candles)
+    
+    @property
+    def candles_1d(self) -> CandleRing:
+        return self._rings["1d"]
+    
+    @candles_1d.setter
+    def candles_1d(self, candles):
+        self._load("1d", candles)
     
     def add_1m(self, candle: Candle):
-        # For backfill: avoid duplicates
-        if self.candles_1m and candle.timestamp <= self.candles_1m[-1].timestamp:
-            # Check if exact duplicate
-            if any(c.timestamp == candle.timestamp for c in self.candles_1m[-5:]):
-                return
-            # Insert in order for historical data
-            self.candles_1m.append(candle)
-            self.candles_1m.sort(key=lambda c: c.timestamp)
-        else:
-            self.candles_1m.append(candle)
-        
-        if len(self.candles_1m) > self.max_1m:
-            self.candles_1m = self.candles_1m[-self.max_1m:]
+        ring = self._rings["1m"]
+        # For backfill: merge older candles in place (duplicates are skipped)
+        if ring and candle.timestamp.timestamp() <= ring.timestamps[-1]:
+            self._extend("1m", [candle])
+            return
+        self._append("1m", candle)
         # Aggregate to 5m when appropriate
         self._maybe_aggregate_5m()
     
     def add_5m_direct(self, candle: Candle):
         """Add a 5m candle directly (for backfill, bypassing aggregation)."""
+        ring = self._rings["5m"]
         # Avoid duplicates by checking timestamp
-        if self.candles_5m and candle.timestamp <= self.candles_5m[-1].timestamp:
+        if ring and candle.timestamp <= ring[-1].timestamp:
+            return
+        self._append("5m", candle)
+
+    def append_arrays(self, timeframe: str, ts, open, high, low, close, volume) -> int:
+        """
+        Bulk-load column arrays (``ts`` in epoch seconds) into a timeframe.
+
+        Rows are sorted, invalid OHLCV rows dropped and duplicate timestamps
+        collapsed (rows already in the buffer win). No Candle objects are
+        built until the ring is read as a list.
+        For 1m, closed 5m buckets newer than the 5m ring are aggregated into
+        it (not logged: this is history, not a live close).
+
+        Returns the number of rows inserted.
+        """
+        ts = np.asarray(ts, dtype=np.float64)
+        cols = [np.asarray(c, dtype=np.float64) for c in (open, high, low, close, volume)]
+        valid = valid_ohlcv(*cols)
+        order = np.argsort(ts[valid], kind="stable")
+        ts = ts[valid][order]
+        cols = [col[valid][order] for col in cols]
+        if len(ts) == 0:
+            return 0
+
+        # Last occurrence wins within the incoming batch
+        keep = np.append(ts[1:] != ts[:-1], True)
+        return self._merge(timeframe, ts[keep], [col[keep] for col in cols])
+
+    def extend_1m(self, candles: list[Candle]) -> int:
+        """
+        Bulk-merge a batch of 1m candles (backfill, REST, rehydration).
+
+        Unlike repeated :meth:`add_1m` this merges the batch into the ring in
+        one pass, skips timestamps already buffered, and rolls closed 5m
+        buckets into the 5m ring once (history, so nothing is logged).
+        Returns the number of candles inserted.
+        """
+        return self._extend("1m", candles)
+
+    def extend_5m(self, candles: list[Candle]) -> int:
+        """Bulk-merge a batch of 5m candles; see :meth:`extend_1m`."""
+        return self._extend("5m", candles)
+
+    def extend_1h(self, candles: list[Candle]) -> int:
+        """Bulk-merge a batch of 1h candles; see :meth:`extend_1m`."""
+        return self._extend("1h", candles)
+
+    def extend_1d(self, candles: list[Candle]) -> int:
+        """Bulk-merge a batch of 1d candles; see :meth:`extend_1m`."""
+        return self._extend("1d", candles)
+
+    def _extend(self, timeframe: str, candles: list[Candle]) -> int:
+        if not candles:
+            return 0
+        candles = list(candles)
+        ts, cols = _candle_columns(candles)
+        if np.any(ts[1:] <= ts[:-1]):
+            order = np.argsort(ts, kind="stable")
+            ts, cols = ts[order], cols[:, order]
+            candles = [candles[i] for i in order.tolist()]
+            keep = np.append(ts[1:] != ts[:-1], True)
+            if not keep.all():
+                ts, cols = ts[keep], cols[:, keep]
+                candles = [candles[i] for i in np.flatnonzero(keep).tolist()]
+        return self._merge(timeframe, ts, cols, candles)
+
+    def _merge(self, timeframe: str, ts, cols, candles: Optional[list] = None) -> int:
+        """Merge sorted unique rows into a ring; 1m merges roll up into 5m."""
+        added = self._rings[timeframe].merge_columns(ts, cols, candles)
+        if added:
+            self.seq += 1
+            self._indicators[timeframe].clear()
+            if timeframe == "1m":
+                self._aggregate_5m_columns()
+        return added
+
+    def _aggregate_5m_columns(self):
+        """Roll closed 5m buckets of the 1m ring into the 5m ring (vectorized)."""
+        ring_1m = self._rings["1m"]
+        ts = ring_1m.timestamps
+        if len(ts) == 0:
+            return
+        buckets = ts - ts % 300
+        starts = np.flatnonzero(np.append(True, buckets[1:] != buckets[:-1]))
+        ends = np.append(starts[1:], len(ts)) - 1
+        # Same close rule as _maybe_aggregate_5m: the bucket's minute-4 bar exists
+        closed = ts[ends] - buckets[ends] >= 240
+        ring_5m = self._rings["5m"]
+        if ring_5m:
+            closed &= buckets[starts] > ring_5m.timestamps[-1]
+        if not closed.any():
             return
-        self.candles_5m.append(candle)
-        if len(self.candles_5m) > self.max_5m:
-            self.candles_5m = self.candles_5m[-self.max_5m:]
+        ring_5m.extend_columns(
+            buckets[starts][closed],
+            ring_1m.opens[starts][closed],
+            np.maximum.reduceat(ring_1m.highs, starts)[closed],
+            np.minimum.reduceat(ring_1m.lows, starts)[closed],
+            ring_1m.closes[ends][closed],
+            np.add.reduceat(ring_1m.volumes, starts)[closed],
+        )
+        self.seq += 1
+        self._indicators["5m"].clear()
+
+    def _append(self, timeframe: str, candle: Candle):
+        """Append to a ring, advancing its incremental indicators first."""
+        ring = self._rings[timeframe]
+        for indicator in self._indicators[timeframe].values():
+            indicator.push(ring, candle)
+        ring.append(candle)
+        self.seq += 1
+    
+    def _load(self, timeframe: str, candles):
+        """Replace a ring's contents; indicators rebuild on their next read."""
+        self._rings[timeframe].load(candles)
+        self.seq += 1
+        self._indicators[timeframe].clear()
+    
+    def _indicator(self, timeframe: str, key: tuple, factory, period: int):
+        """Get (or build from the current window) an incremental indicator."""
+        indicators = self._indicators[timeframe]
+        indicator = indicators.get(key)
+        if indicator is None:
+            indicator = indicators[key] = factory(self._rings[timeframe], period)
+        elif getattr(indicator, "_pushes", 0) >= _RESYNC_EVERY:
+            indicator.resync(self._rings[timeframe])
+        return indicator
     
     def _maybe_aggregate_5m(self):
         """Aggregate 1m candles to 5m when we have 5 complete."""
-        if len(self.candles_1m) < 5:
+        ring = self._rings["1m"]
+        if len(ring) < 5:
             return
         # Check if we should create new 5m candle
-        last_1m = self.candles_1m[-1]
+        last_1m = ring[-1]
         if last_1m.timestamp.minute % 5 == 4:  # End of 5m period
-            last_5 = self.candles_1m[-5:]
-            candle_5m = Candle(
-                timestamp=last_5[0].timestamp,
-                open=last_5[0].open,
-                high=max(c.high for c in last_5),
-                low=min(c.low for c in last_5),
-                close=last_5[-1].close,
-                volume=sum(c.volume for c in last_5),
+            first_1m = ring[-5]
+            candle_5m = Candle.trusted(
+                timestamp=first_1m.timestamp,
+                open=first_1m.open,
+                high=float(ring.highs[-5:].max()),
+                low=float(ring.lows[-5:].min()),
+                close=last_1m.close,
+                volume=float(ring.volumes[-5:].sum()),
             )
             self.add_5m_direct(candle_5m)
             
             # Log 5m candle for analytics
+            if not self.log_5m:
+                return
             log_candle_5m({
-                "ts": utc_iso_str(last_5[-1].timestamp),
+                "ts": utc_iso_str(last_1m.timestamp),
                 "symbol": self.symbol,
                 "open": candle_5m.open,
                 "high": candle_5m.high,
                 "low": candle_5m.low,
                 "close": candle_5m.close,
                 "volume": candle_5m.volume,
-            }, last_5[-1].timestamp)
-    
-    def get_closes(self, timeframe: str = "1m") -> list[float]:
-        if timeframe == "1m":
-            return [c.close for c in self.candles_1m]
-        elif timeframe == "5m":
-            return [c.close for c in self.candles_5m]
-        elif timeframe == "1h":
-            return [c.close for c in self.candles_1h]
-        elif timeframe == "1d":
-            return [c.close for c in self.candles_1d]
-        return []
-    
-    def get_volumes(self, timeframe: str = "1m") -> list[float]:
-        """Get volume values for the specified timeframe."""
-        if timeframe == "1m":
-            return [c.volume for c in self.candles_1m]
-        elif timeframe == "5m":
-            return [c.volume for c in self.candles_5m]
-        elif timeframe == "1h":
-            return [c.volume for c in self.candles_1h]
-        elif timeframe == "1d":
-            return [c.volume for c in self.candles_1d]
-        return []
-    
-    def get_ranges(self, timeframe: str = "1m") -> list[float]:
-        """Get high-low range values for the specified timeframe."""
-        if timeframe == "1m":
-            return [c.range for c in self.candles_1m]
-        elif timeframe == "5m":
-            return [c.range for c in self.candles_5m]
-        elif timeframe == "1h":
-            return [c.range for c in self.candles_1h]
-        elif timeframe == "1d":
-            return [c.range for c in self.candles_1d]
-        return []
+            }, last_1m.timestamp)
+    
+    def get_closes(self, timeframe: str = "1m") -> np.ndarray:
+        """Get close values for the specified timeframe (read-only view)."""
+        ring = self._rings.get(timeframe)
+        return ring.closes if ring is not None else np.empty(0)
+    
+    def get_volumes(self, timeframe: str = "1m") -> np.ndarray:
+        """Get volume values for the specified timeframe (read-only view)."""
+        ring = self._rings.get(timeframe)
+        return ring.volumes if ring is not None else np.empty(0)
+    
+    def get_ranges(self, timeframe: str = "1m") -> np.ndarray:
+        """Get high-low range values for the specified timeframe (read-only view)."""
+        ring = self._rings.get(timeframe)
+        return ring.ranges if ring is not None else np.empty(0)
     
     def vwap(self, periods: int = 30) -> float:
-        """Calculate VWAP over last N 1m candles."""
-        if len(self.candles_1m) < periods:
+        """Calculate VWAP over last N 1m candles (O(1) via running sums)."""
+        ring = self._rings["1m"]
+        if len(ring) < periods:
             # Not enough history yet; fall back to last close
-            return self.candles_1m[-1].close if self.candles_1m else 0.0
-        recent = self.candles_1m[-periods:]
-        total_vol = sum(c.volume for c in recent)
-        if total_vol == 0:
-            return recent[-1].close
-        return sum(c.midpoint * c.volume for c in recent) / total_vol
+            return ring[-1].close if ring else 0.0
+        acc = self._indicator("1m", ("vwap", periods), _RollingVWAP, periods)
+        if not acc.nonzero:
+            return ring[-1].close
+        return acc.pv / acc.vol
     
     def ema(self, period: int = 20, timeframe: str = "5m") -> float:
-        """Calculate EMA."""
-        closes = self.get_closes(timeframe)
-        if len(closes) < period:
-            return closes[-1] if len(closes) > 0 else 0.0
-        multiplier = 2 / (period + 1)
-        ema = closes[0]
-        for price in closes[1:]:
-            ema = (price - ema) * multiplier + ema
-        return ema
+        """Calculate EMA (seeded from the first close, then updated per candle)."""
+        ring = self._rings.get(timeframe)
+        if ring is None or not ring:
+            return 0.0
+        if len(ring) < period:
+            return ring[-1].close
+        return self._indicator(timeframe, ("ema", period), _RunningEMA, period).value
     
     def atr(self, period: int = 14, timeframe: str = "1m") -> float:
-        """Calculate ATR."""
-        candles = self.candles_1m if timeframe == "1m" else self.candles_5m
-        if len(candles) < period + 1:
-            return candles[-1].range if candles else 0.0
-        
-        tr_values = []
-        for i in range(1, len(candles)):
-            high = candles[i].high
-            low = candles[i].low
-            prev_close = candles[i-1].close
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            tr_values.append(tr)
-        
-        return np.mean(tr_values[-period:])
+        """Calculate ATR as the mean of the last N true ranges (O(1))."""
+        timeframe = "1m" if timeframe == "1m" else "5m"
+        ring = self._rings[timeframe]
+        if len(ring) < period + 1:
+            return ring[-1].range if ring else 0.0
+        acc = self._indicator(timeframe, ("atr", period), _RollingATR, period)
+        return acc.tr_sum / period
     
     @property
     def last_price(self) -> float:
-        if self.candles_1m:
-            return self.candles_1m[-1].close
+        ring = self._rings["1m"]
+        if ring:
+            return ring[-1].close
         return 0.0
     
     def __repr__(self) -> str:
@@ -219,4 +752,3 @@ class CandleBuffer:
     def is_warm(self) -> bool:
         """Check if buffer has minimum data for strategy analysis."""
         return len(self.candles_1m) >= 20 and len(self.candles_5m) >= 5
-
@@ -0,0 +1,177 @@
+"""
+Performance Instrumentation
+
+Lightweight timers for the bot's hot paths:
+
+    with perf.span("clock_b.hot_list"):            # One stage
+        ...
+    with perf.span("strategy.analyze", symbol=sym):  # Also kept per symbol
+        ...
+    perf.record("ws.message", seconds)             # Already-measured duration
+
+Durations go into fixed log-spaced histograms (1us..~60s, ~19% apart), so a
+record is one bisect and a few increments. ``snapshot()`` reports count,
+mean, p50/p95/p99 and max per stage, the slowest symbols per stage, the
+event-loop lag (``LoopLagMonitor``) and the estimated instrumentation
+overhead. With PERF_ENABLED=0 spans are a shared no-op context.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from typing import Optional
+
+from core.config import settings
+from core.logger import utc_iso_str
+from core.loop_monitor import LoopLagMonitor
+
+_BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(104))  # Bucket upper bounds (s)
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """Latency histogram over fixed log buckets (seconds)."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (capped at max)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(_BOUNDS[i], self.max) if i < len(_BOUNDS) else self.max
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Span:
+    __slots__ = ("_registry", "_name", "_symbol", "_began")
+
+    def __init__(self, registry: "PerfRegistry", name: str, symbol: Optional[str]):
+        self._registry = registry
+        self._name = name
+        self._symbol = symbol
+
+    def __enter__(self):
+        self._began = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._registry.record(self._name, time.perf_counter() - self._began, self._symbol)
+        return False
+
+
+class PerfRegistry:
+    """Per-stage and per-symbol histograms for the current reporting window."""
+
+    def __init__(self, enabled: bool = True, top_symbols: int = 20):
+        self.enabled = enabled
+        self.top_symbols = top_symbols
+        self.loop_monitor: Optional[LoopLagMonitor] = None
+        self._stages: dict[str, Histogram] = {}
+        self._symbols: dict[str, dict[str, Histogram]] = {}
+        self._lock = threading.Lock()  # Spans may close on worker threads
+        self._window_start = time.time()
+        self._records = 0
+        self._record_cost: Optional[float] = None
+
+    def span(self, name: str, symbol: Optional[str] = None):
+        """Context manager timing its block into ``name`` (and ``symbol``)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, symbol)
+
+    def record(self, name: str, seconds: float, symbol: Optional[str] = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(name)
+            if hist is None:
+                hist = self._stages[name] = Histogram()
+            hist.record(seconds)
+            if symbol is not None:
+                per_symbol = self._symbols.get(name)
+                if per_symbol is None:
+                    per_symbol = self._symbols[name] = {}
+                hist = per_symbol.get(symbol)
+                if hist is None:
+                    hist = per_symbol[symbol] = Histogram()
+                hist.record(seconds)
+            self._records += 1
+
+    def record_cost(self) -> float:
+        """Measured cost of one span in seconds (for the overhead estimate)."""
+        if self._record_cost is None:
+            probe = PerfRegistry()
+            runs = 2000
+            began = time.perf_counter()
+            for _ in range(runs):
+                with probe.span("probe", "SYM-USD"):
+                    pass
+            self._record_cost = (time.perf_counter() - began) / runs
+        return self._record_cost
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Histograms for the window so far; ``reset`` starts a new window."""
+        now = time.time()
+        with self._lock:
+            window_s = now - self._window_start
+            records = self._records
+            stages = {name: hist.as_dict() for name, hist in sorted(self._stages.items())}
+            symbols = {
+                name: {
+                    symbol: hist.as_dict()
+                    for symbol, hist in sorted(per_symbol.items(), key=lambda kv: -kv[1].total)[: self.top_symbols]
+                }
+                for name, per_symbol in sorted(self._symbols.items())
+            }
+            if reset:
+                self._stages = {}
+                self._symbols = {}
+                self._records = 0
+                self._window_start = now
+
+        snapshot = {
+            "ts": utc_iso_str(),
+            "enabled": self.enabled,
+            "window_s": round(window_s, 1),
+            "records": records,
+            "overhead_pct": round(records * self.record_cost() / window_s * 100, 4) if window_s > 0 and records else 0.0,
+            "stages": stages,
+            "symbols": symbols,
+        }
+        if self.loop_monitor is not None:
+            snapshot["loop_lag"] = self.loop_monitor.get_stats()
+        return snapshot
+
+
+# Global registry for the bot process
+perf = PerfRegistry(enabled=settings.perf_enabled)
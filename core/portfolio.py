@@ -13,10 +13,10 @@ This is the source of truth for positions and P&L.
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, Dict, List
-from coinbase.rest import RESTClient
 
 from core.config import settings
 from core.logging_utils import get_logger
+from core.rest_pool import PooledClient, rest_pool
 
 logger = get_logger(__name__)
 
@@ -74,7 +74,7 @@ class PortfolioTracker:
     """
     
     def __init__(self):
-        self._client: Optional[RESTClient] = None
+        self._client: Optional[PooledClient] = None
         self._portfolio_uuid: Optional[str] = None
         self._last_snapshot: Optional[PortfolioSnapshot] = None
         self._realized_pnl: float = 0.0  # Computed from fills
@@ -85,11 +85,11 @@ class PortfolioTracker:
             return True
             
         try:
-            self._client = RESTClient(
+            self._client = rest_pool.private_client(
                 api_key=settings.coinbase_api_key,
                 api_secret=settings.coinbase_api_secret
             )
-            return True
+            return self._client is not None
         except Exception as e:
             logger.warning("[PORTFOLIO] Failed to init client: %s", e)
             return False
@@ -0,0 +1,220 @@
+"""
+Pooled Coinbase REST Clients
+
+Long-lived ``RESTClient`` instances shared by the whole process instead of a
+new client per request. A client keeps its HTTP session (and the keep-alive
+TLS connection behind it) across calls, so only the first request through a
+pooled client pays connection setup.
+
+- ``rest_pool.public``: unauthenticated market data (candles)
+- ``rest_pool.private(key, secret)``: one pool per API credential pair
+- Bounded concurrency: a pool lends out at most ``size`` clients at a time
+- Per-endpoint latency metrics (calls, errors, mean/max/last ms)
+
+``PooledClient`` is a drop-in for a ``RESTClient`` held by long-lived
+objects: every method call borrows a client from its pool for that call.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterator, Optional
+
+from core.config import settings
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EndpointStats:
+    """Latency of one REST endpoint."""
+    calls: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    last_s: float = 0.0
+
+    def record(self, elapsed: float, ok: bool):
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.total_s += elapsed
+        self.last_s = elapsed
+        if elapsed > self.max_s:
+            self.max_s = elapsed
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.total_s / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_s * 1000, 1),
+            "last_ms": round(self.last_s * 1000, 1),
+        }
+
+
+class ClientPool:
+    """A bounded set of reusable clients built by ``factory``."""
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int = 4):
+        self.name = name
+        self.factory = factory
+        self.size = max(1, size)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.created = 0
+        self.waits = 0  # Borrows that waited for a free client
+
+    def prime(self):
+        """Build one client now (so bad credentials fail at init, not first use)."""
+        with self._lock:
+            if self.created:
+                return
+        client = self.factory()
+        with self._lock:
+            self._idle.append(client)
+            self.created += 1
+
+    @contextmanager
+    def client(self) -> Iterator[Any]:
+        """Borrow a client, blocking while all ``size`` clients are in use."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            self._slots.acquire()
+        try:
+            with self._lock:
+                client = self._idle.pop() if self._idle else None
+            if client is None:
+                client = self.factory()
+                with self._lock:
+                    self.created += 1
+            try:
+                yield client
+            finally:
+                with self._lock:
+                    self._idle.append(client)
+        finally:
+            self._slots.release()
+
+    def call(self, endpoint: str, *args, **kwargs) -> Any:
+        """Call ``client.<endpoint>(...)`` on a pooled client and record its latency."""
+        with self.client() as client:
+            method = getattr(client, endpoint)
+            began = time.perf_counter()
+            ok = False
+            try:
+                result = method(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                elapsed = time.perf_counter() - began
+                with self._lock:
+                    stats = self.endpoints.get(endpoint)
+                    if stats is None:
+                        stats = self.endpoints[endpoint] = EndpointStats()
+                    stats.record(elapsed, ok)
+
+    def proxy(self) -> "PooledClient":
+        return PooledClient(self)
+
+    def close(self):
+        """Close idle clients' HTTP sessions."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for client in idle:
+            session = getattr(client, "session", None)
+            if session is not None and hasattr(session, "close"):
+                try:
+                    session.close()
+                except Exception:
+                    logger.debug("[POOL] Failed to close %s session", self.name, exc_info=True)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self.created,
+                "idle": len(self._idle),
+                "waits": self.waits,
+                "endpoints": {name: s.as_dict() for name, s in sorted(self.endpoints.items())},
+            }
+
+
+class PooledClient:
+    """Stand-in for a ``RESTClient``: each method call runs on a pooled client."""
+
+    def __init__(self, pool: ClientPool):
+        self.pool = pool
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return partial(self.pool.call, name)
+
+
+def _rest_client(**kwargs) -> Any:
+    from coinbase.rest import RESTClient
+    return RESTClient(**kwargs)
+
+
+class RestClientPools:
+    """The public pool plus one private pool per API credential pair."""
+
+    def __init__(self, size: int = 4):
+        self.size = size
+        self.public = ClientPool("public", _rest_client, size)
+        self._private: dict[tuple[str, str], ClientPool] = {}
+        self._lock = threading.Lock()
+
+    def private(self, api_key: Optional[str] = None, api_secret: Optional[str] = None) -> Optional[ClientPool]:
+        """Authenticated pool (defaults to the configured keys); None without credentials."""
+        key = api_key if api_key is not None else settings.coinbase_api_key
+        secret = api_secret if api_secret is not None else settings.coinbase_api_secret
+        if not key or not secret:
+            return None
+        with self._lock:
+            pool = self._private.get((key, secret))
+            if pool is None:
+                pool = ClientPool("private", partial(_rest_client, api_key=key, api_secret=secret), self.size)
+                self._private[(key, secret)] = pool
+            return pool
+
+    def public_client(self) -> PooledClient:
+        return self.public.proxy()
+
+    def private_client(self, api_key: Optional[str] = None, api_secret: Optional[str] = None) -> Optional[PooledClient]:
+        """Pooled authenticated client, or None without credentials."""
+        pool = self.private(api_key, api_secret)
+        if pool is None:
+            return None
+        pool.prime()
+        return pool.proxy()
+
+    def close(self):
+        self.public.close()
+        with self._lock:
+            pools = list(self._private.values())
+        for pool in pools:
+            pool.close()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            pools = list(self._private.values())
+        private: dict = {"size": self.size, "created": 0, "idle": 0, "waits": 0, "endpoints": {}}
+        for pool in pools:
+            stats = pool.get_stats()
+            for field in ("created", "idle", "waits"):
+                private[field] += stats[field]
+            private["endpoints"].update(stats["endpoints"])
+        return {"public": self.public.get_stats(), "private": private}
+
+
+# Global pools shared by every REST caller in the process
+rest_pool = RestClientPools(size=settings.rest_pool_size)
@@ -0,0 +1,421 @@
+"""
+Shared Coinbase REST Scheduler
+
+One process-wide token bucket for every REST request (orders, tier polling,
+startup warmup, background backfill), so the modules share the exchange
+budget instead of each pacing itself and colliding into bursts of 429s.
+
+- Priority: waiters are granted tokens ORDER > POSITION > TIER2 > TIER3 > BACKFILL
+- Adaptive backoff: a 429 empties the bucket, pauses all requests except
+  ORDER and halves the rate; each success restores part of the configured rate
+- Coalescing: requests with the same key while one is in flight share its response
+
+Coroutines ``await rest_scheduler.run(...)`` and worker threads call
+``rest_scheduler.call(...)``; both wait in the same priority queue. The
+priority of code that does not pass one comes from ``request_priority()``.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Collection, Hashable, Iterator, Optional
+
+from core.config import settings
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+    ORDER = 0
+    POSITION = 1
+    TIER2 = 2
+    TIER3 = 3
+    BACKFILL = 4
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar("rest_priority", default=Priority.TIER2)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Set the priority of REST requests made in this context (incl. ``asyncio.to_thread``)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True if an exception is a Coinbase 429 response."""
+    text = str(error)
+    return "429" in text or "Too Many Requests" in text
+
+
+class _Waiter:
+    """A queued token request; ``wake`` is safe to call from any thread."""
+
+    __slots__ = ("priority", "seq", "wake", "cancelled")
+
+    def __init__(self, priority: int, seq: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.seq = seq
+        self.wake = wake
+        self.cancelled = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RestScheduler:
+    """
+    Priority token bucket with 429 backoff and request coalescing.
+
+    Only the head of the priority queue may take a token; it sleeps until
+    the bucket refills (or a cooldown ends) and wakes the next waiter once
+    it is granted. A higher-priority arrival simply becomes the new head.
+    """
+
+    def __init__(
+        self,
+        rate: float = 8.0,
+        burst: float = 8.0,
+        min_rate: float = 1.0,
+        max_backoff: float = 60.0,
+        recovery: float = 0.05,
+    ):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.max_backoff = max_backoff
+        self.recovery = recovery  # Fraction of base_rate restored per success
+        self.tokens = burst
+        self._last_refill = time.monotonic()
+        self._cooldown_until = 0.0
+
+        self._lock = threading.Lock()
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._inflight: dict[Hashable, Future] = {}
+        self._position_source: Optional[Callable[[], Collection[str]]] = None
+
+        # Stats
+        self.requests = 0
+        self.coalesced = 0
+        self.total_429s = 0
+        self.consecutive_429s = 0
+        self.granted = [0] * len(Priority)
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def configure(self, rate: float, burst: float):
+        """Change the rate budget (keeps backoff state)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            scale = self.rate / self.base_rate if self.base_rate else 1.0
+            self.base_rate = rate
+            self.rate = max(min(self.min_rate, rate), rate * scale)
+            self.burst = burst
+            self.tokens = min(self.tokens, burst)
+
+    def set_position_source(self, source: Optional[Callable[[], Collection[str]]]):
+        """Symbols returned by ``source`` are promoted to POSITION priority."""
+        self._position_source = source
+
+    def priority_for(self, symbol: Optional[str], priority: Optional[Priority] = None) -> Priority:
+        """Resolve a request's priority (explicit > context), promoting open positions."""
+        if priority is None:
+            priority = _priority.get()
+        if symbol and priority > Priority.POSITION and self._position_source is not None:
+            try:
+                if symbol in self._position_source():
+                    return Priority.POSITION
+            except Exception:
+                logger.debug("[RATE] Position source failed", exc_info=True)
+        return priority
+
+    # ------------------------------------------------------------------
+    # Token bucket (call with _lock held)
+    # ------------------------------------------------------------------
+
+    def _refill(self, now: float):
+        if now > self._last_refill:
+            self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+    def _take(self, now: float, priority: int = Priority.TIER2) -> float:
+        """Take a token; return 0, or the seconds until one is available."""
+        if now < self._cooldown_until:
+            if priority == Priority.ORDER:
+                # Orders are never held behind a 429 from market data; they
+                # borrow against the budget that refills after the cooldown
+                self.tokens -= 1
+                return 0.0
+            return self._cooldown_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def _head(self) -> Optional[_Waiter]:
+        while self._waiters and self._waiters[0].cancelled:
+            heapq.heappop(self._waiters)
+        return self._waiters[0] if self._waiters else None
+
+    def _enqueue(self, priority: Priority, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(int(priority), next(self._seq), wake)
+        heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _try_grant(self, waiter: _Waiter) -> float:
+        """Grant ``waiter`` a token if it is at the head; else seconds to wait (inf = not head)."""
+        if self._head() is not waiter:
+            return math.inf
+        wait = self._take(time.monotonic(), waiter.priority)
+        if wait == 0:
+            heapq.heappop(self._waiters)
+            self.granted[waiter.priority] += 1
+            head = self._head()
+            if head is not None:
+                head.wake()
+        return wait
+
+    def _cancel(self, waiter: _Waiter):
+        with self._lock:
+            was_head = self._head() is waiter
+            waiter.cancelled = True
+            head = self._head()
+            if was_head and head is not None:
+                head.wake()
+
+    # ------------------------------------------------------------------
+    # Acquire
+    # ------------------------------------------------------------------
+
+    def acquire_blocking(self, priority: Optional[Priority] = None):
+        """Block this thread until a token is granted."""
+        priority = self.priority_for(None, priority)
+        if _on_event_loop():
+            # Called synchronously on an event loop: any sleep here freezes
+            # WS handling, so take a token or borrow one (the bucket goes
+            # negative and queued callers wait off the debt) without waiting.
+            with self._lock:
+                if self._take(time.monotonic(), priority):
+                    self.tokens -= 1
+                self.granted[priority] += 1
+            return
+
+        event = threading.Event()
+        with self._lock:
+            waiter = self._enqueue(priority, event.set)
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    wait = self._try_grant(waiter)
+                if wait == 0:
+                    return
+                event.wait(None if wait == math.inf else wait)
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    async def acquire(self, priority: Optional[Priority] = None):
+        """Wait (without blocking the loop) until a token is granted."""
+        priority = self.priority_for(None, priority)
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop closed
+
+        with self._lock:
+            waiter = self._enqueue(priority, wake)
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    wait = self._try_grant(waiter)
+                if wait == 0:
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), None if wait == math.inf else wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._cancel(waiter)
+            raise
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def record_success(self):
+        """A request succeeded: clear the 429 streak and restore some rate."""
+        with self._lock:
+            self.consecutive_429s = 0
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * self.recovery)
+
+    def record_429(self):
+        """A request was rate limited: pause everyone, empty the bucket, halve the rate."""
+        with self._lock:
+            self.total_429s += 1
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return  # Same burst; already backing off
+            self.consecutive_429s += 1
+            backoff = min(self.max_backoff, 2 ** (self.consecutive_429s - 1))
+            self._cooldown_until = now + backoff
+            self.tokens = 0.0
+            self._last_refill = self._cooldown_until
+            self.rate = max(self.min_rate, self.rate / 2)
+            rate = self.rate
+        logger.warning("[RATE] 429 received, pausing REST %ss at %.1f req/s (#%s)",
+                       backoff, rate, self.consecutive_429s)
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Return (shared future, True if the caller must perform the request)."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._inflight[key] = Future()
+            future.set_running_or_notify_cancel()
+            return future, True
+
+    def _settle(self, key: Hashable, future: Future, result: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _invoke(self, fn: Callable, args: tuple) -> Any:
+        with self._lock:
+            self.requests += 1
+        try:
+            result = fn(*args)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.record_429()
+            raise
+        self.record_success()
+        return result
+
+    def call(
+        self,
+        fn: Callable,
+        *args,
+        priority: Optional[Priority] = None,
+        symbol: Optional[str] = None,
+        key: Optional[Hashable] = None,
+    ) -> Any:
+        """Run a blocking REST call in this thread once a token is granted."""
+        priority = self.priority_for(symbol, priority)
+        if key is not None and _on_event_loop():
+            key = None  # Can't block the loop on a request a coroutine owns
+        if key is not None:
+            future, owner = self._join(key)
+            if not owner:
+                return future.result()
+        try:
+            self.acquire_blocking(priority)
+            result = self._invoke(fn, args)
+        except BaseException as e:
+            if key is not None:
+                self._settle(key, future, error=e)
+            raise
+        if key is not None:
+            self._settle(key, future, result)
+        return result
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        priority: Optional[Priority] = None,
+        symbol: Optional[str] = None,
+        key: Optional[Hashable] = None,
+    ) -> Any:
+        """Await a token, then run a blocking REST call in a worker thread."""
+        priority = self.priority_for(symbol, priority)
+        if key is not None:
+            future, owner = self._join(key)
+            if not owner:
+                return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            await self.acquire(priority)
+            result = await asyncio.to_thread(self._invoke, fn, args)
+        except BaseException as e:
+            if key is not None:
+                self._settle(key, future, error=e)
+            raise
+        if key is not None:
+            self._settle(key, future, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    @property
+    def cooldown_remaining(self) -> float:
+        return max(0.0, self._cooldown_until - time.monotonic())
+
+    @property
+    def is_degraded(self) -> bool:
+        """Backing off from a 429, or not yet back to the full rate."""
+        return self.cooldown_remaining > 0 or self.rate < self.base_rate
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            waiting = sum(1 for w in self._waiters if not w.cancelled)
+            return {
+                "rate": round(self.rate, 2),
+                "base_rate": self.base_rate,
+                "tokens": round(self.tokens, 2),
+                "waiting": waiting,
+                "in_flight_keys": len(self._inflight),
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "total_429s": self.total_429s,
+                "consecutive_429s": self.consecutive_429s,
+                "cooldown_s": round(self.cooldown_remaining, 1),
+                "granted": {p.name.lower(): self.granted[p] for p in Priority},
+            }
+
+
+# Global scheduler shared by every REST caller in the process
+rest_scheduler = RestScheduler(rate=settings.rest_rps, burst=settings.rest_burst)
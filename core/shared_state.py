@@ -371,11 +371,16 @@ def _serialize_state(state) -> dict:
             "events_5s": state.events_last_5s,
             "rest_requests": state.rest_requests,
             "rest_429s": state.rest_429s,
+            "loop_lag_ms": getattr(state, "loop_lag_ms", 0.0),
+            "loop_lag_max_ms": getattr(state, "loop_lag_max_ms", 0.0),
             "candles_persisted": state.candles_persisted,
             "ml_fresh_pct": state.ml_fresh_pct,
             "vol_regime": state.vol_regime,
         },
         
+        # Last perf window (stage/symbol latency histograms, see core.perf)
+        "perf": getattr(state, "perf", {}),
+        
         # Heartbeats
         "heartbeats": {
             "ws": _heartbeat_age(state.heartbeat_ws),
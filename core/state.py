@@ -222,6 +222,11 @@ class BotState:
     rest_requests: int = 0
     rest_429s: int = 0
     
+    # Event loop
+    loop_lag_ms: float = 0.0      # p99 lag over the last minute
+    loop_lag_max_ms: float = 0.0  # Worst lag since start
+    perf: dict = field(default_factory=dict)  # Last core.perf window (/api/perf)
+    
     # Throughput (reset every 5s)
     ticks_last_5s: int = 0
     candles_last_5s: int = 0
@@ -0,0 +1,310 @@
+"""
+Binary Tick Capture
+
+Compact, append-only capture of raw WS ticks and trades. Replaces the
+per-tick JSON lines in market_*.jsonl: a record is a fixed 48-byte struct,
+so writing is a struct pack into a buffer and reading is a memory map.
+
+Format: logs/<mode>/ticks/ticks_{YYYY-MM-DD}.bin
+    16-byte header: magic b"CTTICKS\\0", uint16 version, uint16 record size
+    N little-endian records laid out as TICK_DTYPE
+
+Symbols are interned into ticks_{YYYY-MM-DD}.symbols (one per line, the
+line number is the symbol id). A symbol's line is always on disk before
+any record that references it.
+"""
+
+import atexit
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+from core.mode_paths import get_logs_dir
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"CTTICKS\x00"
+VERSION = 1
+HEADER_SIZE = 16
+
+KIND_TICK = 0
+KIND_TRADE = 1
+
+SIDE_UNKNOWN = 0
+SIDE_BUY = 1
+SIDE_SELL = -1
+_SIDES = {"BUY": SIDE_BUY, "SELL": SIDE_SELL}
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+
+TICK_DTYPE = np.dtype([
+    ("ts_ns", "<i8"),       # Epoch nanoseconds (UTC)
+    ("price", "<f8"),
+    ("size", "<f8"),        # Trade size (NaN for ticks)
+    ("bid", "<f8"),         # Best bid (NaN if absent / trades)
+    ("ask", "<f8"),         # Best ask (NaN if absent / trades)
+    ("symbol_id", "<u4"),
+    ("kind", "u1"),         # KIND_TICK / KIND_TRADE
+    ("side", "i1"),         # SIDE_BUY / SIDE_SELL / SIDE_UNKNOWN
+    ("reserved", "<u2"),
+])
+_RECORD = struct.Struct("<qddddIBbH")
+assert _RECORD.size == TICK_DTYPE.itemsize == 48
+
+_NAN = float("nan")
+
+
+def capture_paths(base_dir: Path, day: str) -> tuple[Path, Path]:
+    """Return (records, symbols) paths for a YYYY-MM-DD capture day."""
+    return base_dir / f"ticks_{day}.bin", base_dir / f"ticks_{day}.symbols"
+
+
+class TickCaptureWriter:
+    """
+    Buffered writer for the binary tick capture.
+
+    Records are packed into an in-memory buffer and written in blocks of
+    ``flush_bytes`` (or every ``flush_interval`` seconds). Files roll over
+    at UTC midnight based on the record timestamp.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+    ):
+        # Resolve base dir lazily so TRADING_MODE overrides are respected
+        if base_dir:
+            resolved = Path(base_dir)
+            self._base_dir_func = lambda: resolved
+        else:
+            self._base_dir_func = lambda: get_logs_dir() / "ticks"
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._file = None
+        self._symbols_file = None
+        self._day: Optional[int] = None
+        self._symbol_ids: dict[str, int] = {}
+        self._last_flush = time.monotonic()
+
+        # Stats
+        self.records_written = 0
+
+    def write_tick(
+        self,
+        symbol: str,
+        price: float,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        ts_ns: Optional[int] = None,
+    ):
+        """Capture a ticker update."""
+        self._write(
+            KIND_TICK, symbol, price, _NAN,
+            _NAN if bid is None else bid,
+            _NAN if ask is None else ask,
+            SIDE_UNKNOWN, ts_ns,
+        )
+
+    def write_trade(
+        self,
+        symbol: str,
+        price: float,
+        size: float,
+        side: str = "",
+        ts_ns: Optional[int] = None,
+    ):
+        """Capture a market trade."""
+        self._write(
+            KIND_TRADE, symbol, price, size, _NAN, _NAN,
+            _SIDES.get(side.upper(), SIDE_UNKNOWN) if side else SIDE_UNKNOWN, ts_ns,
+        )
+
+    def _write(self, kind, symbol, price, size, bid, ask, side, ts_ns):
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        with self._lock:
+            day = ts_ns // NS_PER_DAY
+            if day != self._day:
+                self._rotate(day)
+            symbol_id = self._symbol_ids.get(symbol)
+            if symbol_id is None:
+                symbol_id = self._intern(symbol)
+            self._buffer += _RECORD.pack(ts_ns, price, size, bid, ask, symbol_id, kind, side, 0)
+            self.records_written += 1
+            if (
+                len(self._buffer) >= self.flush_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def _rotate(self, day: int):
+        """Switch to the capture files for ``day`` (epoch days, UTC)."""
+        self._flush_locked()
+        self._close_locked()
+
+        base_dir = self._base_dir_func()
+        base_dir.mkdir(parents=True, exist_ok=True)
+        day_str = datetime.fromtimestamp(day * 86_400, tz=timezone.utc).strftime("%Y-%m-%d")
+        records_path, symbols_path = capture_paths(base_dir, day_str)
+
+        # Resume an existing day (restart) with its symbol dictionary intact
+        self._symbol_ids = {}
+        if symbols_path.exists():
+            for i, line in enumerate(symbols_path.read_text().splitlines()):
+                self._symbol_ids[line] = i
+        self._symbols_file = open(symbols_path, "a", encoding="utf-8")
+
+        self._file = open(records_path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC + struct.pack("<HH", VERSION, TICK_DTYPE.itemsize) + b"\x00" * 4)
+        else:
+            # Drop a torn trailing record from a crash so records stay aligned
+            excess = (self._file.tell() - HEADER_SIZE) % TICK_DTYPE.itemsize
+            if excess:
+                self._file.truncate(self._file.tell() - excess)
+        self._day = day
+
+    def _intern(self, symbol: str) -> int:
+        symbol_id = len(self._symbol_ids)
+        self._symbol_ids[symbol] = symbol_id
+        self._symbols_file.write(symbol + "\n")
+        self._symbols_file.flush()
+        return symbol_id
+
+    def _flush_locked(self):
+        if self._buffer and self._file is not None:
+            try:
+                self._file.write(self._buffer)
+                self._file.flush()
+            except OSError as e:
+                logger.warning("[TICKS] Capture write failed: %s", e)
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def _close_locked(self):
+        for f in (self._file, self._symbols_file):
+            if f is not None:
+                f.close()
+        self._file = None
+        self._symbols_file = None
+        self._day = None
+
+    def flush(self):
+        """Write buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and close the current capture files."""
+        with self._lock:
+            self._flush_locked()
+            self._close_locked()
+
+
+@dataclass
+class TickCapture:
+    """A memory-mapped capture file and its symbol dictionary."""
+    path: Path
+    symbols: list[str]
+    records: np.ndarray  # Structured array (TICK_DTYPE), memory-mapped
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def iter_chunks(self, chunk_records: int = 1 << 20) -> Iterator[np.ndarray]:
+        """Yield consecutive structured-array views of at most ``chunk_records``."""
+        for start in range(0, len(self.records), chunk_records):
+            yield self.records[start:start + chunk_records]
+
+    def symbol_of(self, records: np.ndarray) -> np.ndarray:
+        """Map the symbol_id column of ``records`` to symbol strings."""
+        return np.asarray(self.symbols, dtype=object)[records["symbol_id"]]
+
+
+def open_capture(path: str | Path) -> TickCapture:
+    """Memory-map a ticks_*.bin file (ignores a torn trailing record)."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+        raise ValueError(f"Not a tick capture file: {path}")
+    version, record_size = struct.unpack("<HH", header[8:12])
+    if version != VERSION or record_size != TICK_DTYPE.itemsize:
+        raise ValueError(f"Unsupported tick capture v{version} ({record_size}-byte records): {path}")
+
+    symbols_path = path.with_suffix(".symbols")
+    symbols = symbols_path.read_text().splitlines() if symbols_path.exists() else []
+
+    count = (path.stat().st_size - HEADER_SIZE) // TICK_DTYPE.itemsize
+    if count <= 0:
+        records = np.empty(0, dtype=TICK_DTYPE)
+    else:
+        records = np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+    return TickCapture(path=path, symbols=symbols, records=records)
+
+
+def capture_to_parquet(
+    path: str | Path,
+    out_path: str | Path | None = None,
+    chunk_records: int = 1 << 20,
+) -> Path:
+    """Convert a capture file to Parquet (symbol stored dictionary-encoded)."""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet conversion")
+
+    capture = open_capture(path)
+    out_path = Path(out_path) if out_path else capture.path.with_suffix(".parquet")
+    symbols = pa.array(capture.symbols, type=pa.string())
+    schema = pa.schema([
+        ("ts", pa.timestamp("ns", tz="UTC")),
+        ("symbol", pa.dictionary(pa.int32(), pa.string())),
+        ("kind", pa.uint8()),
+        ("side", pa.int8()),
+        ("price", pa.float64()),
+        ("size", pa.float64()),
+        ("bid", pa.float64()),
+        ("ask", pa.float64()),
+    ])
+
+    with pq.ParquetWriter(out_path, schema, compression="zstd") as writer:
+        for chunk in capture.iter_chunks(chunk_records):
+            table = pa.table({
+                "ts": pa.array(chunk["ts_ns"], type=pa.timestamp("ns", tz="UTC")),
+                "symbol": pa.DictionaryArray.from_arrays(
+                    pa.array(chunk["symbol_id"].astype(np.int32)), symbols
+                ),
+                "kind": pa.array(chunk["kind"]),
+                "side": pa.array(chunk["side"]),
+                "price": pa.array(chunk["price"]),
+                "size": pa.array(chunk["size"]),
+                "bid": pa.array(chunk["bid"]),
+                "ask": pa.array(chunk["ask"]),
+            }, schema=schema)
+            writer.write_table(table)
+
+    logger.info("[TICKS] Converted %d records to %s", len(capture), out_path)
+    return out_path
+
+
+# Singleton instance
+tick_capture = TickCaptureWriter()
+atexit.register(tick_capture.close)
@@ -0,0 +1,15 @@
+"""
+DuckDB analytics warehouse (data/cointrader.duckdb).
+
+Trades, signals, rejections, exit decisions and stored candles are loaded
+incrementally from the JSONL logs so multi-day analytics are columnar SQL
+queries instead of log rescans.
+
+Run an ingestion pass:
+    python -m core.warehouse
+"""
+
+from core.warehouse.ingest import DB_PATH, Ingestor, connect, ingest
+from core.warehouse.queries import Warehouse, warehouse
+
+__all__ = ["DB_PATH", "Ingestor", "Warehouse", "connect", "ingest", "warehouse"]
@@ -0,0 +1,32 @@
+"""Run one incremental warehouse ingestion pass: python -m core.warehouse"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from core.warehouse.ingest import DB_PATH, LOGS_ROOT, MODES, PARQUET_DIR, ingest
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m core.warehouse", description="Load new log lines into DuckDB")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse file")
+    parser.add_argument("--logs", type=Path, default=LOGS_ROOT, help="Logs root (contains <mode>/ dirs)")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to ingest")
+    parser.add_argument("--no-parquet", action="store_true", help="Skip data/candles_1m parquet exports")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = ingest(
+        args.db,
+        args.logs,
+        None if args.no_parquet else PARQUET_DIR,
+        [m.strip() for m in args.modes.split(",") if m.strip()],
+    )
+    added = ", ".join(f"{table}={n}" for table, n in sorted(counts.items())) or "nothing new"
+    print(f"Ingested {added} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
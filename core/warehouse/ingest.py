@@ -0,0 +1,361 @@
+"""
+Incremental loader from JSONL logs / candle files into DuckDB.
+
+Sources (per mode under logs/<mode>/ plus the shared parquet exports):
+    trades_*.jsonl          -> trades (typed records), exits (exit decisions)
+    strategy_*.jsonl        -> signals, rejections
+    candles/{symbol}/{tf}/*.jsonl -> candles (CandleStore day segments)
+    candles/{symbol}/*.jsonl -> candles (legacy flat CandleStore files)
+    data/candles_1m/*.parquet -> candles (tf=1m)
+
+Every table carries a ``day`` DATE column and rows arrive in time order, so
+DuckDB's row-group min/max statistics prune day/ts ranges the way a
+partitioned layout would. Log files are append-only: ``ingest_state``
+remembers the byte offset consumed per file and each run parses only the
+new complete lines. A file that shrinks (rewritten/rotated) has its rows
+dropped and is reloaded from the start.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import duckdb
+import pyarrow as pa
+
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+ROOT = Path(__file__).parent.parent.parent
+DB_PATH = ROOT / "data" / "cointrader.duckdb"
+LOGS_ROOT = ROOT / "logs"
+PARQUET_DIR = ROOT / "data" / "candles_1m"
+MODES = ("paper", "live")
+
+# Columns after the common (ts, day, mode) prefix; every log table ends in src
+LOG_TABLES: dict[str, list[tuple[str, str]]] = {
+    "trades": [
+        ("type", "VARCHAR"), ("symbol", "VARCHAR"), ("strategy_id", "VARCHAR"),
+        ("side", "VARCHAR"), ("price", "DOUBLE"), ("qty", "DOUBLE"),
+        ("entry_price", "DOUBLE"), ("exit_price", "DOUBLE"), ("stop_price", "DOUBLE"),
+        ("size_usd", "DOUBLE"), ("pnl", "DOUBLE"), ("pnl_pct", "DOUBLE"),
+        ("r_multiple", "DOUBLE"), ("exit_reason", "VARCHAR"), ("hold_minutes", "DOUBLE"),
+        ("correlation_id", "VARCHAR"),
+    ],
+    "signals": [
+        ("symbol", "VARCHAR"), ("strategy_id", "VARCHAR"), ("signal_type", "VARCHAR"),
+        ("price", "DOUBLE"), ("confidence", "DOUBLE"), ("reason", "VARCHAR"),
+    ],
+    "rejections": [
+        ("symbol", "VARCHAR"), ("gate", "VARCHAR"), ("strategy_id", "VARCHAR"),
+        ("reason", "VARCHAR"),
+    ],
+    "exits": [
+        ("symbol", "VARCHAR"), ("exit_reason", "VARCHAR"), ("current_price", "DOUBLE"),
+        ("entry_price", "DOUBLE"), ("stop_price", "DOUBLE"), ("pnl_pct", "DOUBLE"),
+        ("hold_minutes", "DOUBLE"), ("is_partial", "BOOLEAN"),
+    ],
+}
+
+TRADE_TYPES = {"order_intent", "fill", "trade_close", "ml_entry", "ml_exit"}
+
+_ARROW_TYPES = {"VARCHAR": pa.string(), "DOUBLE": pa.float64(), "BOOLEAN": pa.bool_()}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS candles (
+        symbol VARCHAR NOT NULL, tf VARCHAR NOT NULL, ts TIMESTAMP NOT NULL, day DATE NOT NULL,
+        open DOUBLE, high DOUBLE, low DOUBLE, close DOUBLE, volume DOUBLE,
+        PRIMARY KEY (symbol, tf, ts))""",
+    """CREATE TABLE IF NOT EXISTS ingest_state (
+        path VARCHAR PRIMARY KEY, "offset" BIGINT, size BIGINT, mtime DOUBLE, rows BIGINT)""",
+    *(
+        f"CREATE TABLE IF NOT EXISTS {table} (ts TIMESTAMP NOT NULL, day DATE NOT NULL, mode VARCHAR, "
+        + ", ".join(f"{name} {sql_type}" for name, sql_type in cols)
+        + ", src VARCHAR)"
+        for table, cols in LOG_TABLES.items()
+    ),
+]
+
+
+def connect(path: Path | str = DB_PATH, read_only: bool = False, timeout: float = 5.0):
+    """
+    Open the warehouse, retrying while another process holds the write lock.
+
+    Connections are meant to be short-lived (open, ingest/query, close) so
+    the bot, the web server and CLI scripts can take turns on one file.
+    Also retries the in-process conflict DuckDB raises while a connection
+    with a different ``read_only`` setting is open.
+    """
+    path = Path(path)
+    if not read_only:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return duckdb.connect(str(path), read_only=read_only)
+        except (duckdb.IOException, duckdb.ConnectionException):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+def ensure_schema(con) -> None:
+    for ddl in SCHEMA:
+        con.execute(ddl)
+
+
+def _route(family: str, record: dict) -> Optional[str]:
+    """Pick the warehouse table for one log record (None = not ingested)."""
+    rtype = record.get("type")
+    if family == "trades":
+        if rtype in TRADE_TYPES:
+            return "trades"
+        if rtype is None and "exit_reason" in record:
+            return "exits"
+    elif family == "strategy":
+        if rtype == "signal":
+            return "signals"
+        if rtype is None and "gate" in record:
+            return "rejections"
+    return None
+
+
+def _coerce(value, sql_type: str):
+    if value is None:
+        return None
+    try:
+        if sql_type == "DOUBLE":
+            return float(value)
+        if sql_type == "BOOLEAN":
+            return bool(value)
+        return value if isinstance(value, str) else str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_new_lines(path: Path, offset: int) -> tuple[list[bytes], int]:
+    """Return complete lines after ``offset`` and the offset past the last one."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n")
+    if end < 0:
+        return [], offset
+    return data[:end].split(b"\n"), offset + end + 1
+
+
+class Ingestor:
+    """One ingestion pass over the log tree into an open connection."""
+
+    def __init__(
+        self,
+        con,
+        logs_root: Path = LOGS_ROOT,
+        parquet_dir: Optional[Path] = PARQUET_DIR,
+        modes: Iterable[str] = MODES,
+    ):
+        self.con = con
+        self.logs_root = Path(logs_root)
+        self.parquet_dir = Path(parquet_dir) if parquet_dir else None
+        self.modes = tuple(modes)
+        self.counts: dict[str, int] = {}
+        ensure_schema(con)
+        self._state = {
+            row[0]: row[1:]
+            for row in con.execute('SELECT path, "offset", size, mtime FROM ingest_state').fetchall()
+        }
+
+    def run(self) -> dict[str, int]:
+        """Ingest everything new; returns rows added per table."""
+        for mode in self.modes:
+            logs_dir = self.logs_root / mode
+            if not logs_dir.is_dir():
+                continue
+            for family in ("trades", "strategy"):
+                for path in sorted(logs_dir.glob(f"{family}_*.jsonl")):
+                    self._ingest_log(path, family, mode)
+            candles_dir = logs_dir / "candles"
+            if candles_dir.is_dir():
+                for path in sorted(candles_dir.glob("*/*.jsonl")):
+                    self._ingest_candle_jsonl(path, path.parent.name, path.stem)
+                for path in sorted(candles_dir.glob("*/*/*.jsonl")):
+                    self._ingest_candle_jsonl(path, path.parent.parent.name, path.parent.name)
+        if self.parquet_dir is not None and self.parquet_dir.is_dir():
+            for path in sorted(self.parquet_dir.glob("*.parquet")):
+                self._ingest_candle_parquet(path)
+        return self.counts
+
+    # ------------------------------------------------------------------ state
+
+    def _pending(self, path: Path, whole_file: bool = False) -> Optional[int]:
+        """Byte offset to resume from, or None when the file has nothing new."""
+        st = path.stat()
+        key = str(path)
+        prev = self._state.get(key)
+        if prev is None:
+            return 0
+        offset, size, mtime = prev
+        if whole_file:
+            return None if (size, mtime) == (st.st_size, st.st_mtime) else 0
+        if st.st_size < offset:
+            return 0  # Rewritten/truncated: reload from the start
+        return offset if st.st_size > offset else None
+
+    def _save_state(self, path: Path, offset: int, rows: int) -> None:
+        st = path.stat()
+        self.con.execute(
+            'INSERT OR REPLACE INTO ingest_state VALUES (?, ?, ?, ?, ?)',
+            [str(path), offset, st.st_size, st.st_mtime, rows],
+        )
+        self._state[str(path)] = (offset, st.st_size, st.st_mtime)
+
+    def _add(self, table: str, rows: int) -> None:
+        if rows:
+            self.counts[table] = self.counts.get(table, 0) + rows
+
+    # ------------------------------------------------------------------ logs
+
+    def _ingest_log(self, path: Path, family: str, mode: str) -> None:
+        offset = self._pending(path)
+        if offset is None:
+            return
+        src = str(path)
+        if offset == 0 and src in self._state:
+            for table in LOG_TABLES:
+                self.con.execute(f"DELETE FROM {table} WHERE src = ?", [src])
+
+        lines, new_offset = _read_new_lines(path, offset)
+        batches: dict[str, list[dict]] = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or not record.get("ts"):
+                continue
+            table = _route(family, record)
+            if table is not None:
+                batches.setdefault(table, []).append(record)
+
+        self.con.begin()
+        try:
+            for table, records in batches.items():
+                self._insert_records(table, records, mode, src)
+            self._save_state(path, new_offset, sum(len(r) for r in batches.values()))
+            self.con.commit()
+        except Exception:
+            self.con.rollback()
+            raise
+
+    def _insert_records(self, table: str, records: list[dict], mode: str, src: str) -> None:
+        cols = LOG_TABLES[table]
+        data = {"ts": [str(r["ts"]) for r in records]}
+        for name, sql_type in cols:
+            data[name] = [_coerce(r.get(name), sql_type) for r in records]
+        batch = pa.table(data, schema=pa.schema(
+            [("ts", pa.string())] + [(name, _ARROW_TYPES[t]) for name, t in cols]
+        ))
+        names = ", ".join(name for name, _ in cols)
+        self.con.register("_batch", batch)
+        try:
+            inserted = self.con.execute(
+                f"""INSERT INTO {table}
+                    SELECT ts, CAST(ts AS DATE), ?, {names}, ?
+                    FROM (SELECT TRY_CAST(ts AS TIMESTAMP) AS ts, {names} FROM _batch)
+                    WHERE ts IS NOT NULL
+                    ORDER BY ts""",
+                [mode, src],
+            ).fetchone()[0]
+        finally:
+            self.con.unregister("_batch")
+        self._add(table, inserted)
+
+    # --------------------------------------------------------------- candles
+
+    def _ingest_candle_jsonl(self, path: Path, symbol: str, default_tf: str) -> None:
+        offset = self._pending(path)
+        if offset is None:
+            return
+        lines, new_offset = _read_new_lines(path, offset)
+        ts, o, h, l, c, v, tf = [], [], [], [], [], [], []
+        for line in lines:
+            try:
+                r = json.loads(line)
+                row = (str(r["ts"]), float(r["open"]), float(r["high"]), float(r["low"]),
+                       float(r["close"]), float(r["volume"]), str(r.get("tf") or default_tf))
+            except (ValueError, KeyError, TypeError):
+                continue
+            for column, value in zip((ts, o, h, l, c, v, tf), row):
+                column.append(value)
+        batch = pa.table({"ts": ts, "open": o, "high": h, "low": l, "close": c, "volume": v, "tf": tf})
+        self.con.begin()
+        try:
+            self._insert_candles(batch, symbol)
+            self._save_state(path, new_offset, len(ts))
+            self.con.commit()
+        except Exception:
+            self.con.rollback()
+            raise
+
+    def _ingest_candle_parquet(self, path: Path) -> None:
+        if self._pending(path, whole_file=True) is None:
+            return
+        names = self.con.execute("SELECT name FROM parquet_schema(?)", [str(path)]).fetchall()
+        where = "WHERE type = 'candle_1m'" if ("type",) in names else ""
+        batch = self.con.execute(
+            f"SELECT ts, open, high, low, close, volume, symbol, '1m' AS tf FROM read_parquet(?) {where}",
+            [str(path)],
+        ).fetch_arrow_table()
+        self.con.begin()
+        try:
+            self._insert_candles(batch)
+            self._save_state(path, 0, batch.num_rows)
+            self.con.commit()
+        except Exception:
+            self.con.rollback()
+            raise
+
+    def _insert_candles(self, batch: pa.Table, symbol: Optional[str] = None) -> None:
+        if batch.num_rows == 0:
+            return
+        symbol_expr = "?" if symbol is not None else "symbol"
+        params = [symbol] if symbol is not None else []
+        self.con.register("_batch", batch)
+        try:
+            inserted = self.con.execute(
+                f"""INSERT OR IGNORE INTO candles
+                    SELECT symbol, tf, ts, CAST(ts AS DATE), open, high, low, close, volume FROM (
+                        SELECT DISTINCT ON (symbol, tf, ts) * FROM (
+                            SELECT {symbol_expr} AS symbol, tf, TRY_CAST(ts AS TIMESTAMP) AS ts,
+                                   open, high, low, close, volume
+                            FROM _batch
+                        )
+                    ) WHERE ts IS NOT NULL
+                    ORDER BY symbol, tf, ts""",
+                params,
+            ).fetchone()[0]
+        finally:
+            self.con.unregister("_batch")
+        self._add("candles", inserted)
+
+
+def ingest(
+    path: Path | str = DB_PATH,
+    logs_root: Path = LOGS_ROOT,
+    parquet_dir: Optional[Path] = PARQUET_DIR,
+    modes: Iterable[str] = MODES,
+) -> dict[str, int]:
+    """Run one incremental ingestion pass; returns rows added per table."""
+    start = time.perf_counter()
+    con = connect(path)
+    try:
+        counts = Ingestor(con, logs_root, parquet_dir, modes).run()
+    finally:
+        con.close()
+    if counts:
+        logger.info("[WAREHOUSE] Ingested %s in %.2fs", counts, time.perf_counter() - start)
+    return counts
@@ -0,0 +1,214 @@
+"""
+Analytics queries over the DuckDB warehouse.
+
+Used by the web server (/api/analytics/*) and scripts/analyze_performance.py
+in place of rescanning JSONL logs. Each call opens a short-lived connection
+so the bot, the web server and CLI scripts can share the database file.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from core.logging_utils import get_logger
+from core.warehouse.ingest import DB_PATH, LOGS_ROOT, MODES, PARQUET_DIR, connect, ensure_schema, ingest
+
+logger = get_logger(__name__)
+
+
+def _naive_utc(ts: datetime) -> datetime:
+    """Warehouse timestamps are stored as naive UTC TIMESTAMP."""
+    return ts.astimezone(timezone.utc).replace(tzinfo=None) if ts.tzinfo else ts
+
+
+def _cutoff(days: float) -> datetime:
+    return _naive_utc(datetime.now(timezone.utc) - timedelta(days=days))
+
+
+def _rate_fields(row: dict) -> dict:
+    """Add win_rate / avg_pnl / profit_factor to an aggregate row."""
+    trades = row["trades"]
+    row["win_rate"] = row["wins"] / trades * 100 if trades else 0.0
+    row["avg_pnl"] = row["total_pnl"] / trades if trades else 0.0
+    # None = no losing trades (infinite profit factor, not JSON-encodable)
+    row["profit_factor"] = row["gross_profit"] / row["gross_loss"] if row["gross_loss"] > 0 else None
+    return row
+
+
+_CLOSE_AGG = """
+    count(*) AS trades,
+    count(*) FILTER (WHERE pnl > 0) AS wins,
+    count(*) FILTER (WHERE NOT pnl > 0 OR pnl IS NULL) AS losses,
+    coalesce(sum(pnl), 0) AS total_pnl,
+    coalesce(sum(pnl) FILTER (WHERE pnl > 0), 0) AS gross_profit,
+    coalesce(-sum(pnl) FILTER (WHERE pnl <= 0), 0) AS gross_loss,
+    coalesce(avg(hold_minutes), 0) AS avg_hold_min
+"""
+
+
+class Warehouse:
+    """Query facade plus rate-limited incremental refresh."""
+
+    def __init__(
+        self,
+        path: Path | str = DB_PATH,
+        logs_root: Path = LOGS_ROOT,
+        parquet_dir: Optional[Path] = PARQUET_DIR,
+    ):
+        self.path = Path(path)
+        self.logs_root = Path(logs_root)
+        self.parquet_dir = parquet_dir
+        # DuckDB rejects a second in-process connection with a different
+        # read_only setting, so queries and ingest share one lock and config
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+
+    def refresh(self, min_interval: float = 0.0) -> dict[str, int]:
+        """Ingest new log lines unless a refresh ran within ``min_interval`` seconds."""
+        with self._lock:
+            if min_interval and time.monotonic() - self._last_refresh < min_interval:
+                return {}
+            try:
+                return ingest(self.path, self.logs_root, self.parquet_dir, MODES)
+            except Exception as e:
+                logger.warning("[WAREHOUSE] Refresh failed: %s", e)
+                return {}
+            finally:
+                self._last_refresh = time.monotonic()
+
+    def _rows(self, sql: str, params: list) -> list[dict]:
+        with self._lock:
+            con = connect(self.path)
+            try:
+                ensure_schema(con)
+                cur = con.execute(sql, params)
+                names = [d[0] for d in cur.description]
+                return [dict(zip(names, row)) for row in cur.fetchall()]
+            finally:
+                con.close()
+
+    @staticmethod
+    def _window(days: float, mode: Optional[str]) -> tuple[str, list]:
+        cutoff = _cutoff(days)
+        where = "day >= ? AND ts >= ?"
+        params: list = [cutoff.date(), cutoff]
+        if mode:
+            where += " AND mode = ?"
+            params.append(mode)
+        return where, params
+
+    # ----------------------------------------------------------------- trades
+
+    def summary(self, days: float = 1, mode: Optional[str] = None) -> dict:
+        """Closed-trade totals plus signal/rejection counts."""
+        where, params = self._window(days, mode)
+        row = self._rows(
+            f"SELECT {_CLOSE_AGG} FROM trades WHERE type = 'trade_close' AND {where}", params
+        )[0]
+        counts = self._rows(
+            f"""SELECT (SELECT count(*) FROM signals WHERE {where}) AS signals,
+                       (SELECT count(*) FROM rejections WHERE {where}) AS rejections""",
+            params + params,
+        )[0]
+        return {**_rate_fields(row), **counts}
+
+    def by_strategy(self, days: float = 1, mode: Optional[str] = None) -> dict[str, dict]:
+        """Closed-trade aggregates per strategy, best P&L first."""
+        where, params = self._window(days, mode)
+        rows = self._rows(
+            f"""SELECT coalesce(strategy_id, 'unknown') AS strategy, {_CLOSE_AGG}
+                FROM trades WHERE type = 'trade_close' AND {where}
+                GROUP BY 1 ORDER BY total_pnl DESC""",
+            params,
+        )
+        return {row.pop("strategy"): _rate_fields(row) for row in rows}
+
+    def exit_reasons(self, days: float = 1, mode: Optional[str] = None) -> dict[str, dict]:
+        """Closed trades grouped by exit reason, most frequent first."""
+        where, params = self._window(days, mode)
+        rows = self._rows(
+            f"""SELECT coalesce(exit_reason, 'unknown') AS reason, count(*) AS count,
+                       coalesce(sum(pnl), 0) AS total_pnl, count(*) FILTER (WHERE pnl > 0) AS wins
+                FROM trades WHERE type = 'trade_close' AND {where}
+                GROUP BY 1 ORDER BY count DESC""",
+            params,
+        )
+        result = {}
+        for row in rows:
+            reason = row.pop("reason")
+            row["win_rate"] = row["wins"] / row["count"] * 100 if row["count"] else 0.0
+            result[reason] = row
+        return result
+
+    def daily_pnl(self, days: float = 30, mode: Optional[str] = None) -> list[dict]:
+        """Realized P&L per UTC day with a running cumulative total."""
+        where, params = self._window(days, mode)
+        rows = self._rows(
+            f"""SELECT day, count(*) AS trades, sum(pnl) AS pnl,
+                       sum(sum(pnl)) OVER (ORDER BY day) AS cum_pnl
+                FROM trades WHERE type = 'trade_close' AND {where}
+                GROUP BY day ORDER BY day""",
+            params,
+        )
+        for row in rows:
+            row["day"] = row["day"].isoformat()
+        return rows
+
+    # ----------------------------------------------------------- rejections
+
+    def rejections(self, days: float = 1, mode: Optional[str] = None, top: int = 10) -> dict:
+        """Rejection counts by gate and the most-rejected symbols."""
+        where, params = self._window(days, mode)
+        by_gate = self._rows(
+            f"""SELECT coalesce(gate, 'unknown') AS gate, count(*) AS n
+                FROM rejections WHERE {where} GROUP BY 1 ORDER BY n DESC""",
+            params,
+        )
+        by_symbol = self._rows(
+            f"""SELECT coalesce(symbol, 'unknown') AS symbol, count(*) AS n
+                FROM rejections WHERE {where} GROUP BY 1 ORDER BY n DESC LIMIT ?""",
+            params + [top],
+        )
+        return {
+            "total": sum(r["n"] for r in by_gate),
+            "by_gate": {r["gate"]: r["n"] for r in by_gate},
+            "by_symbol": {r["symbol"]: r["n"] for r in by_symbol},
+        }
+
+    # -------------------------------------------------------------- candles
+
+    def candles(
+        self,
+        symbol: str,
+        tf: str = "1m",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 1440,
+    ) -> list[dict]:
+        """Stored candles for one symbol (latest ``limit`` within [start, end))."""
+        where = "symbol = ? AND tf = ?"
+        params: list = [symbol, tf]
+        if start is not None:
+            start = _naive_utc(start)
+            where += " AND day >= ? AND ts >= ?"
+            params += [start.date(), start]
+        if end is not None:
+            end = _naive_utc(end)
+            where += " AND day <= ? AND ts < ?"
+            params += [end.date(), end]
+        rows = self._rows(
+            f"""SELECT * FROM (
+                    SELECT ts, open, high, low, close, volume FROM candles
+                    WHERE {where} ORDER BY ts DESC LIMIT ?
+                ) ORDER BY ts""",
+            params + [limit],
+        )
+        for row in rows:
+            row["ts"] = row["ts"].replace(tzinfo=timezone.utc).isoformat()
+        return rows
+
+
+# Singleton instance
+warehouse = Warehouse()
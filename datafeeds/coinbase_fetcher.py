@@ -1,46 +1,21 @@
-"""Coinbase REST candle fetcher with windowing and rate limiting."""
+"""Coinbase REST candle fetcher with windowing, paced by the shared REST scheduler."""
 
 from __future__ import annotations
 
 import time
+from functools import partial
 from datetime import datetime, timezone
 from typing import List
 
-from coinbase.rest import RESTClient
-
 from core.logging_utils import get_logger
 from core.models import Candle
+from core.rest_pool import rest_pool
+from core.rest_scheduler import is_rate_limit_error, rest_scheduler
 
 logger = get_logger(__name__)
 
-# Coinbase returns max 300 candles per request; cap rps to avoid 429s
+# Coinbase returns max 300 candles per request
 _MAX_CANDLES = 300
-_client: RESTClient | None = None
-
-
-class _TokenBucket:
-    """Simple token bucket for global rate limiting."""
-
-    def __init__(self, rps: float = 4.0, burst: float = 4.0):  # Reduced from 8 to avoid 429s
-        self.capacity = burst
-        self.tokens = burst
-        self.rps = rps
-        self.last_refill = time.time()
-
-    def acquire(self, cost: float = 1.0):
-        now = time.time()
-        elapsed = now - self.last_refill
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rps)
-        self.last_refill = now
-        wait = max(0.0, cost - self.tokens) / self.rps if self.tokens < cost else 0.0
-        if wait > 0:
-            time.sleep(wait)
-            self.tokens = max(0.0, self.tokens - cost + wait * self.rps)
-        else:
-            self.tokens -= cost
-
-
-_bucket = _TokenBucket()
 
 _granularity_map = {
     60: "ONE_MINUTE",
@@ -52,13 +27,6 @@ _granularity_map = {
 }
 
 
-def _get_client() -> RESTClient:
-    global _client
-    if _client is None:
-        _client = RESTClient()  # Public data; no auth required
-    return _client
-
-
 def fetch_history_windowed(
     symbol: str,
     granularity_s: int = 60,
@@ -67,7 +35,7 @@ def fetch_history_windowed(
 ) -> List[Candle]:
     """
     Fetch candles using Coinbase public endpoint, windowed to respect 300-bar limit.
-    Returns oldest→newest candles.
+    Returns oldest→newest candles. Priority comes from ``request_priority()``.
     """
     granularity = _granularity_map.get(granularity_s, "ONE_MINUTE")
     total_seconds = max(lookback_minutes, 1) * 60
@@ -83,12 +51,17 @@ def fetch_history_windowed(
         # Coinbase expects start/end as unix seconds strings
         for attempt in range(max_retries):
             try:
-                _bucket.acquire()
-                resp = _get_client().get_public_candles(
-                    product_id=symbol,
-                    start=str(cursor),
-                    end=str(chunk_end),
-                    granularity=granularity,
+                resp = rest_scheduler.call(
+                    partial(
+                        rest_pool.public.call,  # Public data; no auth required
+                        "get_public_candles",
+                        product_id=symbol,
+                        start=str(cursor),
+                        end=str(chunk_end),
+                        granularity=granularity,
+                    ),
+                    symbol=symbol,
+                    key=("public_candles", symbol, granularity_s, end_ts - cursor, chunk_end - cursor),
                 )
                 raw = getattr(resp, "candles", None) or []
                 for c in raw:
@@ -109,10 +82,10 @@ def fetch_history_windowed(
                         continue
                 break  # chunk succeeded
             except Exception as e:
-                is_rate = "429" in str(e) or "Too Many Requests" in str(e)
                 if attempt < max_retries - 1:
-                    backoff = 0.5 if not is_rate else min(30, 2 ** attempt)
-                    time.sleep(backoff)
+                    # 429s wait out the scheduler's backoff on the next call
+                    if not is_rate_limit_error(e):
+                        time.sleep(0.5)
                     continue
                 logger.warning("[CB-FETCH] %s %ss chunk failed: %s", symbol, granularity_s, e)
         cursor = chunk_end
@@ -2,11 +2,16 @@
 
 from datafeeds.collectors.candle_collector import CandleCollector, MockCollector
 from datafeeds.collectors.dynamic_backfill import DynamicBackfill
+from datafeeds.collectors.replay_collector import ReplayCollector
 from datafeeds.collectors.rest_poller import RestPoller
+from datafeeds.collectors.warmup import StartupWarmup, WarmupReport
 
 __all__ = [
     "CandleCollector",
     "MockCollector",
     "DynamicBackfill",
+    "ReplayCollector",
     "RestPoller",
+    "StartupWarmup",
+    "WarmupReport",
 ]
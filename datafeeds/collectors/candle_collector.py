@@ -1,48 +1,95 @@
 """WebSocket candle collector using Coinbase Advanced Trade API."""
 
 import asyncio
-import json
+import time
 from datetime import datetime, timezone
 from typing import Callable, Optional
-import websockets
 
 from core.config import settings
+from core.helpers.clock import utc_now
 from core.logging_utils import get_logger
 from core.models import Candle, CandleBuffer
 from core.logger import log_raw, utc_iso_str
+from core.perf import perf
+from core.tick_capture import tick_capture
+from datafeeds.collectors.tick_aggregator import TickAggregator, parse_exchange_ts
+from datafeeds.collectors.ws_decode import WsDecoder
+from datafeeds.collectors.ws_shard import WsShard
 
 logger = get_logger(__name__)
 
 
 class CandleCollector:
-    """Collects real-time candle data from Coinbase WebSocket."""
+    """
+    Collects real-time candle data from Coinbase WebSocket.
+
+    Symbols are spread over ``num_shards`` connections (:class:`WsShard`),
+    each with its own reconnect loop; a health monitor restarts any shard
+    that goes silent. Symbol changes are sent as incremental
+    subscribe/unsubscribe messages, so rotation never drops the stream for
+    symbols that stay.
+
+    Bars are built by a :class:`TickAggregator` on exchange event time and
+    closed on each minute boundary by a timer task, independent of whether
+    a symbol keeps trading.
+    """
     
     WS_URL = "wss://advanced-trade-ws.coinbase.com"
     
-    # Reconnection settings
+    # Reconnection settings (per shard)
     RECONNECT_BASE_DELAY = 1.0   # Start with 1 second
     RECONNECT_MAX_DELAY = 60.0   # Max 60 seconds
     RECONNECT_MULTIPLIER = 2.0   # Double each time
     MAX_RECONNECT_ATTEMPTS = 10  # Give up after 10 consecutive failures
     
-    def __init__(self, symbols: list[str], on_candle: Optional[Callable] = None):
+    # Shard health: heartbeats arrive every second, so silence means a dead link
+    HEALTH_CHECK_INTERVAL = 5.0
+    SHARD_STALE_AFTER = 20.0
+    RECEIVING_MAX_AGE = 30.0     # is_receiving threshold (seconds)
+    
+    def __init__(
+        self,
+        symbols: list[str],
+        on_candle: Optional[Callable] = None,
+        num_shards: Optional[int] = None,
+        url: Optional[str] = None,
+    ):
         self.symbols = list(symbols)
         self.on_candle = on_candle
         self.buffers: dict[str, CandleBuffer] = {
             sym: CandleBuffer(symbol=sym) for sym in symbols
         }
         self._running = False
-        self._connected = False
-        self._ws = None
         self._last_trades: dict[str, list] = {sym: [] for sym in symbols}
-        self._current_minute: dict[str, Optional[Candle]] = {sym: None for sym in symbols}
-        self._last_message_time: Optional[datetime] = None
+        self.aggregator = TickAggregator(interval=60)
+        for sym in symbols:
+            self.aggregator.add_symbol(sym)
+        self._exchange_lag = 0.0  # Smoothed receive time minus exchange time (s)
+        self._close_task: Optional[asyncio.Task] = None
+        self._decoder = WsDecoder(symbols, parser=settings.ws_json_parser)
+        self._last_message_ts: Optional[float] = None  # Epoch seconds
+        self._monitor_task: Optional[asyncio.Task] = None
         
-        # Reconnection state
-        self._reconnect_attempts = 0
-        self._reconnect_delay = self.RECONNECT_BASE_DELAY
-        self._last_connect_time: Optional[datetime] = None
-        self._total_reconnects = 0
+        # Connection shards; a symbol stays on the shard it was assigned to
+        self.url = url or self.WS_URL
+        self._shards = [
+            WsShard(
+                i, self.url, self._on_message, self._build_ws_message,
+                base_delay=self.RECONNECT_BASE_DELAY,
+                max_delay=self.RECONNECT_MAX_DELAY,
+                multiplier=self.RECONNECT_MULTIPLIER,
+                max_attempts=self.MAX_RECONNECT_ATTEMPTS,
+            )
+            for i in range(max(1, num_shards or settings.ws_shards))
+        ]
+        for shard in self._shards:
+            shard.on_connect = self._on_shard_connect
+            shard.on_disconnect = self._on_shard_disconnect
+        self._shard_of: dict[str, WsShard] = {}
+        for sym in self.symbols:
+            shard = self._pick_shard()
+            shard.symbols.add(sym)
+            self._shard_of[sym] = shard
         
         # Callbacks
         self.on_connect: Optional[Callable] = None  # Called when WS connects
@@ -53,11 +100,11 @@ class CandleCollector:
         """Get fresh JWT from settings (regenerated each call)."""
         return settings.get_ws_jwt()
     
-    def _get_subscribe_message(self, channel: str) -> dict:
-        """Build subscription message."""
+    def _build_ws_message(self, kind: str, channel: str, product_ids: list[str]) -> dict:
+        """Build a subscribe/unsubscribe message."""
         msg = {
-            "type": "subscribe",
-            "product_ids": self.symbols,
+            "type": kind,
+            "product_ids": product_ids,
             "channel": channel,
         }
         
@@ -69,293 +116,231 @@ class CandleCollector:
         
         return msg
     
+    def _exchange_time(self, value) -> float:
+        """Exchange event time in epoch seconds (receive time if missing)."""
+        received = self._last_message_ts
+        ts = parse_exchange_ts(value)
+        if ts is None:
+            return received
+        lag = min(max(received - ts, 0.0), 30.0)
+        self._exchange_lag += 0.05 * (lag - self._exchange_lag)
+        perf.record("ws.exchange_lag", lag)
+        return ts
+
+    def _emit(self, closed: list[tuple[str, Candle]]):
+        """Push closed bars into their buffers and notify listeners."""
+        for symbol, candle in closed:
+            buffer = self.buffers.get(symbol)
+            if buffer is None:
+                continue
+            buffer.add_1m(candle)
+            if self.on_candle:
+                with perf.span("ws.on_candle", symbol):
+                    self.on_candle(symbol, candle)
+
+    async def _close_bars(self):
+        """Timer: close every symbol's bar on each minute boundary."""
+        aggregator = self.aggregator
+        while self._running:
+            now = utc_now().timestamp() - self._exchange_lag
+            await asyncio.sleep(aggregator.interval - now % aggregator.interval + aggregator.grace)
+            try:
+                # Only carry bars forward on live shards; outages stay gaps
+                closed = aggregator.advance(utc_now().timestamp() - self._exchange_lag, fill=self._live_symbols())
+                self._emit(closed)
+            except Exception as e:
+                logger.exception("[WS] Bar close failed: %s", e)
+
+    async def _on_message(self, message: str | bytes):
+        """Decode one WS frame and route it (timed as ``ws.message``)."""
+        with perf.span("ws.message"):
+            await self._route_message(message)
+
+    async def _route_message(self, message: str | bytes):
+        """Decode one WS frame and route it by channel."""
+        data = self._decoder.decode(message)
+        if data is None:
+            return
+        channel = data.get("channel")
+        if channel == "ticker":
+            await self._handle_ticker(data)
+        elif channel == "market_trades":
+            await self._handle_trades(data)
+        elif channel == "heartbeats":
+            # Heartbeat keeps connection alive and confirms health
+            self._last_message_ts = time.time()
+            log_raw({
+                "ts": utc_iso_str(),
+                "type": "heartbeat",
+                "src": "ws:heartbeats"
+            })
+        elif data.get("type") == "error":
+            # Handle error messages from Coinbase
+            logger.error("[WS] ERROR: %s", data.get("message", data))
+
     async def _handle_ticker(self, data: dict):
         """Handle ticker updates and build candles."""
-        self._last_message_time = datetime.now(timezone.utc)
+        self._last_message_ts = time.time()
+        event_ts = self._exchange_time(data.get("timestamp"))
+        binary_capture = settings.raw_capture_format == "binary"
         
-        events = data.get("events", [])
-        for event in events:
-            tickers = event.get("tickers", [])
-            for ticker in tickers:
-                symbol = ticker.get("product_id")
-                if symbol not in self.symbols:
-                    continue
-                
-                try:
-                    price = float(ticker.get("price", 0))
-                    bid = ticker.get("best_bid")
-                    ask = ticker.get("best_ask")
-                    
-                    if price <= 0:
-                        continue
-                    
-                    # Log raw tick
-                    tick_record = {
-                        "ts": utc_iso_str(),
-                        "type": "tick",
-                        "symbol": symbol,
-                        "price": price,
-                        "src": "ws:ticker"
-                    }
-                    if bid:
-                        tick_record["bid"] = float(bid)
-                    if ask:
-                        tick_record["ask"] = float(ask)
-                    if bid and ask:
-                        mid = (float(bid) + float(ask)) / 2
-                        if mid > 0:
-                            tick_record["spread_bps"] = round((float(ask) - float(bid)) / mid * 10000, 2)
-                    log_raw(tick_record)
-                    
-                    # Compute spread_bps for callback
-                    spread_bps = None
-                    if bid and ask:
-                        mid = (float(bid) + float(ask)) / 2
-                        if mid > 0:
-                            spread_bps = round((float(ask) - float(bid)) / mid * 10000, 2)
+        for symbol, price, bid, ask, spread_bps in self._decoder.tickers(data):
+            # Capture raw tick
+            if binary_capture:
+                tick_capture.write_tick(symbol, price, bid, ask)
+            else:
+                tick_record = {
+                    "ts": utc_iso_str(),
+                    "type": "tick",
+                    "symbol": symbol,
+                    "price": price,
+                    "src": "ws:ticker"
+                }
+                if bid is not None:
+                    tick_record["bid"] = bid
+                if ask is not None:
+                    tick_record["ask"] = ask
+                if spread_bps is not None:
+                    tick_record["spread_bps"] = spread_bps
+                log_raw(tick_record)
 
-                    # Call tick callback for real-time updates (with spread)
-                    if self.on_tick:
-                        self.on_tick(symbol, price, spread_bps=spread_bps if spread_bps is not None else 0.0)
-                    
-                    now = datetime.now(timezone.utc)
-                    minute_key = now.replace(second=0, microsecond=0)
-                    
-                    current = self._current_minute.get(symbol)
-                    
-                    if current is None or current.timestamp != minute_key:
-                        # Close previous candle
-                        if current is not None:
-                            self.buffers[symbol].add_1m(current)
-                            if self.on_candle:
-                                self.on_candle(symbol, current)
-                        
-                        # Start new candle
-                        self._current_minute[symbol] = Candle(
-                            timestamp=minute_key,
-                            open=price,
-                            high=price,
-                            low=price,
-                            close=price,
-                            volume=0.0  # Estimated from trades
-                        )
-                    else:
-                        # Update current candle
-                        current.high = max(current.high, price)
-                        current.low = min(current.low, price)
-                        current.close = price
-                        
-                except (ValueError, TypeError):
-                    continue
+            # Call tick callback for real-time updates (with spread)
+            if self.on_tick:
+                self.on_tick(symbol, price, spread_bps=spread_bps if spread_bps is not None else 0.0)
+            
+            self._emit(self.aggregator.on_tick(symbol, price, event_ts))
     
     async def _handle_trades(self, data: dict):
         """Handle trade updates for volume."""
-        self._last_message_time = datetime.now(timezone.utc)
+        self._last_message_ts = time.time()
+        message_ts = data.get("timestamp")
+        binary_capture = settings.raw_capture_format == "binary"
         
-        events = data.get("events", [])
-        for event in events:
-            trades = event.get("trades", [])
-            for trade in trades:
-                symbol = trade.get("product_id")
-                if symbol not in self.symbols:
-                    continue
-                
-                try:
-                    price = float(trade.get("price", 0))
-                    size = float(trade.get("size", 0))
-                    side = trade.get("side", "")
-                    
-                    # Log raw trade
-                    trade_record = {
-                        "ts": utc_iso_str(),
-                        "type": "trade",
-                        "symbol": symbol,
-                        "price": price,
-                        "size": size,
-                        "src": "ws:market_trades"
-                    }
-                    if side:
-                        trade_record["side"] = side
-                    log_raw(trade_record)
-                    
-                    current = self._current_minute.get(symbol)
-                    if current is not None:
-                        current.volume += size
-                        current.high = max(current.high, price)
-                        current.low = min(current.low, price)
-                        current.close = price
-                except (ValueError, TypeError):
-                    continue
+        for symbol, price, size, side, trade_time in self._decoder.trades(data):
+            # Capture raw trade
+            if binary_capture:
+                tick_capture.write_trade(symbol, price, size, side)
+            else:
+                trade_record = {
+                    "ts": utc_iso_str(),
+                    "type": "trade",
+                    "symbol": symbol,
+                    "price": price,
+                    "size": size,
+                    "src": "ws:market_trades"
+                }
+                if side:
+                    trade_record["side"] = side
+                log_raw(trade_record)
+            
+            # Volume goes to the bar of the trade's own execution time
+            trade_ts = self._exchange_time(trade_time or message_ts)
+            self._emit(self.aggregator.on_trade(symbol, price, size, trade_ts))
     
+    def _pick_shard(self, pending: Optional[dict] = None) -> WsShard:
+        """Least-loaded shard for a new symbol."""
+        pending = pending or {}
+        return min(self._shards, key=lambda shard: len(shard.symbols) + len(pending.get(shard, ())))
+
+    def _active_shards(self) -> list[WsShard]:
+        """Shards carrying symbols (the first one if none do)."""
+        return [shard for shard in self._shards if shard.symbols] or self._shards[:1]
+
+    def _on_shard_connect(self, shard: WsShard):
+        if self.on_connect:
+            self.on_connect()
+
+    def _on_shard_disconnect(self, shard: WsShard):
+        if self.on_disconnect:
+            self.on_disconnect()
+
+    def _live_symbols(self) -> set[str]:
+        """Symbols whose shard is connected and receiving."""
+        now = time.time()
+        return {
+            sym
+            for shard in self._shards
+            if shard.connected and shard.age(now) < self.RECEIVING_MAX_AGE
+            for sym in shard.symbols
+        }
+
+    async def _monitor_shards(self):
+        """Health monitor: restart shards that are connected but silent."""
+        while self._running:
+            await asyncio.sleep(self.HEALTH_CHECK_INTERVAL)
+            now = time.time()
+            for shard in self._shards:
+                if shard.connected and shard.age(now) > self.SHARD_STALE_AFTER:
+                    logger.warning("[WS:%d] No data for %.0fs, restarting connection",
+                                   shard.index, shard.age(now))
+                    try:
+                        await shard.restart()
+                    except Exception:
+                        logger.debug("[WS:%d] Restart failed", shard.index, exc_info=True)
+
     @property
     def is_connected(self) -> bool:
-        """Check if WebSocket is connected."""
-        return self._connected
+        """Check if any WebSocket shard is connected."""
+        return any(shard.connected for shard in self._shards)
     
     @property
     def is_receiving(self) -> bool:
-        """Check if actively receiving data."""
-        if not self._connected:
-            return False
-        if self._last_message_time is None:
-            return self._connected  # Just connected, no data yet
-        age = (datetime.now(timezone.utc) - self._last_message_time).total_seconds()
-        return age < 30  # More lenient - 30 seconds
+        """Check if every shard carrying symbols is connected and receiving."""
+        now = time.time()
+        return all(
+            shard.connected and shard.age(now) < self.RECEIVING_MAX_AGE
+            for shard in self._active_shards()
+        )
     
     @property
     def last_message_age(self) -> float:
-        """Get age of last message in seconds."""
-        if self._last_message_time is None:
-            return 0.0 if self._connected else 999.0
-        return (datetime.now(timezone.utc) - self._last_message_time).total_seconds()
+        """Age of the stalest active shard's last message, in seconds."""
+        now = time.time()
+        return max(shard.age(now) for shard in self._active_shards())
 
     @property
     def total_reconnects(self) -> int:
         """Total reconnect attempts during this session."""
-        return getattr(self, "_total_reconnects", 0)
-    
-    async def _listen(self):
-        """Main WebSocket listener loop."""
-        while self._running:
-            try:
-                async with websockets.connect(self.WS_URL) as ws:
-                    self._ws = ws
-                    self._connected = True
-                    self._last_connect_time = datetime.now(timezone.utc)
-                    
-                    # Reset reconnect state on successful connection
-                    if self._reconnect_attempts > 0:
-                        logger.info(
-                            "[WS] ✅ Reconnected after %s attempts",
-                            self._reconnect_attempts,
-                        )
-                    self._reconnect_attempts = 0
-                    self._reconnect_delay = self.RECONNECT_BASE_DELAY
-                    
-                    # Subscribe to heartbeats first (connection health)
-                    heartbeat_sub = self._get_subscribe_message("heartbeats")
-                    await ws.send(json.dumps(heartbeat_sub))
-                    
-                    # Subscribe to ticker channel
-                    ticker_sub = self._get_subscribe_message("ticker")
-                    await ws.send(json.dumps(ticker_sub))
-                    
-                    # Subscribe to market trades for volume
-                    trades_sub = self._get_subscribe_message("market_trades")
-                    await ws.send(json.dumps(trades_sub))
-                    
-                    logger.info(
-                        "[WS] Connected, subscribed to %s symbols (ticker + trades + heartbeats)",
-                        len(self.symbols),
-                    )
-                    
-                    # Notify connection callback
-                    if self.on_connect:
-                        self.on_connect()
-                    
-                    async for message in ws:
-                        try:
-                            data = json.loads(message)
-                            
-                            # Handle error messages from Coinbase
-                            msg_type = data.get("type")
-                            if msg_type == "error":
-                                logger.error("[WS] ERROR: %s", data.get("message", data))
-                                continue
-                            
-                            channel = data.get("channel")
-                            
-                            if channel == "ticker":
-                                await self._handle_ticker(data)
-                            elif channel == "market_trades":
-                                await self._handle_trades(data)
-                            elif channel == "heartbeats":
-                                # Heartbeat keeps connection alive and confirms health
-                                self._last_message_time = datetime.now(timezone.utc)
-                                log_raw({
-                                    "ts": utc_iso_str(),
-                                    "type": "heartbeat",
-                                    "src": "ws:heartbeats"
-                                })
-                                
-                        except json.JSONDecodeError:
-                            continue
-                        except Exception as e:
-                            logger.exception("[WS] Error processing message: %s", e)
-                            
-            except websockets.ConnectionClosed as e:
-                self._connected = False
-                self._reconnect_attempts += 1
-                self._total_reconnects += 1
-                
-                if self.on_disconnect:
-                    self.on_disconnect()
-                
-                if self._reconnect_attempts >= self.MAX_RECONNECT_ATTEMPTS:
-                    logger.error(
-                        "[WS] ❌ Max reconnect attempts (%s) reached, giving up",
-                        self.MAX_RECONNECT_ATTEMPTS,
-                    )
-                    break
-                
-                logger.warning(
-                    "[WS] Connection closed (code: %s), reconnecting in %.1fs... (attempt %s)",
-                    e.code,
-                    self._reconnect_delay,
-                    self._reconnect_attempts,
-                )
-                await asyncio.sleep(self._reconnect_delay)
-                
-                # Exponential backoff
-                self._reconnect_delay = min(
-                    self._reconnect_delay * self.RECONNECT_MULTIPLIER,
-                    self.RECONNECT_MAX_DELAY
-                )
-                
-            except Exception as e:
-                self._connected = False
-                self._reconnect_attempts += 1
-                self._total_reconnects += 1
-                
-                if self.on_disconnect:
-                    self.on_disconnect()
-                
-                if self._reconnect_attempts >= self.MAX_RECONNECT_ATTEMPTS:
-                    logger.error(
-                        "[WS] ❌ Max reconnect attempts (%s) reached, giving up",
-                        self.MAX_RECONNECT_ATTEMPTS,
-                    )
-                    break
-                
-                logger.warning(
-                    "[WS] Error: %s, reconnecting in %.1fs... (attempt %s)",
-                    e,
-                    self._reconnect_delay,
-                    self._reconnect_attempts,
-                    exc_info=True,
-                )
-                await asyncio.sleep(self._reconnect_delay)
-                
-                # Exponential backoff
-                self._reconnect_delay = min(
-                    self._reconnect_delay * self.RECONNECT_MULTIPLIER,
-                    self.RECONNECT_MAX_DELAY
-                )
+        return sum(shard.reconnects for shard in self._shards)
+
+    def shard_status(self) -> list[dict]:
+        """Per-connection health snapshot."""
+        now = time.time()
+        return [
+            {
+                "index": shard.index,
+                "connected": shard.connected,
+                "symbols": len(shard.symbols),
+                "last_message_age": round(shard.age(now), 1),
+                "reconnects": shard.reconnects,
+            }
+            for shard in self._shards
+        ]
     
     async def start(self):
         """Start the collector."""
         self._running = True
-        await self._listen()
+        self._close_task = asyncio.create_task(self._close_bars())
+        self._monitor_task = asyncio.create_task(self._monitor_shards())
+        try:
+            await asyncio.gather(*(shard.run() for shard in self._shards))
+        finally:
+            self._close_task.cancel()
+            self._monitor_task.cancel()
     
     def stop(self):
         """Stop the collector."""
         self._running = False
-        if self._ws:
-            asyncio.create_task(self._ws.close())
+        for task in (self._close_task, self._monitor_task):
+            if task:
+                task.cancel()
+        for shard in self._shards:
+            shard.stop()
     
     async def update_symbols(self, symbols: list[str]):
         """
-        Update the set of streamed symbols. Triggers a reconnect with new subscriptions.
+        Update the set of streamed symbols with incremental subscribe and
+        unsubscribe messages on the owning shards (no reconnect).
         Safe to call while running.
         """
         # Deduplicate and keep order
@@ -370,20 +355,33 @@ class CandleCollector:
             return  # No change
         
         self.symbols = new_symbols
+        self._decoder.set_symbols(new_symbols)
         
         # Ensure buffers/state for any newly added symbols
         for sym in new_symbols:
             if sym not in self.buffers:
                 self.buffers[sym] = CandleBuffer(symbol=sym)
                 self._last_trades[sym] = []
-                self._current_minute[sym] = None
+            self.aggregator.add_symbol(sym)
+        for sym in list(self.buffers):
+            if sym not in seen:
+                self.aggregator.remove_symbol(sym)
         
-        # Trigger reconnect to resubscribe
-        if self._ws:
-            try:
-                await self._ws.close()
-            except Exception:
-                logger.debug("WebSocket close failed during symbol update", exc_info=True)
+        # Unsubscribe first so freed shard capacity goes to the new symbols
+        removed: dict[WsShard, list[str]] = {}
+        for sym in [s for s in self._shard_of if s not in seen]:
+            removed.setdefault(self._shard_of.pop(sym), []).append(sym)
+        for shard, syms in removed.items():
+            await shard.unsubscribe(syms)
+        
+        added: dict[WsShard, list[str]] = {}
+        for sym in new_symbols:
+            if sym not in self._shard_of:
+                shard = self._pick_shard(added)
+                self._shard_of[sym] = shard
+                added.setdefault(shard, []).append(sym)
+        for shard, syms in added.items():
+            await shard.subscribe(syms)
     
     def get_buffer(self, symbol: str) -> Optional[CandleBuffer]:
         """Get candle buffer for a symbol."""
@@ -391,10 +389,10 @@ class CandleCollector:
     
     def get_last_price(self, symbol: str) -> float:
         """Get last price for a symbol (checks current forming candle first)."""
-        # First check current forming candle (most recent data)
-        current = self._current_minute.get(symbol)
-        if current and current.close > 0:
-            return current.close
+        # First check current forming bar (most recent data)
+        price = self.aggregator.last_price(symbol)
+        if price > 0:
+            return price
         # Fall back to completed candles
         buffer = self.buffers.get(symbol)
         if buffer and buffer.last_price > 0:
@@ -6,7 +6,7 @@ Handles automatic backfill when symbols are promoted to Tier 1 (WebSocket).
 - Fetches 60 min 1m + 120 min 5m candles
 - Fetches 1H and 1D candles for higher timeframe context
 - Gates trading eligibility until warm
-- Runs in background with retries
+- Runs in background with retries at BACKFILL REST priority
 """
 
 import asyncio
@@ -17,6 +17,7 @@ from collections import deque
 
 from core.logging_utils import get_logger
 from core.models import Candle, CandleBuffer
+from core.rest_scheduler import Priority, is_rate_limit_error, request_priority
 
 logger = get_logger(__name__)
 
@@ -158,28 +159,27 @@ class DynamicBackfill:
         job.last_attempt = datetime.now(timezone.utc)
         
         try:
-            # Fetch 1m candles (60 min lookback)
-            candles_1m = await asyncio.to_thread(
-                self.fetch_candles, symbol, 60, 60
-            )
-            await asyncio.sleep(0.5)  # Small delay between fetches
-            
-            # Fetch 5m candles (60 min lookback - reduced from 120)
-            candles_5m = await asyncio.to_thread(
-                self.fetch_candles, symbol, 300, 60
-            )
-            
-            # Fetch 1H candles (48 hours lookback) for trend indicators
-            await asyncio.sleep(0.3)
-            candles_1h = await asyncio.to_thread(
-                self.fetch_candles, symbol, 3600, 48  # 1 hour = 3600 seconds
-            )
-            
-            # Fetch 1D candles (30 days lookback) for daily trend
-            await asyncio.sleep(0.3)
-            candles_1d = await asyncio.to_thread(
-                self.fetch_candles, symbol, 86400, 30  # 1 day = 86400 seconds
-            )
+            # Requests are paced by the shared REST scheduler
+            with request_priority(Priority.BACKFILL):
+                # Fetch 1m candles (60 min lookback)
+                candles_1m = await asyncio.to_thread(
+                    self.fetch_candles, symbol, 60, 60
+                )
+                
+                # Fetch 5m candles (60 min lookback - reduced from 120)
+                candles_5m = await asyncio.to_thread(
+                    self.fetch_candles, symbol, 300, 60
+                )
+                
+                # Fetch 1H candles (48 hours lookback) for trend indicators
+                candles_1h = await asyncio.to_thread(
+                    self.fetch_candles, symbol, 3600, 48  # 1 hour = 3600 seconds
+                )
+                
+                # Fetch 1D candles (30 days lookback) for daily trend
+                candles_1d = await asyncio.to_thread(
+                    self.fetch_candles, symbol, 86400, 30  # 1 day = 86400 seconds
+                )
             
             job.candles_1m = len(candles_1m) if candles_1m else 0
             job.candles_5m = len(candles_5m) if candles_5m else 0
@@ -235,10 +235,9 @@ class DynamicBackfill:
             
         except Exception as e:
             job.error = str(e)
-            if "429" in str(e):
-                # Rate limited, put back in queue for later
+            if is_rate_limit_error(e):
+                # Rate limited (the scheduler backs off); retry later
                 job.attempts -= 1  # Don't count rate limit as attempt
-                await asyncio.sleep(5)
             elif job.attempts >= job.max_attempts:
                 job.completed = True
                 self.failed_jobs += 1
@@ -0,0 +1,350 @@
+"""
+Recorded-session market replay.
+
+``ReplayCollector`` is a drop-in for ``CandleCollector`` that feeds a
+recorded session through the same ``on_tick`` / ``on_candle`` callbacks,
+so the whole bot loop can be load-tested and profiled offline.
+
+Sources:
+    logs/<mode>/ticks/ticks_YYYY-MM-DD.bin   binary tick capture; bars are built
+                                            by the live TickAggregator
+    data/candles (or a sub-directory)       1m parquet partitions of the candle store
+
+Time is a :class:`VirtualClock` installed with ``core.helpers.set_clock``:
+at a finite speed (1x, 10x, ...) events are paced against the wall clock,
+at ``max`` the clock jumps from event to event and the replay only yields
+to the event loop between batches.
+"""
+
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from core.candle_store import CandleStore
+from core.helpers.clock import set_clock
+from core.logging_utils import get_logger
+from core.models import Candle, CandleBuffer
+from core.tick_capture import KIND_TRADE, open_capture
+from datafeeds.collectors.tick_aggregator import TickAggregator
+
+logger = get_logger(__name__)
+
+KIND_BAR = -1  # Recorded 1m bar (not a tick capture kind)
+
+# Ticks/trades: (ts, symbol, kind, price, size, bid, ask)
+# Bars:         (ts, symbol, KIND_BAR, candle), ts = bar close
+ReplayEvent = tuple
+
+
+def parse_speed(value: str | float | None) -> float:
+    """Parse a speed multiplier ("1", "10x", "max") into a float (inf = max)."""
+    if value is None:
+        return 1.0
+    if isinstance(value, (int, float)):
+        speed = float(value)
+    else:
+        text = value.strip().lower()
+        if text in ("max", "inf", ""):
+            return math.inf
+        speed = float(text.removesuffix("x"))
+    return math.inf if speed <= 0 else speed
+
+
+class VirtualClock:
+    """
+    Replay time in epoch seconds.
+
+    Paced mode maps wall time onto session time at ``speed``; max mode
+    reports the timestamp of the event being replayed.
+    """
+
+    def __init__(self, start: float, speed: float = 1.0):
+        self.speed = speed
+        self._start = start
+        self._ts = start
+        self._wall0 = time.monotonic()
+
+    @property
+    def paced(self) -> bool:
+        return math.isfinite(self.speed)
+
+    def time(self) -> float:
+        if self.paced:
+            return self._start + (time.monotonic() - self._wall0) * self.speed
+        return self._ts
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    def behind(self, ts: float) -> float:
+        """Seconds of session time the replay is lagging behind schedule."""
+        return max(0.0, self.time() - ts) if self.paced else 0.0
+
+    async def wait_until(self, ts: float):
+        """Sleep until session time ``ts`` (max mode: jump there)."""
+        if not self.paced:
+            self._ts = max(self._ts, ts)
+            return
+        delay = (ts - self.time()) / self.speed
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _capture_events(path: Path, chunk_records: int = 1 << 16) -> tuple[list[str], Iterator[ReplayEvent]]:
+    capture = open_capture(path)
+
+    def events() -> Iterator[ReplayEvent]:
+        for chunk in capture.iter_chunks(chunk_records):
+            chunk = np.sort(chunk, order="ts_ns", kind="stable")
+            names = capture.symbol_of(chunk)
+            columns = (
+                (chunk["ts_ns"] / 1e9).tolist(), names.tolist(), chunk["kind"].tolist(),
+                chunk["price"].tolist(), chunk["size"].tolist(),
+                chunk["bid"].tolist(), chunk["ask"].tolist(),
+            )
+            yield from zip(*columns)
+
+    return list(capture.symbols), events()
+
+
+def _candle_events(
+    root: Path,
+    symbols: Optional[list[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> tuple[list[str], Iterator[ReplayEvent]]:
+    """1m bars from a candle-store root (or one symbol's directory), merged by time."""
+    if (root / "1m").is_dir():
+        store, names = CandleStore(root.parent), [root.name]
+    else:
+        store = CandleStore(root)
+        names = store.list_symbols()
+    if symbols is not None:
+        wanted = set(symbols)
+        names = [s for s in names if s in wanted]
+
+    loaded = {s: store.load_range(s, "1m", start=start, end=end) for s in names}
+    loaded = {s: a for s, a in loaded.items() if len(a)}
+    if not loaded:
+        return [], iter(())
+    ts = np.concatenate([a.ts for a in loaded.values()])
+    sym = np.concatenate([np.full(len(a), s, dtype=object) for s, a in loaded.items()])
+    cols = [np.concatenate([getattr(a, c) for a in loaded.values()]) for c in ("open", "high", "low", "close", "volume")]
+    order = np.argsort(ts, kind="stable")
+
+    def events() -> Iterator[ReplayEvent]:
+        utc = timezone.utc
+        for t, s, o, h, l, c, v in zip(
+            ts[order].tolist(), sym[order].tolist(), *(col[order].tolist() for col in cols)
+        ):
+            # A bar is replayed when it closes
+            yield t + 60, s, KIND_BAR, Candle.trusted(datetime.fromtimestamp(t, utc), o, h, l, c, v)
+
+    return sorted(loaded), events()
+
+
+def open_replay_source(
+    path: str | Path,
+    symbols: Optional[list[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> tuple[list[str], Iterator[ReplayEvent]]:
+    """Return (symbols in the source, time-ordered event iterator)."""
+    path = Path(path)
+    if path.suffix == ".bin":
+        return _capture_events(path)
+    if path.is_dir():
+        return _candle_events(path, symbols, start, end)
+    raise ValueError(f"Unsupported replay source (expected ticks_*.bin or a candle directory): {path}")
+
+
+class ReplayCollector:
+    """Replay a recorded session through the ``CandleCollector`` interface."""
+
+    YIELD_EVERY = 256  # Events between event-loop yields at max speed
+
+    def __init__(
+        self,
+        symbols: list[str],
+        on_candle: Optional[Callable] = None,
+        source: str | Path = "",
+        speed: str | float = 1.0,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        self.symbols = list(symbols)
+        self.on_candle = on_candle
+        self.source = Path(source)
+        self.speed = parse_speed(speed)
+        self.start_time = start
+        self.end_time = end
+        self.buffers: dict[str, CandleBuffer] = {sym: CandleBuffer(symbol=sym) for sym in symbols}
+        self.aggregator = TickAggregator(interval=60)
+        for sym in symbols:
+            self.aggregator.add_symbol(sym)
+        self.clock: Optional[VirtualClock] = None
+        self._subscribed = set(symbols)
+        self._running = False
+        self._last_event_wall: Optional[float] = None
+
+        # Replay statistics
+        self.events_replayed = 0
+        self.bars_emitted = 0
+        self.max_behind = 0.0
+
+        # Callbacks (same as CandleCollector)
+        self.on_connect: Optional[Callable] = None
+        self.on_tick: Optional[Callable] = None
+        self.on_disconnect: Optional[Callable] = None
+
+    @staticmethod
+    def source_symbols(path: str | Path) -> list[str]:
+        """Symbols present in a replay source (without loading it)."""
+        path = Path(path)
+        if path.suffix == ".bin":
+            return list(open_capture(path).symbols)
+        if (path / "1m").is_dir():
+            return [path.name]
+        return CandleStore(path).list_symbols()
+
+    def _emit(self, closed: list[tuple[str, Candle]]):
+        for symbol, candle in closed:
+            buffer = self.buffers.get(symbol)
+            if buffer is None:
+                continue
+            buffer.add_1m(candle)
+            self.bars_emitted += 1
+            if self.on_candle:
+                self.on_candle(symbol, candle)
+
+    def _replay_event(self, event: ReplayEvent):
+        if event[2] == KIND_BAR:
+            # Recorded 1m bar: a final tick at the close, then the bar itself
+            _, symbol, _, candle = event
+            if self.on_tick:
+                self.on_tick(symbol, candle.close, spread_bps=0.0)
+            self._emit([(symbol, candle)])
+            return
+        ts, symbol, kind, price, size, bid, ask = event
+        if kind == KIND_TRADE:
+            self._emit(self.aggregator.on_trade(symbol, price, size, ts))
+            return
+        spread_bps = 0.0
+        if bid == bid and ask == ask and bid > 0 and ask > 0:
+            spread_bps = round((ask - bid) / ((bid + ask) / 2) * 10000, 2)
+        if self.on_tick:
+            self.on_tick(symbol, price, spread_bps=spread_bps)
+        self._emit(self.aggregator.on_tick(symbol, price, ts))
+
+    async def start(self):
+        """Replay the source on the virtual clock until it ends or ``stop()``."""
+        _, events = open_replay_source(self.source, self.symbols, self.start_time, self.end_time)
+        lo = self.start_time.timestamp() if self.start_time else None
+        hi = self.end_time.timestamp() if self.end_time else None
+        self._running = True
+        aggregator = self.aggregator
+        next_close: Optional[float] = None
+        wall0 = time.perf_counter()
+
+        try:
+            for event in events:
+                if not self._running:
+                    break
+                ts, symbol = event[0], event[1]
+                if (lo is not None and ts < lo) or symbol not in self._subscribed:
+                    continue
+                if hi is not None and ts >= hi:
+                    break
+
+                if self.clock is None:
+                    self.clock = VirtualClock(ts, self.speed)
+                    set_clock(self.clock.now)
+                    next_close = ts - ts % aggregator.interval + aggregator.interval + aggregator.grace
+                    logger.info("[REPLAY] %s from %s at %s", self.source,
+                                self.clock.now().isoformat(), "max" if not self.clock.paced else f"{self.speed:g}x")
+                    if self.on_connect:
+                        self.on_connect()
+
+                # Minute-boundary closes for quiet symbols, as the live timer does
+                while ts >= next_close and event[2] != KIND_BAR:
+                    await self.clock.wait_until(next_close)
+                    self._emit(aggregator.advance(next_close))
+                    next_close += aggregator.interval
+                await self.clock.wait_until(ts)
+
+                self._replay_event(event)
+                self.events_replayed += 1
+                self._last_event_wall = time.time()
+                if self.clock.paced:
+                    self.max_behind = max(self.max_behind, self.clock.behind(ts))
+                elif self.events_replayed % self.YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+        finally:
+            self._running = False
+            elapsed = time.perf_counter() - wall0
+            logger.info(
+                "[REPLAY] Done: %d events, %d bars in %.1fs (%.0f events/s, max %.1fs behind)",
+                self.events_replayed, self.bars_emitted, elapsed,
+                self.events_replayed / elapsed if elapsed > 0 else 0.0, self.max_behind,
+            )
+            if self.on_disconnect:
+                self.on_disconnect()
+
+    def stop(self):
+        """Stop replaying and restore the wall clock."""
+        self._running = False
+        if self.clock is not None:
+            set_clock(None)
+            self.clock = None
+
+    async def update_symbols(self, symbols: list[str]):
+        """Change the replayed symbol set (takes effect from the next event)."""
+        new_symbols = list(dict.fromkeys(symbols))
+        if set(new_symbols) == self._subscribed:
+            return
+        for sym in new_symbols:
+            if sym not in self.buffers:
+                self.buffers[sym] = CandleBuffer(symbol=sym)
+            self.aggregator.add_symbol(sym)
+        for sym in self._subscribed.difference(new_symbols):
+            self.aggregator.remove_symbol(sym)
+        self.symbols = new_symbols
+        self._subscribed = set(new_symbols)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._running
+
+    @property
+    def is_receiving(self) -> bool:
+        return self._running and self.events_replayed > 0
+
+    @property
+    def last_message_age(self) -> float:
+        if self._last_event_wall is None:
+            return 0.0 if self._running else 999.0
+        return time.time() - self._last_event_wall
+
+    @property
+    def total_reconnects(self) -> int:
+        return 0
+
+    def get_buffer(self, symbol: str) -> Optional[CandleBuffer]:
+        return self.buffers.get(symbol)
+
+    def get_last_price(self, symbol: str) -> float:
+        price = self.aggregator.last_price(symbol)
+        if price > 0:
+            return price
+        buffer = self.buffers.get(symbol)
+        if buffer and buffer.last_price > 0:
+            return buffer.last_price
+        return 0.0
+
+    def has_any_data(self) -> bool:
+        return any(self.get_last_price(symbol) > 0 for symbol in self.symbols)
@@ -2,103 +2,40 @@
 REST Candle Poller
 
 Handles REST API polling for Tier 2 (fast) and Tier 3 (slow) symbols.
-- Rate limit aware with graceful degradation
+- Paced by the shared REST scheduler (TIER2/TIER3 priority)
 - Async polling with concurrency control
 - Integrates with tier scheduler and candle store
 """
 
 import asyncio
-from datetime import datetime, timezone, timedelta
 from typing import Optional, Callable, List
-from dataclasses import dataclass
-import time
 
 from core.logging_utils import get_logger
 from core.models import Candle, CandleBuffer
 from core.helpers import validate_candles
+from core.rest_scheduler import Priority, RestScheduler, is_rate_limit_error, request_priority, rest_scheduler
 
 logger = get_logger(__name__)
 
 
-@dataclass
-class RateLimitState:
-    """Tracks rate limit status."""
-    tokens: float = 4.0            # Current tokens (reduced to avoid 429s)
-    max_tokens: float = 4.0        # Max tokens (conservative)
-    refill_rate: float = 3.0       # Tokens per second (very conservative)
-    last_refill: float = 0.0       # Timestamp of last refill
-    
-    # Degradation state
-    is_degraded: bool = False
-    degraded_until: Optional[datetime] = None
-    consecutive_429s: int = 0
-    total_429s: int = 0
-    
-    def refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
-        self.tokens = min(self.max_tokens, self.tokens + elapsed * self.refill_rate)
-        self.last_refill = now
-    
-    def try_consume(self, count: int = 1) -> bool:
-        """Try to consume tokens. Returns True if allowed."""
-        self.refill()
-        if self.tokens >= count:
-            self.tokens -= count
-            return True
-        return False
-    
-    def wait_time(self, count: int = 1) -> float:
-        """Time to wait before tokens available."""
-        self.refill()
-        if self.tokens >= count:
-            return 0.0
-        needed = count - self.tokens
-        return needed / self.refill_rate
-    
-    def record_429(self):
-        """Record a 429 rate limit response."""
-        self.consecutive_429s += 1
-        self.total_429s += 1
-        self.is_degraded = True
-        # Back off exponentially
-        backoff = min(60, 2 ** self.consecutive_429s)
-        self.degraded_until = datetime.now(timezone.utc) + timedelta(seconds=backoff)
-        self.tokens = 0  # Empty the bucket
-        logger.warning("[RATE] 429 received, backing off %ss ( #%s)", backoff, self.consecutive_429s)
-    
-    def record_success(self):
-        """Record successful request."""
-        self.consecutive_429s = 0
-        if self.is_degraded and self.degraded_until:
-            if datetime.now(timezone.utc) >= self.degraded_until:
-                self.is_degraded = False
-                self.degraded_until = None
-    
-    def should_skip_tier3(self) -> bool:
-        """In degraded mode, skip Tier 3 polling."""
-        return self.is_degraded and self.consecutive_429s >= 2
-
-
 class RestPoller:
     """
     Polls REST API for Tier 2 and Tier 3 symbols.
     
     Features:
-    - Concurrent but rate-limited requests
-    - Graceful degradation on rate limits
-    - Tier 3 slows first, then Tier 2
+    - Concurrent requests paced by the shared REST scheduler
+    - Tier 2 outranks Tier 3 for tokens; Tier 3 is skipped while backing off
     """
     
     def __init__(
         self,
         fetch_candles_func: Callable,  # (symbol, granularity_s, lookback_min) -> List[Candle]
         fetch_spread_func: Optional[Callable] = None,  # (symbol) -> float
+        scheduler: Optional[RestScheduler] = None,
     ):
         self.fetch_candles = fetch_candles_func
         self.fetch_spread = fetch_spread_func
-        self.rate_limit = RateLimitState()
+        self.scheduler = scheduler or rest_scheduler
         
         self._running = False
         self._tier2_task: Optional[asyncio.Task] = None
@@ -161,8 +98,8 @@ class RestPoller:
                 if not self._running:
                     break
                 
-                # Skip Tier 3 if degraded
-                if self.rate_limit.should_skip_tier3():
+                # Skip Tier 3 while repeated 429s are being backed off
+                if self.scheduler.consecutive_429s >= 2:
                     logger.info("[POLLER] Skipping Tier 3 (rate limit degraded)")
                     continue
                 
@@ -180,42 +117,29 @@ class RestPoller:
                 self.errors += 1
     
     async def _poll_batch(self, symbols: List[str], tier_scheduler, is_tier2: bool):
-        """Poll a batch of symbols with rate limiting."""
-        batch_size = 3 if is_tier2 else 2  # Smaller batches to avoid rate limits
+        """Poll a batch of symbols; the scheduler paces the individual requests."""
+        batch_size = 3 if is_tier2 else 2  # Small batches keep tiers interleaved
+        priority = Priority.TIER2 if is_tier2 else Priority.TIER3
         
         for i in range(0, len(symbols), batch_size):
             batch = symbols[i:i + batch_size]
             
-            # Wait for rate limit tokens
-            wait_time = self.rate_limit.wait_time(len(batch))
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            
-            if not self.rate_limit.try_consume(len(batch)):
-                # Still no tokens, skip this batch
-                continue
-            
             # Poll batch concurrently
-            tasks = [self._poll_symbol(sym, tier_scheduler) for sym in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            with request_priority(priority):
+                tasks = [self._poll_symbol(sym, tier_scheduler) for sym in batch]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Count successes and failures
             for result in results:
                 if isinstance(result, Exception):
                     self.errors += 1
-                    if "429" in str(result):
+                    if is_rate_limit_error(result):
                         self.total_429s += 1
-                        self.rate_limit.record_429()
+                elif is_tier2:
+                    self.polls_tier2 += 1
                 else:
-                    self.rate_limit.record_success()
-                    if is_tier2:
-                        self.polls_tier2 += 1
-                    else:
-                        self.polls_tier3 += 1
+                    self.polls_tier3 += 1
                 self.total_requests += 1
-            
-            # Small delay between batches
-            await asyncio.sleep(0.5)
     
     async def _poll_symbol(self, symbol: str, tier_scheduler):
         """Poll a single symbol for candles."""
@@ -256,14 +180,9 @@ class RestPoller:
     
     async def poll_single(self, symbol: str, tier_scheduler) -> bool:
         """Poll a single symbol on-demand (for backfill etc)."""
-        if not self.rate_limit.try_consume(1):
-            wait = self.rate_limit.wait_time(1)
-            await asyncio.sleep(wait)
-            if not self.rate_limit.try_consume(1):
-                return False
-        
         try:
-            await self._poll_symbol(symbol, tier_scheduler)
+            with request_priority(Priority.TIER2):
+                await self._poll_symbol(symbol, tier_scheduler)
             return True
         except Exception as e:
             logger.warning("[POLLER] Single poll error %s: %s", symbol, e, exc_info=True)
@@ -277,7 +196,7 @@ class RestPoller:
             "errors": self.errors,
             "requests": self.total_requests,
             "total_429s": self.total_429s,
-            "rate_tokens": self.rate_limit.tokens,
-            "is_degraded": self.rate_limit.is_degraded,
-            "consecutive_429s": self.rate_limit.consecutive_429s,
+            "rate_tokens": self.scheduler.tokens,
+            "is_degraded": self.scheduler.is_degraded,
+            "consecutive_429s": self.scheduler.consecutive_429s,
         }
@@ -0,0 +1,206 @@
+"""
+Tick-to-bar aggregation keyed on exchange event time.
+
+Ticks and trades are bucketed by the exchange timestamp carried in the WS
+message, not by the local receive time. Open bars sit in a timer wheel
+(slot = bar start) that is advanced on every minute boundary, so each
+symbol's bar closes on time even when the symbol stops trading; symbols
+that saw no ticks get a zero-volume bar carried forward from the last
+close. Per-symbol state is a small slotted record; ``Candle`` objects are
+only built for closed bars.
+"""
+
+from datetime import datetime, timezone
+from typing import Collection, Optional
+
+from core.logging_utils import get_logger
+from core.models import Candle
+
+logger = get_logger(__name__)
+
+_minute_cache: dict[str, float] = {}
+
+
+def parse_exchange_ts(value) -> Optional[float]:
+    """
+    Parse an exchange ISO-8601 UTC timestamp to epoch seconds.
+
+    Handles nanosecond fractions (``2024-01-01T00:00:05.123456789Z``) which
+    ``datetime.fromisoformat`` rejects. The minute prefix is cached, so the
+    per-message cost is a dict lookup and one float parse.
+    """
+    if not value or not isinstance(value, str) or len(value) < 19:
+        return None
+    prefix = value[:16]
+    base = _minute_cache.get(prefix)
+    try:
+        if base is None:
+            base = datetime.strptime(prefix, "%Y-%m-%dT%H:%M").replace(tzinfo=timezone.utc).timestamp()
+            if len(_minute_cache) > 4096:
+                _minute_cache.clear()
+            _minute_cache[prefix] = base
+        end = 19
+        if len(value) > 19 and value[19] == ".":
+            end = 20
+            while end < len(value) and value[end].isdigit():
+                end += 1
+        return base + float(value[17:end])
+    except ValueError:
+        return None
+
+
+class _BarState:
+    """Open bar plus carry-forward state for one symbol."""
+
+    __slots__ = ("start", "open", "high", "low", "close", "volume", "last_close", "emitted")
+
+    def __init__(self):
+        self.start = -1          # Open bar start (epoch s), -1 when no bar is open
+        self.open = self.high = self.low = self.close = 0.0
+        self.volume = 0.0
+        self.last_close = 0.0    # Close of the last closed bar (carry-forward price)
+        self.emitted = -1        # Start of the last emitted bar
+
+
+class TickAggregator:
+    """
+    Build fixed-interval OHLCV bars per symbol from ticks and trades.
+
+    ``on_tick``/``on_trade`` update the open bar and return any bars closed
+    because the event belongs to a later bucket. ``advance(now)`` closes
+    every bar that ended at least ``grace`` seconds before ``now`` and fills
+    silent symbols with zero-volume bars. Closed bars are returned as
+    ``(symbol, Candle)`` in time order per symbol.
+    """
+
+    def __init__(self, interval: int = 60, grace: float = 2.0, max_carry: int = 60):
+        self.interval = interval
+        self.grace = grace              # Lateness allowed for exchange events
+        self.max_carry = max_carry      # Longest zero-volume run filled at once
+        self._states: dict[str, _BarState] = {}
+        self._wheel: dict[int, set[str]] = {}  # Bar start -> symbols with that bar open
+        self._watermark = -1            # Every bar starting before this is closed
+        self.late_events = 0
+
+    # ------------------------------------------------------------- symbols
+
+    def add_symbol(self, symbol: str):
+        if symbol not in self._states:
+            self._states[symbol] = _BarState()
+
+    def remove_symbol(self, symbol: str):
+        state = self._states.pop(symbol, None)
+        if state is not None and state.start >= 0:
+            slot = self._wheel.get(state.start)
+            if slot is not None:
+                slot.discard(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._states
+
+    def last_price(self, symbol: str) -> float:
+        """Latest traded price (open bar close, else the last closed bar)."""
+        state = self._states.get(symbol)
+        if state is None:
+            return 0.0
+        return state.close if state.start >= 0 else state.last_close
+
+    # -------------------------------------------------------------- events
+
+    def on_tick(self, symbol: str, price: float, ts: float) -> list[tuple[str, Candle]]:
+        """Apply a ticker price at exchange time ``ts``."""
+        return self._apply(symbol, price, 0.0, ts)
+
+    def on_trade(self, symbol: str, price: float, size: float, ts: float) -> list[tuple[str, Candle]]:
+        """Apply a trade; its size counts toward the bar containing ``ts``."""
+        return self._apply(symbol, price, size, ts)
+
+    def _apply(self, symbol: str, price: float, size: float, ts: float) -> list[tuple[str, Candle]]:
+        state = self._states.get(symbol)
+        if state is None or price <= 0:
+            return []
+        start = int(ts) - int(ts) % self.interval
+        closed: list[tuple[str, Candle]] = []
+
+        if start != state.start:
+            if start < state.start or start <= state.emitted or start < self._watermark:
+                # Bucket already closed: the bar is final, drop the event
+                self.late_events += 1
+                return closed
+            if state.start >= 0:
+                self._close(symbol, state, closed)
+            self._fill(symbol, state, start, closed)
+            state.start = start
+            state.open = state.high = state.low = state.close = price
+            state.volume = size
+            self._wheel.setdefault(start, set()).add(symbol)
+            return closed
+
+        if price > state.high:
+            state.high = price
+        elif price < state.low:
+            state.low = price
+        state.close = price
+        state.volume += size
+        return closed
+
+    # ---------------------------------------------------------------- wheel
+
+    def advance(self, now: float, fill: bool | Collection[str] = True) -> list[tuple[str, Candle]]:
+        """
+        Close all bars whose interval ended ``grace`` seconds before ``now``.
+
+        With ``fill``, symbols without ticks get zero-volume bars up to the
+        boundary; without it (e.g. while the feed is down) gaps stay gaps.
+        A collection fills only the symbols it contains (the live shards).
+        """
+        boundary = int(now - self.grace)
+        boundary -= boundary % self.interval  # Bars starting before this are complete
+        if boundary <= self._watermark:
+            return []
+        closed: list[tuple[str, Candle]] = []
+        for start in sorted(s for s in self._wheel if s < boundary):
+            for symbol in sorted(self._wheel.pop(start)):
+                state = self._states.get(symbol)
+                if state is not None and state.start == start:
+                    self._close(symbol, state, closed)
+
+        last = boundary - self.interval
+        for symbol, state in self._states.items():
+            if fill is True or (fill is not False and symbol in fill):
+                self._fill(symbol, state, boundary, closed)
+            elif state.emitted < last and state.start < 0:
+                state.emitted = last
+        self._watermark = boundary
+        return closed
+
+    def _close(self, symbol: str, state: _BarState, closed: list):
+        closed.append((symbol, Candle.trusted(
+            datetime.fromtimestamp(state.start, timezone.utc),
+            state.open, state.high, state.low, state.close, state.volume,
+        )))
+        slot = self._wheel.get(state.start)
+        if slot is not None:
+            slot.discard(symbol)
+            if not slot:
+                del self._wheel[state.start]
+        state.last_close = state.close
+        state.emitted = state.start
+        state.start = -1
+
+    def _fill(self, symbol: str, state: _BarState, until: int, closed: list):
+        """Emit zero-volume bars for the silent buckets before ``until``."""
+        if state.emitted < 0 or state.last_close <= 0:
+            return
+        start = state.emitted + self.interval
+        if start >= until:
+            return
+        missing = (until - start) // self.interval
+        if missing > self.max_carry:
+            start = until - self.max_carry * self.interval
+        price = state.last_close
+        for bar_start in range(start, until, self.interval):
+            closed.append((symbol, Candle.trusted(
+                datetime.fromtimestamp(bar_start, timezone.utc), price, price, price, price, 0.0,
+            )))
+        state.emitted = until - self.interval
@@ -0,0 +1,232 @@
+"""
+Startup Warmup
+
+Concurrent replacement for the old sequential startup backfill (5 symbols,
+four REST calls each, one after another):
+
+1. Load cached history for every tier-1 symbol from the CandleStore in one
+   parallel columnar read
+2. Fetch only what the cache is missing per timeframe (nothing, the stale
+   tail, or the full lookback), all symbols concurrently; the shared REST
+   scheduler paces requests and promotes open positions
+3. Seed LiveFeatureEngine as soon as a symbol's 1m/5m data lands, then
+   fill its 1h/1d context
+
+``on_symbol_ready(symbol, buffer)`` fires per symbol after step 3's seeding,
+so warm symbols can trade while the rest are still loading.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.candle_store import CandleStore, candle_store
+from core.logging_utils import get_logger
+from core.models import CandleBuffer
+from core.rest_scheduler import Priority, request_priority
+
+logger = get_logger(__name__)
+
+TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+# History each timeframe should cover after warmup (minutes)
+DEFAULT_LOOKBACK_MINUTES = {"1m": 60, "5m": 60, "1h": 48 * 60, "1d": 30 * 24 * 60}
+
+_EXTEND = {
+    "1m": CandleBuffer.extend_1m,
+    "5m": CandleBuffer.extend_5m,
+    "1h": CandleBuffer.extend_1h,
+    "1d": CandleBuffer.extend_1d,
+}
+
+
+def missing_minutes(timestamps: np.ndarray, tf_seconds: int, lookback_minutes: int, now: float) -> int:
+    """
+    Minutes of history to fetch so ``timestamps`` covers the lookback window.
+
+    0 when the window is covered up to the bar before the one forming now,
+    only the stale tail when the older part is cached, else the full lookback.
+    """
+    if len(timestamps) == 0 or timestamps[0] > now - lookback_minutes * 60 + tf_seconds:
+        return lookback_minutes
+    stale = now - float(timestamps[-1])
+    if stale < 2 * tf_seconds:
+        return 0
+    return min(lookback_minutes, int(np.ceil(stale / 60)))
+
+
+@dataclass
+class WarmupReport:
+    """What one warmup run loaded and how long it took."""
+    symbols: int = 0
+    from_cache: int = 0          # Symbols needing no REST call at all
+    requests: int = 0            # Gap fetches issued
+    skipped: int = 0             # Timeframe fetches the cache made unnecessary
+    errors: int = 0
+    candles_cached: int = 0
+    candles_fetched: int = 0
+    warm: int = 0
+    first_warm_s: Optional[float] = None  # Time to the first warm symbol
+    elapsed_s: float = 0.0
+
+
+class StartupWarmup:
+    """
+    Cache-first, gap-only warmup of many candle buffers at once.
+
+    Without ``fetch_candles_func`` (no REST access) buffers are warmed from
+    the store alone.
+    """
+
+    def __init__(
+        self,
+        fetch_candles_func: Optional[Callable],  # (symbol, granularity_s, lookback_min) -> List[Candle]
+        store: Optional[CandleStore] = None,
+        feature_engine=None,
+        concurrency: int = 8,
+        lookback_minutes: Optional[Dict[str, int]] = None,
+        max_age_hours: int = 4,
+    ):
+        self.fetch_candles = fetch_candles_func
+        self.store = store if store is not None else candle_store
+        self.feature_engine = feature_engine
+        self.concurrency = max(1, concurrency)
+        self.lookback_minutes = {**DEFAULT_LOOKBACK_MINUTES, **(lookback_minutes or {})}
+        self.max_age_hours = max_age_hours
+        # 1h/1d cache reads reach back as far as their lookback (+1 day)
+        self.htf_max_age_hours = max(self.lookback_minutes["1h"], self.lookback_minutes["1d"]) // 60 + 24
+
+        # Callback
+        self.on_symbol_ready: Optional[Callable] = None  # (symbol, buffer)
+
+    async def run(self, symbols: List[str], get_buffer: Callable) -> WarmupReport:
+        """Warm ``symbols`` (position symbols first) and return a report."""
+        began = time.monotonic()
+        report = WarmupReport()
+        buffers = {}
+        for symbol in dict.fromkeys(symbols):
+            buffer = get_buffer(symbol)
+            if buffer is not None:
+                buffers[symbol] = buffer
+        report.symbols = len(buffers)
+        if not buffers:
+            return report
+
+        await self._load_cached(buffers, report)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with request_priority(Priority.TIER2):
+            await asyncio.gather(*(
+                self._warm_symbol(symbol, buffer, semaphore, report, began)
+                for symbol, buffer in buffers.items()
+            ))
+
+        report.elapsed_s = time.monotonic() - began
+        logger.info(
+            "[WARMUP] %d/%d symbols warm in %.1fs (first after %s): %d cached + %d fetched candles, "
+            "%d requests, %d skipped, %d errors",
+            report.warm,
+            report.symbols,
+            report.elapsed_s,
+            f"{report.first_warm_s:.1f}s" if report.first_warm_s is not None else "n/a",
+            report.candles_cached,
+            report.candles_fetched,
+            report.requests,
+            report.skipped,
+            report.errors,
+        )
+        return report
+
+    async def _load_cached(self, buffers: Dict[str, CandleBuffer], report: WarmupReport):
+        """Bulk-load stored history for all symbols (recent and higher TF reads overlap)."""
+        symbols = list(buffers)
+        try:
+            loads = await asyncio.gather(
+                asyncio.to_thread(self.store.rehydrate_arrays, symbols, self.max_age_hours, ("1m", "5m")),
+                asyncio.to_thread(self.store.rehydrate_arrays, symbols, self.htf_max_age_hours, ("1h", "1d")),
+            )
+        except Exception:
+            logger.warning("[WARMUP] Cache load failed; fetching full history", exc_info=True)
+            return
+        for stored in loads:
+            for symbol, data in stored.items():
+                buffer = buffers[symbol]
+                # 5m first so the 1m load only aggregates newer buckets
+                for tf in ("5m", "1m", "1h", "1d"):
+                    arrays = data.get(tf)
+                    if arrays is not None and len(arrays):
+                        report.candles_cached += buffer.append_arrays(tf, *arrays.columns())
+
+    async def _warm_symbol(
+        self,
+        symbol: str,
+        buffer: CandleBuffer,
+        semaphore: asyncio.Semaphore,
+        report: WarmupReport,
+        began: float,
+    ):
+        # 1m/5m decide warmth: fill and seed them before the higher timeframes
+        requests = await self._fill(symbol, buffer, ("5m", "1m"), semaphore, report)
+        if self.feature_engine is not None and buffer.candles_1m:
+            self.feature_engine.seed(symbol, list(buffer.candles_1m), buffer.vwap(30))
+        if buffer.is_warm:
+            report.warm += 1
+            if report.first_warm_s is None:
+                report.first_warm_s = time.monotonic() - began
+        if self.on_symbol_ready:
+            self.on_symbol_ready(symbol, buffer)
+
+        requests += await self._fill(symbol, buffer, ("1h", "1d"), semaphore, report)
+        if self.feature_engine is not None and (buffer.candles_1h or buffer.candles_1d):
+            self.feature_engine.update_higher_tf(symbol, list(buffer.candles_1h), list(buffer.candles_1d))
+
+        if not requests:
+            report.from_cache += 1
+
+    async def _fill(
+        self,
+        symbol: str,
+        buffer: CandleBuffer,
+        timeframes: tuple,
+        semaphore: asyncio.Semaphore,
+        report: WarmupReport,
+    ) -> int:
+        """Fetch each timeframe's gap concurrently, merge in order; returns requests issued."""
+        fetched = await asyncio.gather(*(
+            self._fetch_gap(symbol, buffer, tf, semaphore, report) for tf in timeframes
+        ))
+        for tf, candles in zip(timeframes, fetched):
+            if not candles:
+                continue
+            report.candles_fetched += _EXTEND[tf](buffer, candles)
+            self.store.write_candles(symbol, candles, tf, source="warmup")
+        return sum(candles is not None for candles in fetched)
+
+    async def _fetch_gap(
+        self,
+        symbol: str,
+        buffer: CandleBuffer,
+        tf: str,
+        semaphore: asyncio.Semaphore,
+        report: WarmupReport,
+    ) -> Optional[list]:
+        """Candles fetched for the missing span, or None when nothing was requested."""
+        if self.fetch_candles is None:
+            return None
+        tf_seconds = TIMEFRAME_SECONDS[tf]
+        ring = getattr(buffer, f"candles_{tf}")
+        minutes = missing_minutes(ring.timestamps, tf_seconds, self.lookback_minutes[tf], time.time())
+        if not minutes:
+            report.skipped += 1
+            return None
+        async with semaphore:
+            report.requests += 1
+            try:
+                return await asyncio.to_thread(self.fetch_candles, symbol, tf_seconds, minutes) or []
+            except Exception as e:
+                report.errors += 1
+                logger.debug("[WARMUP] %s %s fetch failed: %s", symbol, tf, e)
+                return []
@@ -0,0 +1,115 @@
+"""
+Decoding layer for Coinbase Advanced Trade WS messages.
+
+Parses raw frames with a pluggable JSON parser (orjson when installed,
+stdlib ``json`` otherwise) and flattens ticker / market_trades payloads
+into plain tuples for subscribed symbols only. Symbol filtering is a
+frozenset lookup, every numeric field is converted once, and the spread is
+computed once per ticker.
+
+    TickerUpdate: (symbol, price, bid, ask, spread_bps)
+    TradeUpdate:  (symbol, price, size, side, time)
+
+``bid``/``ask``/``spread_bps`` are None when the ticker omits a side.
+"""
+
+import json
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+TickerUpdate = tuple[str, float, Optional[float], Optional[float], Optional[float]]
+TradeUpdate = tuple[str, float, float, str, Optional[str]]
+
+JSON_PARSERS: dict[str, Callable] = {"json": json.loads}
+if ORJSON_AVAILABLE:
+    JSON_PARSERS["orjson"] = orjson.loads
+
+
+def get_json_parser(name: Optional[str] = "auto") -> Callable:
+    """Resolve a parser name ("auto", "json", "orjson") to a ``loads`` callable."""
+    if name in (None, "auto"):
+        return JSON_PARSERS.get("orjson", json.loads)
+    parser = JSON_PARSERS.get(name)
+    if parser is None:
+        logger.warning("[WS] JSON parser %r unavailable, using stdlib json", name)
+        return json.loads
+    return parser
+
+
+def _opt_float(value) -> Optional[float]:
+    if not value:
+        return None
+    price = float(value)
+    return price if price > 0 else None
+
+
+class WsDecoder:
+    """Decode WS frames and extract updates for the subscribed symbols."""
+
+    __slots__ = ("loads", "_symbols")
+
+    def __init__(self, symbols: Iterable[str] = (), parser: str | Callable | None = "auto"):
+        self.loads = parser if callable(parser) else get_json_parser(parser)
+        self._symbols: frozenset[str] = frozenset()
+        self.set_symbols(symbols)
+
+    def set_symbols(self, symbols: Iterable[str]):
+        """Replace the subscribed symbol index."""
+        self._symbols = frozenset(symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def decode(self, message: str | bytes) -> Optional[dict]:
+        """Parse one frame; None for malformed or non-object payloads."""
+        try:
+            data = self.loads(message)
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+            return None
+        return data if isinstance(data, dict) else None
+
+    def tickers(self, data: dict) -> Iterator[TickerUpdate]:
+        """Ticker updates with a positive price for subscribed symbols."""
+        symbols = self._symbols
+        for event in data.get("events") or ():
+            for ticker in event.get("tickers") or ():
+                symbol = ticker.get("product_id")
+                if symbol not in symbols:
+                    continue
+                try:
+                    price = float(ticker.get("price") or 0)
+                    if price <= 0:
+                        continue
+                    bid = _opt_float(ticker.get("best_bid"))
+                    ask = _opt_float(ticker.get("best_ask"))
+                except (ValueError, TypeError):
+                    continue
+                spread_bps = None
+                if bid is not None and ask is not None:
+                    spread_bps = round((ask - bid) / ((bid + ask) / 2) * 10000, 2)
+                yield symbol, price, bid, ask, spread_bps
+
+    def trades(self, data: dict) -> Iterator[TradeUpdate]:
+        """Market trades for subscribed symbols (``time`` is the exchange ISO string)."""
+        symbols = self._symbols
+        for event in data.get("events") or ():
+            for trade in event.get("trades") or ():
+                symbol = trade.get("product_id")
+                if symbol not in symbols:
+                    continue
+                try:
+                    price = float(trade.get("price") or 0)
+                    size = float(trade.get("size") or 0)
+                except (ValueError, TypeError):
+                    continue
+                yield symbol, price, size, trade.get("side") or "", trade.get("time")
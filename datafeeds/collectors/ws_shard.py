@@ -0,0 +1,167 @@
+"""
+One WebSocket connection carrying a shard of the streamed symbols.
+
+``CandleCollector`` spreads its symbols over several shards. Each shard
+owns its connection, reconnect backoff and liveness timestamp, and changes
+its symbol set with incremental subscribe/unsubscribe messages, so adding
+or dropping a symbol never interrupts the other symbols' streams.
+"""
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+import websockets
+
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# (type, channel, product_ids) -> subscribe/unsubscribe payload
+MessageBuilder = Callable[[str, str, list[str]], dict]
+
+
+class WsShard:
+    """A single WS connection and the symbols subscribed on it."""
+
+    CHANNELS = ("ticker", "market_trades")
+
+    def __init__(
+        self,
+        index: int,
+        url: str,
+        on_message: Callable[[str | bytes], Awaitable[None]],
+        build_message: MessageBuilder,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0,
+        max_attempts: int = 10,
+    ):
+        self.index = index
+        self.url = url
+        self.symbols: set[str] = set()
+        self._on_message = on_message
+        self._build_message = build_message
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._multiplier = multiplier
+        self._max_attempts = max_attempts
+
+        self.connected = False
+        self.last_message_ts: Optional[float] = None  # Epoch seconds
+        self.reconnects = 0
+        self._ws = None
+        self._running = False
+        self._attempts = 0
+        self._delay = base_delay
+
+        self.on_connect: Optional[Callable[["WsShard"], None]] = None
+        self.on_disconnect: Optional[Callable[["WsShard"], None]] = None
+
+    # ---------------------------------------------------------- subscriptions
+
+    async def subscribe(self, symbols: Iterable[str]):
+        """Add symbols; sends a subscribe on the live connection (if any)."""
+        new = sorted(s for s in set(symbols) if s not in self.symbols)
+        self.symbols.update(new)
+        await self._send_channels("subscribe", new)
+
+    async def unsubscribe(self, symbols: Iterable[str]):
+        """Drop symbols; sends an unsubscribe on the live connection (if any)."""
+        gone = sorted(s for s in set(symbols) if s in self.symbols)
+        self.symbols.difference_update(gone)
+        await self._send_channels("unsubscribe", gone)
+
+    async def _send_channels(self, kind: str, product_ids: list[str]):
+        ws = self._ws
+        if ws is None or not product_ids:
+            return  # The (re)connect subscribes the full symbol set
+        try:
+            for channel in self.CHANNELS:
+                await ws.send(json.dumps(self._build_message(kind, channel, product_ids)))
+        except Exception as e:
+            # The reconnect path resubscribes from self.symbols
+            logger.debug("[WS:%d] %s failed: %s", self.index, kind, e)
+
+    # ------------------------------------------------------------ connection
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the last message (999 if never connected)."""
+        if self.last_message_ts is None:
+            return 999.0
+        return (now or time.time()) - self.last_message_ts
+
+    async def restart(self):
+        """Drop the connection; :meth:`run` reconnects and resubscribes."""
+        ws = self._ws
+        if ws is not None:
+            await ws.close()
+
+    def stop(self):
+        self._running = False
+        if self._ws is not None:
+            asyncio.create_task(self._ws.close())
+
+    async def run(self):
+        """Connect, subscribe and pump messages until stopped or out of retries."""
+        self._running = True
+        while self._running:
+            error: Optional[BaseException] = None
+            try:
+                async with websockets.connect(self.url) as ws:
+                    await self._on_open(ws)
+                    async for message in ws:
+                        self.last_message_ts = time.time()
+                        try:
+                            await self._on_message(message)
+                        except Exception as e:
+                            logger.exception("[WS:%d] Error processing message: %s", self.index, e)
+            except Exception as e:
+                error = e
+            finally:
+                was_connected = self.connected
+                self._ws = None
+                self.connected = False
+                if was_connected and self.on_disconnect:
+                    self.on_disconnect(self)
+
+            if not self._running:
+                break
+            if error is None:
+                continue  # Closed cleanly (restart): reconnect right away
+
+            self._attempts += 1
+            self.reconnects += 1
+            if self._attempts >= self._max_attempts:
+                logger.error("[WS:%d] ❌ Max reconnect attempts (%s) reached, giving up",
+                             self.index, self._max_attempts)
+                break
+            if isinstance(error, websockets.ConnectionClosed):
+                logger.warning("[WS:%d] Connection closed (code: %s), reconnecting in %.1fs... (attempt %s)",
+                               self.index, error.code, self._delay, self._attempts)
+            else:
+                logger.warning("[WS:%d] Error: %s, reconnecting in %.1fs... (attempt %s)",
+                               self.index, error, self._delay, self._attempts)
+            await asyncio.sleep(self._delay)
+            # Exponential backoff
+            self._delay = min(self._delay * self._multiplier, self._max_delay)
+
+    async def _on_open(self, ws):
+        if self._attempts > 0:
+            logger.info("[WS:%d] ✅ Reconnected after %s attempts", self.index, self._attempts)
+        self._attempts = 0
+        self._delay = self._base_delay
+
+        symbols = sorted(self.symbols)
+        # Heartbeats first (connection health), then the data channels
+        await ws.send(json.dumps(self._build_message("subscribe", "heartbeats", symbols)))
+        self._ws = ws
+        self.connected = True
+        self.last_message_ts = time.time()
+        # Symbols added while the heartbeat subscribe was in flight are included here
+        await self._send_channels("subscribe", sorted(self.symbols))
+        logger.info("[WS:%d] Connected, subscribed to %s symbols (ticker + trades + heartbeats)",
+                    self.index, len(self.symbols))
+        if self.on_connect:
+            self.on_connect(self)
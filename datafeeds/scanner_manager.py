@@ -264,12 +264,14 @@ class ScannerManager:
         
         return candidates
     
-    def update_predictive_ranker(self, get_buffer_func) -> dict:
+    def update_predictive_ranker(self, get_buffer_func, dirty=None) -> dict:
         """
         Feed all warm symbols to the predictive ranker for MTF analysis.
         
         Args:
             get_buffer_func: Function to get candle buffer for a symbol
+            dirty: Optional DirtyTracker; symbols whose buffer is unchanged
+                since the last update are skipped
             
         Returns:
             Status dict with ranker info
@@ -278,13 +280,17 @@ class ScannerManager:
             from core.candle_store import candle_store
             symbols = candle_store.list_symbols() if hasattr(candle_store, "list_symbols") else []
             
+            buffers = [(symbol, get_buffer_func(symbol)) for symbol in symbols[:50]]  # Limit to top 50 for performance
+            buffers = [(symbol, buffer) for symbol, buffer in buffers if buffer]
+            if dirty is not None:
+                changed = dirty.select("predictive", ((symbol, buffer.seq) for symbol, buffer in buffers))
+                buffers = [(symbol, buffer) for symbol, buffer in buffers if symbol in changed]
+            
             updated = 0
-            for symbol in symbols[:50]:  # Limit to top 50 for performance
-                buffer = get_buffer_func(symbol)
-                if buffer:
-                    mtf = predictive_ranker.update_from_buffer(symbol, buffer)
-                    if mtf:
-                        updated += 1
+            for symbol, buffer in buffers:
+                mtf = predictive_ranker.update_from_buffer(symbol, buffer)
+                if mtf:
+                    updated += 1
             
             # Get actionable plays
             actionable = predictive_ranker.get_actionable_plays()
@@ -7,112 +7,23 @@ Clock C: Background slow context (every 10-60 minutes)
 """
 
 import asyncio
+import bisect
 import time
 from dataclasses import dataclass, field
+from functools import partial
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Callable
+from typing import Iterable, Optional, Callable
 import numpy as np
 
 from core.config import settings
 from core.logging_utils import get_logger
-from core.models import Candle
+from core.models import Candle, CandleBuffer
+from core.rest_pool import rest_pool
+from core.rest_scheduler import Priority, is_rate_limit_error, rest_scheduler
 
 logger = get_logger(__name__)
 
 
-# ============================================================
-# RATE LIMITER - Prevents 429 errors from Coinbase
-# ============================================================
-
-class RateLimiter:
-    """
-    Token bucket rate limiter with exponential backoff.
-    
-    Coinbase limits:
-    - Public endpoints: ~10 requests/second
-    - Private endpoints: ~15 requests/second
-    """
-    
-    def __init__(self, requests_per_second: float = 5.0, burst_size: int = 10):
-        self.rate = requests_per_second
-        self.burst_size = burst_size
-        self.tokens = burst_size
-        self.last_update = time.monotonic()
-        self._lock = None  # Created lazily if needed for async
-        self._sync_lock = False
-        
-        # Backoff tracking per symbol
-        self._backoff: dict[str, float] = {}  # symbol -> next_allowed_time
-        self._failures: dict[str, int] = {}   # symbol -> consecutive failures
-        
-    def _refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.monotonic()
-        elapsed = now - self.last_update
-        self.tokens = min(self.burst_size, self.tokens + elapsed * self.rate)
-        self.last_update = now
-    
-    def acquire_sync(self, symbol: str = "") -> float:
-        """
-        Synchronous acquire - returns wait time in seconds.
-        Returns 0 if can proceed immediately.
-        """
-        self._refill()
-        
-        # Check symbol-specific backoff
-        if symbol and symbol in self._backoff:
-            wait_until = self._backoff[symbol]
-            now = time.monotonic()
-            if now < wait_until:
-                return wait_until - now
-            else:
-                # Backoff expired, clear it
-                del self._backoff[symbol]
-                self._failures.pop(symbol, None)
-        
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return 0.0
-        else:
-            # Need to wait for a token
-            wait_time = (1 - self.tokens) / self.rate
-            return wait_time
-    
-    def wait_sync(self, symbol: str = ""):
-        """Synchronous wait - blocks until request can proceed."""
-        wait_time = self.acquire_sync(symbol)
-        if wait_time > 0:
-            time.sleep(wait_time)
-    
-    def record_success(self, symbol: str):
-        """Record successful request - clear backoff."""
-        self._failures.pop(symbol, None)
-        self._backoff.pop(symbol, None)
-    
-    def record_failure(self, symbol: str, is_rate_limit: bool = False):
-        """Record failed request - apply exponential backoff."""
-        failures = self._failures.get(symbol, 0) + 1
-        self._failures[symbol] = failures
-        
-        if is_rate_limit:
-            # Exponential backoff: 1s, 2s, 4s, 8s, 16s, max 30s
-            backoff_seconds = min(30, 2 ** (failures - 1))
-            self._backoff[symbol] = time.monotonic() + backoff_seconds
-            logger.debug("[RATE] %s backoff %ds after %d failures", symbol, backoff_seconds, failures)
-    
-    def get_stats(self) -> dict:
-        """Get rate limiter stats."""
-        return {
-            "tokens_available": self.tokens,
-            "symbols_in_backoff": len(self._backoff),
-            "total_failures": sum(self._failures.values()),
-        }
-
-
-# Global rate limiter instance - reduced to avoid 429 errors
-_rate_limiter = RateLimiter(requests_per_second=2.0, burst_size=3)
-
-
 @dataclass
 class SymbolInfo:
     """Static/slow info about a symbol."""
@@ -255,6 +166,13 @@ class SymbolScanner:
         self.burst_metrics: dict[str, BurstMetrics] = {}
         self.hot_list = HotList()
         
+        # Ranking maintained incrementally as metrics change: (-burst_score, symbol)
+        # kept sorted, so top-N queries walk the head instead of re-sorting
+        self._ranking: list[tuple[float, str]] = []
+        self._rank_keys: dict[str, tuple[float, str]] = {}
+        # Eligible symbols, rebuilt only when the universe refreshes
+        self._eligible: set[str] = set()
+        
         self._client = None
         self._last_universe_refresh: Optional[datetime] = None
         self._last_burst_update: Optional[datetime] = None
@@ -271,14 +189,13 @@ class SymbolScanner:
             return True
         
         try:
-            from coinbase.rest import RESTClient
             import os
             
             key = os.getenv("COINBASE_API_KEY")
             secret = os.getenv("COINBASE_API_SECRET")
             
             if key and secret:
-                self._client = RESTClient(api_key=key, api_secret=secret)
+                self._client = rest_pool.private_client(key, secret)
                 return True
         except Exception as e:
             logger.warning("[SCANNER] Failed to init client: %s", e, exc_info=True)
@@ -299,7 +216,7 @@ class SymbolScanner:
             logger.info("[SCANNER] Refreshing universe...")
             
             # Get all products
-            products = self._client.get_products()
+            products = await rest_scheduler.run(self._client.get_products, priority=Priority.TIER3)
             
             product_list = []
             if hasattr(products, 'products'):
@@ -398,6 +315,7 @@ class SymbolScanner:
                 )
             
             self._last_universe_refresh = datetime.now()
+            self._rebuild_eligible()
             logger.info("[SCANNER] Universe: %s eligible / %s total", eligible_count, len(self.universe))
             
         except Exception as e:
@@ -406,13 +324,22 @@ class SymbolScanner:
     
     def _use_default_universe(self):
         """Fallback to configured symbols."""
-        for symbol in settings.coins:
+        self.use_static_universe(settings.coins)
+    
+    def use_static_universe(self, symbols: list[str]):
+        """Mark ``symbols`` eligible without asking the exchange (e.g. replays)."""
+        for symbol in symbols:
             self.universe[symbol] = SymbolInfo(
                 symbol=symbol,
                 is_eligible=True,
                 tier="unknown",
                 last_updated=datetime.now()
             )
+        self._rebuild_eligible()
+    
+    def _rebuild_eligible(self):
+        """Recompute the eligible-symbol set (only changes with the universe)."""
+        self._eligible = {s.symbol for s in self.universe.values() if s.is_eligible}
     
     def get_eligible_symbols(self) -> list[str]:
         """Get list of eligible symbols."""
@@ -512,7 +439,7 @@ class SymbolScanner:
         if vwap_distance > 0:
             burst_score *= (1 + min(vwap_distance, 5) / 100)
         
-        self.burst_metrics[symbol] = BurstMetrics(
+        self._set_burst_metrics(BurstMetrics(
             symbol=symbol,
             price=price,
             vol_spike=vol_spike,
@@ -524,7 +451,147 @@ class SymbolScanner:
             vwap_distance=vwap_distance,
             burst_score=burst_score,
             last_updated=datetime.now()
+        ))
+    
+    def update_burst_metrics_many(self, buffers: Iterable[CandleBuffer]):
+        """
+        Clock B: Batched update_burst_metrics for all streamed symbols.
+        
+        Buffers are grouped by window shape (1m depth capped at 60, 5m depth)
+        so each group stacks into 2-D arrays; medians, the regression slope
+        (closed form) and burst_score are then computed per group in one
+        vectorized pass. At steady state every warm symbol lands in a single
+        group, so cost grows with array size rather than Python call count.
+        """
+        groups: dict[tuple[int, int], list[CandleBuffer]] = {}
+        for buffer in buffers:
+            count_1m = len(buffer.candles_1m)
+            # Work with whatever data we have (minimum 3 candles)
+            if count_1m < 3:
+                continue
+            key = (min(count_1m, 60), len(buffer.candles_5m))
+            groups.setdefault(key, []).append(buffer)
+        
+        now = datetime.now()
+        for (depth_1m, depth_5m), group in groups.items():
+            self._update_burst_group(group, depth_1m, depth_5m, now)
+    
+    def _update_burst_group(
+        self,
+        group: list[CandleBuffer],
+        depth_1m: int,
+        depth_5m: int,
+        now: datetime,
+    ):
+        """Vectorized burst metrics for buffers sharing the same window shape."""
+        count = len(group)
+        ones = np.ones(count)
+        zeros = np.zeros(count)
+        
+        closes_1m = np.stack([b.get_closes("1m")[-depth_1m:] for b in group])
+        price = closes_1m[:, -1]
+        
+        # Volume/range spike: last 5m bar vs median of the prior bars
+        if depth_5m >= 2:
+            volumes_5m = np.stack([b.get_volumes("5m") for b in group])
+            ranges_5m = np.stack([b.get_ranges("5m") for b in group])
+            vol_median = np.median(volumes_5m[:, :-1], axis=1)
+            range_median = np.median(ranges_5m[:, :-1], axis=1)
+            vol_spike = np.divide(volumes_5m[:, -1], vol_median, out=ones.copy(), where=vol_median > 0)
+            range_spike = np.divide(ranges_5m[:, -1], range_median, out=ones.copy(), where=range_median > 0)
+        else:
+            vol_spike = range_spike = ones  # Not enough data yet
+        
+        # Trend over up to 15 candles
+        lookback = min(depth_1m - 1, 15)
+        trend_15m = ((price / closes_1m[:, -lookback - 1]) - 1) * 100
+        
+        # Trend slope: least-squares slope in closed form, sum(x_c * y) / sum(x_c^2)
+        if depth_1m >= 10:
+            window = min(depth_1m, 15)
+            x = np.arange(window) - (window - 1) / 2
+            slope = closes_1m[:, -window:] @ x / (x @ x)
+            trend_slope = slope / price * 100  # Normalize as %
+        else:
+            trend_slope = zeros
+        
+        # VWAP distance
+        vwap = np.array([b.vwap(30) for b in group])
+        vwap_distance = np.divide(price, vwap, out=ones.copy(), where=vwap > 0)
+        vwap_distance = (vwap_distance - 1) * 100
+        
+        # Daily abnormality and range vs day (need a full hour of 1m closes)
+        infos = [self.universe.get(b.symbol) for b in group]
+        if depth_1m >= 60:
+            atr_24h = np.array([info.atr_24h if info else 0.0 for info in infos])
+            range_24h = np.array([info.range_24h if info else 0.0 for info in infos])
+            return_1h = np.abs(closes_1m[:, -1] - closes_1m[:, -60])
+            range_1h = closes_1m.max(axis=1) - closes_1m.min(axis=1)
+            daily_move = np.divide(return_1h, atr_24h, out=zeros.copy(), where=atr_24h > 0)
+            range_vs_day = np.divide(range_1h, range_24h, out=zeros.copy(), where=range_24h > 0)
+        else:
+            daily_move = range_vs_day = zeros
+        
+        # Composite burst score, with a bonus for price above VWAP
+        burst_score = vol_spike * range_spike * np.maximum(trend_15m / 100, 0.01)
+        burst_score = np.where(
+            vwap_distance > 0,
+            burst_score * (1 + np.minimum(vwap_distance, 5) / 100),
+            burst_score,
+        )
+        
+        rows = zip(
+            group,
+            price.tolist(),
+            vol_spike.tolist(),
+            range_spike.tolist(),
+            trend_15m.tolist(),
+            trend_slope.tolist(),
+            daily_move.tolist(),
+            range_vs_day.tolist(),
+            vwap_distance.tolist(),
+            burst_score.tolist(),
         )
+        for buffer, p, vs, rs, trend, slope, move, rvd, vd, score in rows:
+            self._set_burst_metrics(BurstMetrics(
+                symbol=buffer.symbol,
+                price=p,
+                vol_spike=vs,
+                range_spike=rs,
+                trend_15m=trend,
+                trend_slope=slope,
+                daily_move=move,
+                range_vs_day=rvd,
+                vwap_distance=vd,
+                burst_score=score,
+                last_updated=now
+            ))
+    
+    def _set_burst_metrics(self, metrics: BurstMetrics):
+        """Store metrics for a symbol and move it to its new rank position."""
+        symbol = metrics.symbol
+        self.burst_metrics[symbol] = metrics
+        
+        key = (-float(metrics.burst_score), symbol)
+        old_key = self._rank_keys.get(symbol)
+        if old_key == key:
+            return
+        if old_key is not None:
+            idx = bisect.bisect_left(self._ranking, old_key)
+            if idx < len(self._ranking) and self._ranking[idx] == old_key:
+                del self._ranking[idx]
+        bisect.insort(self._ranking, key)
+        self._rank_keys[symbol] = key
+    
+    def _iter_ranked(self):
+        """Yield eligible burst metrics from highest to lowest burst score."""
+        eligible = self._eligible
+        metrics = self.burst_metrics
+        for _, symbol in self._ranking:
+            if symbol in eligible:
+                m = metrics.get(symbol)
+                if m is not None:
+                    yield m
     
     def compute_hot_list(self, top_n: int = 10) -> HotList:
         """
@@ -532,24 +599,18 @@ class SymbolScanner:
         Includes BOTH burst activity AND trending coins.
         Call after updating all burst metrics.
         """
-        # Get all metrics, filter for eligible symbols
+        # Walk the maintained ranking (highest burst first) and stop at top_n.
         # RELAXED FILTER: Include burst activity OR trending coins
-        eligible_metrics = [
-            m for m in self.burst_metrics.values()
-            if m.symbol in self.universe 
-            and self.universe[m.symbol].is_eligible
-            and (m.burst_score > 0 or abs(m.trend_15m) > 0.3 or m.vol_spike > 1.2)
-        ]
-        
-        # Sort by burst score descending
-        eligible_metrics.sort(key=lambda x: x.burst_score, reverse=True)
-        
-        # Assign ranks
-        for i, m in enumerate(eligible_metrics):
-            m.rank = i + 1
+        top_metrics = []
+        for m in self._iter_ranked():
+            if len(top_metrics) >= top_n:
+                break
+            if m.burst_score > 0 or abs(m.trend_15m) > 0.3 or m.vol_spike > 1.2:
+                top_metrics.append(m)
+                m.rank = len(top_metrics)
         
         self.hot_list = HotList(
-            symbols=eligible_metrics[:top_n],
+            symbols=top_metrics,
             last_updated=datetime.now()
         )
         
@@ -567,22 +628,15 @@ class SymbolScanner:
         """
         from logic.intelligence import SECTOR_MAP
         
-        eligible = [
-            m for m in self.burst_metrics.values()
-            if m.symbol in self.universe 
-            and self.universe[m.symbol].is_eligible
-        ]
-        
-        # Sort by burst score
-        eligible.sort(key=lambda x: x.burst_score, reverse=True)
-        
         result = []
-        for i, m in enumerate(eligible[:top_k]):
+        for m in self._iter_ranked():
+            if len(result) >= top_k:
+                break
             info = self.universe.get(m.symbol)
             base = m.symbol.split("-")[0]
             result.append({
                 "product_id": m.symbol,
-                "rank": i + 1,
+                "rank": len(result) + 1,
                 "score": round(m.burst_score, 1),
                 "tier": info.tier if info else "unknown",
                 "sector": SECTOR_MAP.get(base, "other")
@@ -611,7 +665,11 @@ class SymbolScanner:
             info = self.universe.get(sym)
             try:
                 # Advanced Trade book endpoint; limit=1 keeps it light
-                book = self._client.get_product_book(product_id=sym, limit=1)
+                book = rest_scheduler.call(
+                    partial(self._client.get_product_book, product_id=sym, limit=1),
+                    symbol=sym,
+                    key=("product_book", sym),
+                )
                 bids = getattr(book, "bids", None) or book.get("bids", [])
                 asks = getattr(book, "asks", None) or book.get("asks", [])
                 best_bid = float(bids[0]["price"]) if bids else 0.0
@@ -636,7 +694,7 @@ class SymbolScanner:
         Fetch historical candles for warmup/backfill.
         Returns a list of Candle objects sorted oldest→newest.
         
-        Includes rate limiting and exponential backoff for 429 errors.
+        Requests go through the shared REST scheduler (priority, 429 backoff).
         """
         # Map seconds to Coinbase granularity strings
         granularity_map = {
@@ -656,18 +714,19 @@ class SymbolScanner:
         
         for attempt in range(max_retries):
             try:
-                # Rate limit before making request
-                _rate_limiter.wait_sync(symbol)
-                
-                # Use public endpoint (works without auth)
-                from coinbase.rest import RESTClient
-                public_client = RESTClient()  # Unauthenticated for public data
-                
-                resp = public_client.get_public_candles(
-                    product_id=symbol,
-                    start=str(int(start.timestamp())),
-                    end=str(int(end.timestamp())),
-                    granularity=granularity
+                # Public endpoint on a pooled keep-alive client; shared REST
+                # budget, identical in-flight fetches share one response
+                resp = rest_scheduler.call(
+                    partial(
+                        rest_pool.public.call,
+                        "get_public_candles",
+                        product_id=symbol,
+                        start=str(int(start.timestamp())),
+                        end=str(int(end.timestamp())),
+                        granularity=granularity,
+                    ),
+                    symbol=symbol,
+                    key=("public_candles", symbol, granularity_s, lookback_minutes * 60, lookback_minutes * 60),
                 )
                 raw = getattr(resp, "candles", None) or []
                 candles: list[Candle] = []
@@ -693,24 +752,15 @@ class SymbolScanner:
                     ))
                 
                 candles.sort(key=lambda x: x.timestamp)
-                
-                # Success - clear any backoff
-                _rate_limiter.record_success(symbol)
                 return candles
                 
             except Exception as e:
-                error_str = str(e)
-                is_rate_limit = "429" in error_str or "Too Many Requests" in error_str
-                
-                # Record failure for backoff
-                _rate_limiter.record_failure(symbol, is_rate_limit=is_rate_limit)
+                is_rate_limit = is_rate_limit_error(e)
                 
                 if is_rate_limit and attempt < max_retries - 1:
-                    # Wait with exponential backoff before retry
-                    backoff = min(30, 2 ** attempt)
-                    logger.debug("[SCANNER] Rate limited on %s, waiting %ds (attempt %d/%d)", 
-                               symbol, backoff, attempt + 1, max_retries)
-                    time.sleep(backoff)
+                    # The scheduler holds the retry until its backoff expires
+                    logger.debug("[SCANNER] Rate limited on %s (attempt %d/%d)", 
+                               symbol, attempt + 1, max_retries)
                     continue
                 elif attempt < max_retries - 1:
                     # Non-rate-limit error, brief pause then retry
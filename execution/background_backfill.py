@@ -12,7 +12,6 @@ Usage:
 """
 
 import asyncio
-import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -20,6 +19,7 @@ from collections import defaultdict
 
 from core.logging_utils import get_logger
 from core.config import settings
+from core.rest_scheduler import Priority, request_priority
 
 logger = get_logger(__name__)
 
@@ -81,9 +81,6 @@ class BackgroundBackfill:
         self.test_results: List[StrategyTestResult] = []
         self.strategy_issues: Dict[str, List[str]] = defaultdict(list)
         
-        # Rate limiting
-        self._last_api_call = 0
-        self._api_delay = 0.3  # 300ms between API calls
         self._running = False
         self._symbols_queue: List[str] = []
         self._current_idx = 0
@@ -93,13 +90,6 @@ class BackgroundBackfill:
         self.total_tests_run = 0
         self.last_run: Optional[datetime] = None
     
-    def _rate_limit(self):
-        """Ensure we don't hit API rate limits."""
-        elapsed = time.time() - self._last_api_call
-        if elapsed < self._api_delay:
-            time.sleep(self._api_delay - elapsed)
-        self._last_api_call = time.time()
-    
     async def run_cycle(self, symbols: List[str], max_symbols: int = 5) -> Dict:
         """
         Run one backfill cycle - processes a few symbols then returns.
@@ -182,12 +172,12 @@ class BackgroundBackfill:
         # Backfill 1h candles (most useful for trend analysis)
         # Go back 7 days if we don't have much history
         try:
-            self._rate_limit()
-            history_1h = self.scanner.fetch_history(
-                symbol, 
-                granularity_s=3600, 
-                lookback_minutes=7*24*60  # 7 days
-            )
+            with request_priority(Priority.BACKFILL):
+                history_1h = self.scanner.fetch_history(
+                    symbol, 
+                    granularity_s=3600, 
+                    lookback_minutes=7*24*60  # 7 days
+                )
             if history_1h:
                 for candle in history_1h:
                     if hasattr(buffer, 'add_1h'):
@@ -201,12 +191,12 @@ class BackgroundBackfill:
         
         # Backfill 1d candles for longer-term context
         try:
-            self._rate_limit()
-            history_1d = self.scanner.fetch_history(
-                symbol,
-                granularity_s=86400,
-                lookback_minutes=30*24*60  # 30 days
-            )
+            with request_priority(Priority.BACKFILL):
+                history_1d = self.scanner.fetch_history(
+                    symbol,
+                    granularity_s=86400,
+                    lookback_minutes=30*24*60  # 30 days
+                )
             if history_1d:
                 for candle in history_1d:
                     if hasattr(buffer, 'add_1d'):
@@ -5,13 +5,12 @@ before any order is placed.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from typing import Optional, Tuple, TYPE_CHECKING
 
 from core.config import settings
 from core.logging_utils import get_logger
 from core.models import Intent, Signal, SignalType
-from core.helpers import is_warm, GateReason
+from core.helpers import is_warm, GateReason, utc_now
 from core.asset_class import get_risk_profile
 from core.config_manager import get_config_manager
 from datafeeds.universe import tier_scheduler
@@ -352,7 +351,7 @@ class EntryGateChecker:
                 "cooldown_seconds": self.cooldown_seconds,
             })
         
-        elapsed = (datetime.now(timezone.utc) - self.order_cooldown[symbol]).total_seconds()
+        elapsed = (utc_now() - self.order_cooldown[symbol]).total_seconds()
         min_cooldown = settings.order_cooldown_min_seconds
         
         if elapsed < min_cooldown:
@@ -107,11 +107,14 @@ class ExchangeSyncer:
             return
         
         try:
-            from coinbase.rest import RESTClient
-            self._client = RESTClient(
+            from core.rest_pool import rest_pool
+            self._client = rest_pool.private_client(
                 api_key=settings.coinbase_api_key,
                 api_secret=settings.coinbase_api_secret
             )
+            if self._client is None:
+                logger.warning("[SYNC] Live client not initialized (missing API keys)")
+                return
             logger.info("[SYNC] Live client initialized")
             self._fetch_portfolio_uuid()
         except Exception as e:
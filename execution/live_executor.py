@@ -84,7 +84,7 @@ class LiveExecutor(IExecutor):
         
         for attempt in range(max_retries):
             try:
-                rate_limiter.wait_if_needed()
+                await rate_limiter.async_wait_if_needed()
                 # Get portfolio UUID from portfolio manager
                 portfolio_uuid = getattr(self.portfolio, '_portfolio_uuid', None)
                 logger.info("[LIVE] Placing order for %s with portfolio_uuid=%s", symbol, portfolio_uuid)
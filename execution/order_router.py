@@ -12,6 +12,7 @@ Refactored from 2,230 lines to ~400 lines.
 """
 
 import asyncio
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -185,78 +186,141 @@ class OrderRouter:
             self._startup_stop_health_check()
         except Exception as e:
             logger.error("[SYNC] Failed to sync positions from exchange: %s", e)
-    
+
+    async def refresh_positions_from_exchange(self):
+        """
+        Periodic exchange reconciliation for the running bot.
+
+        Same steps as _sync_positions_from_exchange, but the REST work runs in
+        worker threads against a copy of the positions. Changes are applied on
+        the event loop, and only to positions the loop has not touched since the
+        copy, so exits/entries never see the dict change mid-iteration. Missing
+        stops are chosen and recorded on the loop; only their placement runs
+        in a thread.
+        """
+        client = self._exchange_sync._client
+        if not client:
+            return
+
+        try:
+            before = dict(self.positions)
+            synced = await asyncio.to_thread(
+                sync_with_exchange, client, dict(before), quiet=False, mode=TradingMode.LIVE
+            )
+            for symbol, pos in before.items():
+                if symbol not in synced and self.positions.get(symbol) is pos:
+                    del self.positions[symbol]
+            for symbol, pos in synced.items():
+                if self.positions.get(symbol) is before.get(symbol):
+                    self.positions[symbol] = pos
+            for symbol, pos in self.positions.items():
+                if not self.position_registry.has_position(symbol):
+                    self.position_registry.add_position(pos)
+            if len(self.positions) != len(before):
+                logger.info("[SYNC] Positions synced from exchange: %d → %d", len(before), len(self.positions))
+            self.persistence.save_positions(self.positions)
+
+            synced_orders = await asyncio.to_thread(order_manager.sync_with_exchange)
+            logger.info("[ORDER] Synced %d orders from exchange", synced_orders)
+            if self.mode == TradingMode.LIVE:
+                # Decide and apply on the loop; only the stop placement runs in a thread
+                missing = self._find_missing_stops()
+                if missing:
+                    placed = await asyncio.to_thread(self._place_stops, missing)
+                    for symbol in self._apply_placed_stops(missing, placed):
+                        if symbol not in self.positions:
+                            await asyncio.to_thread(order_manager.cancel_stop_order, symbol)
+        except Exception as e:
+            logger.error("[SYNC] Failed to sync positions from exchange: %s", e)
+
     def _startup_stop_health_check(self):
         """Verify all live positions have valid stop orders and place missing ones."""
         if self.mode != TradingMode.LIVE:
             return
-        
-        positions_without_stops = []
+        missing = self._find_missing_stops()
+        if missing:
+            self._apply_placed_stops(missing, self._place_stops(missing))
+    
+    def _find_missing_stops(self) -> list:
+        """(symbol, position, qty) for live positions with no stop order (event loop)."""
         positions_checked = 0
-        stops_placed = 0
-        stops_failed = []
-        
+        missing = []
+        no_qty = []
         for symbol, pos in self.positions.items():
             if not pos.stop_price or pos.stop_price <= 0:
                 continue
             positions_checked += 1
             
             # Check if stop order exists
-            if not order_manager.has_stop_order(symbol):
-                positions_without_stops.append(symbol)
+            if order_manager.has_stop_order(symbol):
+                continue
+            
+            # Get available qty from exchange
+            qty = pos.size_qty
+            if self._exchange_sync:
+                detail = self._exchange_sync.holdings_detail.get(symbol, {})
+                available_qty = detail.get('available_qty', 0)
+                if available_qty > 0:
+                    qty = min(qty, available_qty * 0.999)
+            if qty <= 0:
+                no_qty.append(symbol)
+                continue
+            missing.append((symbol, pos, qty))
         
-        if positions_without_stops:
+        if missing or no_qty:
             logger.warning("[STARTUP] %d/%d positions missing stop orders: %s", 
-                          len(positions_without_stops), positions_checked,
-                          ', '.join(positions_without_stops[:5]))
-            
-            # IMMEDIATELY place stops for all missing positions
-            for symbol in positions_without_stops:
-                pos = self.positions.get(symbol)
-                if not pos:
-                    continue
-                
-                # Get available qty from exchange
-                qty = pos.size_qty
-                if self._exchange_sync:
-                    detail = self._exchange_sync.holdings_detail.get(symbol, {})
-                    available_qty = detail.get('available_qty', 0)
-                    if available_qty > 0:
-                        qty = min(qty, available_qty * 0.999)
-                
-                if qty <= 0:
-                    logger.warning("[STARTUP] %s: no available qty for stop", symbol)
-                    stops_failed.append(symbol)
-                    continue
-                
-                # Place stop order
-                placed_id = order_manager.place_stop_order(
-                    symbol=symbol,
-                    qty=qty,
-                    stop_price=pos.stop_price,
-                )
-                
-                if placed_id:
-                    pos.stop_order_id = placed_id
-                    stops_placed += 1
-                    logger.info("[STARTUP] Placed stop for %s @ $%.4f", symbol, pos.stop_price)
-                else:
-                    stops_failed.append(symbol)
-                    logger.warning("[STARTUP] Failed to place stop for %s", symbol)
-                
-                # Brief pause to avoid rate limits
-                import time
-                time.sleep(0.3)
-            
-            # Save positions with new stop_order_ids
-            self.persistence.save_positions(self.positions)
-            
-            if stops_placed > 0:
-                logger.info("[STARTUP] Placed %d/%d missing stops", stops_placed, len(positions_without_stops))
-            if stops_failed:
-                logger.warning("[STARTUP] %d stops failed: %s", len(stops_failed), ', '.join(stops_failed[:5]))
+                          len(missing) + len(no_qty), positions_checked,
+                          ', '.join([m[0] for m in missing][:5] + no_qty[:5]))
+            for symbol in no_qty:
+                logger.warning("[STARTUP] %s: no available qty for stop", symbol)
         else:
             logger.info("[STARTUP] Stop health check OK: %d positions verified", positions_checked)
+        return missing
+    
+    def _place_stops(self, missing: list) -> dict:
+        """Place the stop orders (REST only; safe in a worker thread). Returns {symbol: order_id}."""
+        placed = {}
+        for symbol, pos, qty in missing:
+            placed[symbol] = order_manager.place_stop_order(
+                symbol=symbol,
+                qty=qty,
+                stop_price=pos.stop_price,
+            )
+            # Brief pause to avoid rate limits
+            time.sleep(0.3)
+        return placed
+    
+    def _apply_placed_stops(self, missing: list, placed: dict) -> list:
+        """
+        Record placed stop ids on their positions and save (event loop).
+        
+        Returns symbols whose position closed or changed while the stop was
+        being placed; their new stop orders are orphans.
+        """
+        stops_placed = 0
+        stops_failed = []
+        orphaned = []
+        for symbol, pos, _ in missing:
+            placed_id = placed.get(symbol)
+            if not placed_id:
+                stops_failed.append(symbol)
+                logger.warning("[STARTUP] Failed to place stop for %s", symbol)
+            elif self.positions.get(symbol) is not pos:
+                orphaned.append(symbol)
+                logger.warning("[STARTUP] %s closed while its stop was placed", symbol)
+            else:
+                pos.stop_order_id = placed_id
+                stops_placed += 1
+                logger.info("[STARTUP] Placed stop for %s @ $%.4f", symbol, pos.stop_price)
+        
+        # Save positions with new stop_order_ids
+        self.persistence.save_positions(self.positions)
+        
+        if stops_placed > 0:
+            logger.info("[STARTUP] Placed %d/%d missing stops", stops_placed, len(missing))
+        if stops_failed:
+            logger.warning("[STARTUP] %d stops failed: %s", len(stops_failed), ', '.join(stops_failed[:5]))
+        return orphaned
     
     def _init_submodules(self):
         """Initialize extracted submodules with dependencies."""
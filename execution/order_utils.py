@@ -11,6 +11,7 @@ from enum import Enum
 from functools import wraps
 
 from core.logging_utils import get_logger
+from core.rest_scheduler import Priority, rest_scheduler
 
 logger = get_logger(__name__)
 
@@ -32,47 +33,22 @@ class OrderFatalError(OrderError):
     pass
 
 
-@dataclass
 class RateLimiter:
     """
-    Simple rate limiter for API calls.
-    Coinbase Advanced Trade: 10 requests/second for private endpoints.
+    Order-side view of the shared REST scheduler.
+    Orders draw from the same request budget as market data, ahead of every other class.
     """
-    max_requests: int = 8  # Conservative limit (below 10)
-    window_seconds: float = 1.0
-    _requests: list = None
     
-    def __post_init__(self):
-        self._requests = []
+    def __init__(self, priority: Priority = Priority.ORDER):
+        self.priority = priority
     
     def wait_if_needed(self):
-        """Block if we've exceeded rate limit."""
-        now = time.time()
-        
-        # Remove old requests outside window
-        self._requests = [t for t in self._requests if now - t < self.window_seconds]
-        
-        if len(self._requests) >= self.max_requests:
-            # Wait for oldest request to expire
-            sleep_time = self.window_seconds - (now - self._requests[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            self._requests = self._requests[1:]
-        
-        self._requests.append(now)
+        """Block until the scheduler grants a request token."""
+        rest_scheduler.acquire_blocking(self.priority)
     
     async def async_wait_if_needed(self):
         """Async version of wait_if_needed."""
-        now = time.time()
-        self._requests = [t for t in self._requests if now - t < self.window_seconds]
-        
-        if len(self._requests) >= self.max_requests:
-            sleep_time = self.window_seconds - (now - self._requests[0])
-            if sleep_time > 0:
-                await asyncio.sleep(sleep_time)
-            self._requests = self._requests[1:]
-        
-        self._requests.append(now)
+        await rest_scheduler.acquire(self.priority)
 
 
 # Global rate limiter instance
@@ -115,6 +91,8 @@ def with_retry(
                     # Check if it's a rate limit error
                     error_str = str(e).lower()
                     is_rate_limit = 'rate' in error_str or '429' in error_str
+                    if '429' in error_str:
+                        rest_scheduler.record_429()  # Back off every REST caller
                     is_timeout = 'timeout' in error_str
                     is_temporary = 'temporary' in error_str or '503' in error_str or '502' in error_str
                     
@@ -165,6 +143,8 @@ def with_retry_async(
                     error_str = str(e).lower()
                     
                     is_rate_limit = 'rate' in error_str or '429' in error_str
+                    if '429' in error_str:
+                        rest_scheduler.record_429()  # Back off every REST caller
                     is_timeout = 'timeout' in error_str
                     is_temporary = 'temporary' in error_str or '503' in error_str
                     
@@ -18,14 +18,16 @@ Features are computed incrementally where possible for speed.
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict
-from datetime import datetime, timezone
+from datetime import datetime
+
+from core.helpers.clock import utc_now
 
 
 @dataclass
 class LiveIndicators:
     """Real-time computed indicators for a symbol."""
     symbol: str
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = field(default_factory=utc_now)
     is_ready: bool = False          # True when enough candles for all indicators
     
     # Price action
@@ -127,7 +129,7 @@ class LiveIndicators:
     
     def is_stale(self, max_age_seconds: float = 120) -> bool:
         """Check if indicators are stale (older than max_age_seconds)."""
-        age = (datetime.now(timezone.utc) - self.timestamp).total_seconds()
+        age = (utc_now() - self.timestamp).total_seconds()
         return age > max_age_seconds
 
 
@@ -200,7 +202,7 @@ class LiveMLResult:
     symbol: str
     raw_score: float = 0.0          # -1 to +1
     confidence: float = 0.0         # 0 to 1
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = field(default_factory=utc_now)
     
     @property
     def bullish(self) -> bool:
@@ -212,13 +214,13 @@ class LiveMLResult:
     
     def is_stale(self, max_age_seconds: float = 180) -> bool:
         """Check if ML result is stale (older than max_age_seconds)."""
-        age = (datetime.now(timezone.utc) - self.timestamp).total_seconds()
+        age = (utc_now() - self.timestamp).total_seconds()
         return age > max_age_seconds
     
     @property
     def age_seconds(self) -> float:
         """Get age of this ML result in seconds."""
-        return (datetime.now(timezone.utc) - self.timestamp).total_seconds()
+        return (utc_now() - self.timestamp).total_seconds()
 
 
 class LiveFeatureEngine:
@@ -257,6 +259,33 @@ class LiveFeatureEngine:
             self.state[symbol] = FeatureState(symbol=symbol)
         
         s = self.state[symbol]
+        self._advance(s, candle_1m)
+        
+        # Not ready yet
+        if not s.is_ready:
+            return None
+        
+        return self._snapshot(symbol, s, candle_1m, spread_bps, vwap)
+    
+    def seed(self, symbol: str, candles_1m: List, vwap: float = 0.0) -> Optional[LiveIndicators]:
+        """
+        Warm a symbol from history in one call (startup warmup).
+        Restarts the incremental state (higher-TF data is kept) and builds
+        only one indicator snapshot, for the last candle.
+        """
+        if not candles_1m:
+            return self.latest.get(symbol)
+        prev = self.state.get(symbol)
+        s = self.state[symbol] = FeatureState(symbol=symbol)
+        if prev is not None:
+            s.closes_1h, s.highs_1h, s.lows_1h = prev.closes_1h, prev.highs_1h, prev.lows_1h
+            s.closes_1d, s.highs_1d, s.lows_1d = prev.closes_1d, prev.highs_1d, prev.lows_1d
+        for candle in candles_1m[:-1]:
+            self._advance(s, candle)
+        return self.update(symbol, candles_1m[-1], 0.0, vwap)
+    
+    def _advance(self, s: FeatureState, candle_1m):
+        """Fold one 1m candle into the rolling state."""
         s.candle_count += 1
         
         price = candle_1m.close
@@ -351,10 +380,13 @@ class LiveFeatureEngine:
             if len(s.closes_5m) > 12:
                 s.closes_5m = s.closes_5m[-12:]
             s.candles_since_5m = 0
-        
-        # Not ready yet
-        if not s.is_ready:
-            return None
+    
+    def _snapshot(self, symbol: str, s: FeatureState, candle_1m, spread_bps: float, vwap: float) -> LiveIndicators:
+        """Build (and cache) the indicator snapshot for the latest candle."""
+        price = candle_1m.close
+        high = candle_1m.high
+        low = candle_1m.low
+        volume = candle_1m.volume
         
         # Build indicators snapshot
         ind = LiveIndicators(symbol=symbol, is_ready=True)
@@ -6,7 +6,6 @@ Handles BTC trend tracking, Fear & Greed integration, and trading session detect
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict
-import os
 
 from core.config import settings
 from core.logging_utils import get_logger
@@ -73,12 +72,9 @@ class RegimeDetector:
     def fetch_btc_trend(self) -> bool:
         """Fetch BTC trend from Coinbase."""
         try:
-            from coinbase.rest import RESTClient
+            from core.rest_pool import rest_pool
             
-            client = RESTClient(
-                api_key=os.getenv("COINBASE_API_KEY"),
-                api_secret=os.getenv("COINBASE_API_SECRET")
-            )
+            client = rest_pool.public_client()  # Candles are a public endpoint
             
             end = datetime.now(timezone.utc)
             start = end - timedelta(hours=1)
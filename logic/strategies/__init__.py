@@ -9,6 +9,7 @@ relative_strength, support_bounce, momentum_1h, rsi_momentum, bb_expansion
 """
 
 from .base import BaseStrategy, StrategySignal
+from .features import FeatureSnapshot, get_snapshot
 from .burst_flag import BurstFlagStrategy
 from .vwap_reclaim import VWAPReclaimStrategy
 from .daily_momentum import DailyMomentumStrategy
@@ -23,6 +24,8 @@ from .orchestrator import StrategyOrchestrator
 __all__ = [
     "BaseStrategy",
     "StrategySignal", 
+    "FeatureSnapshot",
+    "get_snapshot",
     "BurstFlagStrategy",
     "VWAPReclaimStrategy",
     "DailyMomentumStrategy",
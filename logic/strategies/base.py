@@ -6,11 +6,13 @@ All strategies inherit from BaseStrategy and produce StrategySignal objects.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime
 import logging
 from typing import Optional, List
 from enum import Enum
 
+from core.helpers.clock import utc_now
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +56,7 @@ class StrategySignal:
     # Context
     reason: str = ""
     reasons: List[str] = field(default_factory=list)
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = field(default_factory=utc_now)
     
     # Impulse/Flag data (for burst_flag strategy)
     impulse_pct: float = 0.0
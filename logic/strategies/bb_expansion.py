@@ -10,8 +10,8 @@ This catches explosive moves like ZEC +23%, TROLL +22%.
 """
 
 from logic.strategies.base import BaseStrategy, StrategySignal, SignalDirection
+from logic.strategies.features import get_snapshot
 from typing import Optional
-import numpy as np
 
 
 class BBExpansionStrategy(BaseStrategy):
@@ -41,17 +41,15 @@ class BBExpansionStrategy(BaseStrategy):
         if price <= 0:
             return None
         
-        # Calculate Bollinger Bands (20, 2)
-        closes = np.array([c.close for c in candles_5m[-40:]])
-        
-        bb_upper, bb_middle, bb_lower, bb_width = self._calculate_bb(closes, period=20, std_dev=2)
+        # Calculate Bollinger Bands (20, 2) from the shared snapshot
+        snap = get_snapshot(buffer, features)
+        bb_upper, bb_middle, bb_lower, bb_width = snap.bollinger(20, 2)
         
         if bb_upper is None:
             return None
         
         # Previous BB width (for expansion detection)
-        closes_prev = closes[:-1]
-        _, _, _, bb_width_prev = self._calculate_bb(closes_prev, period=20, std_dev=2)
+        _, _, _, bb_width_prev = snap.bollinger(20, 2, back=1)
         
         if bb_width_prev is None:
             return None
@@ -135,26 +133,6 @@ class BBExpansionStrategy(BaseStrategy):
             ]
         )
     
-    def _calculate_bb(self, closes: np.ndarray, period: int = 20, std_dev: float = 2.0):
-        """Calculate Bollinger Bands."""
-        if len(closes) < period:
-            return None, None, None, None
-        
-        # Middle band (SMA)
-        middle = np.mean(closes[-period:])
-        
-        # Standard deviation
-        std = np.std(closes[-period:])
-        
-        # Upper and lower bands
-        upper = middle + (std_dev * std)
-        lower = middle - (std_dev * std)
-        
-        # Band width (normalized)
-        width = (upper - lower) / middle if middle > 0 else 0
-        
-        return upper, middle, lower, width
-    
     def reset(self, symbol: str):
         """Stateless."""
         pass
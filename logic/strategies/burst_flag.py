@@ -10,6 +10,7 @@ from typing import Optional
 from datetime import datetime, timezone
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
+from .features import get_snapshot
 from core.config import settings
 from core.mode_config import ConfigurationManager
 
@@ -58,7 +59,7 @@ class BurstFlagStrategy(BaseStrategy):
         
         # Use existing strategy analysis
         from core.models import Signal, SignalType
-        signal = self._strategy.analyze(symbol, buffer)
+        signal = self._strategy.analyze(symbol, buffer, snapshot=get_snapshot(buffer, features))
         
         if signal is None:
             return None
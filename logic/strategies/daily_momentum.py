@@ -6,10 +6,11 @@ Catches coins like SUI that move gradually over days rather than sharp intraday
 """
 
 from typing import Optional
-from datetime import datetime, timezone
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
+from .features import get_snapshot
 from core.config import settings
+from core.helpers.clock import utc_now
 
 
 class DailyMomentumStrategy(BaseStrategy):
@@ -59,7 +60,7 @@ class DailyMomentumStrategy(BaseStrategy):
         
         # Check cache - only recompute daily analysis every 5 minutes
         cache_key = symbol
-        now = datetime.now(timezone.utc)
+        now = utc_now()
         cached = self._daily_cache.get(cache_key)
         
         if cached and (now - cached['timestamp']).total_seconds() < 300:
@@ -329,7 +330,7 @@ class DailyMomentumStrategy(BaseStrategy):
             return None
         
         # Calculate levels
-        atr = buffer.atr(14, "1m")
+        atr = get_snapshot(buffer, features).atr(14, "1m")
         if atr <= 0:
             atr = price * 0.02  # Fallback: 2% ATR
         
@@ -0,0 +1,113 @@
+"""
+Shared per-symbol feature snapshot for strategies.
+
+One ``FeatureSnapshot`` is built per symbol per candle change (keyed on
+``CandleBuffer.seq``) and handed to every strategy as ``features["snapshot"]``:
+
+    snap = get_snapshot(buffer, features)
+    rsi = snap.rsi(14)                  # RSI(14) on 5m closes
+    upper, middle, lower, width = snap.bollinger(20, 2.0)
+
+Arrays are copied out of the candle rings once, and derived indicators are
+memoized on first use, so nine strategies reading the same RSI, ATR or
+median volume compute it once between candle closes.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class FeatureSnapshot:
+    """Candle arrays and memoized indicators for one buffer at one ``seq``."""
+
+    def __init__(self, buffer):
+        self.symbol = buffer.symbol
+        self.seq = buffer.seq
+        self.buffer = buffer
+        self.price = buffer.last_price
+        self.closes_1m = buffer.get_closes("1m").copy()
+        self.volumes_1m = buffer.get_volumes("1m").copy()
+        self.ranges_1m = buffer.get_ranges("1m").copy()
+        self.closes_5m = buffer.get_closes("5m").copy()
+        self.volumes_5m = buffer.get_volumes("5m").copy()
+        self.ranges_5m = buffer.get_ranges("5m").copy()
+        self._memo: dict[tuple, object] = {}
+
+    def is_current(self, buffer) -> bool:
+        """True while ``buffer`` has not changed since this snapshot."""
+        return buffer is self.buffer and buffer.seq == self.seq
+
+    def _array(self, name: str, timeframe: str) -> np.ndarray:
+        return getattr(self, f"{name}_{timeframe}")
+
+    def rsi(self, period: int = 14, timeframe: str = "5m", back: int = 0) -> Optional[float]:
+        """RSI (simple-mean gains/losses) ending ``back`` bars ago; None if too short."""
+        key = ("rsi", period, timeframe, back)
+        if key not in self._memo:
+            closes = self._array("closes", timeframe)
+            closes = closes[:len(closes) - back][-(period + 1):]
+            value = None
+            if len(closes) >= period + 1:
+                deltas = np.diff(closes)
+                avg_gain = np.mean(np.where(deltas > 0, deltas, 0))
+                avg_loss = np.mean(np.where(deltas < 0, -deltas, 0))
+                value = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+            self._memo[key] = value
+        return self._memo[key]
+
+    def bollinger(self, period: int = 20, std_dev: float = 2.0, timeframe: str = "5m", back: int = 0):
+        """(upper, middle, lower, width) ending ``back`` bars ago; Nones if too short."""
+        key = ("bb", period, std_dev, timeframe, back)
+        if key not in self._memo:
+            closes = self._array("closes", timeframe)
+            value = (None, None, None, None)
+            if len(closes) - back >= period:
+                middle, std = self.mean_std("closes", timeframe, period, back)
+                upper = middle + std_dev * std
+                lower = middle - std_dev * std
+                value = (upper, middle, lower, (upper - lower) / middle if middle > 0 else 0)
+            self._memo[key] = value
+        return self._memo[key]
+
+    def mean_std(self, name: str, timeframe: str, window: int, back: int = 0) -> tuple:
+        """(mean, std) of the ``window`` values ending ``back`` bars ago."""
+        key = ("mean_std", name, timeframe, window, back)
+        if key not in self._memo:
+            values = self._array(name, timeframe)
+            values = values[:len(values) - back][-window:]
+            self._memo[key] = (np.mean(values), np.std(values))
+        return self._memo[key]
+
+    def median(self, name: str, timeframe: str, window: int) -> float:
+        """Median of the last ``window`` values of ``volumes``/``ranges``/``closes``."""
+        key = ("median", name, timeframe, window)
+        if key not in self._memo:
+            self._memo[key] = np.median(self._array(name, timeframe)[-window:])
+        return self._memo[key]
+
+    def vwap(self, periods: int = 30) -> float:
+        key = ("vwap", periods)
+        if key not in self._memo:
+            self._memo[key] = self.buffer.vwap(periods)
+        return self._memo[key]
+
+    def atr(self, period: int = 14, timeframe: str = "1m") -> float:
+        key = ("atr", period, timeframe)
+        if key not in self._memo:
+            self._memo[key] = self.buffer.atr(period, timeframe)
+        return self._memo[key]
+
+    def ema(self, period: int = 20, timeframe: str = "5m") -> float:
+        key = ("ema", period, timeframe)
+        if key not in self._memo:
+            self._memo[key] = self.buffer.ema(period, timeframe)
+        return self._memo[key]
+
+
+def get_snapshot(buffer, features: Optional[dict]) -> FeatureSnapshot:
+    """The orchestrator's snapshot for ``buffer`` (or a fresh one for direct callers)."""
+    snapshot = features.get("snapshot") if features else None
+    if snapshot is None or not snapshot.is_current(buffer):
+        snapshot = FeatureSnapshot(buffer)
+    return snapshot
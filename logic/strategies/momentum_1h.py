@@ -15,8 +15,8 @@ Exit: ATR trailing stop or momentum decay
 """
 
 from logic.strategies.base import BaseStrategy, StrategySignal, SignalDirection
+from logic.strategies.features import get_snapshot
 from typing import Optional
-import numpy as np
 
 
 class Momentum1HStrategy(BaseStrategy):
@@ -84,29 +84,24 @@ class Momentum1HStrategy(BaseStrategy):
         
         # === GATE 4: ATR SHOCK (Volatility expansion) ===
         # Most 1H gainers are volatility shocks
-        candles_5m = getattr(buffer, 'candles_5m', [])
+        snap = get_snapshot(buffer, features)
+        ranges_5m = snap.ranges_5m
         
         atr_shock = False
-        if len(candles_5m) >= 20:
+        if len(ranges_5m) >= 20:
             # Calculate recent ATR vs baseline
-            recent_ranges = [c.high - c.low for c in candles_5m[-5:]]
-            baseline_ranges = [c.high - c.low for c in candles_5m[-20:-5]]
+            recent_atr = snap.mean_std("ranges", "5m", 5)[0]
+            baseline_atr = snap.mean_std("ranges", "5m", 15, back=5)[0]
             
-            if baseline_ranges:
-                recent_atr = np.mean(recent_ranges)
-                baseline_atr = np.mean(baseline_ranges)
-                
-                if baseline_atr > 0:
-                    atr_ratio = recent_atr / baseline_atr
-                    atr_shock = atr_ratio > 1.3  # 30% ATR expansion
+            if baseline_atr > 0:
+                atr_ratio = recent_atr / baseline_atr
+                atr_shock = atr_ratio > 1.3  # 30% ATR expansion
         
         # === GATE 5: NOT EXHAUSTED ===
         # Don't chase if already at extremes
         # Check if price is >2 std devs from recent mean (overextended)
-        if len(candles_5m) >= 20:
-            recent_closes = [c.close for c in candles_5m[-20:]]
-            mean_price = np.mean(recent_closes)
-            std_price = np.std(recent_closes)
+        if len(snap.closes_5m) >= 20:
+            mean_price, std_price = snap.mean_std("closes", "5m", 20)
             
             if std_price > 0:
                 z_score = (price - mean_price) / std_price
@@ -6,13 +6,27 @@ All strategies share the same gate funnel. The orchestrator:
 2. Collects valid signals
 3. Picks the highest edge_score_base signal
 4. Returns it for gate processing
+
+``analyze_many`` evaluates a batch of symbols inline, or on a worker pool when
+``STRATEGY_WORKERS`` > 1. Each symbol runs all of its strategies on one worker
+(strategy state is keyed by symbol), and selection plus stats happen
+afterwards on the caller in batch order, so the result is the same as calling
+``analyze`` for each symbol in turn. The pool is opt-in: strategy code holds
+the GIL, so it only helps where numpy work dominates.
+
+Strategies share one ``FeatureSnapshot`` per symbol (``features["snapshot"]``),
+rebuilt only when the symbol's candle buffer changes.
 """
 
-from typing import Optional, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Sequence, Tuple
 from dataclasses import dataclass
 
+from core.config import settings
 from core.logging_utils import get_logger
+from core.perf import perf
 from .base import BaseStrategy, StrategySignal
+from .features import FeatureSnapshot
 
 logger = get_logger(__name__)
 from .burst_flag import BurstFlagStrategy
@@ -55,8 +69,9 @@ class StrategyOrchestrator:
     All signals go through the SAME gate funnel after selection.
     """
     
-    def __init__(self, config: Optional[OrchestratorConfig] = None):
+    def __init__(self, config: Optional[OrchestratorConfig] = None, max_workers: Optional[int] = None):
         self.config = config or OrchestratorConfig()
+        self.max_workers = max_workers or settings.strategy_workers
         self.strategies: List[BaseStrategy] = []
         
         # Initialize enabled strategies
@@ -82,6 +97,12 @@ class StrategyOrchestrator:
         # Stats tracking
         self._signal_counts: Dict[str, int] = {}
         self._selection_counts: Dict[str, int] = {}
+        
+        # Last feature snapshot per symbol (reused until the buffer changes)
+        self._snapshots: Dict[str, FeatureSnapshot] = {}
+        
+        # Worker pool for analyze_many (created on first batch)
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def analyze(
         self,
@@ -102,20 +123,66 @@ class StrategyOrchestrator:
         Returns:
             Best StrategySignal (highest edge_score_base) or None
         """
-        candidates: List[StrategySignal] = []
+        return self._select(symbol, self._evaluate(symbol, buffer, features, market_context))
+    
+    def analyze_many(
+        self,
+        batch: Sequence[Tuple[str, object, dict]],
+        market_context: dict,
+    ) -> Dict[str, Optional[StrategySignal]]:
+        """
+        Run all strategies for a batch of ``(symbol, buffer, features)``.
         
-        for strategy in self.strategies:
-            try:
-                signal = strategy.analyze(symbol, buffer, features, market_context)
-                if signal is not None and signal.is_valid:
-                    candidates.append(signal)
-                    
-                    # Track signal generation
-                    sid = signal.strategy_id
-                    self._signal_counts[sid] = self._signal_counts.get(sid, 0) + 1
-                    
-            except Exception as e:
-                logger.warning("[ORCH] %s error on %s: %s", strategy.strategy_id, symbol, e)
+        Blocks until the whole batch is done, so buffers cannot change
+        underneath the workers when called from the event loop.
+        
+        Returns:
+            {symbol: best StrategySignal or None}, in batch order
+        """
+        if self.max_workers <= 1 or len(batch) <= 1:
+            evaluated = [self._evaluate(symbol, buffer, features, market_context) for symbol, buffer, features in batch]
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="strategy")
+            futures = [
+                self._executor.submit(self._evaluate, symbol, buffer, features, market_context)
+                for symbol, buffer, features in batch
+            ]
+            evaluated = [future.result() for future in futures]
+        
+        return {
+            symbol: self._select(symbol, candidates)
+            for (symbol, _, _), candidates in zip(batch, evaluated)
+        }
+    
+    def _evaluate(self, symbol: str, buffer, features: dict, market_context: dict) -> List[StrategySignal]:
+        """Valid signals from every strategy for one symbol (safe on a worker thread)."""
+        candidates: List[StrategySignal] = []
+        with perf.span("strategy.analyze", symbol):
+            if buffer is not None:
+                features = dict(features, snapshot=self.snapshot(symbol, buffer))
+            for strategy in self.strategies:
+                try:
+                    signal = strategy.analyze(symbol, buffer, features, market_context)
+                    if signal is not None and signal.is_valid:
+                        candidates.append(signal)
+                except Exception as e:
+                    logger.warning("[ORCH] %s error on %s: %s", strategy.strategy_id, symbol, e)
+        return candidates
+    
+    def snapshot(self, symbol: str, buffer) -> FeatureSnapshot:
+        """Shared feature snapshot for ``symbol``, rebuilt when its buffer changes."""
+        snapshot = self._snapshots.get(symbol)
+        if snapshot is None or not snapshot.is_current(buffer):
+            snapshot = self._snapshots[symbol] = FeatureSnapshot(buffer)
+        return snapshot
+    
+    def _select(self, symbol: str, candidates: List[StrategySignal]) -> Optional[StrategySignal]:
+        """Pick the best signal (ties go to the earlier strategy) and update stats."""
+        # Track signal generation
+        for signal in candidates:
+            sid = signal.strategy_id
+            self._signal_counts[sid] = self._signal_counts.get(sid, 0) + 1
         
         if not candidates:
             return None
@@ -6,10 +6,10 @@ Detects tight consolidation ranges and enters on volume breakout.
 """
 
 from typing import Optional
-from datetime import datetime, timezone
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
 from core.config import settings
+from core.helpers.clock import utc_now
 
 
 class RangeBreakoutStrategy(BaseStrategy):
@@ -181,7 +181,7 @@ class RangeBreakoutStrategy(BaseStrategy):
             'candle_count': candles_in_range,
             'vol_avg': vol_avg,
             'vol_decay': vol_decay_ratio,
-            'detected_at': datetime.now(timezone.utc),
+            'detected_at': utc_now(),
         }
         
         return self._range_cache[symbol]
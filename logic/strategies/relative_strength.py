@@ -6,10 +6,11 @@ Finds altcoins outperforming BTC and enters on pullback.
 """
 
 from typing import Optional
-from datetime import datetime, timezone
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
+from .features import get_snapshot
 from core.config import settings
+from core.helpers.clock import utc_now
 
 
 class RelativeStrengthStrategy(BaseStrategy):
@@ -100,7 +101,7 @@ class RelativeStrengthStrategy(BaseStrategy):
             return None
         
         # Calculate levels based on ATR
-        atr = buffer.atr(14, "1m")
+        atr = get_snapshot(buffer, features).atr(14, "1m")
         if atr <= 0:
             atr = price * 0.015  # Fallback 1.5%
         
@@ -202,7 +203,7 @@ class RelativeStrengthStrategy(BaseStrategy):
             'alt_4h': alt_change_4h,
             'btc_1h': btc_change_1h,
             'btc_4h': btc_change_4h,
-            'updated': datetime.now(timezone.utc)
+            'updated': utc_now()
         }
         
         return self._rs_cache[symbol]
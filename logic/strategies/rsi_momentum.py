@@ -10,8 +10,8 @@ This catches coins that dip then rip (common in crypto).
 """
 
 from logic.strategies.base import BaseStrategy, StrategySignal, SignalDirection
+from logic.strategies.features import get_snapshot
 from typing import Optional
-import numpy as np
 
 
 class RSIMomentumStrategy(BaseStrategy):
@@ -41,16 +41,15 @@ class RSIMomentumStrategy(BaseStrategy):
         if price <= 0:
             return None
         
-        # Calculate RSI(14) on 5m candles
-        closes = np.array([c.close for c in candles_5m[-30:]])
-        rsi = self._calculate_rsi(closes, period=14)
+        # Calculate RSI(14) on 5m candles (shared snapshot)
+        snap = get_snapshot(buffer, features)
+        rsi = snap.rsi(14, "5m")
         
         if rsi is None:
             return None
         
         # Get previous RSI for cross detection
-        closes_prev = np.array([c.close for c in candles_5m[-31:-1]])
-        rsi_prev = self._calculate_rsi(closes_prev, period=14)
+        rsi_prev = snap.rsi(14, "5m", back=1)
         
         if rsi_prev is None:
             return None
@@ -129,26 +128,6 @@ class RSIMomentumStrategy(BaseStrategy):
             ]
         )
     
-    def _calculate_rsi(self, closes: np.ndarray, period: int = 14) -> Optional[float]:
-        """Calculate RSI."""
-        if len(closes) < period + 1:
-            return None
-        
-        deltas = np.diff(closes)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
-    
     def reset(self, symbol: str):
         """Stateless."""
         pass
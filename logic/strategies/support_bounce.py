@@ -6,11 +6,11 @@ Identifies key support levels and enters on confirmed bounces.
 """
 
 from typing import Optional, List, Tuple
-from datetime import datetime, timezone
 from collections import defaultdict
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
 from core.config import settings
+from core.helpers.clock import utc_now
 
 
 class SupportBounceStrategy(BaseStrategy):
@@ -132,7 +132,7 @@ class SupportBounceStrategy(BaseStrategy):
         # Check cache (update every 5 minutes)
         cached = self._level_cache.get(symbol)
         if cached:
-            age = (datetime.now(timezone.utc) - cached['updated_at']).total_seconds()
+            age = (utc_now() - cached['updated_at']).total_seconds()
             if age < 300:  # 5 minute cache
                 return cached
         
@@ -187,7 +187,7 @@ class SupportBounceStrategy(BaseStrategy):
         result = {
             'supports': support_data[:5],  # Top 5 supports
             'resistances': resistance_data[:5],  # Top 5 resistances
-            'updated_at': datetime.now(timezone.utc)
+            'updated_at': utc_now()
         }
         
         self._level_cache[symbol] = result
@@ -6,10 +6,11 @@ Entry on pullback to VWAP or EMA zone after impulse, with volume reclaim.
 """
 
 from typing import Optional
-from datetime import datetime, timezone
 
 from .base import BaseStrategy, StrategySignal, SignalDirection
+from .features import get_snapshot
 from core.config import settings
+from core.helpers.clock import utc_now
 
 
 class VWAPReclaimStrategy(BaseStrategy):
@@ -62,8 +63,9 @@ class VWAPReclaimStrategy(BaseStrategy):
         candles = buffer.candles_1m
         current = candles[-1]
         price = current.close
-        vwap = buffer.vwap(30)  # 30-candle VWAP
-        atr = buffer.atr(14, "1m")
+        snap = get_snapshot(buffer, features)
+        vwap = snap.vwap(30)  # 30-candle VWAP
+        atr = snap.atr(14, "1m")
         
         if vwap <= 0 or atr <= 0:
             return None
@@ -174,7 +176,7 @@ class VWAPReclaimStrategy(BaseStrategy):
         if current is None or recent_high > current['high'] * 1.002:  # New high
             self._impulse_memory[symbol] = {
                 'high': recent_high,
-                'timestamp': datetime.now(timezone.utc),
+                'timestamp': utc_now(),
                 'trend_score': trend_5m,
             }
     
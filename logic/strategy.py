@@ -1,15 +1,17 @@
 """Burst-flag strategy with trap avoidance."""
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Optional
 import numpy as np
 
 from core.config import settings
+from core.helpers.clock import utc_now
 from core.models import (
     CandleBuffer, Candle, Signal, SignalType, 
     ImpulseLeg, FlagPattern, Side
 )
+from logic.strategies.features import FeatureSnapshot
 
 
 @dataclass
@@ -35,23 +37,31 @@ class BurstFlagStrategy:
         self.flags: dict[str, Optional[FlagPattern]] = {}
         self.swing_highs: dict[str, list[SwingHigh]] = {}
         self.trap_zones: dict[str, bool] = {}  # True if in trap zone
+        self.spread_bps: dict[str, float] = {}  # Last spread passed to analyze()
     
-    def analyze(self, symbol: str, buffer: CandleBuffer, spread_bps: float = 999.0) -> Signal:
+    def analyze(
+        self,
+        symbol: str,
+        buffer: CandleBuffer,
+        spread_bps: float = 999.0,
+        snapshot: Optional[FeatureSnapshot] = None,
+    ) -> Signal:
         """Main analysis function - returns a signal.
         
         Args:
             symbol: Trading pair
             buffer: Candle data buffer
             spread_bps: Current bid-ask spread in basis points (for FAST mode)
+            snapshot: Shared feature snapshot for ``buffer`` (built if omitted)
         """
-        self._current_spread_bps = spread_bps  # Store for _generate_entry_signal
+        self.spread_bps[symbol] = spread_bps  # Store for _generate_entry_signal (per symbol: batches run in parallel)
         
         # Need minimum data (keep short to react early)
         if len(buffer.candles_1m) < 10 or len(buffer.candles_5m) < 3:
             return Signal(
                 symbol=symbol,
                 type=SignalType.NONE,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 reason="Insufficient data"
             )
@@ -65,12 +75,12 @@ class BurstFlagStrategy:
             return trap_signal
         
         # Check for burst
-        burst = self._detect_burst(symbol, buffer)
+        burst = self._detect_burst(symbol, buffer, snapshot or FeatureSnapshot(buffer))
         if not burst:
             return Signal(
                 symbol=symbol,
                 type=SignalType.NONE,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 reason="No burst detected"
             )
@@ -81,7 +91,7 @@ class BurstFlagStrategy:
             return Signal(
                 symbol=symbol,
                 type=SignalType.BURST_DETECTED,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 reason="Burst detected, waiting for impulse"
             )
@@ -90,7 +100,7 @@ class BurstFlagStrategy:
         
         # FAST MODE: Impulse can trigger directly without flag
         # If impulse meets minimum and we have tight spread, enter on momentum
-        spread_bps = getattr(self, '_current_spread_bps', 999.0)
+        spread_bps = self.spread_bps.get(symbol, 999.0)
         momentum_entry = (
             settings.fast_mode_enabled and
             impulse.pct_move >= settings.impulse_min_pct and  # Use config threshold (1.0%)
@@ -101,7 +111,7 @@ class BurstFlagStrategy:
         if momentum_entry:
             # Create synthetic flag at current level for entry signal
             synthetic_flag = FlagPattern(
-                start_time=datetime.now(timezone.utc) - timedelta(minutes=1),
+                start_time=utc_now() - timedelta(minutes=1),
                 high=impulse.high,
                 low=buffer.last_price * 0.99,
                 retrace_pct=0.1,
@@ -118,7 +128,7 @@ class BurstFlagStrategy:
             return Signal(
                 symbol=symbol,
                 type=SignalType.IMPULSE_FOUND,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 impulse=impulse,
                 reason=f"Impulse +{impulse.pct_move:.1f}%, waiting for flag"
@@ -132,7 +142,7 @@ class BurstFlagStrategy:
             return Signal(
                 symbol=symbol,
                 type=SignalType.FLAG_FORMING,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 impulse=impulse,
                 flag=flag,
@@ -142,27 +152,26 @@ class BurstFlagStrategy:
         # BREAKOUT SIGNAL!
         return self._generate_entry_signal(symbol, buffer, impulse, flag)
     
-    def _detect_burst(self, symbol: str, buffer: CandleBuffer) -> bool:
+    def _detect_burst(self, symbol: str, buffer: CandleBuffer, snapshot: FeatureSnapshot) -> bool:
         """Detect volume + volatility burst."""
-        volumes = buffer.get_volumes("5m")
-        ranges = buffer.get_ranges("5m")
+        volumes = snapshot.volumes_5m
+        ranges = snapshot.ranges_5m
         
         # Early fallback: if we don't have enough 5m history yet, use 1m burst check
         if len(volumes) < 6:
-            vol_1m = buffer.get_volumes("1m")
-            rng_1m = buffer.get_ranges("1m")
+            vol_1m = snapshot.volumes_1m
             if len(vol_1m) < 12:
                 return False
             vol_current = vol_1m[-1]
-            vol_median = np.median(vol_1m[-30:]) if len(vol_1m) >= 30 else np.median(vol_1m)
-            range_current = rng_1m[-1]
-            range_median = np.median(rng_1m[-30:]) if len(rng_1m) >= 30 else np.median(rng_1m)
+            vol_median = snapshot.median("volumes", "1m", 30)
+            range_current = snapshot.ranges_1m[-1]
+            range_median = snapshot.median("ranges", "1m", 30)
         else:
             # Current vs median (5m)
             vol_current = volumes[-1]
-            vol_median = np.median(volumes[-24:]) if len(volumes) >= 24 else np.median(volumes)
+            vol_median = snapshot.median("volumes", "5m", 24)
             range_current = ranges[-1]
-            range_median = np.median(ranges[-24:]) if len(ranges) >= 24 else np.median(ranges)
+            range_median = snapshot.median("ranges", "5m", 24)
         
         if vol_median == 0 or range_median == 0:
             return False
@@ -171,8 +180,8 @@ class BurstFlagStrategy:
         range_spike = range_current / range_median
         
         # Check VWAP filter
-        price = buffer.last_price
-        vwap = buffer.vwap(periods=120)  # 2h VWAP
+        price = snapshot.price
+        vwap = snapshot.vwap(120)  # 2h VWAP
         
         # Gate 1: Both metrics above thresholds
         both_above = (
@@ -358,7 +367,7 @@ class BurstFlagStrategy:
                     )
         
         # Keep only recent swing highs (last 2 hours)
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=2)
+        cutoff = utc_now() - timedelta(hours=2)
         self.swing_highs[symbol] = [
             sh for sh in self.swing_highs[symbol] 
             if sh.timestamp > cutoff
@@ -374,7 +383,7 @@ class BurstFlagStrategy:
             return Signal(
                 symbol=symbol,
                 type=SignalType.TRAP_TRIPLE_TOP,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 reason="Triple top detected - avoiding longs"
             )
@@ -386,7 +395,7 @@ class BurstFlagStrategy:
             return Signal(
                 symbol=symbol,
                 type=SignalType.TRAP_HEAD_SHOULDERS,
-                timestamp=datetime.now(timezone.utc),
+                timestamp=utc_now(),
                 price=buffer.last_price,
                 reason="Head & shoulders detected - avoiding longs"
             )
@@ -524,7 +533,7 @@ class BurstFlagStrategy:
         # Check FAST breakout conditions
         is_fast = False
         if settings.fast_mode_enabled:
-            spread_bps = getattr(self, '_current_spread_bps', 999.0)
+            spread_bps = self.spread_bps.get(symbol, 999.0)
             
             # FAST gate conditions
             fast_confidence = confidence >= settings.fast_confidence_min
@@ -550,7 +559,7 @@ class BurstFlagStrategy:
         return Signal(
             symbol=symbol,
             type=signal_type,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=utc_now(),
             price=price,
             confidence=confidence,
             impulse=impulse,
@@ -21,6 +21,7 @@ import os
 import signal as sig
 import subprocess
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -31,7 +32,7 @@ from core.mode_config import ConfigurationManager, RuntimeConfigStore, sanitize_
 from core.mode_configs import TradingMode
 from core.profiles import apply_profile
 from core.models import Intent, Signal, SignalType, CandleBuffer
-from core.logger import log_candle_1m, log_burst, log_signal, utc_iso_str
+from core.logger import flush_logs, log_candle_1m, log_burst, log_perf, log_signal, utc_iso_str
 from core.trading_container import TradingContainer
 from core.events import MarketEventBus, TickEvent, CandleEvent, OrderEvent
 
@@ -64,10 +65,23 @@ from core.state import (
 from core.helpers import safe_features, make_signal_event, run_preflight
 from core.config_manager import get_config_manager
 
-from datafeeds.collectors import CandleCollector, DynamicBackfill, MockCollector, RestPoller
+from datafeeds.collectors import (
+    CandleCollector,
+    DynamicBackfill,
+    MockCollector,
+    ReplayCollector,
+    RestPoller,
+    StartupWarmup,
+)
 from datafeeds.coinbase_fetcher import fetch_history_windowed
 from datafeeds.universe import SymbolScanner, tier_scheduler
 from core.candle_store import candle_store
+from core.dirty_tracker import DirtyTracker
+from core.loop_monitor import LoopLagMonitor
+from core.perf import perf
+from core.rest_pool import rest_pool
+from core.rest_scheduler import Priority, request_priority, rest_scheduler
+from core.tick_capture import tick_capture
 from logic.strategies.orchestrator import StrategyOrchestrator
 from execution.order_router import OrderRouter
 from core.helpers.preflight import test_api_keys
@@ -77,7 +91,7 @@ from core.bot_controller import get_controller
 class TradingBotV2:
     """Main trading bot orchestrator with three-clock architecture."""
     
-    def __init__(self):
+    def __init__(self, replay_path: Optional[str] = None, replay_speed: Optional[str] = None):
         self._config_manager = get_config_manager()
         self.mode = ConfigurationManager.get_trading_mode()
         self.config_store = RuntimeConfigStore(self.mode)
@@ -88,7 +102,13 @@ class TradingBotV2:
         self.orchestrator = StrategyOrchestrator()
         self.events = MarketEventBus(self.mode)
         self.scanner = SymbolScanner()
-        self.collector: Optional[CandleCollector | MockCollector] = None
+        self.collector: Optional[CandleCollector | MockCollector | ReplayCollector] = None
+        # Offline replay source (load testing) instead of the live feed
+        self.replay_path = replay_path or settings.replay_path
+        self.replay_speed = replay_speed or settings.replay_speed
+        if self.replay_path and self.mode != TradingMode.PAPER:
+            # Replayed prices are stale; they must never reach a live executor
+            raise ValueError("Replay is only supported in PAPER mode")
         self.router: Optional[OrderRouter] = None
         self._last_5m_counts: dict[str, int] = {}
         
@@ -97,13 +117,11 @@ class TradingBotV2:
         self._running = False
         self.stream_limit = 150  # Max symbols to stream at once (gaming PC - full coverage!)
         self._last_hot_leader: Optional[str] = None
-        self._last_rest_probe: Optional[datetime] = None
         self._focus_rotation_secs = 15
         self._focus_rotation_pool = 3
         self._focus_index = 0
         self._last_focus_switch: Optional[datetime] = None
         self._focus_symbol: Optional[str] = None
-        self._last_history_probe: Optional[datetime] = None
         self._strategy_pool = 50  # Analyze top 50 symbols each loop (gaming PC can handle it)
         
         # SIGNAL TRACKING (4 different purposes - all needed!):
@@ -120,6 +138,17 @@ class TradingBotV2:
         self._clock_c_task: Optional[asyncio.Task] = None  # Every 30 min
         self._poller_task: Optional[asyncio.Task] = None   # REST poller
         self._backfill_task: Optional[asyncio.Task] = None # Dynamic backfill
+        self._warmup_task: Optional[asyncio.Task] = None   # Startup warmup
+        self._refresh_tasks: list[asyncio.Task] = []       # Background REST refreshes
+        self._last_pnl_log: Optional[datetime] = None
+        
+        # Event-loop lag (blocking work on the loop thread shows up here)
+        self.loop_monitor = LoopLagMonitor()
+        perf.loop_monitor = self.loop_monitor
+        
+        # Change tracking: Clock B stages only re-run symbols whose data moved
+        self.dirty = DirtyTracker(settings.dirty_refresh_s, settings.dirty_spread_bps)
+        self._position_symbols: set[str] = set()
         
         # Tiered polling system
         self.rest_poller: Optional[RestPoller] = None
@@ -208,8 +237,14 @@ class TradingBotV2:
         self._running = True
         
         # === CLOCK C: Initial universe discovery ===
-        logger.info("[CLOCK C] Refreshing symbol universe...")
-        await self.scanner.refresh_universe()
+        if self.replay_path:
+            # Replays stay offline: the recorded symbols are the universe
+            self.scanner.use_static_universe(
+                ReplayCollector.source_symbols(self.replay_path) or settings.coins
+            )
+        else:
+            logger.info("[CLOCK C] Refreshing symbol universe...")
+            await self.scanner.refresh_universe()
         self._update_universe_state()
         
         # Get symbols to stream (eligible symbols or defaults)
@@ -223,7 +258,17 @@ class TradingBotV2:
         self.state.universe.symbols_streaming = len(stream_symbols)
         
         # Initialize collector
-        if settings.is_configured and api_ok:
+        if self.replay_path:
+            logger.info("[BOT] Replaying %s at %s speed", self.replay_path, self.replay_speed)
+            self.collector = ReplayCollector(
+                symbols=stream_symbols,
+                on_candle=self._on_candle,
+                source=self.replay_path,
+                speed=self.replay_speed,
+            )
+            self.collector.on_tick = self._on_tick
+            self.collector.on_connect = self._on_ws_connect
+        elif settings.is_configured and api_ok:
             logger.info("[BOT] Using live WebSocket connection")
             self.collector = CandleCollector(
                 symbols=stream_symbols,
@@ -247,10 +292,8 @@ class TradingBotV2:
         logger.info("[BOT] State writer started early for dashboard")
         
         # === PHASE: BACKFILL ===
-        # Note: Rehydrate from parquet happens in _rehydrate_from_store after router init
-        # This keeps startup fast - we backfill first, then load cached data
+        # Warmup starts after router init so open positions are warmed (and fetched) first
         self.state.phase = "backfill"
-        self._backfill_initial(stream_symbols)
     
         # Initialize order router with mode-specific dependencies
         container = TradingContainer(self.mode, self.config)
@@ -269,15 +312,19 @@ class TradingBotV2:
         # Connect candle collector for thesis invalidation checks
         if self.collector:
             self.router.set_candle_collector(self.collector)
+        
+        # REST requests for open positions outrank tier polling and backfill
+        rest_scheduler.set_position_source(lambda: self.router.positions)
 
-        # Rehydrate candles from persistent storage (limit scope for fast startup)
-        try:
-            position_symbols = list(self.router.positions.keys()) if self.router else []
-            starter_symbols = list(stream_symbols[:15])
-            rehydrate_symbols = list(dict.fromkeys(position_symbols + starter_symbols))
-            self._rehydrate_from_store(rehydrate_symbols)
-        except Exception:
-            logger.warning("[STORE] Rehydrate error", exc_info=True)
+        if self.replay_path:
+            # Recorded sessions carry their own history; only restore open positions
+            self._rehydrate_from_store(list(self.router.positions.keys()))
+        else:
+            # Concurrent cache-first warmup; runs alongside the rest of startup and the
+            # WebSocket so warm symbols can trade while the others are still loading
+            self._warmup_task = asyncio.create_task(self._run_warmup(stream_symbols))
+        # Seal closed days / merge months in the background while running
+        candle_store.start_compactor()
         
         # === PHASE: SYNCING ===
         self.state.phase = "syncing"
@@ -329,6 +376,23 @@ class TradingBotV2:
         self._clock_b_task = asyncio.create_task(self._clock_b_loop())    # Every minute
         self._clock_c_task = asyncio.create_task(self._clock_c_loop())    # Every 30 min
         
+        # Blocking REST work runs in background tasks that publish into cached
+        # state; Clock B only reads it
+        self._refresh_tasks = [
+            asyncio.create_task(self.loop_monitor.run()),
+            asyncio.create_task(self._refresh_loop("portfolio", 60, self._refresh_portfolio)),
+            asyncio.create_task(self._refresh_loop(
+                "perf", settings.perf_interval_s, self._export_perf, initial_delay=settings.perf_interval_s
+            )),
+        ]
+        if not self.replay_path:
+            # Live market data from REST would mix a second timeline into a replay
+            self._refresh_tasks += [
+                asyncio.create_task(self._refresh_loop("btc_trend", 120, self._refresh_btc_trend)),
+                asyncio.create_task(self._refresh_loop("history_probe", 20, self._probe_unstreamed_history)),
+                asyncio.create_task(self._refresh_loop("rest_probe", 60, lambda: self._rest_probe(limit=20))),
+            ]
+        
         # Start tiered polling services
         if self.rest_poller:
             self._poller_task = asyncio.create_task(
@@ -369,6 +433,10 @@ class TradingBotV2:
             from core.persistence import save_positions
             save_positions(self.router.positions)
         
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        for task in self._refresh_tasks:
+            task.cancel()
         if self.collector:
             self.collector.stop()
         
@@ -377,13 +445,26 @@ class TradingBotV2:
             await self.rest_poller.stop()
         if self.backfill_service:
             await self.backfill_service.stop()
-        
-        # Flush candle store to disk
+
+        # Report REST latency per endpoint, then drop keep-alive connections
+        for pool_name, pool_stats in rest_pool.get_stats().items():
+            for endpoint, stats in pool_stats["endpoints"].items():
+                logger.info("[REST] %s %s: %d calls, %d errors, mean %.0fms, max %.0fms", pool_name,
+                            endpoint, stats["calls"], stats["errors"], stats["mean_ms"], stats["max_ms"])
+        rest_pool.close()
+
+        # Flush candle store to disk, then seal any closed days into parquet
+        candle_store.stop_compactor()
         candle_store.flush_all()
         logger.info(
             "[STORE] Flushed %s candles to disk",
             candle_store.candles_written
         )
+        candle_store.compact_all()
+        
+        # Drain buffered JSONL logs and the binary tick capture
+        flush_logs()
+        tick_capture.flush()
     
     async def _check_and_rebalance(self):
         """Check if over budget and offer to rebalance at startup."""
@@ -489,8 +570,10 @@ class TradingBotV2:
             candle_record["atr14_1m"] = round(buffer.atr(14, "1m"), 6)
         log_candle_1m(candle_record, candle.timestamp)
         
-        # Persist to candle store (WS source)
-        candle_store.write_candle(symbol, candle, "1m", source="ws")
+        # Persist to candle store (WS source); replayed bars are already on disk
+        # and would rewrite past days (or the replay's own input)
+        if not self.replay_path:
+            candle_store.write_candle(symbol, candle, "1m", source="ws")
 
         # Emit normalized event for downstream consumers
         if self.events:
@@ -547,6 +630,7 @@ class TradingBotV2:
         # Store latest spread for FAST mode decisions
         if spread_bps is not None:
             self._latest_spreads[symbol] = spread_bps
+            self.dirty.mark_spread(symbol, spread_bps)
 
         # Emit normalized tick event
         if self.events:
@@ -628,18 +712,14 @@ class TradingBotV2:
             self.state.log(msg, "FOCUS")
             logger.info("[HOT] %s", msg)
     
-    def _rest_probe(self, limit: int = 5):
+    async def _rest_probe(self, limit: int = 5):
         """
-        Periodically fetch spread snapshots for non-streamed symbols using REST
+        Fetch spread snapshots for non-streamed symbols using REST
         to improve eligibility and rotation decisions.
         """
         if not self.scanner._init_client():
             return
         
-        now = datetime.now()
-        if self._last_rest_probe and (now - self._last_rest_probe) < timedelta(seconds=60):
-            return
-        
         exclude = set(self.collector.symbols) if self.collector else set()
         candidates = [
             s for s in self.scanner.get_eligible_symbols()
@@ -650,8 +730,8 @@ class TradingBotV2:
             return
         
         try:
-            self.scanner.refresh_spread_snapshots(candidates)
-            self._last_rest_probe = now
+            with request_priority(Priority.TIER3):
+                await asyncio.to_thread(self.scanner.refresh_spread_snapshots, candidates)
             self.state.log(f"REST probe {len(candidates)} symbols", "UNIV")
             
             # Log probes to monitor
@@ -669,7 +749,7 @@ class TradingBotV2:
         except Exception as e:
             logger.warning("[REST] Probe error: %s", e, exc_info=True)
     
-    def _probe_unstreamed_history(self, limit: int = 3, lookback_minutes: int = 30):
+    async def _probe_unstreamed_history(self, limit: int = 3, lookback_minutes: int = 30):
         """
         Pull lightweight history for a few non-streamed symbols to surface
         off-stream bursts into the hot list.
@@ -677,10 +757,6 @@ class TradingBotV2:
         if not self.collector or not self.scanner._init_client():
             return
         
-        now = datetime.now(timezone.utc)
-        if self._last_history_probe and (now - self._last_history_probe).total_seconds() < 20:
-            return
-        
         exclude = set(self.collector.symbols)
         candidates = [
             s for s in self.scanner.get_eligible_symbols()
@@ -690,13 +766,17 @@ class TradingBotV2:
         if not candidates:
             return
         
-        for sym in candidates:
-            history = self.scanner.fetch_history(sym, granularity_s=60, lookback_minutes=lookback_minutes)
+        # Fetch concurrently off the loop; metrics are applied here on the loop
+        with request_priority(Priority.TIER3):
+            histories = await asyncio.gather(*(
+                asyncio.to_thread(self.scanner.fetch_history, sym, 60, lookback_minutes)
+                for sym in candidates
+            ))
+        for sym, history in zip(candidates, histories):
             if len(history) < 10:
                 continue
             buf = CandleBuffer(symbol=sym)
-            for c in history:
-                buf.add_1m(c)
+            buf.extend_1m(history)
             self.scanner.update_burst_metrics(
                 symbol=sym,
                 candles_1m=buf.candles_1m,
@@ -722,183 +802,107 @@ class TradingBotV2:
                 )
             except Exception:
                 logger.debug("[PROBE] Failed to add probe for %s", sym, exc_info=True)
-        self._last_history_probe = now
     
-    def _backfill_initial(self, symbols: list[str], minutes_1m: int = 60, minutes_5m: int = 60):
-        """Pull recent history via REST and seed candle buffers to avoid warmup lag."""
-        import time as _time
-        
-        if not self.collector:
+    async def _refresh_loop(self, name: str, interval_s: float, refresh, initial_delay: float = 0.0):
+        """Run an async refresh (after ``initial_delay``) every ``interval_s`` seconds until stopped."""
+        await asyncio.sleep(initial_delay)
+        while self._running:
+            try:
+                await refresh()
+            except Exception:
+                logger.warning("[REFRESH] %s failed", name, exc_info=True)
+            await asyncio.sleep(interval_s)
+    
+    async def _export_perf(self):
+        """Publish the perf window to state (/api/perf) and perf_YYYY-MM-DD.jsonl, then reset it."""
+        if not perf.enabled:
             return
+        snapshot = perf.snapshot(reset=True)
+        snapshot["dirty"] = self.dirty.get_stats(reset=True)
+        self.state.perf = snapshot
+        log_perf(snapshot)
+    
+    async def _refresh_btc_trend(self):
+        """Update the BTC regime (REST call off the loop)."""
+        from logic.intelligence import intelligence
         
-        # Only attempt if REST client is available
-        if not self.scanner._init_client():
-            logger.warning("[BACKFILL] No REST client; skipping")
+        await asyncio.to_thread(intelligence.fetch_btc_trend)
+        self.state.log(f"Market: {intelligence.regime_status}", "INTEL")
+    
+    async def _refresh_portfolio(self):
+        """Refresh the real portfolio from Coinbase and reconcile positions (LIVE only)."""
+        if self.mode != TradingMode.LIVE or not settings.is_configured or not self.router:
             return
+        from core.portfolio import portfolio_tracker
+        from core.logger import log_pnl_snapshot
+        
+        snap = await asyncio.to_thread(portfolio_tracker.get_snapshot)
+        if snap:
+            self.router._exchange_sync._portfolio_snapshot = snap
+            self.router._exchange_sync._last_snapshot_at = datetime.now(timezone.utc)
+            self.router._exchange_sync._sync_degraded = False
+            # Update state with portfolio values
+            self.state.portfolio_value = snap.total_value
+            self.state.cash_balance = snap.total_cash
+            self.state.holdings_value = snap.total_crypto
         
-        total_1m = 0
-        total_5m = 0
-        success_count = 0
+        # Sync positions with exchange (detect manual trades)
+        await self.router.refresh_positions_from_exchange()
         
-        # Prioritize position symbols first, then top symbols
-        # Increased limit since WebSocket will handle rest anyway
+        # Log PnL snapshot every 5 minutes
+        if snap and (self._last_pnl_log is None or
+                     (datetime.now(timezone.utc) - self._last_pnl_log).total_seconds() >= 300):
+            log_pnl_snapshot({
+                "ts": utc_iso_str(),
+                "equity": snap.total_value,
+                "cash": snap.total_cash,
+                "crypto": snap.total_crypto,
+                "unrealized_pnl": snap.total_unrealized_pnl,
+                "realized_pnl": self.router.daily_stats.total_pnl,
+                "position_count": snap.position_count,
+            })
+            self._last_pnl_log = datetime.now(timezone.utc)
+    
+    async def _run_warmup(self, symbols: list[str]):
+        """Warm tier-1 buffers concurrently: cached history first, then only the REST gaps."""
+        from logic.live_features import feature_engine
+        
+        # Open positions first; the REST scheduler also promotes their requests
         position_symbols = list(self.router.positions.keys()) if self.router else []
-        priority_symbols = list(dict.fromkeys(position_symbols + symbols))  # Dedup preserving order
-        symbols_to_backfill = priority_symbols[:5]  # Fast startup - 5 symbols only
-        num_symbols = len(symbols_to_backfill)
+        symbols = list(dict.fromkeys(position_symbols + symbols))
         
-        logger.info("[BACKFILL] Starting initial backfill for %d symbols (limited from %d)", num_symbols, len(symbols))
+        fetch = fetch_history_windowed if self.scanner._init_client() else None
+        if fetch is None:
+            logger.warning("[WARMUP] No REST client; warming from cache only")
         
-        # Test if we're rate limited before starting
+        warmup = StartupWarmup(fetch_candles_func=fetch, store=candle_store, feature_engine=feature_engine)
+        warmup.on_symbol_ready = lambda sym, buffer: tier_scheduler.update_candle_counts(
+            sym, len(buffer.candles_1m), len(buffer.candles_5m)
+        )
         try:
-            test_sym = symbols_to_backfill[0] if symbols_to_backfill else "BTC-USD"
-            logger.info("[BACKFILL] Testing API availability...")
-            _time.sleep(2)  # Brief pause
-            test_candles = self.scanner.fetch_history(test_sym, granularity_s=60, lookback_minutes=5)
-            if not test_candles:
-                logger.warning("[BACKFILL] API test returned no data, skipping backfill - will warm up via WebSocket")
-                return
-            logger.info("[BACKFILL] API OK, proceeding with backfill...")
-        except Exception as e:
-            if "429" in str(e):
-                logger.warning("[BACKFILL] API rate limited, skipping backfill - will warm up via WebSocket")
-                return
-            logger.warning("[BACKFILL] API test failed: %s - skipping backfill", e)
+            report = await warmup.run(symbols, self.collector.get_buffer)
+        except Exception:
+            logger.warning("[WARMUP] Failed; symbols will warm up via WebSocket", exc_info=True)
             return
-        
-        # Process symbols with progress tracking and rate limiting
-        for idx, sym in enumerate(symbols_to_backfill):
-            buffer = self.collector.get_buffer(sym)
-            if buffer is None:
-                continue
-            
-            try:
-                # Fetch 1m candles (most important for live trading)
-                history_1m = self.scanner.fetch_history(sym, granularity_s=60, lookback_minutes=minutes_1m)
-                for candle in history_1m:
-                    buffer.add_1m(candle)
-                    total_1m += 1
-                
-                # Seed FeatureState from backfilled candles (last 20 to warm up indicators)
-                from logic.live_features import feature_engine
-                for candle in history_1m[-20:]:
-                    feature_engine.update(sym, candle, 0.0, 0.0)
-                
-                # Rate limit pause between API calls
-                _time.sleep(0.5)  # Reduced to 0.5s for faster backfill
-                
-                # Fetch 5m candles directly (faster than aggregating from 1m)
-                history_5m = self.scanner.fetch_history(sym, granularity_s=300, lookback_minutes=minutes_5m)
-                for candle in history_5m:
-                    buffer.add_5m_direct(candle)
-                    total_5m += 1
-                
-                # Fetch 1H candles for trend indicators (48 hours)
-                _time.sleep(0.5)
-                history_1h = self.scanner.fetch_history(sym, granularity_s=3600, lookback_minutes=48*60)
-                if history_1h:
-                    buffer.candles_1h = history_1h[-48:]
-                
-                # Fetch 1D candles for daily trend (30 days)
-                _time.sleep(0.5)
-                history_1d = self.scanner.fetch_history(sym, granularity_s=86400, lookback_minutes=30*24*60)
-                if history_1d:
-                    buffer.candles_1d = history_1d[-30:]
-                
-                # Update feature engine with higher TF data
-                if history_1h or history_1d:
-                    from logic.live_features import feature_engine
-                    feature_engine.update_higher_tf(sym, history_1h or [], history_1d or [])
-                
-                if history_1m or history_5m:
-                    success_count += 1
-                
-                # Rate limit pause between symbols
-                _time.sleep(2.0)  # 2s between symbols = very conservative
-                
-            except Exception as e:
-                if "429" in str(e):
-                    logger.warning("[BACKFILL] Rate limited at symbol %d, pausing...", idx)
-                    _time.sleep(5)  # Long pause on rate limit
-                else:
-                    logger.debug("[BACKFILL] Error on %s: %s", sym, e)
-            
-            # Progress indicator every 10 symbols
-            if (idx + 1) % 10 == 0:
-                print(f"\r[BACKFILL] Progress: {idx + 1}/{num_symbols} symbols...", end="", flush=True)
-        
-        # Clear progress line
-        if num_symbols >= 10:
-            print()
-        
-        if total_1m > 0 or total_5m > 0:
-            logger.info(
-                "[BACKFILL] Loaded %s 1m + %s 5m candles for %s/%s symbols",
-                total_1m,
-                total_5m,
-                success_count,
-                num_symbols,
-            )
-            self.state.log(f"Backfill: {total_1m} 1m, {total_5m} 5m candles", "DATA")
-            
-            # Mark backfilled symbols as warm in tier scheduler
-            for sym in symbols_to_backfill:
-                buffer = self.collector.get_buffer(sym) if self.collector else None
-                if buffer:
-                    tier_scheduler.update_candle_counts(
-                        sym,
-                        len(buffer.candles_1m),
-                        len(buffer.candles_5m)
-                    )
+        self.state.log(
+            f"Warmup: {report.warm}/{report.symbols} warm in {report.elapsed_s:.1f}s "
+            f"({report.candles_cached} cached, {report.candles_fetched} fetched)",
+            "DATA",
+        )
     
-    def _rehydrate_from_store_early(self, symbols: list[str]) -> int:
-        """
-        Rehydrate candle buffers from persistent storage BEFORE API backfill.
-        Returns count of symbols successfully warmed from cache.
-        """
-        warm_count = 0
-        try:
-            stored = candle_store.rehydrate_buffers(symbols, max_age_hours=4)
-            
-            for sym, data in stored.items():
-                buffer = self.collector.get_buffer(sym) if self.collector else None
-                if buffer is None:
-                    continue
-                
-                candles_1m = data.get("1m", [])
-                candles_5m = data.get("5m", [])
-                
-                # Add stored candles to buffer
-                for candle in candles_1m:
-                    buffer.add_1m(candle)
-                for candle in candles_5m:
-                    buffer.add_5m_direct(candle)
-                
-                # Count as warm if we have enough data
-                if len(candles_1m) >= 30:
-                    warm_count += 1
-                    
-            logger.info("[REHYDRATE] Loaded %d symbols from cache (warm: %d)", len(stored), warm_count)
-        except Exception as e:
-            logger.warning("[REHYDRATE] Error loading from cache: %s", e)
-        
-        return warm_count
-
     def _rehydrate_from_store(self, symbols: list[str]):
         """Rehydrate candle buffers from persistent storage on startup."""
         try:
-            stored = candle_store.rehydrate_buffers(symbols, max_age_hours=4)
+            stored = candle_store.rehydrate_arrays(symbols, max_age_hours=4)
             
             for sym, data in stored.items():
                 buffer = self.collector.get_buffer(sym) if self.collector else None
                 if buffer is None:
                     continue
                 
-                # Add stored candles to buffer
-                for candle in data.get("1m", []):
-                    buffer.add_1m(candle)
-                for candle in data.get("5m", []):
-                    buffer.add_5m_direct(candle)
+                # Bulk-load columns (5m first so 1m only aggregates newer buckets)
+                buffer.append_arrays("5m", *data["5m"].columns())
+                buffer.append_arrays("1m", *data["1m"].columns())
                 
                 # Update tier scheduler
                 tier_scheduler.update_candle_counts(
@@ -923,6 +927,11 @@ class TradingBotV2:
         tier_scheduler.on_ws_add = self._on_symbol_promoted_to_ws
         tier_scheduler.on_ws_remove = self._on_symbol_demoted_from_ws
         
+        if self.replay_path:
+            # No REST polling or backfill: replayed buffers hold only the recording
+            logger.info("[TIER] Replay: REST poller and backfill disabled")
+            return
+        
         # Initialize REST poller
         if self.scanner._init_client():
             self.rest_poller = RestPoller(
@@ -972,10 +981,8 @@ class TradingBotV2:
         # Update burst metrics if we have a buffer
         if candles_1m and len(candles_1m) >= 10:
             buf = CandleBuffer(symbol=symbol)
-            for c in candles_1m:
-                buf.add_1m(c)
-            for c in candles_5m:
-                buf.add_5m_direct(c)
+            buf.extend_1m(candles_1m)
+            buf.extend_5m(candles_5m)
             
             self.scanner.update_burst_metrics(
                 symbol=symbol,
@@ -991,10 +998,8 @@ class TradingBotV2:
         buffer = self.collector.get_buffer(symbol) if self.collector else None
         
         if buffer:
-            for candle in candles_1m:
-                buffer.add_1m(candle)
-            for candle in candles_5m:
-                buffer.add_5m_direct(candle)
+            buffer.extend_1m(candles_1m)
+            buffer.extend_5m(candles_5m)
             # Store higher timeframe candles in buffer
             if candles_1h:
                 buffer.candles_1h = candles_1h[-48:]  # Keep last 48 hours
@@ -1057,6 +1062,8 @@ class TradingBotV2:
     
     async def _clock_c_loop(self):
         """Clock C: Background slow context (every 30 min)."""
+        if self.replay_path:
+            return  # Universe is fixed to the recorded symbols
         while self._running:
             try:
                 await asyncio.sleep(30 * 60)  # 30 minutes
@@ -1091,190 +1098,136 @@ class TradingBotV2:
     
     async def _clock_b_loop(self):
         """Clock B: Rolling intraday context (every 5 seconds)."""
-        from logic.intelligence import intelligence
-        
         # Wait for initial data
         await asyncio.sleep(3)
         
-        # Track BTC regime update
-        last_btc_check = datetime.now(timezone.utc) - timedelta(minutes=5)
         last_counter_reset = datetime.now(timezone.utc)
         
         while self._running:
             try:
+                loop_began = time.perf_counter()
                 # Reset population counters every 5 seconds (not every loop)
-                if (datetime.now(timezone.utc) - last_counter_reset).total_seconds() >= 5:
-                    self.state.ticks_last_5s = 0
-                    self.state.candles_last_5s = 0
-                    self.state.events_last_5s = 0
-                    last_counter_reset = datetime.now(timezone.utc)
-                
-                if (datetime.now(timezone.utc) - self._last_config_reload).total_seconds() >= 10:
-                    self._config_manager.reload_if_changed()
-                    self._last_config_reload = datetime.now(timezone.utc)
+                with perf.span("clock_b.housekeeping"):
+                    if (datetime.now(timezone.utc) - last_counter_reset).total_seconds() >= 5:
+                        self.state.ticks_last_5s = 0
+                        self.state.candles_last_5s = 0
+                        self.state.events_last_5s = 0
+                        last_counter_reset = datetime.now(timezone.utc)
 
-                # Surface warm/cold status for dashboard and logging
-                tier_stats = tier_scheduler.get_stats()
-                self.state.tier1_count = tier_stats.get("tier1_ws", 0)
-                self.state.tier2_count = tier_stats.get("tier2_fast", 0)
-                self.state.tier3_count = tier_stats.get("tier3_slow", 0)
-                self.state.warm_symbols = tier_stats.get("warm", 0)
-                self.state.cold_symbols = tier_stats.get("cold", 0)
-                if self.backfill_service:
-                    self.state.pending_backfills = self.backfill_service.get_pending_count()
+                    if (datetime.now(timezone.utc) - self._last_config_reload).total_seconds() >= 10:
+                        self._config_manager.reload_if_changed()
+                        self._last_config_reload = datetime.now(timezone.utc)
 
-                # Update BTC regime every 2 minutes
-                if (datetime.now(timezone.utc) - last_btc_check).total_seconds() >= 120:
-                    intelligence.fetch_btc_trend()
-                    last_btc_check = datetime.now(timezone.utc)
-                    self.state.log(f"Market: {intelligence.regime_status}", "INTEL")
+                    # Surface warm/cold status for dashboard and logging
+                    tier_stats = tier_scheduler.get_stats()
+                    self.state.tier1_count = tier_stats.get("tier1_ws", 0)
+                    self.state.tier2_count = tier_stats.get("tier2_fast", 0)
+                    self.state.tier3_count = tier_stats.get("tier3_slow", 0)
+                    self.state.warm_symbols = tier_stats.get("warm", 0)
+                    self.state.cold_symbols = tier_stats.get("cold", 0)
+                    if self.backfill_service:
+                        self.state.pending_backfills = self.backfill_service.get_pending_count()
+                    
+                    # Opened/closed positions (any source) re-run their symbol's stages
+                    positions = set(self.router.positions) if self.router else set()
+                    for symbol in positions ^ self._position_symbols:
+                        self.dirty.mark(symbol)
+                    self._position_symbols = positions
                 
                 # Always show current prices, even without full data
-                self._update_live_prices()
+                with perf.span("clock_b.live_prices"):
+                    self._update_live_prices()
                 
                 # Adjust streaming set based on hot list + positions
-                await self._manage_streams()
+                with perf.span("clock_b.manage_streams"):
+                    await self._manage_streams()
                 
-                # Update burst metrics for all streaming symbols
-                for symbol in self.collector.symbols:
-                    buffer = self.collector.get_buffer(symbol)
-                    if buffer is None:
-                        continue
-                    
-                    # Need at least some candles for metrics (lowered threshold)
-                    if len(buffer.candles_1m) < 3:
-                        continue
-                    
-                    # Get universe info for daily baseline
-                    info = self.scanner.universe.get(symbol)
-                    atr_24h = info.atr_24h if info else 0
-                    
-                    # Update scanner burst metrics
-                    self.scanner.update_burst_metrics(
-                        symbol=symbol,
-                        candles_1m=buffer.candles_1m,
-                        candles_5m=buffer.candles_5m,
-                        vwap=buffer.vwap(30),
-                        atr_24h=atr_24h
+                # Update burst metrics for streaming symbols with new candles (one
+                # batched pass; daily baselines come from scanner.universe)
+                with perf.span("clock_b.burst_metrics"):
+                    stream_buffers = [
+                        buffer for buffer in map(self.collector.get_buffer, self.collector.symbols)
+                        if buffer is not None
+                    ]
+                    changed = self.dirty.select(
+                        "burst_metrics", ((buffer.symbol, buffer.seq) for buffer in stream_buffers)
+                    )
+                    self.scanner.update_burst_metrics_many(
+                        buffer for buffer in stream_buffers if buffer.symbol in changed
                     )
-                self.state.heartbeat_scanner = datetime.now(timezone.utc)
+                    self.state.heartbeat_scanner = datetime.now(timezone.utc)
                 
                 # ML freshness counts (cached only, no recompute)
-                from logic.intelligence import intelligence
-                total_ml = len(intelligence.live_ml)
-                fresh_ml = sum(1 for ml in intelligence.live_ml.values() if not ml.is_stale())
-                self.state.ml_total_count = total_ml
-                self.state.ml_fresh_count = fresh_ml
-                
-                # Probe a few non-streamed symbols with REST history to surface bursts
-                self._probe_unstreamed_history(limit=3, lookback_minutes=30)
+                with perf.span("clock_b.ml_counts"):
+                    from logic.intelligence import intelligence
+                    total_ml = len(intelligence.live_ml)
+                    fresh_ml = sum(1 for ml in intelligence.live_ml.values() if not ml.is_stale())
+                    self.state.ml_total_count = total_ml
+                    self.state.ml_fresh_count = fresh_ml
                 
                 # Compute hot list (side-effect updates scanner.hot_list)
-                self.scanner.compute_hot_list(top_n=20)  # Increased from 10 to 20
-                self._log_hot_leader_change()
-                
-                # REST probe more non-streamed symbols to improve spreads/eligibility (gaming PC)
-                self._rest_probe(limit=20)
+                with perf.span("clock_b.hot_list"):
+                    self.scanner.compute_hot_list(top_n=20)  # Increased from 10 to 20
+                    self._log_hot_leader_change()
                 
                 # Log burst metrics for hot list (Layer C)
-                now_utc = datetime.now(timezone.utc)
-                for rank, metrics in enumerate(self.scanner.hot_list.symbols[:10], 1):
-                    info = self.scanner.universe.get(metrics.symbol)
-                    burst_record = {
-                        "ts": utc_iso_str(now_utc),
-                        "type": "burst_metrics",
-                        "symbol": metrics.symbol,
-                        "price": metrics.price,
-                        "vol_spike": metrics.vol_spike,
-                        "range_spike": metrics.range_spike,
-                        "trend_15m": metrics.trend_15m,
-                        "trend_slope": metrics.trend_slope,
-                        "burst_score": metrics.burst_score,
-                        "vwap_distance": metrics.vwap_distance,
-                        "daily_move": metrics.daily_move,
-                        "rank": rank
-                    }
-                    if info:
-                        burst_record["tier"] = info.tier
-                    log_burst(burst_record, now_utc)
+                with perf.span("clock_b.burst_log"):
+                    now_utc = datetime.now(timezone.utc)
+                    for rank, metrics in enumerate(self.scanner.hot_list.symbols[:10], 1):
+                        info = self.scanner.universe.get(metrics.symbol)
+                        burst_record = {
+                            "ts": utc_iso_str(now_utc),
+                            "type": "burst_metrics",
+                            "symbol": metrics.symbol,
+                            "price": metrics.price,
+                            "vol_spike": metrics.vol_spike,
+                            "range_spike": metrics.range_spike,
+                            "trend_15m": metrics.trend_15m,
+                            "trend_slope": metrics.trend_slope,
+                            "burst_score": metrics.burst_score,
+                            "vwap_distance": metrics.vwap_distance,
+                            "daily_move": metrics.daily_move,
+                            "rank": rank
+                        }
+                        if info:
+                            burst_record["tier"] = info.tier
+                        log_burst(burst_record, now_utc)
                 
                 # Update dashboard burst leaderboard
-                self._update_burst_leaderboard()
+                with perf.span("clock_b.leaderboard"):
+                    self._update_burst_leaderboard()
                 
                 # Run strategy analysis on hot symbols
-                await self._run_strategy_analysis()
+                with perf.span("clock_b.strategy_analysis"):
+                    await self._run_strategy_analysis()
                 
-                # Refresh real portfolio from Coinbase (every 15 seconds) - skip in PAPER
-                if not hasattr(self, '_last_portfolio_refresh'):
-                    # Force immediate first refresh by setting to old time
-                    self._last_portfolio_refresh = datetime.now(timezone.utc) - timedelta(seconds=20)
-                    self._last_pnl_log = datetime.now(timezone.utc)
-                if not hasattr(self, '_last_status_write'):
-                    self._last_status_write = datetime.now(timezone.utc)
-                if (datetime.now(timezone.utc) - self._last_portfolio_refresh).total_seconds() >= 60:  # Reduced from 15s to avoid rate limits
-                    if self.mode == TradingMode.LIVE and settings.is_configured:
-                        from core.portfolio import portfolio_tracker
-                        from core.logger import log_pnl_snapshot, utc_iso_str as pnl_utc_iso_str
-                        from core.persistence import sync_with_exchange
-                        
-                        try:
-                            snap = portfolio_tracker.get_snapshot()
-                            if snap:
-                                self.router._exchange_sync._portfolio_snapshot = snap
-                                self.router._exchange_sync._last_snapshot_at = datetime.now(timezone.utc)
-                                self.router._exchange_sync._sync_degraded = False
-                                # Update state with portfolio values
-                                self.state.portfolio_value = snap.total_value
-                                self.state.cash_balance = snap.total_cash
-                                self.state.holdings_value = snap.total_crypto
-                            self._last_portfolio_refresh = datetime.now(timezone.utc)
-                            
-                            # Sync positions with exchange (detect manual trades)
-                            try:
-                                client = getattr(getattr(self.router, "_exchange_sync", None), "_client", None)
-                                if client:
-                                    self.router._sync_positions_from_exchange()
-                            except Exception:
-                                logger.debug("Position sync refresh failed", exc_info=True)
-                            
-                            # Log PnL snapshot every 5 minutes
-                            if (datetime.now(timezone.utc) - self._last_pnl_log).total_seconds() >= 300:
-                                if snap:
-                                    log_pnl_snapshot({
-                                        "ts": pnl_utc_iso_str(),
-                                        "equity": snap.total_value,
-                                        "cash": snap.total_cash,
-                                        "crypto": snap.total_crypto,
-                                        "unrealized_pnl": snap.total_unrealized_pnl,
-                                        "realized_pnl": self.router.daily_stats.total_pnl,
-                                        "position_count": snap.position_count,
-                                    })
-                                self._last_pnl_log = datetime.now(timezone.utc)
-                        except Exception:
-                            logger.warning("Portfolio refresh failed", exc_info=True)
-                    else:
-                        self._last_portfolio_refresh = datetime.now(timezone.utc)
-                
-                # Periodic status snapshot for health_check when bot not attached
-                if (datetime.now(timezone.utc) - self._last_status_write).total_seconds() >= 30:
-                    self._write_status_snapshot()
-                    self._write_health_log()
-                    self._last_status_write = datetime.now(timezone.utc)
+                with perf.span("clock_b.status_write"):
+                    if not hasattr(self, '_last_status_write'):
+                        self._last_status_write = datetime.now(timezone.utc)
+                    # Periodic status snapshot for health_check when bot not attached
+                    if (datetime.now(timezone.utc) - self._last_status_write).total_seconds() >= 30:
+                        self._write_status_snapshot()
+                        self._write_health_log()
+                        self._last_status_write = datetime.now(timezone.utc)
                 
                 # Update positions state
-                self._update_positions_state()
+                with perf.span("clock_b.positions_state"):
+                    self._update_positions_state()
                 
                 # Update WS status from collector (use is_receiving for data flow, not just socket open)
-                if hasattr(self.collector, 'is_receiving'):
-                    self.state.ws_ok = self.collector.is_receiving
-                    self.state.ws_last_age = self.collector.last_message_age
-                    if hasattr(self.collector, 'total_reconnects'):
-                        self.state.ws_reconnect_count = self.collector.total_reconnects
-                elif hasattr(self.collector, 'is_connected'):
-                    self.state.ws_ok = self.collector.is_connected
+                with perf.span("clock_b.ws_status"):
+                    if hasattr(self.collector, 'is_receiving'):
+                        self.state.ws_ok = self.collector.is_receiving
+                        self.state.ws_last_age = self.collector.last_message_age
+                        if hasattr(self.collector, 'total_reconnects'):
+                            self.state.ws_reconnect_count = self.collector.total_reconnects
+                    elif hasattr(self.collector, 'is_connected'):
+                        self.state.ws_ok = self.collector.is_connected
+
+                    # Update streaming count
+                    self.state.universe.symbols_streaming = len(self.collector.symbols)
                 
-                # Update streaming count
-                self.state.universe.symbols_streaming = len(self.collector.symbols)
+                perf.record("clock_b.loop", time.perf_counter() - loop_began)
                 
                 await asyncio.sleep(2)  # Faster loop for more responsive signals
                 
@@ -1344,7 +1297,8 @@ class TradingBotV2:
         if (now - self._last_predict_update).total_seconds() >= 30:
             self._last_predict_update = now
             predict_status = self._scanner_manager.update_predictive_ranker(
-                get_buffer_func=lambda s: self.collector.get_buffer(s) if self.collector else None
+                get_buffer_func=lambda s: self.collector.get_buffer(s) if self.collector else None,
+                dirty=self.dirty,
             )
             if predict_status.get("actionable", 0) > 0:
                 self.state.predictive_plays = predict_status.get("top_plays", [])
@@ -1423,7 +1377,7 @@ class TradingBotV2:
             logger.warning("Failed to write health snapshot", exc_info=True)
     
     async def _run_strategy_analysis(self):
-        """Run strategy analysis on focus coin and manage trades."""
+        """Run strategy analysis on the focus coin and hot list, and manage trades."""
         # Check kill switch
         if self.router.daily_stats.should_stop:
             self.state.kill_switch = True
@@ -1458,7 +1412,10 @@ class TradingBotV2:
             if focus_buffer:
                 self._update_focus_coin_basic(focus_symbol, focus_buffer)
         
-        # Analyze each candidate; focus updates only for focus symbol
+        # Evaluate changed candidates as one batch on the strategy worker pool
+        if focus_symbol and focus_symbol != prev_focus:
+            self.dirty.mark(focus_symbol)
+        buffers = []
         for symbol in candidates:
             buffer = self.collector.get_buffer(symbol)
             if buffer is None:
@@ -1466,9 +1423,18 @@ class TradingBotV2:
                 if symbol == focus_symbol:
                     self._clear_signal_state("No candle data")
                 continue
-            
-            features = self._build_features(symbol, buffer)
-            strat_signal = self.orchestrator.analyze(symbol, buffer, features, market_context)
+            buffers.append((symbol, buffer))
+        changed = self.dirty.select("strategies", ((symbol, buffer.seq) for symbol, buffer in buffers))
+        batch = [
+            (symbol, buffer, self._build_features(symbol, buffer))
+            for symbol, buffer in buffers if symbol in changed
+        ]
+        with perf.span("strategy.batch"):
+            strat_signals = self.orchestrator.analyze_many(batch, market_context)
+        
+        # Apply results in candidate order; focus updates only for focus symbol
+        for symbol, buffer, features in batch:
+            strat_signal = strat_signals[symbol]
             if strat_signal is None:
                 self._last_strategy_signals.pop(symbol, None)
                 # If focus symbol has no signal, clear stale signal
@@ -1583,7 +1549,8 @@ class TradingBotV2:
         # Check for exits on all positions
         self.state.heartbeat_order_router = datetime.now(timezone.utc)
         for symbol in list(self.router.positions.keys()):
-            result = await self.router.check_exits(symbol)
+            with perf.span("router.check_exits", symbol):
+                result = await self.router.check_exits(symbol)
             if result:
                 self.orchestrator.reset(symbol)
                 emoji = "✅" if result.pnl >= 0 else "❌"
@@ -1770,9 +1737,8 @@ class TradingBotV2:
         try:
             # Minimal REST ping to validate reachability (public endpoint)
             def _rest_ping():
-                from coinbase.rest import RESTClient
-                client = RESTClient()
-                client.get_public_candles(product_id="BTC-USD", granularity="ONE_MINUTE", start=None, end=None)
+                rest_pool.public.call("get_public_candles", product_id="BTC-USD",
+                                      granularity="ONE_MINUTE", start=None, end=None)
 
             results = run_preflight(self.state, self.collector, self.router, rest_ping_func=_rest_ping)
             ok = results.get("api_ok", False) and results.get("ws_ok", False) and results.get("sync_fresh", False) \
@@ -2009,8 +1975,15 @@ class TradingBotV2:
             self.state.rest_polls_tier2 = poller_stats.get("polls_tier2", 0)
             self.state.rest_polls_tier3 = poller_stats.get("polls_tier3", 0)
             self.state.rest_requests = poller_stats.get("requests", 0)
-            self.state.rest_429s = poller_stats.get("total_429s", 0)
-            self.state.rest_rate_degraded = poller_stats.get("is_degraded", False)
+        
+        # Shared REST budget (all callers)
+        self.state.rest_429s = rest_scheduler.total_429s
+        self.state.rest_rate_degraded = rest_scheduler.is_degraded
+        
+        # Event-loop lag (p99 over the last minute)
+        lag = self.loop_monitor.get_stats()
+        self.state.loop_lag_ms = lag["p99_ms"]
+        self.state.loop_lag_max_ms = lag["max_ms"]
 
         # BTC regime and sector tracking from intelligence
         from logic.intelligence import intelligence
@@ -2058,6 +2031,7 @@ Examples:
   python run_v2.py --paper           # Force paper trading mode
   python run_v2.py --live            # Force live trading mode  
   python run_v2.py --mode=live       # Explicit mode setting
+  python run_v2.py --paper --replay logs/paper/ticks/ticks_2025-01-06.bin --replay-speed max
         """
     )
     
@@ -2073,6 +2047,10 @@ Examples:
                        help='Run preflight checks and exit without starting the bot')
     parser.add_argument('--launcher', action='store_true',
                        help='Indicates bot is managed by launcher (enables controller integration)')
+    parser.add_argument('--replay', metavar='PATH',
+                       help='Replay a ticks_*.bin capture or 1m candle directory instead of the live feed')
+    parser.add_argument('--replay-speed', default=None,
+                       help='Replay speed multiplier: 1, 10, ... or max (default 1)')
     
     args = parser.parse_args()
     
@@ -2095,6 +2073,12 @@ Examples:
     else:
         print(f"📋 Using {original_mode.upper()} mode from environment")
     
+    if args.replay:
+        if args.live or args.mode == 'live':
+            print("❌ --replay is only supported in paper mode")
+            sys.exit(1)
+        print(f"⏯️  Replay: {args.replay} at {args.replay_speed or '1'}x")
+    
     # Reload configuration if mode was overridden
     if args.paper or args.live or args.mode:
         from importlib import reload
@@ -2104,6 +2088,10 @@ Examples:
     # Import settings (after any reload)
     from core.config import settings
     
+    if (args.replay or settings.replay_path) and settings.trading_mode != "paper":
+        print("❌ Replay (--replay / REPLAY_PATH) is only supported in paper mode")
+        sys.exit(1)
+    
     print(f"🎯 Trading Mode: {settings.trading_mode}")
     print(f"🔑 API Keys: {'Configured' if settings.coinbase_api_key else 'Missing'}")
 
@@ -2132,7 +2120,7 @@ Examples:
             if input("Continue anyway? (y/N): ").lower() != 'y':
                 sys.exit(1)
     
-    bot = TradingBotV2()
+    bot = TradingBotV2(replay_path=args.replay, replay_speed=args.replay_speed)
     shutdown_requested = False
     
     # Controller integration for launcher-managed mode
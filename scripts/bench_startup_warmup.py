@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time to the first warm symbol.
+
+Builds a temporary CandleStore with cached history for part of the universe
+(1m/5m ending ``--stale-min`` minutes ago, full 1h/1d), then warms the
+buffers with the legacy sequential backfill (API probe, four REST calls per
+symbol for 5 symbols, then a cache load for the first 15) and with
+``StartupWarmup``. REST calls are simulated with a fixed latency and paced
+by a ``RestScheduler`` at ``--rps``; no network is used.
+
+The legacy backfill blocks startup, so no symbol can trade before it ends.
+
+Usage:
+    python scripts/bench_startup_warmup.py [--symbols 30] [--cached 0.8] [--latency-ms 150] [--rps 8]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.candle_store import CandleStore  # noqa: E402
+from core.models import Candle, CandleBuffer  # noqa: E402
+from core.rest_scheduler import RestScheduler  # noqa: E402
+from datafeeds.collectors.warmup import StartupWarmup  # noqa: E402
+from logic.live_features import LiveFeatureEngine  # noqa: E402
+
+_TIMEFRAMES = {"1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+
+def _candles(tf_seconds: int, start: float, end: float, price: float = 10.0) -> list[Candle]:
+    first = int(start // tf_seconds + 1) * tf_seconds
+    return [
+        Candle(datetime.fromtimestamp(ts, timezone.utc), price, price * 1.01, price * 0.99, price * 1.005, 5.0)
+        for ts in range(first, int(end) - tf_seconds + 1, tf_seconds)
+    ]
+
+
+def build_store(path: Path, symbols: list[str], stale_minutes: int) -> CandleStore:
+    store = CandleStore(base_dir=path)
+    now = time.time()
+    for symbol in symbols:
+        for tf, seconds in _TIMEFRAMES.items():
+            end = now - stale_minutes * 60 if tf in ("1m", "5m") else now
+            store.write_candles(symbol, _candles(seconds, end - max(seconds * 60, 3 * 3600), end), tf)
+    store.flush_all()
+    return store
+
+
+def simulated_fetch(scheduler: RestScheduler, latency: float):
+    """fetch_history_windowed stand-in: one paced request of ``latency`` seconds."""
+    def fetch(symbol: str, granularity_s: int, lookback_minutes: int) -> list[Candle]:
+        scheduler.call(time.sleep, latency, symbol=symbol)
+        now = time.time()
+        return _candles(granularity_s, now - lookback_minutes * 60, now)
+    return fetch
+
+
+def legacy_startup(symbols: list[str], fetch, store: CandleStore) -> tuple[float, int]:
+    """The pre-warmup sequence; returns (seconds until startup continues, warm symbols)."""
+    began = time.monotonic()
+    engine = LiveFeatureEngine()
+    buffers = {s: CandleBuffer(symbol=s, log_5m=False) for s in symbols}
+    if fetch(symbols[0], 60, 5):  # API probe
+        for symbol in symbols[:5]:
+            buffer = buffers[symbol]
+            history_1m = fetch(symbol, 60, 60)
+            buffer.extend_1m(history_1m)
+            for candle in history_1m[-20:]:
+                engine.update(symbol, candle, 0.0, 0.0)
+            buffer.extend_5m(fetch(symbol, 300, 60))
+            buffer.candles_1h = fetch(symbol, 3600, 48 * 60)[-48:]
+            buffer.candles_1d = fetch(symbol, 86400, 30 * 24 * 60)[-30:]
+            engine.update_higher_tf(symbol, list(buffer.candles_1h), list(buffer.candles_1d))
+    for symbol, data in store.rehydrate_arrays(symbols[:15], max_age_hours=4).items():
+        buffers[symbol].append_arrays("5m", *data["5m"].columns())
+        buffers[symbol].append_arrays("1m", *data["1m"].columns())
+    return time.monotonic() - began, sum(b.is_warm for b in buffers.values())
+
+
+def warmup_startup(symbols: list[str], fetch, store: CandleStore):
+    buffers = {s: CandleBuffer(symbol=s, log_5m=False) for s in symbols}
+    warmup = StartupWarmup(fetch, store=store, feature_engine=LiveFeatureEngine())
+    return asyncio.run(warmup.run(symbols, buffers.get))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark startup warmup (time to first warm symbol)")
+    parser.add_argument("--symbols", type=int, default=30, help="Tier-1 (streamed) symbols")
+    parser.add_argument("--cached", type=float, default=0.8, help="Fraction of symbols with cached history")
+    parser.add_argument("--stale-min", type=int, default=15, help="Age of the newest cached 1m/5m bar (minutes)")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Simulated REST round trip")
+    parser.add_argument("--rps", type=float, default=8.0, help="REST scheduler rate (requests/s)")
+    args = parser.parse_args(argv)
+
+    symbols = [f"SYM{i}-USD" for i in range(args.symbols)]
+    cached = symbols[: int(len(symbols) * args.cached)]
+    latency = args.latency_ms / 1000
+    print(f"{len(symbols)} symbols ({len(cached)} cached, {args.stale_min}m stale), "
+          f"{args.latency_ms:.0f}ms REST latency at {args.rps:g} req/s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = build_store(Path(tmp) / "legacy", cached, args.stale_min)
+        elapsed, warm = legacy_startup(symbols, simulated_fetch(RestScheduler(args.rps, args.rps), latency), store)
+        print(f"  legacy sequential: first warm {elapsed:6.2f}s  total {elapsed:6.2f}s  "
+              f"warm {warm}/{len(symbols)}")
+
+        store = build_store(Path(tmp) / "warmup", cached, args.stale_min)
+        report = warmup_startup(symbols, simulated_fetch(RestScheduler(args.rps, args.rps), latency), store)
+        first = report.first_warm_s if report.first_warm_s is not None else float("nan")
+        print(f"  StartupWarmup:     first warm {first:6.2f}s  total {report.elapsed_s:6.2f}s  "
+              f"warm {report.warm}/{report.symbols}  ({report.requests} requests, "
+              f"{report.skipped} skipped; {elapsed / first:.1f}x faster to first warm)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
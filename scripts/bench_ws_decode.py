@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Replay benchmark for WS message decoding.
+
+Replays a message capture through the legacy decode path (stdlib json,
+list symbol scan, floats/spread computed twice) and through
+``WsDecoder`` with every available JSON parser, and reports messages/s.
+
+Capture sources:
+    --capture logs/live/ticks/ticks_2025-01-06.bin   binary tick capture (rebuilt into WS frames)
+    --capture frames.jsonl                           one raw WS frame per line
+    (default)                                        synthetic frames for --symbols symbols
+
+Usage:
+    python scripts/bench_ws_decode.py [--capture PATH] [--messages 200000] [--symbols 200]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.tick_capture import KIND_TRADE, SIDE_BUY, SIDE_SELL, open_capture  # noqa: E402
+from datafeeds.collectors.ws_decode import JSON_PARSERS, WsDecoder  # noqa: E402
+
+_SIDE_NAMES = {SIDE_BUY: "BUY", SIDE_SELL: "SELL"}
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f") + "Z"
+
+
+def _ticker_frame(symbol: str, ts: float, price: float, bid, ask) -> str:
+    ticker = {
+        "type": "ticker", "product_id": symbol, "price": f"{price:.8g}",
+        "volume_24_h": "123456.78", "low_24_h": f"{price * 0.95:.8g}", "high_24_h": f"{price * 1.05:.8g}",
+        "low_52_w": f"{price * 0.5:.8g}", "high_52_w": f"{price * 2:.8g}", "price_percent_chg_24_h": "1.23",
+        "best_bid": "" if bid is None else f"{bid:.8g}", "best_bid_quantity": "10.5",
+        "best_ask": "" if ask is None else f"{ask:.8g}", "best_ask_quantity": "8.25",
+    }
+    return json.dumps({"channel": "ticker", "client_id": "", "timestamp": _iso(ts), "sequence_num": 0,
+                       "events": [{"type": "update", "tickers": [ticker]}]})
+
+
+def _trade_frame(symbol: str, ts: float, price: float, size: float, side: str) -> str:
+    trade = {"trade_id": "1", "product_id": symbol, "price": f"{price:.8g}", "size": f"{size:.8g}",
+             "side": side, "time": _iso(ts)}
+    return json.dumps({"channel": "market_trades", "client_id": "", "timestamp": _iso(ts), "sequence_num": 0,
+                       "events": [{"type": "update", "trades": [trade]}]})
+
+
+def frames_from_capture(path: Path, limit: int) -> tuple[list[str], list[str]]:
+    """Load raw frames (.jsonl) or rebuild them from a binary tick capture."""
+    if path.suffix == ".jsonl":
+        frames = [line for line in path.read_text().splitlines() if line.strip()][:limit]
+        symbols = set()
+        for frame in frames:
+            symbols.update(
+                item.get("product_id")
+                for event in json.loads(frame).get("events", [])
+                for item in event.get("tickers", []) + event.get("trades", [])
+            )
+        return frames, sorted(s for s in symbols if s)
+
+    capture = open_capture(path)
+    records = capture.records[:limit]
+    names = capture.symbol_of(records)
+    frames = []
+    for rec, symbol in zip(records, names):
+        ts = int(rec["ts_ns"]) / 1e9
+        price = float(rec["price"])
+        if rec["kind"] == KIND_TRADE:
+            frames.append(_trade_frame(symbol, ts, price, float(rec["size"]), _SIDE_NAMES.get(int(rec["side"]), "")))
+        else:
+            bid, ask = float(rec["bid"]), float(rec["ask"])
+            frames.append(_ticker_frame(symbol, ts, price, None if bid != bid else bid, None if ask != ask else ask))
+    return frames, list(capture.symbols)
+
+
+def synthetic_frames(count: int, n_symbols: int) -> tuple[list[str], list[str]]:
+    rng = random.Random(7)
+    symbols = [f"SYM{i}-USD" for i in range(n_symbols)]
+    # The feed carries products we are not subscribed to as well
+    feed = symbols + [f"OTHER{i}-USD" for i in range(n_symbols // 4)]
+    ts = 1_736_164_800.0
+    frames = []
+    for _ in range(count):
+        ts += rng.random() * 0.01
+        symbol = rng.choice(feed)
+        price = rng.uniform(0.1, 100.0)
+        if rng.random() < 0.4:
+            frames.append(_trade_frame(symbol, ts, price, rng.uniform(0.1, 50), rng.choice(("BUY", "SELL"))))
+        else:
+            frames.append(_ticker_frame(symbol, ts, price, price * 0.999, price * 1.001))
+    return frames, symbols
+
+
+def legacy_decode(frames: list[str], symbols: list[str]) -> int:
+    """The pre-WsDecoder per-message work (json.loads, list scan, double conversions)."""
+    count = 0
+    for message in frames:
+        data = json.loads(message)
+        if data.get("type") == "error":
+            continue
+        channel = data.get("channel")
+        if channel == "ticker":
+            for event in data.get("events", []):
+                for ticker in event.get("tickers", []):
+                    symbol = ticker.get("product_id")
+                    if symbol not in symbols:
+                        continue
+                    price = float(ticker.get("price", 0))
+                    bid = ticker.get("best_bid")
+                    ask = ticker.get("best_ask")
+                    if price <= 0:
+                        continue
+                    bid_f = float(bid) if bid else None
+                    ask_f = float(ask) if ask else None
+                    if bid and ask:
+                        mid = (float(bid) + float(ask)) / 2
+                        if mid > 0:
+                            round((float(ask) - float(bid)) / mid * 10000, 2)
+                    spread_bps = None
+                    if bid and ask:
+                        mid = (float(bid) + float(ask)) / 2
+                        if mid > 0:
+                            spread_bps = round((float(ask) - float(bid)) / mid * 10000, 2)
+                    count += bid_f is not None and ask_f is not None and spread_bps is not None
+        elif channel == "market_trades":
+            for event in data.get("events", []):
+                for trade in event.get("trades", []):
+                    symbol = trade.get("product_id")
+                    if symbol not in symbols:
+                        continue
+                    float(trade.get("price", 0))
+                    float(trade.get("size", 0))
+                    count += 1
+    return count
+
+
+def decoder_decode(frames: list[str], decoder: WsDecoder) -> int:
+    count = 0
+    for message in frames:
+        data = decoder.decode(message)
+        if data is None:
+            continue
+        channel = data.get("channel")
+        if channel == "ticker":
+            for _ in decoder.tickers(data):
+                count += 1
+        elif channel == "market_trades":
+            for _ in decoder.trades(data):
+                count += 1
+    return count
+
+
+def _rate(fn, frames, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WS message decoding")
+    parser.add_argument("--capture", type=Path, help="ticks_*.bin capture or raw-frame .jsonl")
+    parser.add_argument("--messages", type=int, default=200_000, help="Max frames to replay")
+    parser.add_argument("--symbols", type=int, default=200, help="Subscribed symbols (synthetic feed)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best is reported)")
+    args = parser.parse_args(argv)
+
+    if args.capture:
+        frames, symbols = frames_from_capture(args.capture, args.messages)
+    else:
+        frames, symbols = synthetic_frames(args.messages, args.symbols)
+    print(f"Replaying {len(frames):,} frames, {len(symbols)} subscribed symbols")
+
+    baseline = _rate(lambda: legacy_decode(frames, list(symbols)), frames, args.repeat)
+    print(f"  legacy (json + list scan): {baseline:>12,.0f} msg/s")
+    for name in JSON_PARSERS:
+        decoder = WsDecoder(symbols, parser=name)
+        rate = _rate(lambda: decoder_decode(frames, decoder), frames, args.repeat)
+        print(f"  WsDecoder[{name}]:{' ' * (16 - len(name))}{rate:>12,.0f} msg/s  ({rate / baseline:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,3 +24,16 @@ def clear_test_cooldowns():
     for f in cooldown_files:
         if f.exists():
             f.unlink()
+
+
+@pytest.fixture
+def tmp_logs_dir(tmp_path, monkeypatch):
+    """Send JSONL logs (core.logger families and the WARNING+ events file) to tmp_path."""
+    import core.logger
+    import core.logging_utils
+
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    monkeypatch.setattr(core.logger, "get_logs_dir", lambda mode=None: logs_dir)
+    monkeypatch.setattr(core.logging_utils, "get_logs_dir", lambda mode=None: logs_dir)
+    return logs_dir
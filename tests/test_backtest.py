@@ -0,0 +1,231 @@
+"""Tests for the offline backtest replay."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import BacktestConfig, BacktestEngine, CandleFrame, iter_candles, load_parquet_frames
+from core.helpers import utc_now
+from logic.strategies.base import SignalDirection, StrategySignal
+
+T0 = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+def _frame(symbol: str, closes: list[float], start: datetime = T0) -> CandleFrame:
+    closes = np.asarray(closes, dtype=np.float64)
+    opens = np.r_[closes[0], closes[:-1]]
+    ts = int(start.timestamp()) + 60 * np.arange(len(closes), dtype=np.int64)
+    return CandleFrame(
+        symbol, ts, opens, np.maximum(opens, closes) * 1.001,
+        np.minimum(opens, closes) * 0.999, closes, np.full(len(closes), 10.0),
+    )
+
+
+class _OneShotOrchestrator:
+    """Emits a single long signal for ``symbol`` at candle index ``at``."""
+
+    def __init__(self, symbol: str, at: int, stop_pct: float = 0.02, tp_pct: float = 0.03):
+        self.symbol = symbol
+        self.at = at
+        self.stop_pct = stop_pct
+        self.tp_pct = tp_pct
+        self.seen = 0
+        self.clock_readings = []
+
+    def analyze(self, symbol, buffer, features, market_context):
+        if symbol != self.symbol:
+            return None
+        self.seen += 1
+        self.clock_readings.append(utc_now())
+        if self.seen != self.at:
+            return None
+        price = buffer.last_price
+        return StrategySignal(
+            symbol=symbol,
+            strategy_id="one_shot",
+            direction=SignalDirection.LONG,
+            edge_score_base=90.0,
+            entry_price=price,
+            stop_price=price * (1 - self.stop_pct),
+            tp1_price=price * (1 + self.tp_pct),
+            tp2_price=price * (1 + 2 * self.tp_pct),
+        )
+
+    def reset(self, symbol):
+        pass
+
+
+def test_iter_candles_merges_by_time_then_symbol():
+    frames = {
+        "B-USD": _frame("B-USD", [1.0, 2.0, 3.0]),
+        "A-USD": _frame("A-USD", [10.0, 20.0], start=T0 + timedelta(minutes=1)),
+    }
+    stream = [(s, c.timestamp, c.close) for s, c in iter_candles(frames)]
+    assert stream == [
+        ("B-USD", T0, 1.0),
+        ("A-USD", T0 + timedelta(minutes=1), 10.0),
+        ("B-USD", T0 + timedelta(minutes=1), 2.0),
+        ("A-USD", T0 + timedelta(minutes=2), 20.0),
+        ("B-USD", T0 + timedelta(minutes=2), 3.0),
+    ]
+
+
+def test_load_parquet_frames_filters_and_dedupes(tmp_path):
+    rows = [
+        {"ts": "2025-01-06T00:01:00.000Z", "type": "candle_1m", "symbol": "BTC-USD",
+         "open": 2, "high": 2, "low": 2, "close": 2, "volume": 1},
+        {"ts": "2025-01-06T00:00:00.000Z", "type": "candle_1m", "symbol": "BTC-USD",
+         "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1},
+        {"ts": "2025-01-06T00:00:00.000Z", "type": "candle_5m", "symbol": "BTC-USD",
+         "open": 9, "high": 9, "low": 9, "close": 9, "volume": 9},
+        {"ts": "2025-01-06T00:00:00.000Z", "type": "candle_1m", "symbol": "ETH-USD",
+         "open": 5, "high": 5, "low": 5, "close": 5, "volume": 1},
+    ]
+    path = tmp_path / "candles_1m_2025-01-06.parquet"
+    pd.DataFrame(rows).to_parquet(path, index=False)
+
+    frames = load_parquet_frames([path], symbols=["BTC-USD"])
+    assert list(frames) == ["BTC-USD"]
+    btc = frames["BTC-USD"]
+    assert btc.ts.tolist() == [int(T0.timestamp()), int(T0.timestamp()) + 60]
+    assert btc.close.tolist() == [1.0, 2.0]
+
+
+def test_engine_fills_and_exits_on_simulated_clock():
+    # Flat for 40 minutes, then a steady climb through TP1
+    closes = [100.0] * 40 + [100.0 + i for i in range(1, 20)]
+    frames = {"SOL-USD": _frame("SOL-USD", closes)}
+    orchestrator = _OneShotOrchestrator("SOL-USD", at=35)
+    engine = BacktestEngine(
+        BacktestConfig(live_gates=False, trade_usd=5.0, seed=1),
+        orchestrator=orchestrator,
+    )
+    report = engine.run(iter_candles(frames))
+
+    assert report.candles == len(closes)
+    assert report.signals == 1
+    assert len(report.trades) == 1
+    trade = report.trades[0]
+    assert trade.strategy_id == "one_shot"
+    assert trade.exit_reason == "tp1"
+    assert trade.pnl > 0
+    # Entry at the close of the 35th candle, exit at the close of the first
+    # candle whose high crosses TP1
+    assert trade.entry_time == T0 + timedelta(minutes=35)
+    assert trade.exit_time == T0 + timedelta(minutes=43)
+    assert trade.exit_price == pytest.approx(trade.entry_price * 1.03, rel=1e-3)
+    assert orchestrator.clock_readings[0] == T0 + timedelta(minutes=1)
+
+    stats = report.by_strategy["one_shot"]
+    assert (stats.trades, stats.wins, stats.signals) == (1, 1, 1)
+    assert stats.win_rate == pytest.approx(100.0)
+    assert report.final_balance == pytest.approx(engine.config.paper.paper_start_balance + trade.pnl)
+    assert report.candles_per_sec > 0
+    # Wall clock is restored after the run
+    assert abs((utc_now() - datetime.now(timezone.utc)).total_seconds()) < 5
+
+
+def test_engine_stop_and_time_stop():
+    closes = [100.0] * 40 + [95.0] * 5
+    report = BacktestEngine(
+        BacktestConfig(live_gates=False, trade_usd=5.0),
+        orchestrator=_OneShotOrchestrator("SOL-USD", at=35),
+    ).run(iter_candles({"SOL-USD": _frame("SOL-USD", closes)}))
+    assert [t.exit_reason for t in report.trades] == ["stop"]
+    assert report.by_strategy["one_shot"].losses == 1
+
+    config = BacktestConfig(live_gates=False, trade_usd=5.0)
+    config.paper.max_hold_minutes = 10
+    report = BacktestEngine(
+        config, orchestrator=_OneShotOrchestrator("SOL-USD", at=5),
+    ).run(iter_candles({"SOL-USD": _frame("SOL-USD", [100.0] * 30)}))
+    trade = report.trades[0]
+    assert trade.exit_reason == "time_stop"
+    assert trade.exit_time - trade.entry_time == timedelta(minutes=10)
+
+
+def test_sweep_grid_and_config_mapping():
+    from backtest.sweep import build_config, expand_grid
+
+    grid = {"paper.bf_impulse_strong_pct": [4.0, 5.0], "orchestrator.enable_vwap_reclaim": [True, False]}
+    combos = expand_grid(grid)
+    assert len(combos) == 4
+    assert combos[0] == {"paper.bf_impulse_strong_pct": 4.0, "orchestrator.enable_vwap_reclaim": True}
+
+    config, orch, overrides = build_config({
+        "paper.bf_impulse_strong_pct": 4.0,
+        "orchestrator.enable_vwap_reclaim": False,
+        "settings.vol_spike_threshold": 2.0,
+        "spread_bps": 8.0,
+    })
+    assert config.paper.bf_impulse_strong_pct == 4.0
+    assert config.spread_bps == 8.0
+    assert orch.enable_vwap_reclaim is False
+    assert overrides == {"vol_spike_threshold": 2.0}
+    with pytest.raises(ValueError):
+        build_config({"paper.not_a_field": 1})
+
+
+def test_sweep_arrow_is_memory_mapped(tmp_path):
+    from backtest.sweep import CandleArrow, write_candle_arrow
+
+    frames = {
+        "B-USD": _frame("B-USD", [1.0, 2.0, 3.0]),
+        "A-USD": _frame("A-USD", [10.0, 20.0]),
+    }
+    candles = CandleArrow(write_candle_arrow(frames, tmp_path / "candles.arrow"))
+    assert candles.symbols == ["A-USD", "B-USD"]
+    b = candles.frame("B-USD")
+    assert b.close.tolist() == [1.0, 2.0, 3.0]
+    assert b.ts.tolist() == frames["B-USD"].ts.tolist()
+    assert not b.close.flags.writeable  # View into the mapping, not a copy
+
+
+def test_sweep_runner_merges_and_resumes(tmp_path, monkeypatch):
+    from backtest import sweep
+
+    frames = {s: _frame(s, [100.0 + (i % 7) for i in range(120)]) for s in ("A-USD", "B-USD")}
+    arrow = sweep.write_candle_arrow(frames, tmp_path / "candles.arrow")
+    checkpoint = tmp_path / "ckpt.jsonl"
+    grid = {"spread_bps": [5.0, 10.0], "orchestrator.enable_burst_flag": [False]}
+
+    # Run tasks in-process so the test doesn't depend on worker start-up
+    class _InlinePool:
+        def __init__(self, *args, initargs=(), **kwargs):
+            self.candles = sweep.CandleArrow(initargs[0])
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, task):
+            from concurrent.futures import Future
+            future = Future()
+            future.set_result(fn(task, self.candles))
+            return future
+
+    monkeypatch.setattr(sweep, "ProcessPoolExecutor", _InlinePool)
+    runner = sweep.SweepRunner(arrow, grid, workers=2, checkpoint=checkpoint)
+    assert len(runner.tasks()) == 4  # 2 params x 2 symbols
+    rows = runner.run()
+    assert [r["rank"] for r in rows] == [1, 2]
+    assert all(r["shards"] == 2 and r["candles"] == 240 for r in rows)
+    assert len(checkpoint.read_text().splitlines()) == 4
+
+    # Drop one finished task (and leave a torn line): only that task reruns
+    lines = checkpoint.read_text().splitlines()
+    checkpoint.write_text("\n".join(lines[:3]) + "\n" + lines[3][:10])
+    calls = []
+    real_run_task = sweep.run_task
+    monkeypatch.setattr(sweep, "run_task", lambda task, candles=None: calls.append(task) or real_run_task(task, candles))
+    resumed = sweep.SweepRunner(arrow, grid, workers=2, checkpoint=checkpoint).run()
+    assert len(calls) == 1
+    assert [r["params"] for r in resumed] == [r["params"] for r in rows]
+
+    # The rerun's entry went on its own line, so a second resume has nothing left
+    sweep.SweepRunner(arrow, grid, workers=2, checkpoint=checkpoint).run()
+    assert len(calls) == 1
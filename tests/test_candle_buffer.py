@@ -0,0 +1,317 @@
+"""Tests for the ring-buffer backed CandleBuffer."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.models import Candle, CandleBuffer, CandleRing
+
+
+def _make_candles(count: int, start_price: float = 100.0) -> list[Candle]:
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    candles = []
+    price = start_price
+    for i in range(count):
+        close_price = price + (1.0 if i % 3 else -0.5)
+        candles.append(
+            Candle(
+                timestamp=base_time + timedelta(minutes=i),
+                open=price,
+                high=max(price, close_price) + 0.25,
+                low=min(price, close_price) - 0.25,
+                close=close_price,
+                volume=100.0 + i,
+            )
+        )
+        price = close_price
+    return candles
+
+
+def test_candle_is_slotted_and_trusted_skips_validation():
+    ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    candle = Candle(ts, 1.0, 2.0, 0.5, 1.5, 10.0)
+    assert not hasattr(candle, "__dict__")
+    with pytest.raises(ValueError):
+        Candle(ts, 1.0, 0.9, 0.5, 1.5, 10.0)
+
+    trusted = Candle.trusted(ts, 1.0, 2.0, 0.5, 1.5, 10.0)
+    assert trusted == candle and trusted.range == 1.5
+    assert Candle.trusted(ts, 1.0, 0.9, 0.5, 1.5, 10.0).high == 0.9  # No checks
+    candle.close = 1.8  # Forming candles are still mutated in place
+    assert candle.close == 1.8
+
+
+def test_ring_wraps_and_keeps_newest_in_order():
+    ring = CandleRing(5)
+    candles = _make_candles(12)
+    for c in candles:
+        ring.append(c)
+
+    assert len(ring) == 5
+    assert list(ring) == candles[-5:]
+    assert ring[-1] is candles[-1]
+    assert ring[0] is candles[-5]
+    assert ring[-3:] == candles[-3:]
+    assert ring[::-1] == candles[-5:][::-1]
+    np.testing.assert_array_equal(ring.closes, [c.close for c in candles[-5:]])
+    np.testing.assert_array_equal(ring.ranges, [c.range for c in candles[-5:]])
+
+
+def test_ring_views_are_zero_copy_and_read_only():
+    ring = CandleRing(4)
+    for c in _make_candles(6):
+        ring.append(c)
+    closes = ring.closes
+    assert closes.base is not None
+    with pytest.raises(ValueError):
+        closes[0] = 1.0
+
+
+def test_buffer_matches_list_semantics():
+    candles = _make_candles(150)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    for c in candles:
+        buffer.add_1m(c)
+
+    assert len(buffer.candles_1m) == buffer.max_1m
+    assert list(buffer.candles_1m) == candles[-buffer.max_1m:]
+    assert buffer.get_closes("1m").tolist() == [c.close for c in candles[-buffer.max_1m:]]
+    assert buffer.get_volumes("1m").tolist() == [c.volume for c in candles[-buffer.max_1m:]]
+    assert len(buffer.get_closes("4h")) == 0
+    assert buffer.last_price == candles[-1].close
+
+    recent = candles[-30:]
+    expected_vwap = sum(c.midpoint * c.volume for c in recent) / sum(c.volume for c in recent)
+    assert buffer.vwap(30) == pytest.approx(expected_vwap)
+
+    window = candles[-buffer.max_1m:]
+    tr = [
+        max(cur.high - cur.low, abs(cur.high - prev.close), abs(cur.low - prev.close))
+        for prev, cur in zip(window, window[1:])
+    ]
+    assert buffer.atr(14, "1m") == pytest.approx(np.mean(tr[-14:]))
+
+
+def test_buffer_aggregates_5m():
+    candles = _make_candles(15)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    for c in candles:
+        buffer.add_1m(c)
+
+    assert len(buffer.candles_5m) == 3
+    first = buffer.candles_5m[0]
+    assert first.open == candles[0].open
+    assert first.close == candles[4].close
+    assert first.high == max(c.high for c in candles[:5])
+    assert first.volume == pytest.approx(sum(c.volume for c in candles[:5]))
+
+
+def test_buffer_inserts_out_of_order_and_skips_duplicates():
+    candles = _make_candles(8)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    for c in candles[:3] + candles[4:]:
+        buffer.add_1m(c)
+    buffer.add_1m(candles[3])
+    buffer.add_1m(candles[3])
+
+    assert list(buffer.candles_1m) == candles
+    assert buffer.get_closes("1m").tolist() == [c.close for c in candles]
+
+
+def test_higher_timeframe_assignment_trims_to_capacity():
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    candles = _make_candles(60)
+    buffer.candles_1h = candles
+    assert len(buffer.candles_1h) == buffer.max_1h
+    assert buffer.candles_1h[-1] is candles[-1]
+
+
+def _reference_vwap(candles: list[Candle], periods: int) -> float:
+    if len(candles) < periods:
+        return candles[-1].close if candles else 0.0
+    recent = candles[-periods:]
+    total_vol = sum(c.volume for c in recent)
+    if total_vol == 0:
+        return recent[-1].close
+    return sum(c.midpoint * c.volume for c in recent) / total_vol
+
+
+def _reference_ema(closes: list[float], period: int) -> float:
+    if len(closes) < period:
+        return closes[-1] if closes else 0.0
+    multiplier = 2 / (period + 1)
+    ema = closes[0]
+    for price in closes[1:]:
+        ema = (price - ema) * multiplier + ema
+    return ema
+
+
+def _reference_atr(candles: list[Candle], period: int) -> float:
+    if len(candles) < period + 1:
+        return candles[-1].range if candles else 0.0
+    tr_values = [
+        max(cur.high - cur.low, abs(cur.high - prev.close), abs(cur.low - prev.close))
+        for prev, cur in zip(candles, candles[1:])
+    ]
+    return float(np.mean(tr_values[-period:]))
+
+
+def test_incremental_indicators_match_full_recompute():
+    candles = _make_candles(400)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    fed: list[Candle] = []
+    for i, c in enumerate(candles):
+        buffer.add_1m(c)
+        fed.append(c)
+        window = fed[-buffer.max_1m:]
+        # Read every few candles so indicators register mid-stream and keep advancing
+        if i % 7 == 0 or i > 380:
+            assert buffer.vwap(30) == pytest.approx(_reference_vwap(window, 30))
+            assert buffer.vwap(120) == pytest.approx(_reference_vwap(window, 120))
+            assert buffer.atr(14, "1m") == pytest.approx(_reference_atr(window, 14))
+            assert buffer.atr(14, "5m") == pytest.approx(_reference_atr(list(buffer.candles_5m), 14))
+
+
+def test_running_ema_matches_full_replay_until_window_rolls():
+    candles = _make_candles(5 * 45)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    for i, c in enumerate(candles):
+        buffer.add_1m(c)
+        closes_5m = [c5.close for c5 in buffer.candles_5m]
+        if i % 5 == 4:
+            assert buffer.ema(20, "5m") == pytest.approx(_reference_ema(closes_5m, 20))
+            assert buffer.ema(9, "1m") == pytest.approx(_reference_ema([c1.close for c1 in candles[:i + 1]], 9))
+
+
+def test_vwap_zero_volume_window_falls_back_to_close():
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    candles = _make_candles(40)
+    for c in candles[:10]:
+        buffer.add_1m(c)
+    buffer.vwap(5)
+    for c in candles[10:]:
+        c.volume = 0.0
+        buffer.add_1m(c)
+    assert buffer.vwap(5) == candles[-1].close
+
+
+def test_indicators_rebuild_after_out_of_order_insert():
+    candles = _make_candles(60)
+    buffer = CandleBuffer(symbol="BTC-USD", log_5m=False)
+    for c in candles[:40] + candles[41:]:
+        buffer.add_1m(c)
+    assert buffer.vwap(30) == pytest.approx(_reference_vwap(candles[:40] + candles[41:], 30))
+    buffer.add_1m(candles[40])
+    assert buffer.vwap(30) == pytest.approx(_reference_vwap(candles, 30))
+    assert buffer.atr(14) == pytest.approx(_reference_atr(candles, 14))
+
+
+def _columns(candles: list[Candle]) -> tuple:
+    return (
+        np.array([c.timestamp.timestamp() for c in candles]),
+        np.array([c.open for c in candles]),
+        np.array([c.high for c in candles]),
+        np.array([c.low for c in candles]),
+        np.array([c.close for c in candles]),
+        np.array([c.volume for c in candles]),
+    )
+
+
+def test_ring_extend_columns_materializes_lazily():
+    candles = _make_candles(9)
+    ring = CandleRing(5)
+    ring.append(candles[0])
+    ring.extend_columns(*_columns(candles[1:]))
+
+    assert len(ring) == 5
+    np.testing.assert_array_equal(ring.closes, [c.close for c in candles[-5:]])
+    assert ring._lazy
+    assert [(c.timestamp, c.close) for c in ring] == [(c.timestamp, c.close) for c in candles[-5:]]
+    assert not ring._lazy
+    ring.append(candles[0])
+    assert ring[-1] is candles[0] and ring[0].timestamp == candles[5].timestamp
+
+
+def test_append_arrays_matches_add_1m():
+    candles = _make_candles(40)
+    expected = CandleBuffer(symbol="TEST", log_5m=False)
+    for c in candles:
+        expected.add_1m(c)
+
+    buf = CandleBuffer(symbol="TEST", log_5m=False)
+    assert buf.append_arrays("1m", *_columns(candles)) == 40
+    assert list(buf.candles_1m.timestamps) == list(expected.candles_1m.timestamps)
+    for name in ("timestamps", "opens", "highs", "lows", "closes", "volumes"):
+        np.testing.assert_allclose(getattr(buf.candles_5m, name), getattr(expected.candles_5m, name))
+    assert buf.vwap(30) == pytest.approx(expected.vwap(30))
+    assert buf.atr(14) == pytest.approx(expected.atr(14))
+
+
+def test_append_arrays_merges_older_rows_and_drops_invalid():
+    candles = _make_candles(20)
+    buf = CandleBuffer(symbol="TEST", log_5m=False)
+    for c in candles[10:]:
+        buf.add_1m(c)
+    kept = buf.candles_1m[0]
+
+    ts, o, h, l, c, v = _columns(candles[:12])  # Overlaps two buffered minutes
+    o, c = o.copy(), c.copy()
+    o[0] = -1.0  # Invalid row is dropped
+    c[10] = l[10]  # Conflicting duplicate of a buffered minute
+    assert buf.append_arrays("1m", ts, o, h, l, c, v) == 9
+    assert len(buf.candles_1m) == 19
+    assert buf.candles_1m[0].timestamp == candles[1].timestamp
+    assert buf.candles_1m[9].close == kept.close  # Existing rows win on duplicate timestamps
+    assert np.all(np.diff(buf.candles_1m.timestamps) > 0)
+
+
+def test_extend_1m_matches_add_1m_and_keeps_objects():
+    candles = _make_candles(150)
+    expected = CandleBuffer(symbol="TEST", log_5m=False)
+    for c in candles:
+        expected.add_1m(c)
+
+    buf = CandleBuffer(symbol="TEST", log_5m=False)
+    assert buf.extend_1m(candles) == 150
+    assert list(buf.candles_1m) == list(expected.candles_1m)
+    assert buf.candles_1m[-1] is candles[-1] and not buf.candles_1m._lazy
+    # 5m bars are rolled up once, from the 1m window that was kept
+    assert len(buf.candles_5m) == buf.max_1m // 5
+    np.testing.assert_allclose(buf.candles_5m.closes, expected.candles_5m.closes[-len(buf.candles_5m):])
+    assert buf.vwap(30) == pytest.approx(expected.vwap(30))
+
+
+def test_extend_merges_unsorted_overlapping_batches():
+    candles = _make_candles(30)
+    buf = CandleBuffer(symbol="TEST", log_5m=False)
+    buf.extend_1m(candles[10:20])
+    buffered = buf.candles_1m[0]
+
+    batch = candles[25:] + candles[:12] + candles[20:25]  # Unsorted, overlaps 2 buffered minutes
+    assert buf.extend_1m(batch) == 20
+    assert list(buf.candles_1m) == candles
+    assert buf.candles_1m[0] is candles[0] and buf.candles_1m[10] is buffered
+    assert buf.extend_1m(candles[5:8]) == 0
+
+    five = [c for c in _make_candles(60) if c.timestamp.minute % 5 == 0]
+    buf = CandleBuffer(symbol="TEST", log_5m=False)
+    assert buf.extend_5m(five[6:]) == 6 and buf.extend_5m(five[:8]) == 6
+    assert list(buf.candles_5m.timestamps) == [c.timestamp.timestamp() for c in five]
+
+
+def test_seq_changes_only_when_buffer_data_changes():
+    buffer = CandleBuffer(symbol="TEST-USD", log_5m=False)
+    candles = _make_candles(30)
+    seqs = [buffer.seq]
+    for candle in candles[:20]:
+        buffer.add_1m(candle)
+        seqs.append(buffer.seq)
+    assert all(b > a for a, b in zip(seqs, seqs[1:]))
+
+    before = buffer.seq
+    buffer.vwap(10), buffer.atr(14), buffer.ema(5, "1m")  # Reads don't bump
+    assert buffer.extend_1m(candles[:20]) == 0  # All duplicates
+    assert buffer.seq == before
+    buffer.extend_1m(candles[20:])
+    assert buffer.seq > before
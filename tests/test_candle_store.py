@@ -0,0 +1,139 @@
+"""Tests for the time-partitioned CandleStore (day segments, sealing, month merge)."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import pandas as pd
+
+from core.candle_store import CandleStore
+from core.models import Candle
+
+DAY = datetime(2025, 3, 30, 23, 50, tzinfo=timezone.utc)
+
+
+def _candles(start: datetime, count: int, price: float = 10.0) -> list[Candle]:
+    return [
+        Candle(start + timedelta(minutes=i), price + i, price + i + 1, price + i - 1, price + i + 0.5, 5.0 + i)
+        for i in range(count)
+    ]
+
+
+def _names(path) -> list[str]:
+    return sorted(p.name for p in path.iterdir())
+
+
+@pytest.fixture
+def now():
+    return datetime.now(timezone.utc).replace(second=0, microsecond=0)
+
+
+def test_writes_partition_by_day_and_seal_closed_days(tmp_path):
+    store = CandleStore(base_dir=tmp_path, retention_days=0)
+    candles = _candles(DAY, 20)  # 23:50 -> 00:09 crosses midnight
+    store.write_candles("SOL-USD", candles, "1m")
+    series = tmp_path / "SOL-USD" / "1m"
+    assert _names(series) == ["2025-03-30.jsonl", "2025-03-31.jsonl"]
+
+    # Only days before "today" are sealed; the open segment stays JSONL
+    assert store.compact_to_parquet("SOL-USD", "1m", today=date(2025, 3, 31))
+    assert _names(series) == ["2025-03-30.parquet", "2025-03-31.jsonl"]
+    assert not store.compact_to_parquet("SOL-USD", "1m", today=date(2025, 3, 31))
+
+    arrays = store.load_range("SOL-USD", "1m")
+    assert list(arrays.ts) == [c.timestamp.timestamp() for c in candles]
+    assert list(arrays.close) == [c.close for c in candles]
+
+    # A late correction for the sealed day is merged into it, newest row wins
+    late = Candle(DAY + timedelta(minutes=5), 99.0, 99.0, 99.0, 99.0, 1.0)
+    store.write_candles("SOL-USD", [late], "1m")
+    assert store.load_range("SOL-USD", "1m").close[5] == 99.0
+    assert store.compact_to_parquet("SOL-USD", "1m", today=date(2025, 3, 31))
+    assert _names(series) == ["2025-03-30.parquet", "2025-03-31.jsonl"]
+    arrays = store.load_range("SOL-USD", "1m")
+    assert len(arrays) == 20 and arrays.close[5] == 99.0
+
+
+def test_month_merge_retention_and_range_reads(tmp_path):
+    store = CandleStore(base_dir=tmp_path, retention_days=60)
+    for day in (1, 2, 28):
+        store.write_candles("ETH-USD", _candles(datetime(2025, 2, day, tzinfo=timezone.utc), 3), "1m")
+    store.write_candles("ETH-USD", _candles(datetime(2024, 12, 1, tzinfo=timezone.utc), 3), "1m")
+    store.write_candles("ETH-USD", _candles(datetime(2025, 3, 1, tzinfo=timezone.utc), 3), "1m")
+    series = tmp_path / "ETH-USD" / "1m"
+
+    assert store.compact_to_parquet("ETH-USD", "1m", today=date(2025, 3, 2))
+    # Finished months fold into one file; December is past retention
+    assert _names(series) == ["2025-02.parquet", "2025-03-01.parquet"]
+    assert len(store.load_range("ETH-USD", "1m")) == 12
+
+    # Late February rows land in the month file
+    store.write_candles("ETH-USD", _candles(datetime(2025, 2, 10, tzinfo=timezone.utc), 2), "1m")
+    store.compact_to_parquet("ETH-USD", "1m", today=date(2025, 3, 2))
+    assert _names(series) == ["2025-02.parquet", "2025-03-01.parquet"]
+
+    feb = store.load_range(
+        "ETH-USD", "1m",
+        start=datetime(2025, 2, 2, tzinfo=timezone.utc),
+        end=datetime(2025, 2, 28, 0, 2, tzinfo=timezone.utc),
+    )
+    expected = [datetime(2025, 2, d, 0, m, tzinfo=timezone.utc).timestamp()
+                for d, m in [(2, 0), (2, 1), (2, 2), (10, 0), (10, 1), (28, 0), (28, 1)]]
+    assert list(feb.ts) == expected
+
+    store.cleanup_old_files(max_age_days=0)
+    assert _names(series) == []
+
+
+def test_legacy_flat_files_are_read_and_migrated(tmp_path, now):
+    store = CandleStore(base_dir=tmp_path)
+    old = _candles(now - timedelta(hours=10), 3)
+    recent = _candles(now - timedelta(minutes=5), 3, price=20.0)
+    (tmp_path / "BTC-USD").mkdir()
+    pd.DataFrame([
+        {"ts": c.timestamp.isoformat(), "open": c.open, "high": c.high, "low": c.low,
+         "close": c.close, "volume": c.volume}
+        for c in old + recent
+    ]).to_parquet(store._get_parquet_path("BTC-USD", "1m"), index=False)
+
+    arrays = store.load_arrays("BTC-USD", "1m", max_age_hours=1)
+    assert list(arrays.ts) == [c.timestamp.timestamp() for c in recent]
+    assert store.get_last_candle_ts("BTC-USD", "1m") == recent[-1].timestamp
+
+    assert store.compact_to_parquet("BTC-USD", "1m")
+    assert not store._get_parquet_path("BTC-USD", "1m").exists()
+    assert len(store.load_range("BTC-USD", "1m")) == 6
+    assert store.get_last_candle_ts("BTC-USD", "1m") == recent[-1].timestamp
+
+
+def test_load_arrays_limits_count_and_skips_torn_lines(tmp_path, now):
+    store = CandleStore(base_dir=tmp_path)
+    candles = _candles(now - timedelta(minutes=30), 20)
+    store.write_candles("SOL-USD", candles, "1m")
+    segment = next((tmp_path / "SOL-USD" / "1m").glob("*.jsonl"))
+    with open(segment, "a") as f:
+        f.write('{"ts": "torn')
+
+    arrays = store.load_arrays("SOL-USD", "1m", max_age_hours=1, max_count=5)
+    assert np.all(np.diff(arrays.ts) > 0)
+    assert list(arrays.close) == [c.close for c in candles[-5:]]
+    assert store.load_arrays("MISSING-USD", "1m").ts.size == 0
+    assert not (tmp_path / "MISSING-USD").exists()
+
+
+def test_rehydrate_arrays_loads_symbols_concurrently(tmp_path, now):
+    store = CandleStore(base_dir=tmp_path)
+    for i, symbol in enumerate(["A-USD", "B-USD", "C-USD"]):
+        store.write_candles(symbol, _candles(now - timedelta(minutes=10), 5 + i), "1m")
+    store.write_candles("A-USD", _candles(now - timedelta(minutes=10), 2), "5m")
+
+    result = store.rehydrate_arrays(["A-USD", "B-USD", "C-USD", "MISSING-USD"], workers=3)
+    assert sorted(result) == ["A-USD", "B-USD", "C-USD"]
+    assert [len(result[s]["1m"]) for s in sorted(result)] == [5, 6, 7]
+    assert len(result["A-USD"]["5m"]) == 2 and len(result["B-USD"]["5m"]) == 0
+
+    legacy = store.rehydrate_buffers(["B-USD"])
+    assert [c.close for c in legacy["B-USD"]["1m"]] == list(result["B-USD"]["1m"].close)
@@ -127,6 +127,45 @@ class TestStrategies:
         # Check some expected strategies exist
         assert "burst_flag" in strategy_ids
         assert "vwap_reclaim" in strategy_ids
+    
+    def test_analyze_many_matches_sequential_analyze(self):
+        from logic.strategies import StrategyOrchestrator
+        from logic.strategies.base import BaseStrategy, SignalDirection, StrategySignal
+        
+        class Scored(BaseStrategy):
+            def __init__(self, strategy_id, offset):
+                self.strategy_id = strategy_id
+                self.offset = offset
+                self.seen = {}  # Per-symbol state, like the real strategies
+            
+            def analyze(self, symbol, buffer, features, market_context):
+                self.seen[symbol] = self.seen.get(symbol, 0) + 1
+                score = (features["rank"] * 7 + self.offset) % 50
+                if score == 0:
+                    return None
+                return StrategySignal(
+                    symbol=symbol, strategy_id=self.strategy_id, direction=SignalDirection.LONG,
+                    edge_score_base=score, entry_price=10.0, stop_price=9.5, tp1_price=11.0,
+                )
+        
+        def build(max_workers):
+            orchestrator = StrategyOrchestrator(max_workers=max_workers)
+            orchestrator.strategies = [Scored("a", 3), Scored("b", 11), Scored("c", 11)]
+            return orchestrator
+        
+        batch = [(f"SYM{i}-USD", None, {"rank": i}) for i in range(40)]
+        sequential = build(1)
+        expected = {symbol: sequential.analyze(symbol, buffer, features, {}) for symbol, buffer, features in batch}
+        parallel = build(4)
+        results = parallel.analyze_many(batch, {})
+        
+        assert list(results) == [symbol for symbol, _, _ in batch]
+        for symbol, signal in results.items():
+            want = expected[symbol]
+            assert (signal.strategy_id, signal.edge_score_base, signal.reasons) == \
+                (want.strategy_id, want.edge_score_base, want.reasons)
+        assert parallel.get_stats() == sequential.get_stats()
+        assert all(s.seen == {symbol: 1 for symbol, _, _ in batch} for s in parallel.strategies)
 
 
 class TestConfig:
@@ -0,0 +1,50 @@
+"""Tests for dirty-flag scheduling of Clock B stages."""
+
+from core.dirty_tracker import DirtyTracker
+
+
+def test_only_changed_symbols_are_selected_between_refreshes():
+    dirty = DirtyTracker(refresh_s=30)
+    seqs = {"A-USD": 1, "B-USD": 1, "C-USD": 1}
+    assert dirty.select("strategies", seqs.items(), now=0) == set(seqs)  # First pass
+    assert dirty.select("strategies", seqs.items(), now=2) == set()
+
+    seqs["B-USD"] = 2  # New candle
+    assert dirty.select("strategies", seqs.items(), now=4) == {"B-USD"}
+    assert dirty.select("strategies", seqs.items(), now=6) == set()
+    assert dirty.select("strategies", seqs.items(), now=30) == set(seqs)  # Forced refresh
+
+    assert dirty.get_stats() == {"strategies": {"processed": 7, "skipped": 8}}
+
+
+def test_stages_consume_changes_independently():
+    dirty = DirtyTracker(refresh_s=30)
+    seqs = {"A-USD": 1}
+    dirty.select("burst_metrics", seqs.items(), now=0)
+    dirty.select("strategies", seqs.items(), now=0)
+    seqs["A-USD"] = 2
+    assert dirty.select("burst_metrics", seqs.items(), now=1) == {"A-USD"}
+    assert dirty.select("strategies", seqs.items(), now=1) == {"A-USD"}
+
+
+def test_position_and_spread_marks():
+    dirty = DirtyTracker(refresh_s=30, spread_bps=5)
+    seqs = {"A-USD": 1, "B-USD": 1}
+    dirty.select("strategies", seqs.items(), now=0)
+
+    dirty.mark("A-USD")  # Position opened
+    assert dirty.select("strategies", seqs.items(), now=1) == {"A-USD"}
+
+    dirty.mark_spread("B-USD", 10.0)  # First spread seen: baseline only
+    dirty.mark_spread("B-USD", 13.0)  # Below threshold
+    assert dirty.select("strategies", seqs.items(), now=2) == set()
+    dirty.mark_spread("B-USD", 16.0)
+    assert dirty.select("strategies", seqs.items(), now=3) == {"B-USD"}
+    assert dirty.select("strategies", seqs.items(), now=4) == set()
+
+
+def test_zero_refresh_processes_everything():
+    dirty = DirtyTracker(refresh_s=0)
+    seqs = {"A-USD": 1, "B-USD": 1}
+    for now in range(3):
+        assert dirty.select("strategies", seqs.items(), now=now) == set(seqs)
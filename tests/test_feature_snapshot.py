@@ -0,0 +1,75 @@
+"""Tests for the shared per-symbol strategy feature snapshot."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.models import Candle, CandleBuffer
+from logic.strategies import FeatureSnapshot, StrategyOrchestrator, get_snapshot
+from logic.strategies.base import BaseStrategy
+
+
+def _buffer(minutes: int = 240) -> CandleBuffer:
+    buffer = CandleBuffer(symbol="TEST-USD", max_1m=240, max_5m=48, log_5m=False)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rng = np.random.default_rng(7)
+    price = 10.0
+    candles = []
+    for i in range(minutes):
+        close = price * (1 + rng.normal(0, 0.004))
+        candles.append(Candle(start + timedelta(minutes=i), price, max(price, close) * 1.001,
+                              min(price, close) * 0.999, close, 100 + rng.random() * 50))
+        price = close
+    buffer.extend_1m(candles)
+    return buffer
+
+
+def _reference_rsi(closes, period=14):
+    deltas = np.diff(closes)
+    avg_gain = np.mean(np.where(deltas > 0, deltas, 0)[-period:])
+    avg_loss = np.mean(np.where(deltas < 0, -deltas, 0)[-period:])
+    return 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def test_indicators_match_the_per_strategy_formulas():
+    buffer = _buffer()
+    snap = FeatureSnapshot(buffer)
+    closes = np.array([c.close for c in buffer.candles_5m[-40:]])
+
+    assert snap.rsi(14) == _reference_rsi(closes[-30:])
+    assert snap.rsi(14, back=1) == _reference_rsi(closes[-31:-1])
+    upper, middle, lower, width = snap.bollinger(20, 2)
+    assert middle == np.mean(closes[-20:])
+    assert upper == middle + 2 * np.std(closes[-20:])
+    assert snap.bollinger(20, 2, back=1)[1] == np.mean(closes[-21:-1])
+    assert snap.median("volumes", "5m", 24) == np.median(buffer.get_volumes("5m")[-24:])
+    assert snap.vwap(120) == buffer.vwap(120) and snap.atr(14) == buffer.atr(14)
+    assert snap.price == buffer.last_price
+
+
+def test_snapshot_is_reused_until_the_buffer_changes():
+    built = []
+
+    class Probe(BaseStrategy):
+        strategy_id = "probe"
+
+        def analyze(self, symbol, buffer, features, market_context):
+            built.append(features["snapshot"])
+            return None
+
+    orchestrator = StrategyOrchestrator(max_workers=1)
+    orchestrator.strategies = [Probe(), Probe()]
+    buffer = _buffer()
+    orchestrator.analyze("TEST-USD", buffer, {}, {})
+    orchestrator.analyze("TEST-USD", buffer, {}, {})
+    assert len({id(s) for s in built}) == 1
+
+    snap = built[0]
+    assert get_snapshot(buffer, {"snapshot": snap}) is snap
+    last = buffer.candles_1m[-1]
+    buffer.add_1m(Candle(last.timestamp + timedelta(minutes=1), last.close, last.close * 1.01,
+                         last.close * 0.99, last.close, 120.0))
+    assert not snap.is_current(buffer)
+    orchestrator.analyze("TEST-USD", buffer, {}, {})
+    assert built[-1] is not snap and built[-1].is_current(buffer)
+    assert get_snapshot(buffer, {"snapshot": snap}) is not snap
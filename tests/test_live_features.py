@@ -1,5 +1,6 @@
 """Tests for live feature computation."""
 
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 
 import numpy as np
@@ -48,3 +49,18 @@ def test_compute_macd_signal_and_obv_slope():
     assert indicators.macd_signal != 0
     assert indicators.macd_histogram == pytest.approx(indicators.macd_line - indicators.macd_signal)
     assert indicators.obv_slope > 0
+
+
+def test_seed_matches_candle_by_candle_updates():
+    candles = _make_candles(40)
+    stepped = LiveFeatureEngine()
+    for candle in candles:
+        expected = stepped.update("BTC-USD", candle, 0.0, 101.0)
+    seeded = LiveFeatureEngine()
+    indicators = seeded.seed("BTC-USD", candles, 101.0)
+
+    assert indicators is seeded.latest["BTC-USD"]
+    assert seeded.state["BTC-USD"].candle_count == 40
+    got, want = asdict(indicators), asdict(expected)
+    got.pop("timestamp"), want.pop("timestamp")
+    assert got == want
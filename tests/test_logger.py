@@ -0,0 +1,100 @@
+"""Tests for the buffered JSONL log writer."""
+
+import json
+import threading
+
+from core.logger import JsonlWriter
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_writer_batches_and_flushes(tmp_path):
+    writer = JsonlWriter(flush_interval=10.0)
+    path = tmp_path / "market_2025-01-01.jsonl"
+    for i in range(100):
+        assert writer.submit("market", path, json.dumps({"i": i}) + "\n")
+    assert writer.flush()
+    assert [r["i"] for r in _read_lines(path)] == list(range(100))
+    writer.close()
+
+
+def test_critical_write_is_on_disk_when_submit_returns(tmp_path):
+    writer = JsonlWriter(flush_interval=10.0)
+    path = tmp_path / "trades_2025-01-01.jsonl"
+    assert writer.submit("trades", path, '{"side":"buy"}\n', critical=True)
+    assert _read_lines(path) == [{"side": "buy"}]
+    assert writer.commits >= 1
+    writer.close()
+
+
+def test_rotation_opens_each_day_file(tmp_path):
+    writer = JsonlWriter()
+    day1 = tmp_path / "health_2025-01-01.jsonl"
+    day2 = tmp_path / "health_2025-01-02.jsonl"
+    writer.submit("health", day1, '{"d":1}\n')
+    writer.submit("health", day2, '{"d":2}\n')
+    writer.close()
+    assert _read_lines(day1) == [{"d": 1}]
+    assert _read_lines(day2) == [{"d": 2}]
+
+
+class _GatedWriter(JsonlWriter):
+    """Writer whose thread waits on a gate so the queue can fill up."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = threading.Event()
+
+    def _run(self):
+        self.gate.wait(5)
+        super()._run()
+
+
+def test_overflow_drops_non_critical_lines(tmp_path):
+    writer = _GatedWriter(max_pending=3, overflow="drop")
+    path = tmp_path / "market_2025-01-01.jsonl"
+    for i in range(10):
+        writer.submit("market", path, json.dumps({"i": i}) + "\n")
+    assert writer.dropped == 7
+    writer.gate.set()
+    writer.close()
+    assert [r["i"] for r in _read_lines(path)] == [0, 1, 2]
+
+
+def test_closed_writer_falls_back_to_caller(tmp_path):
+    writer = JsonlWriter()
+    writer.close()
+    assert writer.submit("market", tmp_path / "market_x.jsonl", "{}\n") is False
+
+
+def test_critical_line_is_recommitted_when_fsync_fails(tmp_path, monkeypatch):
+    import core.logger
+
+    real_fsync = core.logger.os.fsync
+    calls = []
+
+    def flaky_fsync(fd):
+        calls.append(fd)
+        if len(calls) == 1:
+            raise OSError("EIO")
+        real_fsync(fd)
+
+    monkeypatch.setattr(core.logger.os, "fsync", flaky_fsync)
+    writer = JsonlWriter(flush_interval=10.0)
+    path = tmp_path / "trades_2025-01-01.jsonl"
+    assert writer.submit("trades", path, '{"side":"buy"}\n', critical=True)
+    assert len(calls) == 2  # Failed group fsync, then the direct recommit
+    assert {"side": "buy"} in _read_lines(path)
+    writer.close()
+
+
+def test_critical_timeout_hands_the_line_back(tmp_path):
+    writer = _GatedWriter(commit_timeout=0.1)
+    path = tmp_path / "trades_2025-01-01.jsonl"
+    assert writer.submit("trades", path, '{"side":"buy"}\n', critical=True) is False
+    writer.gate.set()
+    writer.close()
+    # Withdrawn from the queue, so the caller's synchronous write is the only copy
+    assert not path.exists()
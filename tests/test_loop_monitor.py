@@ -0,0 +1,30 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import time
+
+from core.loop_monitor import LoopLagMonitor
+
+
+def test_blocking_work_on_the_loop_shows_up_as_lag():
+    async def main():
+        monitor = LoopLagMonitor(interval=0.01)
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        quiet = monitor.max_s
+        time.sleep(0.1)  # Blocking call on the loop thread
+        await asyncio.sleep(0.03)
+        task.cancel()
+        return monitor, quiet
+
+    monitor, quiet = asyncio.run(main())
+    stats = monitor.get_stats()
+    assert quiet < 0.05
+    assert monitor.max_s >= 0.08 and stats["max_ms"] >= 80
+    assert stats["samples"] > 3 and stats["p50_ms"] < stats["max_ms"]
+
+
+def test_stats_before_first_sample():
+    assert LoopLagMonitor().get_stats() == {
+        "last_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "samples": 0,
+    }
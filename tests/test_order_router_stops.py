@@ -0,0 +1,25 @@
+"""Tests for recording stops placed off the event loop."""
+
+from types import SimpleNamespace
+
+from execution.order_router import OrderRouter
+
+
+def test_placed_stops_skip_positions_closed_meanwhile():
+    saved = []
+    kept = SimpleNamespace(stop_price=9.0, stop_order_id=None)
+    closed = SimpleNamespace(stop_price=4.0, stop_order_id=None)
+    failed = SimpleNamespace(stop_price=2.0, stop_order_id=None)
+    router = SimpleNamespace(
+        positions={"AAA-USD": kept, "CCC-USD": failed},  # BBB-USD exited during placement
+        persistence=SimpleNamespace(save_positions=lambda positions: saved.append(dict(positions))),
+    )
+    missing = [("AAA-USD", kept, 1.0), ("BBB-USD", closed, 2.0), ("CCC-USD", failed, 3.0)]
+    placed = {"AAA-USD": "stop-a", "BBB-USD": "stop-b", "CCC-USD": None}
+
+    orphaned = OrderRouter._apply_placed_stops(router, missing, placed)
+
+    assert orphaned == ["BBB-USD"]
+    assert kept.stop_order_id == "stop-a"
+    assert closed.stop_order_id is None and failed.stop_order_id is None
+    assert saved == [{"AAA-USD": kept, "CCC-USD": failed}]
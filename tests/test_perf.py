@@ -0,0 +1,56 @@
+"""Tests for the perf histograms and span registry."""
+
+import time
+
+from core.perf import Histogram, PerfRegistry
+
+
+def test_histogram_percentiles_within_bucket_resolution():
+    hist = Histogram()
+    for ms in range(1, 101):
+        hist.record(ms / 1000)
+    stats = hist.as_dict()
+    assert stats["count"] == 100
+    assert stats["max_ms"] == 100.0
+    assert 50 <= stats["p50_ms"] <= 50 * 1.2
+    assert 99 <= stats["p99_ms"] <= 100.0
+    assert abs(stats["mean_ms"] - 50.5) < 1e-6
+
+
+def test_spans_recorded_per_stage_and_symbol():
+    perf = PerfRegistry()
+    for _ in range(3):
+        with perf.span("strategy.analyze", "BTC-USD"):
+            time.sleep(0.002)
+    with perf.span("strategy.analyze", "ETH-USD"):
+        pass
+    perf.record("ws.message", 0.0005)
+
+    snap = perf.snapshot()
+    assert snap["records"] == 5
+    assert snap["stages"]["strategy.analyze"]["count"] == 4
+    assert snap["stages"]["ws.message"]["count"] == 1
+    per_symbol = snap["symbols"]["strategy.analyze"]
+    assert list(per_symbol) == ["BTC-USD", "ETH-USD"]  # Slowest first
+    assert per_symbol["BTC-USD"]["p50_ms"] >= 2.0
+    assert "ws.message" not in snap["symbols"]
+
+
+def test_snapshot_reset_starts_a_new_window():
+    perf = PerfRegistry()
+    with perf.span("clock_b.loop"):
+        pass
+    time.sleep(0.05)
+    first = perf.snapshot(reset=True)
+    assert first["stages"]["clock_b.loop"]["count"] == 1
+    assert 0 <= first["overhead_pct"] < 1.0
+    assert perf.snapshot()["stages"] == {}
+
+
+def test_disabled_registry_is_a_no_op():
+    perf = PerfRegistry(enabled=False)
+    with perf.span("clock_b.loop", "BTC-USD"):
+        pass
+    perf.record("ws.message", 0.1)
+    snap = perf.snapshot()
+    assert snap["records"] == 0 and snap["stages"] == {}
@@ -0,0 +1,81 @@
+"""Tests for recorded-session replay on a virtual clock."""
+
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.candle_store import CandleStore
+from core.helpers import utc_now
+from core.models import Candle
+from core.tick_capture import TickCaptureWriter
+from datafeeds.collectors.replay_collector import ReplayCollector, parse_speed
+
+T0 = int(datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc).timestamp())
+
+
+def _ns(seconds: float) -> int:
+    return int((T0 + seconds) * 1e9)
+
+
+def test_parse_speed():
+    assert parse_speed("1") == 1.0 and parse_speed("10x") == 10.0 and parse_speed(25) == 25.0
+    assert math.isinf(parse_speed("max")) and math.isinf(parse_speed(0))
+
+
+def test_tick_capture_replay_builds_bars_on_virtual_clock(tmp_path):
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    writer.write_tick("SOL-USD", 10.0, bid=9.99, ask=10.01, ts_ns=_ns(1))
+    writer.write_trade("SOL-USD", 11.0, 2.0, "BUY", ts_ns=_ns(30))
+    writer.write_tick("ETH-USD", 2000.0, ts_ns=_ns(45))
+    writer.write_tick("SOL-USD", 12.0, ts_ns=_ns(125))
+    writer.close()
+
+    path = tmp_path / "ticks_2025-01-06.bin"
+    assert ReplayCollector.source_symbols(path) == ["SOL-USD", "ETH-USD"]
+    ticks, bars = [], []
+    collector = ReplayCollector(["SOL-USD"], on_candle=lambda s, c: bars.append((s, c, utc_now())),
+                                source=path, speed="max")
+    collector.on_tick = lambda s, p, spread_bps=None: ticks.append((s, p, spread_bps))
+    asyncio.run(collector.start())
+
+    # Unsubscribed symbols are skipped; trades only feed bar volume
+    assert ticks == [("SOL-USD", 10.0, pytest.approx(20.0)), ("SOL-USD", 12.0, 0.0)]
+    assert [(s, int(c.timestamp.timestamp()) - T0, c.high, c.volume) for s, c, _ in bars] == [
+        ("SOL-USD", 0, 11.0, 2.0),
+        ("SOL-USD", 60, 11.0, 0.0),  # Quiet minute closed by the boundary timer
+    ]
+    # Bars close on session time, not wall time
+    assert bars[0][2] == datetime.fromtimestamp(T0 + 62, timezone.utc)
+    assert collector.get_last_price("SOL-USD") == 12.0
+    assert utc_now().timestamp() == T0 + 125
+
+    collector.stop()
+    assert abs((utc_now() - datetime.now(timezone.utc)).total_seconds()) < 5
+
+
+def test_candle_replay_is_paced_by_speed(tmp_path):
+    store = CandleStore(tmp_path)
+    start = datetime.fromtimestamp(T0, timezone.utc)
+    for symbol, price in (("A-USD", 1.0), ("B-USD", 5.0)):
+        store.write_candles(symbol, [
+            Candle(start + timedelta(minutes=i), price, price + 1, price, price + 0.5, 10.0 + i)
+            for i in range(3)
+        ], tf="1m")
+    store.flush_all()
+
+    bars = []
+    collector = ReplayCollector(["A-USD", "B-USD"], on_candle=lambda s, c: bars.append((s, c)),
+                                source=tmp_path, speed=1200)  # One minute per 50ms
+    began = time.monotonic()
+    asyncio.run(collector.start())
+    elapsed = time.monotonic() - began
+    collector.stop()
+
+    assert [(s, c.volume) for s, c in bars] == [
+        ("A-USD", 10.0), ("B-USD", 10.0), ("A-USD", 11.0), ("B-USD", 11.0), ("A-USD", 12.0), ("B-USD", 12.0),
+    ]
+    assert elapsed >= 0.09  # Two minute boundaries after the first bar
+    assert len(collector.get_buffer("B-USD").candles_1m) == 3
@@ -0,0 +1,127 @@
+"""Tests for pooled keep-alive REST clients against a local stub server."""
+
+import http.client
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core import rest_pool as rest_pool_module
+from core.rest_pool import ClientPool, RestClientPools
+
+
+class StubServer:
+    """HTTP/1.1 candles endpoint that records connections and concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections: set[int] = set()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections open
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.connections.add(self.client_address[1])
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                body = json.dumps({"candles": [{"start": "0", "close": "1.0"}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubClient:
+    """Client with one persistent connection, like a RESTClient's session."""
+
+    def __init__(self, port: int):
+        self._conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+
+    def get_public_candles(self, product_id: str, **params):
+        self._conn.request("GET", f"/candles?product_id={product_id}")
+        return json.loads(self._conn.getresponse().read())
+
+    def get_product(self, product_id: str):
+        raise RuntimeError("404 Not Found")
+
+
+def test_sequential_calls_reuse_one_connection():
+    with StubServer() as server:
+        pool = ClientPool("public", lambda: StubClient(server.port), size=2)
+        for _ in range(5):
+            assert pool.call("get_public_candles", product_id="BTC-USD")["candles"]
+
+    assert server.requests == 5 and len(server.connections) == 1
+    stats = pool.get_stats()
+    assert stats["created"] == 1 and stats["idle"] == 1
+    assert stats["endpoints"]["get_public_candles"]["calls"] == 5
+
+
+def test_pool_bounds_concurrency():
+    with StubServer(delay=0.05) as server:
+        pool = ClientPool("public", lambda: StubClient(server.port), size=2)
+        threads = [
+            threading.Thread(target=pool.call, args=("get_public_candles",), kwargs={"product_id": f"S{i}-USD"})
+            for i in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+    assert server.requests == 6
+    assert server.max_in_flight <= 2 and len(server.connections) <= 2
+    stats = pool.get_stats()
+    assert stats["created"] == 2 and stats["waits"] > 0
+
+
+def test_pooled_client_proxies_methods_and_records_errors():
+    with StubServer() as server:
+        client = ClientPool("private", lambda: StubClient(server.port), size=1).proxy()
+        assert client.get_public_candles("ETH-USD")["candles"][0]["close"] == "1.0"
+        with pytest.raises(RuntimeError):
+            client.get_product("ETH-USD")
+
+    endpoints = client.pool.get_stats()["endpoints"]
+    assert endpoints["get_product"] == {**endpoints["get_product"], "calls": 1, "errors": 1}
+    assert endpoints["get_public_candles"]["errors"] == 0
+
+
+def test_private_pools_are_shared_per_credentials(monkeypatch):
+    built = []
+    monkeypatch.setattr(rest_pool_module, "_rest_client", lambda **kwargs: built.append(kwargs) or object())
+    pools = RestClientPools(size=2)
+
+    assert pools.private("", "") is None and pools.private_client("", "") is None
+    first = pools.private_client("key", "secret")
+    second = pools.private_client("key", "secret")
+    assert first.pool is second.pool is pools.private("key", "secret")
+    assert pools.private("other", "secret") is not first.pool
+    assert built == [{"api_key": "key", "api_secret": "secret"}]  # Primed once, up front
@@ -0,0 +1,129 @@
+"""Tests for the shared REST scheduler: priority, 429 backoff, coalescing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.rest_scheduler import Priority, RestScheduler, request_priority
+
+# 429 warnings go to the events log; keep it out of the repo
+pytestmark = pytest.mark.usefixtures("tmp_logs_dir")
+
+
+def test_tokens_are_granted_by_priority():
+    async def main():
+        scheduler = RestScheduler(rate=50.0, burst=1.0)
+        await scheduler.acquire()  # Drain the bucket so everyone queues
+        granted = []
+
+        async def request(priority):
+            await scheduler.acquire(priority)
+            granted.append(priority)
+
+        await asyncio.gather(*(request(p) for p in (
+            Priority.BACKFILL, Priority.TIER3, Priority.ORDER, Priority.TIER2, Priority.POSITION,
+        )))
+        return granted, scheduler
+
+    granted, scheduler = asyncio.run(main())
+    assert granted == sorted(granted)
+    assert scheduler.get_stats()["waiting"] == 0
+
+
+def test_context_priority_and_position_promotion():
+    scheduler = RestScheduler()
+    assert scheduler.priority_for(None) == Priority.TIER2
+    with request_priority(Priority.BACKFILL):
+        assert scheduler.priority_for("BTC-USD") == Priority.BACKFILL
+        scheduler.set_position_source(lambda: {"BTC-USD"})
+        assert scheduler.priority_for("BTC-USD") == Priority.POSITION
+        assert scheduler.priority_for("ETH-USD") == Priority.BACKFILL
+    assert scheduler.priority_for("BTC-USD", Priority.ORDER) == Priority.ORDER
+
+
+def test_429_pauses_and_halves_rate_then_recovers():
+    scheduler = RestScheduler(rate=100.0, burst=5.0, max_backoff=0.1, recovery=0.5)
+
+    def limited():
+        raise RuntimeError("429 Too Many Requests")
+
+    with pytest.raises(RuntimeError):
+        scheduler.call(limited)
+    scheduler.record_429()  # Same burst: counted, not escalated
+    assert scheduler.total_429s == 2 and scheduler.consecutive_429s == 1
+    assert scheduler.rate == 50.0 and scheduler.is_degraded
+
+    began = time.monotonic()
+    assert scheduler.call(lambda: "ok") == "ok"
+    assert time.monotonic() - began >= 0.05  # Waited out the cooldown
+    assert scheduler.consecutive_429s == 0 and scheduler.rate == 100.0
+
+
+def test_identical_in_flight_requests_are_coalesced():
+    scheduler = RestScheduler(rate=100.0, burst=10.0)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {"candles": [1, 2, 3]}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(scheduler.call(fetch, key=("candles", "SOL-USD"))))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while scheduler.coalesced < 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 3 and all(r is results[0] for r in results)
+    assert scheduler.requests == 1 and scheduler.get_stats()["in_flight_keys"] == 0
+
+
+def test_async_run_executes_off_loop():
+    async def main():
+        scheduler = RestScheduler(rate=100.0, burst=2.0)
+        loop_thread = threading.get_ident()
+        return loop_thread, await scheduler.run(threading.get_ident, priority=Priority.ORDER), scheduler
+
+    loop_thread, worker_thread, scheduler = asyncio.run(main())
+    assert worker_thread != loop_thread
+    assert scheduler.get_stats()["granted"]["order"] == 1
+
+
+def test_orders_skip_the_429_cooldown():
+    scheduler = RestScheduler(rate=10.0, burst=2.0, max_backoff=60.0)
+    scheduler.record_429()
+    scheduler.record_429()  # Same burst
+    assert scheduler.cooldown_remaining > 0
+
+    began = time.monotonic()
+    scheduler.acquire_blocking(Priority.ORDER)
+    assert time.monotonic() - began < 0.1
+    assert scheduler.get_stats()["granted"]["order"] == 1
+
+
+def test_blocking_acquire_on_the_loop_never_sleeps():
+    async def main():
+        scheduler = RestScheduler(rate=10.0, burst=2.0, max_backoff=60.0)
+        for _ in range(3):
+            scheduler.record_429()
+            scheduler._cooldown_until = 0.0  # Next 429 escalates
+        scheduler.record_429()
+        began = time.monotonic()
+        scheduler.acquire_blocking(Priority.TIER2)  # Synchronous call on the loop thread
+        return time.monotonic() - began, scheduler
+
+    blocked, scheduler = asyncio.run(main())
+    assert scheduler.cooldown_remaining > 2
+    assert blocked < 0.1
+    assert scheduler.tokens < 0  # Borrowed; off-loop callers wait off the debt
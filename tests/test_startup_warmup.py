@@ -0,0 +1,117 @@
+"""Tests for the concurrent, cache-first startup warmup."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from core.candle_store import CandleStore
+from core.models import Candle, CandleBuffer
+from datafeeds.collectors.warmup import StartupWarmup, missing_minutes
+from logic.live_features import LiveFeatureEngine
+
+TF_SECONDS = {"1m": 60, "5m": 300, "1h": 3600, "1d": 86400}
+
+
+def _candles(tf_seconds: int, start: float, end: float, price: float = 10.0) -> list[Candle]:
+    """Closed bars aligned to ``tf_seconds`` with start in [start, end)."""
+    first = int(start // tf_seconds + 1) * tf_seconds
+    return [
+        Candle(datetime.fromtimestamp(ts, timezone.utc), price, price + 1, price - 1, price + 0.5, 5.0)
+        for ts in range(first, int(end) - tf_seconds + 1, tf_seconds)
+    ]
+
+
+class FakeFetch:
+    """REST stand-in: serves bars for the requested lookback and tracks concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[tuple] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol: str, granularity_s: int, lookback_minutes: int) -> list[Candle]:
+        with self._lock:
+            self.calls.append((symbol, granularity_s, lookback_minutes))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        now = time.time()
+        return _candles(granularity_s, now - lookback_minutes * 60, now)
+
+
+def _run(warmup: StartupWarmup, symbols: list[str]):
+    buffers = {s: CandleBuffer(symbol=s, log_5m=False) for s in symbols}
+    report = asyncio.run(warmup.run(symbols, buffers.get))
+    return report, buffers
+
+
+def test_missing_minutes():
+    now = 1_700_000_000.0
+    covered = np.arange(now - 3600, now, 60, dtype=np.float64)  # Last closed bar at now - 60
+    assert missing_minutes(np.empty(0), 60, 60, now) == 60
+    assert missing_minutes(covered, 60, 60, now) == 0
+    assert missing_minutes(covered - 600, 60, 60, now) == 11  # Stale tail only
+    assert missing_minutes(covered[-10:], 60, 60, now) == 60  # Older part missing
+
+
+def test_fully_cached_symbol_needs_no_rest(tmp_path):
+    store = CandleStore(base_dir=tmp_path)
+    now = time.time()
+    for tf, seconds in TF_SECONDS.items():
+        store.write_candles("BTC-USD", _candles(seconds, now - max(seconds * 60, 2 * 3600), now), tf)
+    store.flush_all()
+
+    fetch = FakeFetch()
+    report, buffers = _run(StartupWarmup(fetch, store=store), ["BTC-USD"])
+
+    assert fetch.calls == []
+    assert report.from_cache == 1 and report.skipped == 4 and report.warm == 1
+    assert buffers["BTC-USD"].is_warm and len(buffers["BTC-USD"].candles_1d) == 30
+
+
+def test_stale_cache_fetches_only_the_gap(tmp_path):
+    store = CandleStore(base_dir=tmp_path)
+    now = time.time()
+    store.write_candles("ETH-USD", _candles(60, now - 3 * 3600, now - 20 * 60), "1m")
+    store.flush_all()
+
+    fetch = FakeFetch()
+    report, buffers = _run(StartupWarmup(fetch, store=store), ["ETH-USD"])
+
+    lookbacks = {gran: minutes for _, gran, minutes in fetch.calls}
+    assert 20 <= lookbacks[60] <= 22  # Just the missing 1m tail
+    assert lookbacks[3600] == 48 * 60 and lookbacks[86400] == 30 * 24 * 60
+    assert report.candles_cached > 0 and report.requests == len(fetch.calls)
+    assert buffers["ETH-USD"].candles_1m.timestamps[-1] >= now - 120
+    # Fetched candles are written back so the next start finds them cached
+    store.flush_all()
+    assert len(store.load_arrays("ETH-USD", "1d", max_age_hours=31 * 24)) == len(buffers["ETH-USD"].candles_1d)
+
+
+def test_symbols_warm_concurrently_and_seed_features(tmp_path):
+    symbols = [f"S{i}-USD" for i in range(6)]
+    fetch = FakeFetch(delay=0.05)
+    engine = LiveFeatureEngine()
+    warmup = StartupWarmup(fetch, store=CandleStore(base_dir=tmp_path), feature_engine=engine, concurrency=4)
+    ready = []
+    warmup.on_symbol_ready = lambda symbol, buffer: ready.append((symbol, buffer.is_warm))
+
+    report, buffers = _run(warmup, symbols)
+
+    assert 1 < fetch.max_in_flight <= 4
+    assert report.requests == 4 * len(symbols) and report.warm == len(symbols)
+    assert report.first_warm_s is not None and report.first_warm_s < report.elapsed_s
+    assert sorted(ready) == [(s, True) for s in symbols]
+    for symbol in symbols:
+        assert engine.state[symbol].candle_count == len(buffers[symbol].candles_1m)
+        assert engine.state[symbol].closes_1d
@@ -0,0 +1,102 @@
+"""Tests for scanner burst metrics."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.models import Candle, CandleBuffer
+from datafeeds.universe.symbol_scanner import SymbolInfo, SymbolScanner
+
+
+def _make_buffer(symbol: str, count: int, seed: int) -> CandleBuffer:
+    rng = np.random.default_rng(seed)
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    buffer = CandleBuffer(symbol=symbol, log_5m=False)
+    price = 10.0 + seed
+    for i in range(count):
+        close = price * (1 + rng.normal(0, 0.004))
+        buffer.add_1m(Candle(
+            timestamp=base_time + timedelta(minutes=i),
+            open=price,
+            high=max(price, close) * (1 + abs(rng.normal(0, 0.002))),
+            low=min(price, close) * (1 - abs(rng.normal(0, 0.002))),
+            close=close,
+            volume=float(rng.uniform(10, 1000)),
+        ))
+        price = close
+    return buffer
+
+
+def test_batched_burst_metrics_match_per_symbol():
+    counts = [3, 7, 12, 40, 59, 60, 120, 120, 120, 200]
+    buffers = [_make_buffer(f"S{i}-USD", n, i) for i, n in enumerate(counts)]
+
+    single = SymbolScanner()
+    batched = SymbolScanner()
+    for scanner in (single, batched):
+        for b in buffers:
+            scanner.universe[b.symbol] = SymbolInfo(
+                symbol=b.symbol, is_eligible=True, atr_24h=0.5, range_24h=2.0
+            )
+
+    for b in buffers:
+        single.update_burst_metrics(
+            symbol=b.symbol,
+            candles_1m=b.candles_1m,
+            candles_5m=b.candles_5m,
+            vwap=b.vwap(30),
+            atr_24h=0.5,
+        )
+    batched.update_burst_metrics_many(buffers)
+
+    assert set(batched.burst_metrics) == set(single.burst_metrics)
+    fields = [
+        "price", "vol_spike", "range_spike", "trend_15m", "trend_slope",
+        "daily_move", "range_vs_day", "vwap_distance", "burst_score",
+    ]
+    for symbol, expected in single.burst_metrics.items():
+        got = batched.burst_metrics[symbol]
+        for name in fields:
+            assert getattr(got, name) == pytest.approx(getattr(expected, name), rel=1e-9, abs=1e-12), name
+
+
+def test_batched_burst_metrics_skips_cold_buffers():
+    scanner = SymbolScanner()
+    scanner.update_burst_metrics_many([_make_buffer("COLD-USD", 2, 1), CandleBuffer(symbol="EMPTY-USD", log_5m=False)])
+    assert scanner.burst_metrics == {}
+
+
+def test_ranking_tracks_metric_updates_without_resort():
+    from datafeeds.universe.symbol_scanner import BurstMetrics
+
+    scanner = SymbolScanner()
+    symbols = [f"S{i}-USD" for i in range(30)]
+    for sym in symbols:
+        scanner.universe[sym] = SymbolInfo(symbol=sym, is_eligible=sym != "S3-USD")
+    scanner._rebuild_eligible()
+
+    rng = np.random.default_rng(7)
+    for _ in range(5):
+        for sym in symbols:
+            scanner._set_burst_metrics(BurstMetrics(
+                symbol=sym,
+                burst_score=float(rng.uniform(-1, 5)),
+                trend_15m=float(rng.uniform(-1, 1)),
+                vol_spike=float(rng.uniform(0.5, 2)),
+            ))
+
+    expected = sorted(
+        (m for m in scanner.burst_metrics.values() if m.symbol != "S3-USD"),
+        key=lambda m: m.burst_score,
+        reverse=True,
+    )
+    ranked = scanner.get_ranked_universe(top_k=10)
+    assert [r["product_id"] for r in ranked] == [m.symbol for m in expected[:10]]
+    assert [r["rank"] for r in ranked] == list(range(1, 11))
+
+    active = [m for m in expected if m.burst_score > 0 or abs(m.trend_15m) > 0.3 or m.vol_spike > 1.2]
+    hot = scanner.compute_hot_list(top_n=5)
+    assert [m.symbol for m in hot.symbols] == [m.symbol for m in active[:5]]
+    assert [m.rank for m in hot.symbols] == [1, 2, 3, 4, 5]
+    assert len(scanner._ranking) == len(symbols)
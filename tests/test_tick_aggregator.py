@@ -0,0 +1,105 @@
+"""Tests for exchange-time tick aggregation and minute-boundary bar closes."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from datafeeds.collectors import candle_collector
+from datafeeds.collectors.candle_collector import CandleCollector
+from datafeeds.collectors.tick_aggregator import TickAggregator, parse_exchange_ts
+
+T0 = int(datetime(2025, 1, 6, 12, 0, tzinfo=timezone.utc).timestamp())
+
+
+def _bars(closed):
+    return [(s, int(c.timestamp.timestamp()) - T0, c.open, c.high, c.low, c.close, c.volume) for s, c in closed]
+
+
+def test_parse_exchange_ts_handles_nanoseconds():
+    assert parse_exchange_ts("2025-01-06T12:00:05.123456789Z") == pytest.approx(T0 + 5.123456789)
+    assert parse_exchange_ts("2025-01-06T12:01:00Z") == T0 + 60
+    assert parse_exchange_ts("garbage") is None and parse_exchange_ts(None) is None
+
+
+def test_bars_follow_exchange_time_and_trade_volume():
+    agg = TickAggregator(grace=2.0)
+    agg.add_symbol("SOL-USD")
+    assert agg.on_tick("SOL-USD", 10.0, T0 + 1) == []
+    agg.on_trade("SOL-USD", 11.0, 2.0, T0 + 30)
+    agg.on_tick("SOL-USD", 9.5, T0 + 59.9)
+
+    # A trade executed in the next minute closes the bar and opens a new one
+    closed = agg.on_trade("SOL-USD", 12.0, 3.0, T0 + 61)
+    assert _bars(closed) == [("SOL-USD", 0, 10.0, 11.0, 9.5, 9.5, 2.0)]
+
+    # Late event for the closed minute is dropped, not counted in the new bar
+    assert agg.on_trade("SOL-USD", 50.0, 7.0, T0 + 59) == []
+    assert agg.late_events == 1
+    assert agg.last_price("SOL-USD") == 12.0
+
+
+def test_advance_closes_every_symbol_and_carries_forward():
+    agg = TickAggregator(grace=2.0)
+    for symbol in ("A-USD", "B-USD"):
+        agg.add_symbol(symbol)
+    agg.on_tick("A-USD", 5.0, T0 + 10)
+    agg.on_tick("B-USD", 7.0, T0 + 20)
+
+    # Nothing closes until the grace period after the boundary
+    assert agg.advance(T0 + 61) == []
+    assert _bars(agg.advance(T0 + 62)) == [
+        ("A-USD", 0, 5.0, 5.0, 5.0, 5.0, 0.0),
+        ("B-USD", 0, 7.0, 7.0, 7.0, 7.0, 0.0),
+    ]
+
+    # A-USD keeps trading, B-USD goes quiet and gets a zero-volume bar
+    agg.on_trade("A-USD", 6.0, 1.0, T0 + 90)
+    assert _bars(agg.advance(T0 + 122)) == [
+        ("A-USD", 60, 6.0, 6.0, 6.0, 6.0, 1.0),
+        ("B-USD", 60, 7.0, 7.0, 7.0, 7.0, 0.0),
+    ]
+
+    # While the feed is down gaps are not filled, and are not back-filled later
+    assert agg.advance(T0 + 242, fill=False) == []
+    closed = agg.on_tick("B-USD", 8.0, T0 + 245)
+    assert closed == []
+    assert _bars(agg.advance(T0 + 302)) == [
+        ("B-USD", 240, 8.0, 8.0, 8.0, 8.0, 0.0),
+        ("A-USD", 240, 6.0, 6.0, 6.0, 6.0, 0.0),
+    ]
+
+
+def test_gap_between_ticks_is_filled_on_next_event():
+    agg = TickAggregator(max_carry=2)
+    agg.add_symbol("X-USD")
+    agg.on_tick("X-USD", 1.0, T0)
+    closed = agg.on_tick("X-USD", 2.0, T0 + 60 * 5 + 1)
+    # Closed bar, then at most max_carry zero-volume bars right before the new one
+    assert [b[1] for b in _bars(closed)] == [0, 180, 240]
+    assert all(b[6] == 0.0 for b in _bars(closed))
+
+
+def test_collector_builds_bars_from_exchange_timestamps(monkeypatch):
+    monkeypatch.setattr(candle_collector, "log_raw", lambda record: None)
+    monkeypatch.setattr(candle_collector.settings, "raw_capture_format", "jsonl", raising=False)
+    received = []
+    collector = CandleCollector(["SOL-USD"], on_candle=lambda s, c: received.append((s, c)))
+
+    def ticker(ts, price):
+        return {"channel": "ticker", "timestamp": ts,
+                "events": [{"tickers": [{"product_id": "SOL-USD", "price": str(price)}]}]}
+
+    async def feed():
+        await collector._handle_ticker(ticker("2025-01-06T12:00:01.5Z", 10.0))
+        await collector._handle_trades({"channel": "market_trades", "timestamp": "2025-01-06T12:01:00.2Z",
+                                        "events": [{"trades": [
+                                            {"product_id": "SOL-USD", "price": "10.5", "size": "4",
+                                             "side": "BUY", "time": "2025-01-06T12:00:59.9Z"},
+                                        ]}]})
+        await collector._handle_ticker(ticker("2025-01-06T12:01:00.3Z", 11.0))
+
+    asyncio.run(feed())
+    assert _bars(received) == [("SOL-USD", 0, 10.0, 10.5, 10.0, 10.5, 4.0)]
+    assert collector.get_buffer("SOL-USD").candles_1m[-1].volume == 4.0
+    assert collector.get_last_price("SOL-USD") == 11.0
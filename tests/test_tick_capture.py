@@ -0,0 +1,83 @@
+"""Tests for the binary tick capture format."""
+
+import math
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from core.tick_capture import (
+    KIND_TICK,
+    KIND_TRADE,
+    NS_PER_DAY,
+    SIDE_BUY,
+    SIDE_SELL,
+    TickCaptureWriter,
+    capture_to_parquet,
+    open_capture,
+)
+
+DAY0 = 20_000 * NS_PER_DAY  # 2024-10-04 00:00 UTC
+
+
+def test_roundtrip_ticks_and_trades(tmp_path):
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    writer.write_tick("BTC-USD", 100.5, bid=100.0, ask=101.0, ts_ns=DAY0 + 1)
+    writer.write_trade("ETH-USD", 20.0, 3.5, side="SELL", ts_ns=DAY0 + 2)
+    writer.write_trade("BTC-USD", 100.6, 0.1, side="buy", ts_ns=DAY0 + 3)
+    writer.write_tick("ETH-USD", 20.1, ts_ns=DAY0 + 4)
+    writer.close()
+
+    capture = open_capture(tmp_path / "ticks_2024-10-04.bin")
+    rec = capture.records
+    assert capture.symbols == ["BTC-USD", "ETH-USD"]
+    assert len(capture) == 4
+    assert rec["ts_ns"].tolist() == [DAY0 + 1, DAY0 + 2, DAY0 + 3, DAY0 + 4]
+    assert rec["kind"].tolist() == [KIND_TICK, KIND_TRADE, KIND_TRADE, KIND_TICK]
+    assert rec["side"].tolist() == [0, SIDE_SELL, SIDE_BUY, 0]
+    assert capture.symbol_of(rec).tolist() == ["BTC-USD", "ETH-USD", "BTC-USD", "ETH-USD"]
+    assert rec["bid"][0] == 100.0 and rec["ask"][0] == 101.0
+    assert math.isnan(rec["bid"][3]) and math.isnan(rec["size"][0])
+    assert isinstance(rec, np.memmap)
+
+
+def test_rotation_and_resume_keep_symbol_ids(tmp_path):
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    writer.write_tick("SOL-USD", 150.0, ts_ns=DAY0 + 10)
+    writer.write_tick("BTC-USD", 100.0, ts_ns=DAY0 + NS_PER_DAY + 1)
+    writer.close()
+
+    # A restart on the same day appends and reuses the dictionary
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    writer.write_tick("BTC-USD", 101.0, ts_ns=DAY0 + NS_PER_DAY + 2)
+    writer.write_tick("ETH-USD", 20.0, ts_ns=DAY0 + NS_PER_DAY + 3)
+    writer.close()
+
+    day0 = open_capture(tmp_path / "ticks_2024-10-04.bin")
+    day1 = open_capture(tmp_path / "ticks_2024-10-05.bin")
+    assert day0.symbols == ["SOL-USD"]
+    assert day1.symbols == ["BTC-USD", "ETH-USD"]
+    assert day1.symbol_of(day1.records).tolist() == ["BTC-USD", "BTC-USD", "ETH-USD"]
+
+
+def test_reader_ignores_torn_trailing_record(tmp_path):
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    for i in range(5):
+        writer.write_tick("BTC-USD", 100.0 + i, ts_ns=DAY0 + i)
+    writer.close()
+    path = tmp_path / "ticks_2024-10-04.bin"
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    assert len(open_capture(path)) == 5
+
+
+def test_convert_to_parquet(tmp_path):
+    writer = TickCaptureWriter(base_dir=tmp_path)
+    for i in range(50):
+        writer.write_trade("BTC-USD" if i % 2 else "ETH-USD", 10.0 + i, 1.0, "BUY", ts_ns=DAY0 + i)
+    writer.close()
+
+    out = capture_to_parquet(tmp_path / "ticks_2024-10-04.bin", chunk_records=16)
+    table = pq.read_table(out)
+    assert table.num_rows == 50
+    assert table.column("symbol").to_pylist()[:2] == ["ETH-USD", "BTC-USD"]
+    assert table.column("price").to_pylist()[-1] == 59.0
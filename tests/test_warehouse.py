@@ -0,0 +1,120 @@
+"""Tests for the DuckDB analytics warehouse (incremental ingest + queries)."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from core.warehouse import Warehouse, connect
+
+
+def _iso(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def _append(path, records, partial: str = ""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+        f.write(partial)
+
+
+def _close(ts, symbol, strategy, pnl, reason="tp1"):
+    return {"ts": _iso(ts), "type": "trade_close", "symbol": symbol, "strategy_id": strategy,
+            "pnl": pnl, "pnl_pct": pnl, "exit_reason": reason, "hold_minutes": 10}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    logs = tmp_path / "logs"
+    day = now.strftime("%Y-%m-%d")
+    trades = logs / "live" / f"trades_{day}.jsonl"
+    strategy = logs / "live" / f"strategy_{day}.jsonl"
+    _append(trades, [
+        {"ts": _iso(now), "type": "order_intent", "symbol": "SOL-USD", "strategy_id": "burst_flag"},
+        _close(now, "SOL-USD", "burst_flag", 5.0),
+        _close(now, "ETH-USD", "burst_flag", -2.0, "stop"),
+        _close(now - timedelta(days=3), "ETH-USD", "vwap_reclaim", 1.0),
+        {"ts": _iso(now), "symbol": "SOL-USD", "exit_reason": "tp1", "current_price": 1.0},
+        {"ts": _iso(now), "type": "stop_placed", "symbol": "SOL-USD"},
+    ])
+    _append(strategy, [
+        {"ts": _iso(now), "type": "signal", "symbol": "SOL-USD", "strategy_id": "burst_flag"},
+        {"ts": _iso(now), "symbol": "SOL-USD", "gate": "spread"},
+        {"ts": _iso(now), "symbol": "ETH-USD", "gate": "spread"},
+        {"ts": _iso(now), "symbol": "ETH-USD", "gate": "score"},
+        {"ts": _iso(now), "type": "universe", "symbols": []},
+    ], partial='{"ts": "torn')
+    candle_file = logs / "live" / "candles" / "SOL-USD" / "1m.jsonl"
+    base = now.replace(second=0)
+    _append(candle_file, [
+        {"ts": (base - timedelta(minutes=i)).isoformat(), "open": 1, "high": 2, "low": 0.5,
+         "close": 1.5, "volume": 10, "tf": "1m", "source": "ws"}
+        for i in (2, 1, 1)  # duplicate minute
+    ])
+    wh = Warehouse(tmp_path / "wh.duckdb", logs, parquet_dir=None)
+    return wh, trades, strategy, now
+
+
+def test_ingest_routes_records_and_queries(tree):
+    wh, _, _, _ = tree
+    counts = wh.refresh()
+    assert counts == {"trades": 4, "exits": 1, "signals": 1, "rejections": 3, "candles": 2}
+
+    summary = wh.summary(days=1, mode="live")
+    assert summary["trades"] == 2 and summary["wins"] == 1 and summary["losses"] == 1
+    assert summary["total_pnl"] == pytest.approx(3.0)
+    assert summary["profit_factor"] == pytest.approx(2.5)
+    assert summary["signals"] == 1 and summary["rejections"] == 3
+    assert wh.summary(days=7, mode="live")["trades"] == 3
+    assert wh.summary(days=7, mode="paper")["trades"] == 0
+
+    assert list(wh.by_strategy(days=7)) == ["burst_flag", "vwap_reclaim"]
+    assert wh.exit_reasons(days=1)["stop"]["count"] == 1
+    assert wh.rejections(days=1)["by_gate"] == {"spread": 2, "score": 1}
+    daily = wh.daily_pnl(days=7)
+    assert len(daily) == 2 and daily[-1]["cum_pnl"] == pytest.approx(4.0)
+    assert len(wh.candles("SOL-USD")) == 2
+
+
+def test_ingest_is_incremental(tree):
+    wh, trades, strategy, now = tree
+    wh.refresh()
+    assert wh.refresh() == {}
+
+    # Completing the torn line and appending picks up only the new records
+    _append(strategy, [], partial='", "gate": "rr"}\n')
+    _append(strategy, [{"ts": _iso(now), "symbol": "BTC-USD", "gate": "rr"}])
+    _append(trades, [_close(now, "BTC-USD", "burst_flag", 1.0)])
+    assert wh.refresh() == {"trades": 1, "rejections": 1}
+    assert wh.summary(days=1)["trades"] == 3
+
+    # A rewritten (shrunk) file replaces its rows instead of duplicating them
+    trades.write_text(json.dumps(_close(now, "BTC-USD", "burst_flag", 1.0)) + "\n")
+    assert wh.refresh() == {"trades": 1}
+    assert wh.summary(days=30)["trades"] == 1
+
+    con = connect(wh.path)
+    try:
+        assert con.execute("SELECT count(*) FROM exits").fetchone()[0] == 0
+    finally:
+        con.close()
+
+
+
+def test_query_overlaps_open_read_write_connection(tree):
+    wh, _, _, _ = tree
+    assert wh.summary(days=1)["trades"] == 0  # Queries before any ingest see empty tables
+    wh.refresh()
+
+    # e.g. another request's ingest still holding its connection
+    writer = connect(wh.path)
+    try:
+        assert wh.summary(days=1, mode="live")["trades"] == 2
+    finally:
+        writer.close()
+    assert wh.refresh() == {}
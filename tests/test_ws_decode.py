@@ -0,0 +1,58 @@
+"""Tests for the WS decoding layer."""
+
+import json
+
+import pytest
+
+from datafeeds.collectors import ws_decode
+from datafeeds.collectors.ws_decode import WsDecoder, get_json_parser
+
+# Malformed-frame warnings go to the events log; keep it out of the repo
+pytestmark = pytest.mark.usefixtures("tmp_logs_dir")
+
+
+def _ticker(symbol, price, bid="", ask=""):
+    return {"product_id": symbol, "price": price, "best_bid": bid, "best_ask": ask}
+
+
+def test_parser_selection_falls_back_to_stdlib(monkeypatch):
+    assert get_json_parser("json") is json.loads
+    monkeypatch.setattr(ws_decode, "JSON_PARSERS", {"json": json.loads})
+    assert get_json_parser("auto") is json.loads
+    assert get_json_parser("orjson") is json.loads
+
+    calls = []
+    decoder = WsDecoder(["A-USD"], parser=lambda raw: calls.append(raw) or {"channel": "x"})
+    assert decoder.decode(b"{}") == {"channel": "x"} and calls == [b"{}"]
+
+
+def test_decoder_filters_symbols_and_computes_spread_once():
+    decoder = WsDecoder(["SOL-USD", "ETH-USD"], parser="json")
+    frame = json.dumps({"channel": "ticker", "events": [{"tickers": [
+        _ticker("SOL-USD", "100", "99.9", "100.1"),
+        _ticker("BTC-USD", "50000", "49999", "50001"),  # Not subscribed
+        _ticker("ETH-USD", "2000"),                     # No book sides
+        _ticker("ETH-USD", "bad"),
+        _ticker("ETH-USD", "0"),
+    ]}]})
+    data = decoder.decode(frame)
+    assert list(decoder.tickers(data)) == [
+        ("SOL-USD", 100.0, 99.9, 100.1, pytest.approx(20.0)),
+        ("ETH-USD", 2000.0, None, None, None),
+    ]
+
+    trades = {"events": [{"trades": [
+        {"product_id": "SOL-USD", "price": "100.5", "size": "2", "side": "BUY", "time": "t"},
+        {"product_id": "DOGE-USD", "price": "1", "size": "1"},
+    ]}]}
+    assert list(decoder.trades(trades)) == [("SOL-USD", 100.5, 2.0, "BUY", "t")]
+
+    decoder.set_symbols(["DOGE-USD"])
+    assert [t[0] for t in decoder.trades(trades)] == ["DOGE-USD"]
+    assert "SOL-USD" not in decoder
+
+
+def test_decode_rejects_malformed_frames():
+    decoder = WsDecoder([], parser="json")
+    assert decoder.decode("{not json") is None
+    assert decoder.decode("[1, 2]") is None
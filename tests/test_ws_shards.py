@@ -0,0 +1,129 @@
+"""Tests for sharded WS ingestion against a local fake exchange."""
+
+import asyncio
+import json
+import time
+
+import pytest
+import websockets
+
+from datafeeds.collectors import candle_collector
+from datafeeds.collectors.candle_collector import CandleCollector
+
+# Reconnect/health events are logged; keep the events file out of the repo
+pytestmark = pytest.mark.usefixtures("tmp_logs_dir")
+
+
+class FakeExchange:
+    """Streams ticker frames for whatever each connection is subscribed to."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.connections = 0
+        self.subscriptions: list[set[str]] = []
+        self.muted: set[int] = set()
+        self.url = ""
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handler, "127.0.0.1", 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handler(self, ws, *args):
+        conn = self.connections
+        self.connections += 1
+        subscribed: set[str] = set()
+        self.subscriptions.append(subscribed)
+
+        async def read():
+            async for raw in ws:
+                msg = json.loads(raw)
+                if msg["channel"] != "ticker":
+                    continue
+                if msg["type"] == "subscribe":
+                    subscribed.update(msg["product_ids"])
+                else:
+                    subscribed.difference_update(msg["product_ids"])
+
+        reader = asyncio.create_task(read())
+        try:
+            while not reader.done():
+                if conn not in self.muted:
+                    tickers = [{"product_id": s, "price": "1.5"} for s in sorted(subscribed)]
+                    await ws.send(json.dumps({"channel": "ticker", "events": [{"tickers": tickers}]}))
+                await asyncio.sleep(self.interval)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+
+def _collector(monkeypatch, symbols, url, **kwargs):
+    monkeypatch.setattr(candle_collector, "log_raw", lambda record: None)
+    monkeypatch.setattr(candle_collector.settings, "raw_capture_format", "jsonl", raising=False)
+    collector = CandleCollector(symbols, url=url, **kwargs)
+    ticks: dict[str, list[float]] = {}
+    collector.on_tick = lambda symbol, price, **kw: ticks.setdefault(symbol, []).append(time.monotonic())
+    return collector, ticks
+
+
+async def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_symbol_rotation_is_incremental_and_gap_free(monkeypatch):
+    async def scenario():
+        async with FakeExchange() as exchange:
+            collector, ticks = _collector(monkeypatch, ["A-USD", "B-USD", "C-USD", "D-USD"],
+                                          exchange.url, num_shards=2)
+            task = asyncio.create_task(collector.start())
+            await _wait_for(lambda: all(s in ticks for s in collector.symbols))
+            assert exchange.connections == 2
+            assert sorted(len(s) for s in exchange.subscriptions) == [2, 2]
+
+            rotated_at = time.monotonic()
+            await collector.update_symbols(["A-USD", "B-USD", "C-USD", "E-USD"])
+            await _wait_for(lambda: "E-USD" in ticks)
+            await asyncio.sleep(0.2)
+            collector.stop()
+            await task
+
+            # No reconnect: the rotation went out as (un)subscribe messages
+            assert exchange.connections == 2 and collector.total_reconnects == 0
+            assert not any("D-USD" in s for s in exchange.subscriptions)
+            assert ticks["D-USD"][-1] < rotated_at + 0.1
+            # E-USD took D-USD's place on the freed shard
+            assert sorted(len(s) for s in exchange.subscriptions) == [2, 2]
+            for symbol in ("A-USD", "B-USD", "C-USD"):
+                stamps = ticks[symbol]
+                assert max(b - a for a, b in zip(stamps, stamps[1:])) < 0.2
+
+    asyncio.run(scenario())
+
+
+def test_health_monitor_restarts_silent_shard(monkeypatch):
+    monkeypatch.setattr(CandleCollector, "HEALTH_CHECK_INTERVAL", 0.05)
+    monkeypatch.setattr(CandleCollector, "SHARD_STALE_AFTER", 0.2)
+
+    async def scenario():
+        async with FakeExchange() as exchange:
+            exchange.muted.add(0)  # First connection goes silent after the handshake
+            collector, ticks = _collector(monkeypatch, ["A-USD", "B-USD"], exchange.url, num_shards=2)
+            task = asyncio.create_task(collector.start())
+            await _wait_for(lambda: "A-USD" in ticks and "B-USD" in ticks)
+            collector.stop()
+            await task
+
+            assert exchange.connections == 3  # Only the silent shard reconnected
+            assert [s["connected"] for s in collector.shard_status()] == [False, False]
+
+    asyncio.run(scenario())
@@ -26,6 +26,7 @@ from core.bot_controller import get_controller, BotController
 from core.config_manager import get_config_manager, ConfigManager
 from core.mode_config import sanitize_config_snapshot
 from core.strategy_registry import get_strategy_registry, StrategyRegistry
+from core.warehouse import warehouse
 from execution.position_controller import get_position_controller, PositionController
 
 app = FastAPI(title="CoinTrader Dashboard API", version="2.0")
@@ -474,6 +475,8 @@ def get_state_snapshot() -> dict:
                 "events_5s": 0,
                 "rest_requests": 0,
                 "rest_429s": 0,
+                "loop_lag_ms": 0.0,
+                "loop_lag_max_ms": 0.0,
                 "candles_persisted": 0,
                 "ml_fresh_pct": 0,
                 "vol_regime": "normal",
@@ -649,6 +652,8 @@ def get_state_snapshot() -> dict:
             "events_5s": state.events_last_5s,
             "rest_requests": state.rest_requests,
             "rest_429s": state.rest_429s,
+            "loop_lag_ms": getattr(state, "loop_lag_ms", 0.0),
+            "loop_lag_max_ms": getattr(state, "loop_lag_max_ms", 0.0),
             "candles_persisted": state.candles_persisted,
             "ml_fresh_pct": state.ml_fresh_pct,
             "vol_regime": state.vol_regime,
@@ -737,6 +742,18 @@ async def get_coverage():
     )
 
 
+@app.get("/api/perf")
+async def get_perf():
+    """Stage/symbol latency histograms and event-loop lag."""
+    from core.perf import perf
+    from core.shared_state import read_state
+
+    if _bot_state is not None:
+        return perf.snapshot()
+    shared = read_state() or {}
+    return shared.get("perf") or {"enabled": False, "stages": {}, "symbols": {}}
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
@@ -1516,11 +1533,43 @@ async def get_analytics_summary():
     }
 
 
+# Warehouse ingestion is incremental; don't re-scan logs more than this often
+_WAREHOUSE_REFRESH_SECONDS = 30.0
+
+
+def _warehouse_history(days: float, mode: str) -> dict:
+    warehouse.refresh(min_interval=_WAREHOUSE_REFRESH_SECONDS)
+    return {
+        "days": days,
+        "mode": mode,
+        "summary": warehouse.summary(days, mode),
+        "by_strategy": warehouse.by_strategy(days, mode),
+        "exit_reasons": warehouse.exit_reasons(days, mode),
+        "rejections": warehouse.rejections(days, mode),
+    }
+
+
+@app.get("/api/analytics/history")
+async def get_analytics_history(days: float = Query(default=7, gt=0)):
+    """Multi-day trade/strategy/rejection analytics from the DuckDB warehouse."""
+    try:
+        return await asyncio.to_thread(_warehouse_history, days, _bot_mode)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _warehouse_equity(days: float, mode: str) -> list[dict]:
+    warehouse.refresh(min_interval=_WAREHOUSE_REFRESH_SECONDS)
+    return warehouse.daily_pnl(days, mode)
+
+
 @app.get("/api/analytics/equity-history")
-async def get_equity_history():
-    """Get equity curve data (placeholder - needs historical tracking)."""
-    # TODO: Implement equity history tracking
-    return {"history": [], "message": "Equity history tracking not yet implemented"}
+async def get_equity_history(days: float = Query(default=30, gt=0)):
+    """Realized P&L per day with cumulative curve (from the warehouse)."""
+    try:
+        return {"history": await asyncio.to_thread(_warehouse_equity, days, _bot_mode)}
+    except Exception as e:
+        return {"history": [], "error": str(e)}
 
 
 # =============================================================================
@@ -1547,13 +1596,14 @@ def _get_coinbase_client():
         return _coinbase_client
     
     try:
-        from coinbase.rest import RESTClient
         from core.config import settings
+        from core.rest_pool import rest_pool
         
         if not settings.coinbase_api_key or not settings.coinbase_api_secret:
             return None
         
-        _coinbase_client = RESTClient(
+        # Shares the bot process's keep-alive clients when run in-process
+        _coinbase_client = rest_pool.private_client(
             api_key=settings.coinbase_api_key,
             api_secret=settings.coinbase_api_secret
         )